@@ -33,5 +33,28 @@ TEST_BLOG_POST = {
     'category': 'Technology'
 }
 
+# Scratch directory for harness state (entity registries, caches, timings)
+HARNESS_DIR = os.getenv('HARNESS_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.harness'))
+
+# Pre-provisioned accounts leased to tests that just need a logged-in user
+ACCOUNT_POOL = {
+    'size': int(os.getenv('ACCOUNT_POOL_SIZE', '4')),  # Keep >= number of parallel workers
+    'password': os.getenv('ACCOUNT_POOL_PASSWORD', 'PoolPassword123!'),
+}
+
+# Existing account the synthetic monitor's login check signs in with
+MONITOR_ACCOUNT = {
+    'email': os.getenv('MONITOR_EMAIL'),
+    'password': os.getenv('MONITOR_PASSWORD'),
+}
+
+# Run UI tests in isolated browser contexts of one shared Chrome per worker
+# instead of starting a Chrome per test
+BROWSER_CONTEXTS = os.getenv('BROWSER_CONTEXTS', 'false').lower() == 'true'
+
+# Throttle every test browser with a utils.throttling profile, e.g. slow-3g or
+# fast-4g+cpu-4x (unset runs unthrottled)
+THROTTLE_PROFILE = os.getenv('THROTTLE_PROFILE') or None
+
 # Feature flags
 SKIP_ADMIN_TESTS = os.getenv('SKIP_ADMIN_TESTS', 'false').lower() == 'true'  # Set to true to skip admin tests
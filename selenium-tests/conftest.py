@@ -0,0 +1,17 @@
+"""
+Shared Pytest Configuration
+Registers the harness plugins for every suite under tests/
+"""
+
+pytest_plugins = [
+    'utils.cleanup',
+    'utils.account_pool',
+    'utils.api_cassette',
+    'utils.phase_profiler',
+    'utils.html_driver',
+    'utils.readiness_gate',
+    'utils.sharding',
+    'utils.locators',
+    'utils.live_dashboard',
+    'utils.page_snapshots',
+]
@@ -0,0 +1,70 @@
+"""
+Account Pool Test Suite
+Checks provisioning, token caching and exclusive leases against the local
+stand-in backend
+"""
+import json
+import multiprocessing
+
+import pytest
+
+from utils.account_pool import AccountPool, token_expiry
+from utils.api_client import ApiClient
+from utils.standin_server import StandinServer, make_token
+
+
+def _hold_lease(directory, url, ready, release):
+    pool = AccountPool(size=1, client=ApiClient(url), directory=directory)
+    with pool.lease():
+        ready.set()
+        release.wait(10)
+
+
+class TestAccountPool:
+    """Provisioning and leasing of pre-created accounts"""
+
+    def test_01_provision_registers_once_and_caches_tokens(self, tmp_path):
+        """Test 1: Accounts are created on first use and later runs reuse cached JWTs"""
+        with StandinServer() as server:
+            pool = AccountPool(size=3, client=ApiClient(server.url), directory=str(tmp_path))
+            assert pool.provision() == 3
+            assert len(server.store.users) == 3
+            calls = len(server.request_log)
+
+            assert AccountPool(size=3, client=ApiClient(server.url), directory=str(tmp_path)).provision() == 0
+            assert len(server.request_log) == calls
+        print("✓ Second provision served entirely from the token cache")
+
+    def test_02_expiring_tokens_are_refreshed(self, tmp_path):
+        """Test 2: A token close to expiry triggers a login, not a registration"""
+        assert token_expiry(make_token('u1', 60)) > 0
+        assert token_expiry('not-a-jwt') == 0
+        with StandinServer() as server:
+            pool = AccountPool(size=2, client=ApiClient(server.url), directory=str(tmp_path))
+            pool.provision()
+            cache = pool._read_cache()
+            cache['accounts'][pool.email(0)]['user']['token'] = make_token('u1', 60)
+            with open(pool.cache_path, 'w') as f:
+                json.dump(cache, f)
+            assert pool.provision() == 1
+            assert len(server.store.users) == 2
+        print("✓ Stale token refreshed without creating a new user")
+
+    def test_03_leases_are_exclusive_across_processes(self, tmp_path):
+        """Test 3: A leased account is unavailable to other processes until released"""
+        with StandinServer() as server:
+            pool = AccountPool(size=1, client=ApiClient(server.url), directory=str(tmp_path))
+            pool.provision()
+            ready, release = multiprocessing.Event(), multiprocessing.Event()
+            holder = multiprocessing.Process(target=_hold_lease, args=(str(tmp_path), server.url, ready, release))
+            holder.start()
+            try:
+                assert ready.wait(10)
+                with pytest.raises(TimeoutError):
+                    pool.lease(timeout=0.3)
+            finally:
+                release.set()
+                holder.join(10)
+            with pool.lease(timeout=2) as account:
+                assert account['email'] == 'pooluser0@test.com' and account['user']['token']
+        print("✓ Lease held by another process blocks until released")
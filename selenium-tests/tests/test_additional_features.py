@@ -6,9 +6,8 @@ Tests for comments, theme toggle, and other features
 import pytest
 import time
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from utils.driver_setup import get_chrome_driver, close_driver
+from utils.driver_setup import get_test_driver, release_test_driver
+from utils.account_pool import login_browser
 from config import BASE_URL
 
 
@@ -16,56 +15,25 @@ class TestAdditionalFeatures:
     """Test cases for comments and other features"""
     
     @pytest.fixture(autouse=True)
-    def setup_teardown(self):
+    def setup_teardown(self, entity_registry, pooled_account, locate):
         """Setup and teardown for each test"""
-        self.driver = get_chrome_driver(headless=True)
-        self.wait = WebDriverWait(self.driver, 10)
+        self.registry = entity_registry
+        self.account = pooled_account
+        self.driver = get_test_driver(headless=True)
+        self.locate = locate(self.driver)
         
         # Login before each test
         self._login()
         
         yield
-        close_driver(self.driver)
+        release_test_driver(self.driver)
     
     def _login(self):
-        """Helper method to login before tests"""
-        test_email = f"featuretest{int(time.time())}@test.com"
-        self.test_password = "TestPassword123!"
-        
-        self.driver.get(f"{BASE_URL}/sign-up")
-        time.sleep(2)
-        
+        """Helper method to login before tests (leased pool account, no form round-trip)"""
+        self.test_email = self.account['email']
+        self.test_password = self.account['password']
         try:
-            username_input = self.wait.until(
-                EC.presence_of_element_located((By.ID, "username"))
-            )
-            username_input.send_keys(f"featureuser{int(time.time())}")
-            
-            email_input = self.driver.find_element(By.ID, "email")
-            email_input.send_keys(test_email)
-            
-            password_input = self.driver.find_element(By.ID, "password")
-            password_input.send_keys(self.test_password)
-            
-            submit_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-            submit_button.click()
-            time.sleep(3)
-            
-            # Login
-            self.driver.get(f"{BASE_URL}/sign-in")
-            time.sleep(2)
-            
-            email_input = self.wait.until(
-                EC.presence_of_element_located((By.ID, "email"))
-            )
-            email_input.send_keys(test_email)
-            
-            password_input = self.driver.find_element(By.ID, "password")
-            password_input.send_keys(self.test_password)
-            
-            submit_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-            submit_button.click()
-            time.sleep(3)
+            login_browser(self.driver, BASE_URL, self.account['user'])
         except Exception as e:
             print(f"Login helper failed: {e}")
     
@@ -79,10 +47,7 @@ class TestAdditionalFeatures:
         
         try:
             # Click on a blog post
-            blog_post = self.wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, 
-                    "article a, .post-card a, [href*='/post/']"))
-            )
+            blog_post = self.locate('post_link', clickable=True)
             blog_post.click()
             time.sleep(3)
             
@@ -91,22 +56,18 @@ class TestAdditionalFeatures:
             time.sleep(2)
             
             # Find comment textarea
-            comment_input = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 
-                    "textarea[placeholder*='comment' i], textarea[name='comment'], .comment-input"))
-            )
+            comment_input = self.locate('comment_input')
             comment_input.send_keys("This is an automated test comment from Selenium!")
+            self.registry.add_comments_by(self.account['user']['_id'])
             
             # Submit comment
-            submit_button = self.driver.find_element(By.XPATH, 
-                "//button[contains(text(), 'Submit') or contains(text(), 'Post') or contains(text(), 'Comment')]")
+            submit_button = self.locate('comment_submit')
             submit_button.click()
             
             time.sleep(3)
             
             # Verify comment appears
-            comments = self.driver.find_elements(By.CSS_SELECTOR, 
-                ".comment, .comment-item, [class*='comment']")
+            comments = self.locate.find_all('comment')
             assert len(comments) > 0, "Comment not added"
             
             print("[PASS] Comment added successfully")
@@ -122,10 +83,7 @@ class TestAdditionalFeatures:
         
         try:
             # Find theme toggle button (usually moon/sun icon)
-            theme_toggle = self.wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, 
-                    "button[aria-label*='theme' i], .theme-toggle, [class*='theme-toggle']"))
-            )
+            theme_toggle = self.locate('theme_toggle', clickable=True)
             
             # Get initial theme (check body or html class)
             initial_theme_classes = self.driver.find_element(By.TAG_NAME, "html").get_attribute("class")
@@ -0,0 +1,66 @@
+"""
+API Record/Replay Test Suite
+Records stand-in traffic through the cassette proxy and replays it with the
+backend gone
+"""
+import json
+import time
+
+import pytest
+import requests
+
+from config import TEST_ADMIN
+from utils.api_cassette import Cassette, CassetteProxy, request_key
+from utils.api_client import ApiClient, ApiError
+from utils.standin_server import StandinServer
+
+
+class TestApiCassette:
+    """Recording, matching and replaying /api/* exchanges"""
+
+    def test_01_request_key_ignores_volatile_fields(self):
+        """Test 1: Timestamps, uuids, pids, tokens and query order do not change the key"""
+        first = request_key('POST', '/api/blog/post-blog?b=2&a=1', json.dumps(
+            {'blogTitle': 'Post 1712345678', 'token': 'abc', 'email': 'testuser123@test.com'}).encode())
+        second = request_key('POST', '/api/blog/post-blog?a=1&b=2', json.dumps(
+            {'email': 'testuser98765@test.com', 'blogTitle': 'Post 1799999999', 'token': 'xyz'}).encode())
+        assert first == second
+        assert request_key('GET', '/api/blog/get-all-blogs?page=1') != request_key('GET', '/api/blog/get-all-blogs?page=2')
+        print(f"✓ {first}")
+
+    def test_02_replay_serves_recorded_sequences_without_backend(self, tmp_path):
+        """Test 2: Replay returns each test's responses in recorded order after the backend is gone"""
+        cassette_dir = str(tmp_path / 'cassette')
+        with StandinServer() as server:
+            server.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            with CassetteProxy(Cassette(cassette_dir), 'record', server.url) as proxy:
+                client = ApiClient(proxy.url)
+                proxy.scope = 'test_a'
+                admin = client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+                before = client.get_blogs(limit=5)
+                client.post_blog(admin, f"Recorded {int(time.time())}", '<p>body</p>')
+                after = client.get_blogs(limit=5)
+                proxy.scope = 'test_b'
+                other = client.get_blogs(limit=1)
+            assert proxy.counts['recorded'] == 5
+        assert len(before['blogs']) == 0 and len(after['blogs']) == 1
+
+        with CassetteProxy(Cassette(cassette_dir), 'replay', server.url) as proxy:
+            client = ApiClient(proxy.url)
+            proxy.scope = 'test_a'
+            started = time.perf_counter()
+            admin = client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            assert client.get_blogs(limit=5) == before
+            client.post_blog(admin, f"Recorded {int(time.time()) + 7}", '<p>body</p>')
+            assert client.get_blogs(limit=5) == after
+            elapsed = time.perf_counter() - started
+            proxy.scope = 'test_c'  # Not recorded: falls back to the same request from any test
+            assert client.get_blogs(limit=1) == other
+            with pytest.raises(ApiError) as missed:
+                client.get_blogs(limit=99)
+            assert missed.value.status_code == 404
+            assert requests.get(proxy.url + '/api/blog/get-all-blogs?limit=99').headers['X-Cassette'] == 'miss'
+        assert proxy.counts['replayed'] == 5 and proxy.counts['missed'] == 2
+        with pytest.raises(pytest.fail.Exception, match='has no pool accounts'):
+            proxy.replay_pool()  # Recorded without a pooled test
+        print(f"✓ 4 calls replayed in {elapsed * 1000:.1f}ms with the backend stopped")
@@ -9,6 +9,8 @@ import os
 import random
 import string
 
+from utils.cleanup import get_registry
+
 BASE_URL = os.getenv('APP_URL', 'http://localhost:8081')
 API_URL = f"{BASE_URL}/api"
 
@@ -77,8 +79,9 @@ class TestBlogApplication:
             # Check if registration succeeded
             assert response.status_code in [200, 201], f"Registration failed: {response.status_code} - {response.text}"
             
-           data = response.json()
+            data = response.json()
             assert 'email' in data or 'user' in data or '_id' in data, "Response missing user data"
+            get_registry().add_user(TEST_USER_EMAIL, TEST_USER_PASSWORD)
             
             print(f"✓ User registered successfully")
             print(f"  Response: {response.status_code}")
@@ -5,10 +5,12 @@ Tests user registration, login, and logout functionality
 
 import pytest
 import time
+import uuid
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from utils.driver_setup import get_chrome_driver, close_driver
+from utils.account_pool import login_browser
 from config import BASE_URL, TEST_USER
 
 
@@ -16,8 +18,9 @@ class TestAuthentication:
     """Test cases for user authentication"""
     
     @pytest.fixture(autouse=True)
-    def setup_teardown(self):
+    def setup_teardown(self, entity_registry):
         """Setup and teardown for each test"""
+        self.registry = entity_registry
         self.driver = get_chrome_driver(headless=True)
         self.wait = WebDriverWait(self.driver, 10)
         yield
@@ -46,6 +49,7 @@ class TestAuthentication:
         # Submit form
         submit_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
         submit_button.click()
+        self.registry.add_user(TEST_USER['email'], TEST_USER['password'])
         
         time.sleep(3)
         
@@ -61,7 +65,7 @@ class TestAuthentication:
         self.driver.get(f"{BASE_URL}/sign-up")
         time.sleep(2)
         
-        unique_email = f"duplicate{int(time.time())}@test.com"
+        unique_email = f"duplicate{uuid.uuid4().hex[:12]}@test.com"  # Safe across parallel workers
         
         username_input = self.wait.until(
             EC.presence_of_element_located((By.ID, "username"))
@@ -76,6 +80,7 @@ class TestAuthentication:
         
         submit_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
         submit_button.click()
+        self.registry.add_user(unique_email, TEST_USER['password'])
         
         time.sleep(3)
         
@@ -109,34 +114,15 @@ class TestAuthentication:
             assert "sign-up" in self.driver.current_url, "Should show error for duplicate email"
             print("[PASS] Duplicate email registration prevented")
     
-    def test_03_user_login_valid_credentials(self):
+    def test_03_user_login_valid_credentials(self, pooled_account):
         """Test Case 3: User login with valid credentials"""
         print("\n[TEST 3] Testing user login with valid credentials...")
         
-        # First, register a user
-        self.driver.get(f"{BASE_URL}/sign-up")
-        time.sleep(2)
-        
-        test_email = f"logintest{int(time.time())}@test.com"
-        test_password = "TestPassword123!"
-        
-        username_input = self.wait.until(
-            EC.presence_of_element_located((By.ID, "username"))
-        )
-        username_input.send_keys("logintestuser")
-        
-        email_input = self.driver.find_element(By.ID, "email")
-        email_input.send_keys(test_email)
-        
-        password_input = self.driver.find_element(By.ID, "password")
-        password_input.send_keys(test_password)
+        # Pre-provisioned account; only the registration tests create users
+        test_email = pooled_account['email']
+        test_password = pooled_account['password']
         
-        submit_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        submit_button.click()
-        
-        time.sleep(3)
-        
-        # Now login with those credentials
+        # Login through the form
         self.driver.get(f"{BASE_URL}/sign-in")
         time.sleep(2)
         
@@ -187,50 +173,14 @@ class TestAuthentication:
             assert "sign-in" in self.driver.current_url, "Should remain on sign-in page"
             print("[PASS] Invalid login correctly rejected")
     
-    def test_05_user_logout(self):
+    def test_05_user_logout(self, pooled_account):
         """Test Case 5: User logout functionality"""
         print("\n[TEST 5] Testing user logout functionality...")
         
-        # First, register and login
-        self.driver.get(f"{BASE_URL}/sign-up")
+        # Start from a logged-in session (cached token of a pool account)
+        login_browser(self.driver, BASE_URL, pooled_account['user'])
         time.sleep(2)
         
-        test_email = f"logouttest{int(time.time())}@test.com"
-        test_password = "TestPassword123!"
-        
-        username_input = self.wait.until(
-            EC.presence_of_element_located((By.ID, "username"))
-        )
-        username_input.send_keys("logouttestuser")
-        
-        email_input = self.driver.find_element(By.ID, "email")
-        email_input.send_keys(test_email)
-        
-        password_input = self.driver.find_element(By.ID, "password")
-        password_input.send_keys(test_password)
-        
-        submit_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        submit_button.click()
-        
-        time.sleep(3)
-        
-        # Login
-        self.driver.get(f"{BASE_URL}/sign-in")
-        time.sleep(2)
-        
-        email_input = self.wait.until(
-            EC.presence_of_element_located((By.ID, "email"))
-        )
-        email_input.send_keys(test_email)
-        
-        password_input = self.driver.find_element(By.ID, "password")
-        password_input.send_keys(test_password)
-        
-        submit_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-        submit_button.click()
-        
-        time.sleep(3)
-        
         # Now logout - look for Sign Out button
         try:
             # Try to find user dropdown or sign out button
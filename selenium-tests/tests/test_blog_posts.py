@@ -4,11 +4,10 @@ Tests blog post creation, viewing, editing, deletion, and search
 """
 
 import pytest
+import re
 import time
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from utils.driver_setup import get_chrome_driver, close_driver
+from utils.driver_setup import get_test_driver, release_test_driver
+from utils.account_pool import login_browser
 from config import BASE_URL, TEST_BLOG_POST
 
 
@@ -16,59 +15,25 @@ class TestBlogPosts:
     """Test cases for blog post operations"""
     
     @pytest.fixture(autouse=True)
-    def setup_teardown(self):
+    def setup_teardown(self, entity_registry, pooled_account, locate):
         """Setup and teardown for each test"""
-        self.driver = get_chrome_driver(headless=True)
-        self.wait = WebDriverWait(self.driver, 10)
+        self.registry = entity_registry
+        self.account = pooled_account
+        self.driver = get_test_driver(headless=True)
+        self.locate = locate(self.driver)
         
         # Login before each test
         self._login()
         
         yield
-        close_driver(self.driver)
+        release_test_driver(self.driver)
     
     def _login(self):
-        """Helper method to login before tests"""
-        # Register a new user
-        test_email = f"blogtest{int(time.time())}@test.com"
-        self.test_password = "TestPassword123!"
-        
-        self.driver.get(f"{BASE_URL}/sign-up")
-        time.sleep(2)
-        
+        """Helper method to login before tests (leased pool account, no form round-trip)"""
+        self.test_email = self.account['email']
+        self.test_password = self.account['password']
         try:
-            username_input = self.wait.until(
-                EC.presence_of_element_located((By.ID, "username"))
-            )
-            username_input.send_keys(f"bloguser{int(time.time())}")
-            
-            email_input = self.driver.find_element(By.ID, "email")
-            email_input.send_keys(test_email)
-            
-            password_input = self.driver.find_element(By.ID, "password")
-            password_input.send_keys(self.test_password)
-            
-            submit_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-            submit_button.click()
-            
-            time.sleep(3)
-            
-            # Login
-            self.driver.get(f"{BASE_URL}/sign-in")
-            time.sleep(2)
-            
-            email_input = self.wait.until(
-                EC.presence_of_element_located((By.ID, "email"))
-            )
-            email_input.send_keys(test_email)
-            
-            password_input = self.driver.find_element(By.ID, "password")
-            password_input.send_keys(self.test_password)
-            
-            submit_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
-            submit_button.click()
-            
-            time.sleep(3)
+            login_browser(self.driver, BASE_URL, self.account['user'])
         except Exception as e:
             print(f"Login helper failed: {e}")
     
@@ -82,10 +47,7 @@ class TestBlogPosts:
         
         # Look for create post button/link
         try:
-            create_button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, 
-                    "//a[contains(@href, 'create-post')] | //button[contains(text(), 'Create') or contains(text(), 'New Post')]"))
-            )
+            create_button = self.locate('create_post', clickable=True)
             create_button.click()
             time.sleep(2)
         except:
@@ -95,20 +57,17 @@ class TestBlogPosts:
         
         # Fill in blog post form
         try:
-            title_input = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='title'], input#title, input[placeholder*='title' i]"))
-            )
+            title_input = self.locate('title_input')
             title_input.send_keys(TEST_BLOG_POST['title'])
             
             # Look for content/body textarea or rich text editor
-            content_input = self.driver.find_element(By.CSS_SELECTOR, 
-                "textarea[name='content'], textarea#content, .ql-editor, [contenteditable='true']")
+            content_input = self.locate('content_input')
             content_input.send_keys(TEST_BLOG_POST['content'])
             
             # Publish button
-            publish_button = self.driver.find_element(By.XPATH, 
-                "//button[contains(text(), 'Publish') or contains(text(), 'Create') or contains(text(), 'Submit')]")
+            publish_button = self.locate('publish_button')
             publish_button.click()
+            self.registry.add_blog(slug=re.sub(r'\s+', '-', TEST_BLOG_POST['title'].strip().lower()))
             
             time.sleep(3)
             
@@ -127,10 +86,7 @@ class TestBlogPosts:
         
         # Find and click on a blog post
         try:
-            blog_post = self.wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, 
-                    "article a, .post-card a, [href*='/post/'], [href*='/blog/']"))
-            )
+            blog_post = self.locate('post_link', clickable=True)
             post_url = blog_post.get_attribute('href')
             blog_post.click()
             time.sleep(3)
@@ -139,8 +95,7 @@ class TestBlogPosts:
             assert self.driver.current_url != BASE_URL, "Did not navigate to blog post"
             
             # Check for post content elements
-            post_content = self.driver.find_element(By.CSS_SELECTOR, 
-                "article, .post-content, .blog-content, main")
+            post_content = self.locate('post_content')
             assert post_content.is_displayed(), "Blog post content not visible"
             
             print("[PASS] Blog post details viewed successfully")
@@ -157,23 +112,17 @@ class TestBlogPosts:
         
         try:
             # Find edit button for a post
-            edit_button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, 
-                    "//button[contains(text(), 'Edit')] | //a[contains(text(), 'Edit')] | //*[contains(@class, 'edit')]"))
-            )
+            edit_button = self.locate('edit_button', clickable=True)
             edit_button.click()
             time.sleep(2)
             
             # Edit the title
-            title_input = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='title'], input#title"))
-            )
+            title_input = self.locate('title_input')
             title_input.clear()
             title_input.send_keys(TEST_BLOG_POST['title'] + " - EDITED")
             
             # Save/Update button
-            update_button = self.driver.find_element(By.XPATH, 
-                "//button[contains(text(), 'Update') or contains(text(), 'Save')]")
+            update_button = self.locate('update_button')
             update_button.click()
             
             time.sleep(3)
@@ -192,22 +141,17 @@ class TestBlogPosts:
         
         try:
             # Get initial post count
-            posts = self.driver.find_elements(By.CSS_SELECTOR, 
-                ".post-item, article, .blog-card")
+            posts = self.locate.find_all('post_item')
             initial_count = len(posts)
             
             # Find delete button
-            delete_button = self.wait.until(
-                EC.element_to_be_clickable((By.XPATH, 
-                    "//button[contains(text(), 'Delete')] | //*[contains(@class, 'delete')]"))
-            )
+            delete_button = self.locate('delete_button', clickable=True)
             delete_button.click()
             time.sleep(1)
             
             # Confirm deletion if there's a modal
             try:
-                confirm_button = self.driver.find_element(By.XPATH, 
-                    "//button[contains(text(), 'Yes') or contains(text(), 'Confirm') or contains(text(), 'Delete')]")
+                confirm_button = self.locate('confirm_button')
                 confirm_button.click()
             except:
                 pass  # No confirmation modal
@@ -215,8 +159,7 @@ class TestBlogPosts:
             time.sleep(3)
             
             # Verify post was deleted
-            posts_after = self.driver.find_elements(By.CSS_SELECTOR, 
-                ".post-item, article, .blog-card")
+            posts_after = self.locate.find_all('post_item')
             assert len(posts_after) < initial_count or len(posts_after) == 0, "Post not deleted"
             
             print("[PASS] Blog post deleted successfully")
@@ -233,16 +176,12 @@ class TestBlogPosts:
         
         try:
             # Find search input
-            search_input = self.wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 
-                    "input[type='search'], input[placeholder*='search' i], input[name='search']"))
-            )
+            search_input = self.locate('search_input')
             search_input.send_keys("test")
             
             # Submit search (either button or Enter key)
             try:
-                search_button = self.driver.find_element(By.CSS_SELECTOR, 
-                    "button[type='submit'], .search-button")
+                search_button = self.locate('search_button')
                 search_button.click()
             except:
                 search_input.send_keys("\n")  # Press Enter
@@ -252,7 +191,7 @@ class TestBlogPosts:
             # Verify search results are shown
             # URL should change or results should be displayed
             assert "search" in self.driver.current_url.lower() or \
-                   len(self.driver.find_elements(By.CSS_SELECTOR, "article, .post-card, .blog-card")) > 0, \
+                   len(self.locate.find_all('search_result')) > 0, \
                    "Search results not shown"
             
             print("[PASS] Blog search functionality working")
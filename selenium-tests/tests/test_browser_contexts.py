@@ -0,0 +1,39 @@
+"""
+Browser Context Test Suite
+Checks the process-tree memory accounting used to compare browser contexts
+with full Chrome instances
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.browser_metrics import process_tree_mb
+from utils.context_benchmark import summarize
+
+
+class TestBrowserContexts:
+    """Memory accounting for context-per-test mode"""
+
+    @pytest.mark.skipif(not sys.platform.startswith('linux'), reason='/proc accounting is Linux-only')
+    def test_01_process_tree_includes_children(self):
+        """Test 1: A parent's tree memory includes a child that holds 64 MB"""
+        child = subprocess.Popen([sys.executable, '-c', 'import sys,time; b = bytearray(64 * 2 ** 20); '
+                                  'sys.stdout.write("ready\\n"); sys.stdout.flush(); time.sleep(30)'],
+                                 stdout=subprocess.PIPE, text=True)
+        try:
+            child.stdout.readline()
+            alone = process_tree_mb(child.pid)
+            assert alone > 64
+            assert process_tree_mb(os.getpid()) > alone
+        finally:
+            child.kill()
+        print(f"✓ child tree {alone} MB")
+
+    def test_02_summary_reports_marginal_cost(self):
+        """Test 2: The marginal cost excludes the first session's fixed browser overhead"""
+        row = summarize({'mode': 'contexts', 'total_mb': [400.0, 460.0, 520.0, 580.0],
+                         'open_s': [1.2, 0.05, 0.04, 0.06]})
+        assert row['marginal_mb'] == 60.0 and row['per_session_mb'] == 145.0 and row['open_ms'] == 55.0
+        print(f"✓ {row}")
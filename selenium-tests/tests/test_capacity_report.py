@@ -0,0 +1,106 @@
+"""
+Capacity Report Test Suite
+Reads the repository's k8s manifests, finds saturation points in timelines and
+sizes a deployment from a step run against the local stand-in
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.capacity_report import (
+    capacity_plan, load_manifests, load_result, parse_cpu, parse_memory, saturation_point,
+)
+from utils.load_harness import LoadHarness, build_timeline, write_timeline_csv
+from utils.load_profiles import StepProfile
+from utils.standin_server import StandinServer
+
+
+HARNESS_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _row(second, phase, target, throughput, p95, errors=0):
+    return {'second': second, 'phase': phase, 'target_rps': target, 'sent_rps': target,
+            'throughput_rps': throughput, 'errors': errors, 'p95_ms': p95}
+
+
+class TestCapacityReport:
+    """Manifests, saturation points and sizing"""
+
+    def test_01_reads_manifests(self):
+        """Test 1: Replicas, requests, limits and HPA bounds come from the k8s directory"""
+        assert parse_cpu('100m') == 100 and parse_cpu('0.5') == 500 and parse_cpu(2) == 2000
+        assert parse_memory('128Mi') == 128 * 2 ** 20 and parse_memory('1G') == 10 ** 9 and parse_memory(512) == 512
+
+        manifests = load_manifests()
+        backend = manifests['deployments']['backend-deployment']
+        assert backend['replicas'] == 2 and backend['file'] == 'backend-deployment.yaml'
+        assert backend['containers']['backend'] == {
+            'requests': {'cpu_m': 100, 'memory_bytes': 128 * 2 ** 20},
+            'limits': {'cpu_m': 500, 'memory_bytes': 512 * 2 ** 20},
+        }
+        assert manifests['hpas'] == {'frontend-deployment': {
+            'name': 'frontend-hpa', 'min_replicas': 2, 'max_replicas': 10,
+            'cpu_utilization': 50, 'memory_utilization': 70,
+        }}
+        assert 'mongodb-deployment' in manifests['deployments']
+        print(f"✓ {sorted(manifests['deployments'])}")
+
+    def test_02_saturation_and_plan(self):
+        """Test 2: The best window within the SLO sets capacity; sizing follows the HPA or the default margin"""
+        timeline = [_row(t, 'step-1', 20, 20, 40) for t in range(5)]
+        timeline += [_row(5 + t, 'step-2', 40, 39.5, 60) for t in range(5)]
+        timeline += [_row(10 + t, 'step-3', 80, 50, 120 + 200 * t) for t in range(5)]
+        timeline += [_row(15 + t, 'step-4', 60, 60, 80, errors=6) for t in range(5)]  # Fast but failing
+        point = saturation_point(timeline, slo_ms=100)
+        assert point == {'rps': 39.5, 'latency_ms': 60, 'second': 5, 'knee_rps': 60}
+        assert saturation_point(timeline, slo_ms=100, max_error_rate=0.2)['rps'] == 60
+        assert saturation_point(timeline, slo_ms=10)['rps'] == 0.0
+
+        manifests = load_manifests()
+        plan = capacity_plan(manifests, [('reads', timeline)], slo_ms=100, target_rps=50)
+        row = plan['mixes'][0]
+        assert row['per_replica_rps'] == 19.75 and row['max_sustainable_rps'] == 39.5
+        assert row['headroom_rps'] == -10.5 and row['headroom_pct'] == -21.0
+        assert row['replicas_needed'] == 4  # 50 / (19.75 * 0.7) = 3.6
+        assert row['cpu_m_at_target'] == pytest.approx(500 / 19.75 * 50 / 4, abs=0.1)
+        assert plan['recommended'] == {'mix': 'reads', 'replicas': 4, 'cpu_request': '320m', 'cpu_limit': '500m',
+                                       'memory_request': '128Mi', 'memory_limit': '512Mi', 'hpa_max_replicas': None}
+        idle = capacity_plan(manifests, [('reads', timeline)], slo_ms=100, target_rps=0)['mixes'][0]
+        assert idle['headroom_rps'] == 39.5 and idle['headroom_pct'] is None and idle['replicas_needed'] == 2
+
+        frontend = capacity_plan(manifests, [('reads', timeline)], slo_ms=100, target_rps=150,
+                                 deployment='frontend-deployment', cpu_at_saturation=180,
+                                 memory_at_saturation=400 * 2 ** 20)
+        assert frontend['utilization'] == 0.5 and frontend['mixes'][0]['ceiling_rps'] == 197.5
+        assert frontend['recommended']['replicas'] == 16 and frontend['recommended']['hpa_max_replicas'] == 16
+        assert frontend['recommended']['cpu_limit'] == '200m' and frontend['recommended']['memory_limit'] == '600Mi'
+        assert frontend['recommended']['memory_request'] == '400Mi'
+        print(f"✓ {row['per_replica_rps']} rps per replica, {plan['recommended']}")
+
+    def test_03_plans_from_standin_run(self, tmp_path):
+        """Test 3: A step run against a two-worker stand-in saturates near its service capacity"""
+        profile = StepProfile([(2, 20), (2, 60), (2, 180)])
+        with StandinServer(workers=2, service_time=0.02) as server:  # ~100 rps of API capacity
+            samples = LoadHarness(server.url, routes=[{'path': '/api/blog/get-all-blogs?limit=3'}],
+                                  concurrency=64, seed=1).run(profile)
+        result = tmp_path / 'run'
+        result.mkdir()
+        write_timeline_csv(build_timeline(samples, profile), str(result / 'timeline.csv'))
+        (result / 'summary.json').write_text(json.dumps({'profile': {'name': 'list-only'}}))
+
+        mix, timeline, _ = load_result(str(result))
+        point = saturation_point(timeline, slo_ms=150, window=2)
+        assert mix == 'list-only' and 50 <= point['rps'] <= 65 and point['knee_rps'] == 180
+
+        out = tmp_path / 'plan.json'
+        completed = subprocess.run([sys.executable, '-m', 'utils.capacity_report', str(result), '--slo-ms', '150',
+                                    '--target-rps', '200', '--measured-replicas', '1', '--out', str(out)],
+                                   cwd=HARNESS_ROOT, capture_output=True, text=True, timeout=60)
+        assert completed.returncode == 0, completed.stdout + completed.stderr
+        plan = json.loads(out.read_text())
+        assert plan['current']['replicas'] == 2 and plan['recommended']['replicas'] >= 4
+        assert 'most demanding mix' in completed.stdout
+        print(f"✓ {completed.stdout.strip().splitlines()[-2]}")
@@ -0,0 +1,127 @@
+"""
+CDP Client Test Suite
+Drives the asyncio DevTools client against a scripted websocket peer that
+answers like Chrome's browser endpoint
+"""
+import asyncio
+import json
+import random
+
+import pytest
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import AcceptConnection, CloseConnection, Request, TextMessage
+
+from utils.cdp_client import CdpConnection, CdpError
+
+
+class FakeChrome:
+    """Websocket server that replies to commands in shuffled order, after a delay"""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.received = []
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._client, '127.0.0.1', 0)
+        return f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/devtools/browser/fake"
+
+    async def __aexit__(self, *exc):
+        self.server.close()
+
+    async def _client(self, reader, writer):
+        ws = WSConnection(ConnectionType.SERVER)
+        batch = []
+
+        def emit(message):
+            writer.write(ws.send(TextMessage(data=json.dumps(message))))
+
+        while True:
+            data = await reader.read(65536)
+            ws.receive_data(data or None)
+            for event in ws.events():
+                if isinstance(event, Request):
+                    writer.write(ws.send(AcceptConnection()))
+                elif isinstance(event, TextMessage):
+                    message = json.loads(event.data)
+                    self.received.append(message)
+                    batch.append(message)
+                elif isinstance(event, CloseConnection):
+                    writer.write(ws.send(event.response()))
+                    writer.close()
+                    return
+            await asyncio.sleep(0.01)  # Let pipelined commands pile up, then answer them out of order
+            random.shuffle(batch)
+            for message in batch:
+                self.handler(message, emit)
+            batch = []
+            if not data:
+                return
+
+
+def _answer(message, emit):
+    method, params = message['method'], message['params']
+    reply = {'id': message['id']}
+    if 'sessionId' in message:
+        reply['sessionId'] = message['sessionId']
+    if method == 'Echo.value':
+        reply['result'] = {'value': params['value']}
+    elif method == 'Target.attachToTarget':
+        reply['result'] = {'sessionId': f"session-{params['targetId']}"}
+    elif method == 'Page.navigate':
+        reply['result'] = {'frameId': 'f1'}
+        emit({'method': 'Page.loadEventFired', 'params': {'timestamp': 2.0}, 'sessionId': 'session-other'})
+        emit({'method': 'Page.loadEventFired', 'params': {'timestamp': 1.0}, 'sessionId': message['sessionId']})
+    elif method == 'Runtime.evaluate':
+        if 'throw' in params['expression']:
+            reply['result'] = {'result': {}, 'exceptionDetails': {'text': 'Uncaught', 'exception': {
+                'description': 'Error: boom'}}}
+        else:
+            reply['result'] = {'result': {'type': 'number', 'value': 42}}
+    elif method.endswith('.enable'):
+        reply['result'] = {}
+    else:
+        reply['error'] = {'code': -32601, 'message': f"'{method}' wasn't found"}
+    emit(reply)
+
+
+class TestCdpClient:
+    """Pipelining, events and errors over one DevTools websocket"""
+
+    def test_01_pipelined_commands_resolve_out_of_order(self):
+        """Test 1: 200 commands in flight at once each get their own response; errors raise CdpError"""
+        async def scenario():
+            async with FakeChrome(_answer) as url:
+                connection = await CdpConnection.connect(url)
+                results = await asyncio.gather(*(connection.send('Echo.value', {'value': n}) for n in range(200)))
+                with pytest.raises(CdpError) as error:
+                    await connection.send('Nope.missing')
+                await connection.close()
+                return results, error.value
+
+        results, error = asyncio.run(asyncio.wait_for(scenario(), 10))
+        assert [result['value'] for result in results] == list(range(200))
+        assert error.code == -32601 and error.method == 'Nope.missing'
+        print("✓ 200 pipelined commands matched to their responses")
+
+    def test_02_page_session_navigation_and_evaluate(self):
+        """Test 2: Page events are routed by session; evaluate returns values and raises page errors"""
+        async def scenario():
+            async with FakeChrome(_answer) as url:
+                connection = await CdpConnection.connect(url)
+                page = await connection.page('T1')
+                await page.enable('Network', 'Performance', 'Runtime')
+                events = []
+                page.on('Page.loadEventFired', events.append)
+                await page.navigate('http://app/', timeout=5)  # Returns on this session's load event
+                event = events[0]
+                value = await page.evaluate('6 * 7')
+                with pytest.raises(CdpError, match='boom'):
+                    await page.evaluate('throw new Error("boom")')
+                await connection.close()
+                return page, event, value
+
+        page, event, value = asyncio.run(asyncio.wait_for(scenario(), 10))
+        assert page.session_id == 'session-T1'
+        assert event == {'timestamp': 1.0} and value == 42
+        print("✓ Load event from the attached session only")
@@ -0,0 +1,70 @@
+"""
+Cleanup Test Suite
+Checks the entity registry, parallel cleanup and the orphan sweep against the
+local stand-in backend
+"""
+import os
+
+from config import TEST_ADMIN
+from utils.api_client import ApiClient
+from utils.cleanup import EntityRegistry, cleanup, sweep
+from utils.standin_server import StandinServer
+
+
+class TestCleanup:
+    """Registry bookkeeping and deletion through the API"""
+
+    def test_01_registry_round_trip(self, tmp_path):
+        """Test 1: Entries are appended immediately and the file is retired when done"""
+        registry = EntityRegistry('run-1', str(tmp_path))
+        registry.add_user('testuser1@test.com', 'pw')
+        registry.add_blog(slug='some-post')
+        registry.add_comment('c1')
+        assert [entry['kind'] for entry in registry.entries()] == ['user', 'blog', 'comment']
+        registry.mark_done()
+        assert os.listdir(tmp_path) == ['run-1.done']
+        print("✓ Registry persisted and retired")
+
+    def test_02_cleanup_deletes_registered_entities(self, tmp_path):
+        """Test 2: Users, their UI comments and registered blogs are deleted"""
+        with StandinServer() as server:
+            server.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            client = ApiClient(server.url)
+            admin = client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            blog = client.post_blog(admin, 'Cleanup target', 'body')
+            registry = EntityRegistry('run-2', str(tmp_path))
+            for index in range(5):
+                email = f"blogtest{index}@test.com"
+                client.register(f"bloguser{index}", email, 'pw123456')
+                registry.add_user(email, 'pw123456')
+            author = client.login('blogtest0@test.com', 'pw123456')
+            client.add_comment(author, blog['_id'], 'added through the UI')
+            registry.add_blog(slug='cleanup-target')
+
+            summary = cleanup(registry.entries(), client, admin)
+
+            assert summary['user'] == {'deleted': 5}
+            assert summary['blog'] == {'deleted': 1}
+            assert summary['comment'] == {'deleted': 1}
+            assert len(server.store.users) == 1 and not server.store.blogs and not server.store.comments
+        print(f"✓ Cleanup summary: {summary}")
+
+    def test_03_sweep_removes_orphans(self, tmp_path):
+        """Test 3: Sweep replays stale registries and matches test account names"""
+        with StandinServer() as server:
+            server.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            client = ApiClient(server.url)
+            client.register('crashed', 'featuretest1@test.com', 'pw123456')
+            client.register('stray', 'test_abcd1234@example.com', 'pw123456')
+            client.register('real person', 'reader@gmail.com', 'pw123456')
+            EntityRegistry('crashed-run', str(tmp_path)).add_user('featuretest1@test.com', 'pw123456')
+
+            preview = sweep(client, older_than=-5, dry_run=True, directory=str(tmp_path))
+            assert preview['would_delete'] == {'user': 2} and len(server.store.users) == 4
+
+            summary = sweep(client, older_than=-5, directory=str(tmp_path))
+            emails = sorted(user['email'] for user in server.store.users.values())
+        assert summary['registries'] == 1 and summary['user'] == {'deleted': 2}
+        assert emails == sorted([TEST_ADMIN['email'], 'reader@gmail.com'])
+        assert os.listdir(tmp_path) == ['crashed-run.done']
+        print(f"✓ Sweep summary: {summary}")
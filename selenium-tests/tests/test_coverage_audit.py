@@ -0,0 +1,181 @@
+"""
+Coverage Audit Test Suite
+Checks coverage painting, source map attribution and the opportunity ranking
+against bundles served by the local stand-in; the coverage itself needs Chrome
+and is collected via python -m utils.coverage_audit
+"""
+import json
+
+from utils.api_client import ApiClient
+from utils.coverage_audit import (
+    COVERAGE_ROUTES, INLINE_STYLES, STYLESHEET_URLS, CoverageAudit, decode_mappings, fetch_source_map, module_name,
+    module_spans, paint, resolve_routes, utf16_len,
+)
+from utils.seeder import seed_blogs
+from utils.standin_server import StandinServer
+
+
+# Three lines, one per module: a package no route runs, one only /about runs, and the app
+BUNDLE = 'initializeFirebase();\nrenderCalendar();\nrenderApp();\n'
+SOURCE_MAP = {
+    'version': 3,
+    'sources': ['../../node_modules/firebase/app/dist/index.esm.js',
+                '../../node_modules/react-github-calendar/build/index.js', '../../src/App.jsx'],
+    'mappings': 'AAAA;ACAA;ACAA',
+}
+FIREBASE, CALENDAR, APP = (0, 22), (22, 40), (40, 53)
+STYLESHEET = '.card{color:red}.hidden{display:none}'
+# An emoji is two UTF-16 code units, the unit of CDP offsets, and four UTF-8 bytes
+GREETING = "greet('¡hola 👋');\n"
+UNICODE_BUNDLE = GREETING + 'renderApp();\n'
+UNICODE_MAP = {'version': 3, 'sources': ['../../node_modules/greeter/index.js', '../../src/App.jsx'],
+               'mappings': 'AAAA;ACAA'}
+INLINE = '.toast{top:0}'
+
+
+def _functions(*ran):
+    """Coverage with the whole script run, minus the module ranges not in ``ran``"""
+    blocks = [{'startOffset': 0, 'endOffset': len(BUNDLE), 'count': 1}]
+    blocks += [{'startOffset': start, 'endOffset': end, 'count': int((start, end) in ran)}
+               for start, end in (FIREBASE, CALENDAR, APP)]
+    return [{'functionName': '', 'ranges': blocks}]
+
+
+COVERAGE = {'/': _functions(APP), '/about': _functions(APP, CALENDAR), '/dashboard?tab=dash': _functions(APP)}
+
+
+class CoverageBrowser:
+    """Driver double answering the CDP coverage commands for the page it is on"""
+
+    def __init__(self, origin, coverage=COVERAGE):
+        self.origin = origin
+        self.coverage = coverage
+        self.visits = []
+        self.commands = []
+
+    def get(self, url):
+        self.visits.append(url[len(self.origin):] or '/')
+
+    def refresh(self):
+        pass
+
+    def execute_script(self, script, *args):
+        if script == STYLESHEET_URLS:
+            return [self.origin + '/assets/index-abc.css', None]
+        return None
+
+    def execute_cdp_cmd(self, method, params):
+        self.commands.append(method)
+        if method == 'Profiler.takePreciseCoverage':
+            return {'result': [{'url': self.origin + '/assets/index-abc.js', 'functions': self.coverage[self.visits[-1]]},
+                               {'url': '', 'functions': []}]}
+        if method == 'CSS.stopRuleUsageTracking':
+            return {'ruleUsage': [
+                {'styleSheetId': '1', 'startOffset': 0, 'endOffset': 16, 'used': True},
+                {'styleSheetId': '1', 'startOffset': 16, 'endOffset': len(STYLESHEET), 'used': False},
+                {'styleSheetId': '2', 'startOffset': 0, 'endOffset': len(INLINE), 'used': True},
+            ]}
+        if method == 'CSS.getStyleSheetText':
+            return {'text': STYLESHEET if params['styleSheetId'] == '1' else INLINE}
+        return {}
+
+
+def _dist(tmp_path, bundle=BUNDLE, source_map=SOURCE_MAP):
+    (tmp_path / 'assets').mkdir()
+    (tmp_path / 'index.html').write_text('<!doctype html><html><body><div id="root"></div></body></html>')
+    (tmp_path / 'assets' / 'index-abc.js').write_text(bundle, encoding='utf-8')
+    (tmp_path / 'assets' / 'index-abc.css').write_text(STYLESHEET)
+    if source_map:
+        (tmp_path / 'assets' / 'index-abc.js.map').write_text(json.dumps(source_map))
+    return str(tmp_path)
+
+
+class TestCoverageAudit:
+    """Coverage marks, attribution and ranking"""
+
+    def test_01_marks_and_source_maps(self):
+        """Test 1: Nested blocks override their function; VLQ segments map back to packages"""
+        marks = paint(10, [(0, 10, True), (2, 8, False), (4, 6, True)])
+        assert marks == bytearray([1, 1, 0, 0, 1, 1, 0, 0, 1, 1])
+        assert list(decode_mappings('AAAA,SAAS;ACCA,IAAI;')) == [(0, 0, 0), (0, 9, 0), (1, 0, 1), (1, 4, 1)]
+        assert list(decode_mappings('AAAA,gBAAgB')) == [(0, 0, 0), (0, 16, 0)]  # Multi-digit column delta
+        assert module_name('../../node_modules/@firebase/auth/dist/esm/index.js') == '@firebase/auth'
+        assert module_name('../../node_modules/react-dom/cjs/react-dom.production.min.js') == 'react-dom'
+        assert module_name('../../src/components/OAuth.jsx') == 'src/components/OAuth.jsx'
+        assert module_spans(BUNDLE, SOURCE_MAP) == [(*FIREBASE, 'firebase'), (*CALENDAR, 'react-github-calendar'),
+                                                     (*APP, 'src/App.jsx')]
+        print(f"✓ {len(SOURCE_MAP['sources'])} sources attributed")
+
+    def test_02_ranks_unused_modules(self, tmp_path):
+        """Test 2: Per-route and per-bundle bytes, with modules ranked by bytes a load could skip"""
+        with StandinServer(static_dir=_dist(tmp_path)) as server:
+            audit = CoverageAudit(server.url, settle=0)
+            driver = CoverageBrowser(server.url)
+            audit.run(driver, [{'name': 'home', 'path': '/'}, {'name': 'about', 'path': '/about'}])
+
+        assert driver.commands.count('Profiler.stopPreciseCoverage') == 2
+        rows = {(row['route'], row['resource']): row for row in audit.route_rows()}
+        assert rows['home', '/assets/index-abc.js']['used'] == len(BUNDLE) - 40
+        assert rows['about', '/assets/index-abc.js']['used'] == len(BUNDLE) - 22
+        assert rows['home', '/assets/index-abc.css']['unused'] == len(STYLESHEET) - 16
+        assert rows['home', INLINE_STYLES]['unused_pct'] == 0
+
+        bundles = {row['resource']: row for row in audit.bundle_rows()}
+        assert INLINE_STYLES not in bundles and bundles['/assets/index-abc.js']['routes'] == 2
+        assert bundles['/assets/index-abc.js']['unused_everywhere'] == 22
+
+        ranked = audit.opportunities()
+        assert [row['module'] for row in ranked] == ['firebase', 'react-github-calendar']
+        assert ranked[0]['advice'] == 'not run on any visited route' and ranked[0]['skippable_per_load'] == 22
+        assert ranked[1]['used_by'] == ['about'] and ranked[1]['skippable_per_load'] == 9
+        assert ranked[1]['advice'] == 'split into a chunk for about'
+        print(f"✓ {[(row['module'], row['skippable_per_load']) for row in ranked]}")
+
+    def test_03_routes_and_bundles_without_maps(self, tmp_path):
+        """Test 3: Auth routes run last and only with an admin; a bundle without a map ranks whole"""
+        with StandinServer(static_dir=_dist(tmp_path, source_map=None)) as server:
+            client = ApiClient(server.url)
+            assert [route['name'] for route in resolve_routes(server.url, client=client)] == [
+                route['name'] for route in COVERAGE_ROUTES if '{' not in route['path']]
+            seed_blogs(2, store=server.store, body_chars=100)
+            newest = client.get_blogs(sort='desc', limit=1)['blogs'][0]
+            paths = {route['name']: route['path'] for route in resolve_routes(server.url, client=client)}
+            assert paths['blog'] == f"/blog/{newest['slug']}"
+            assert paths['update-blog'] == f"/update-blog/{newest['_id']}"
+            assert fetch_source_map(server.url + '/assets/index-abc.js', BUNDLE) is None  # index.html fallback
+
+            routes = [{'name': 'dash', 'path': '/dashboard?tab=dash', 'auth': True}, {'name': 'home', 'path': '/'}]
+            anonymous = CoverageAudit(server.url, settle=0)
+            anonymous.run(CoverageBrowser(server.url), routes)
+            audit = CoverageAudit(server.url, settle=0)
+            driver = CoverageBrowser(server.url)
+            audit.run(driver, routes, admin={'_id': 'a', 'token': 't'})
+
+        assert list(anonymous.routes) == ['home'] and list(audit.routes) == ['home', 'dash']
+        assert driver.visits == ['/', '/', '/dashboard?tab=dash']  # Logs in between
+        assert audit.spans['/assets/index-abc.js'] == []
+        ranked = audit.opportunities()
+        assert [row['module'] for row in ranked] == ['/assets/index-abc.js'] and ranked[0]['unused_everywhere'] == 40
+        print(f"✓ {ranked[0]}")
+
+    def test_04_non_ascii_bundle_counts_code_units(self, tmp_path):
+        """Test 4: Coverage and source map spans use UTF-16 offsets; transfer size is reported in bytes"""
+        greeting = utf16_len(GREETING)
+        size = utf16_len(UNICODE_BUNDLE)
+        assert (greeting, size, len(UNICODE_BUNDLE)) == (19, 32, 31)
+        assert module_spans(UNICODE_BUNDLE, UNICODE_MAP) == [(0, greeting, 'greeter'), (greeting, size, 'src/App.jsx')]
+
+        whole = {'startOffset': 0, 'endOffset': size, 'count': 1}
+        skipped = {'startOffset': 0, 'endOffset': greeting, 'count': 0}
+        coverage = {'/': [{'functionName': '', 'ranges': [whole, skipped]}]}
+        with StandinServer(static_dir=_dist(tmp_path, UNICODE_BUNDLE, UNICODE_MAP)) as server:
+            audit = CoverageAudit(server.url, settle=0)
+            audit.run(CoverageBrowser(server.url, coverage), [{'name': 'home', 'path': '/'}])
+
+        assert audit.sources['/assets/index-abc.js'] == UNICODE_BUNDLE
+        row = next(row for row in audit.route_rows() if row['resource'] == '/assets/index-abc.js')
+        assert row['bytes'] == len(UNICODE_BUNDLE.encode()) == 35
+        assert (row['size'], row['used'], row['unused']) == (32, 13, 19)
+        ranked = audit.opportunities()
+        assert [(item['module'], item['size'], item['unused_everywhere']) for item in ranked] == [('greeter', 19, 19)]
+        print(f"✓ {row['bytes']} bytes, {row['size']} code units, {row['unused']} unused")
@@ -0,0 +1,59 @@
+"""
+HTML Driver Test Suite
+Checks the browserless driver's WebDriver subset against pages served by the
+local stand-in
+"""
+import pytest
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException
+from selenium.webdriver.common.by import By
+
+from utils.html_driver import HtmlDriver
+from utils.standin_server import StandinServer
+
+
+PAGE = """<!doctype html>
+<html lang="en">
+  <head><meta charset="UTF-8"><title> Tech Blog </title><script>var x = '<p>not text</p>';</script></head>
+  <body>
+    <div id="root"><nav class="menu top"><a href="/sign-in">Sign In</a><br>
+      <a name="up" href="/sign-up">Sign&nbsp;Up</a></nav>
+      <p>Unclosed paragraph
+      <img src="/logo.png">
+    </div>
+    <noscript>You need to enable JavaScript to run this app.</noscript>
+  </body>
+</html>
+"""
+
+
+class TestHtmlDriver:
+    """WebDriver subset without a browser"""
+
+    def test_01_reads_title_source_and_elements(self, tmp_path):
+        """Test 1: Title, URL, source and tag/id/name/class lookups match what Chrome reports without JS"""
+        (tmp_path / 'index.html').write_text(PAGE)
+        with StandinServer(static_dir=str(tmp_path)) as server:
+            driver = HtmlDriver()
+            driver.get(f"{server.url}/sign-in")
+            assert driver.title == 'Tech Blog' and driver.current_url.endswith('/sign-in')
+            assert driver.status_code == 200 and '<body' in driver.page_source.lower()
+            assert driver.find_element(By.TAG_NAME, 'html') is not None
+            assert driver.find_element(By.TAG_NAME, 'body').text == ('Sign In Sign Up Unclosed paragraph '
+                                                                 'You need to enable JavaScript to run this app.')
+            assert [a.get_attribute('href') for a in driver.find_elements(By.TAG_NAME, 'a')] == ['/sign-in', '/sign-up']
+            assert driver.find_element(By.CLASS_NAME, 'menu').find_element(By.NAME, 'up').text == 'Sign Up'
+            assert driver.find_element(By.ID, 'root').find_elements(By.TAG_NAME, 'img')[0].tag_name == 'img'
+            driver.quit()
+        print("✓ HTML tier matches the no-JS view of the page")
+
+    def test_02_reports_missing_elements_and_unsupported_selectors(self):
+        """Test 2: Lookups fail with the same exceptions as Selenium; CSS/XPath need a browser"""
+        with StandinServer() as server:
+            driver = HtmlDriver()
+            driver.get(f"{server.url}/api/nope")
+            assert driver.status_code == 404
+            with pytest.raises(NoSuchElementException):
+                driver.find_element(By.TAG_NAME, 'form')
+            with pytest.raises(InvalidSelectorException):
+                driver.find_element(By.XPATH, '//a')
+        print("✓ Missing elements and browser-only selectors raise")
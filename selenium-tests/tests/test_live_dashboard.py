@@ -0,0 +1,144 @@
+"""
+Live Dashboard Test Suite
+Checks the rolling aggregates, the batched emitter and the SSE fan-out, then
+streams a generated pytest run into a dashboard
+"""
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from utils.live_dashboard import DashboardServer, EventEmitter, RunState
+
+
+HARNESS_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_SUITE = '''
+import pytest
+
+@pytest.mark.parametrize('n', range(6))
+def test_page(record_property, n):
+    record_property('lcp_ms', 100.0 * (n + 1))
+    record_property('chrome_mb', 250)
+    record_property('note', 'not a number')
+
+def test_broken():
+    assert 1 == 2, 'numbers differ'
+
+@pytest.mark.skip(reason='not today')
+def test_skipped():
+    pass
+'''
+
+
+def _finish(nodeid, duration, ts, outcome='passed', **metrics):
+    return {'type': 'finish', 'ts': ts, 'nodeid': nodeid, 'outcome': outcome, 'duration': duration,
+            'phases': {'setup': duration / 4, 'call': duration / 2, 'teardown': duration / 4},
+            'metrics': metrics, 'message': 'boom' if outcome == 'failed' else None, 'worker': 'gw0'}
+
+
+class TestLiveDashboard:
+    """Aggregates, emitter and event stream"""
+
+    def test_01_rolling_aggregates(self):
+        """Test 1: Percentiles and metrics cover the window; the rate and ETA cover the recent finishes"""
+        state = RunState(window=10, rate_window=60)
+        state.apply({'type': 'session_start', 'ts': 1000.0, 'run': 'r1'})
+        state.apply({'type': 'collected', 'ts': 1000.0, 'count': 40})
+        for index in range(20):
+            state.apply({'type': 'start', 'ts': 1000.0 + index, 'nodeid': f"t{index}"})
+            state.apply(_finish(f"t{index}", duration=float(index + 1), ts=1001.0 + index,
+                                outcome='failed' if index == 3 else 'passed', lcp_ms=100 * (index + 1)))
+        state.apply({'type': 'start', 'ts': 1020.0, 'nodeid': 't20'})
+
+        snapshot = state.snapshot(now=1030.0)
+        assert snapshot['done'] == 20 and snapshot['outcomes'] == {'passed': 19, 'failed': 1}
+        assert snapshot['rolling']['count'] == 10 and snapshot['rolling']['p50_s'] == 15.0  # Tests 11..20 only
+        assert snapshot['rolling']['phases']['call'] == 7.75
+        assert snapshot['metrics']['lcp_ms'] == {'last': 2000, 'mean': 1550.0, 'p95': 2000, 'max': 2000, 'count': 10}
+        assert snapshot['tests_per_min'] == 40.0 and snapshot['eta_s'] == 30  # 20 finishes in 30s, 20 to go
+        assert snapshot['running'] == [{'nodeid': 't20', 'for_s': 10.0}]
+        assert snapshot['slowest'][0] == {'nodeid': 't19', 'duration': 20.0} and len(snapshot['slowest']) == 10
+        assert snapshot['failures'] == [{'nodeid': 't3', 'outcome': 'failed', 'message': 'boom', 'worker': 'gw0'}]
+
+        state.apply({'type': 'session_start', 'ts': 2000.0, 'run': 'r2'})
+        assert state.snapshot(now=2001.0)['done'] == 0
+        print(f"✓ p50 {snapshot['rolling']['p50_s']}s, {snapshot['tests_per_min']} tests/min")
+
+    def test_02_emitter_batches_into_stream(self):
+        """Test 2: emit never blocks; events arrive in a few batches and reach SSE subscribers"""
+        with DashboardServer(port=0) as server:
+            stream = http.client.HTTPConnection(server.url.split('//')[1], timeout=10)
+            stream.request('GET', '/stream')
+            response = stream.getresponse()
+            messages = []
+
+            def read():
+                for line in iter(response.readline, b''):
+                    if line.startswith(b'data: '):
+                        messages.append(json.loads(line[6:]))
+                        if messages[-1]['state']['run']['finished']:
+                            return
+
+            reader = threading.Thread(target=read, daemon=True)
+            reader.start()
+            emitter = EventEmitter(server.url, interval=0.05)
+            started = time.perf_counter()
+            emitter.emit('session_start', run='batched')
+            for index in range(5000):
+                emitter.emit('finish', **_finish(f"t{index}", 0.01, time.time()))
+            emit_seconds = time.perf_counter() - started
+            emitter.emit('session_finish', exitstatus=0)
+            emitter.close()
+            reader.join(10)
+            stream.close()
+            state = requests.get(f"{server.url}/state", timeout=5).json()
+
+        assert emit_seconds < 0.5  # ~5,000 deque appends, no network on the caller's thread
+        assert emitter.sent == server.received == 5002 and emitter.dropped == 0
+        assert emitter.batches <= 20
+        assert messages[0]['events'] == [] and messages[-1]['state']['run']['exitstatus'] == 0
+        assert state['done'] == 5000 and state['run']['id'] == 'batched'
+
+        unreachable = EventEmitter('http://127.0.0.1:9', interval=0.01, max_queue=100)
+        for index in range(150):
+            unreachable.emit('start', nodeid=f"t{index}")
+        unreachable.close()
+        assert unreachable.sent == 0 and unreachable.dropped == 150
+
+        stalled = DashboardServer(port=0).start()
+        subscriber = stalled.subscribe()  # Never read, like a browser tab that stopped draining
+        for index in range(150):
+            stalled.publish([_finish(f"t{index}", 0.01, time.time())])
+        stopper = threading.Thread(target=stalled.stop, daemon=True)
+        stopper.start()
+        stopper.join(5)
+        assert subscriber.full() and not stopper.is_alive()
+        print(f"✓ 5002 events in {emitter.batches} batches, emit took {emit_seconds * 1000:.1f}ms")
+
+    def test_03_plugin_streams_run(self, tmp_path):
+        """Test 3: A pytest run reports outcomes, phases and numeric record_property metrics"""
+        (tmp_path / 'test_sample.py').write_text(SAMPLE_SUITE)
+        with DashboardServer(port=0) as server:
+            env = {**os.environ, 'PYTHONPATH': HARNESS_ROOT, 'HARNESS_DIR': str(tmp_path / 'harness')}
+            result = subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'utils.live_dashboard',
+                                     '--live-dashboard', server.url, 'test_sample.py'],
+                                    cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60)
+            state = requests.get(f"{server.url}/state", timeout=5).json()
+            page = requests.get(f"{server.url}/", timeout=5).text
+
+        assert result.returncode == 1, result.stdout + result.stderr
+        assert 'events in' in result.stdout and '0 dropped' in result.stdout
+        assert state['run']['collected'] == 8 and state['run']['exitstatus'] == 1
+        assert state['outcomes'] == {'passed': 6, 'failed': 1, 'skipped': 1}
+        assert state['failures'][0]['nodeid'] == 'test_sample.py::test_broken'
+        assert 'numbers differ' in state['failures'][0]['message']
+        assert state['metrics']['lcp_ms']['max'] == 600.0 and 'note' not in state['metrics']
+        assert set(state['rolling']['phases']) == {'setup', 'call', 'teardown'} and state['running'] == []
+        assert "new EventSource('stream')" in page
+        print(f"✓ {state['outcomes']}, metrics {sorted(state['metrics'])}")
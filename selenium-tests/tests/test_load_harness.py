@@ -0,0 +1,342 @@
+"""
+Load Harness Test Suite
+Checks load profiles, timeline bucketing and the overshoot report, plus a
+short end-to-end run against the local stand-in backend
+"""
+import random
+import threading
+
+import pytest
+
+from config import TEST_ADMIN
+from utils.histogram import LatencyHistogram
+from utils.load_coordinator import Coordinator, run_worker
+from utils.load_harness import LoadHarness, TimelineHistograms, build_timeline, overshoot_report, percentile
+from utils.cleanup import EntityRegistry
+from utils.load_profiles import (
+    ConstantProfile, DiurnalProfile, RampProfile, SpikeProfile, StepProfile,
+    arrivals, profile_from_spec,
+)
+from utils.load_scenarios import (
+    MissingValue, ScenarioRunner, load_scenario, lookup, render, render_path, scenario_from_spec,
+)
+from utils.payload_audit import field_bytes, rankings, route_template, run_audit, unused_fields
+from utils.seeder import seed_blogs, seed_comments
+from utils.standin_server import StandinServer
+
+
+def _sample(offset, latency, status=200):
+    return {'offset': offset, 'route': '/', 'latency': latency, 'status': status, 'bytes': 10, 'error': None}
+
+
+class TestLoadProfiles:
+    """Rate curves and arrival schedules"""
+
+    def test_01_profile_rates(self):
+        """Test 1: Each profile type follows its curve"""
+        assert RampProfile(0, 10, 10).rate_at(5) == pytest.approx(5)
+        assert StepProfile([(5, 1), (5, 9)]).rate_at(7) == 9
+        spike = SpikeProfile(2, 20, duration=30, spike_start=10, spike_duration=5, ramp=2)
+        assert spike.rate_at(5) == 2 and spike.rate_at(11) == pytest.approx(11) and spike.rate_at(13) == 20
+        assert [spike.phase_at(t) for t in (0, 12, 25)] == ['baseline', 'spike', 'recovery']
+        diurnal = DiurnalProfile(1, 9, period=100)
+        assert diurnal.rate_at(0) == pytest.approx(1) and diurnal.rate_at(50) == pytest.approx(9)
+        print("✓ Profile curves correct")
+
+    def test_02_arrivals_match_integral(self):
+        """Test 2: Scheduled arrivals add up to the area under the curve"""
+        profile = SpikeProfile(5, 50, duration=20, spike_start=5, spike_duration=5, ramp=1)
+        offsets = list(arrivals(profile))
+        assert abs(len(offsets) - profile.expected_requests()) <= 2
+        assert offsets == sorted(offsets) and offsets[-1] < profile.duration
+        assert len(list(arrivals(ConstantProfile(10, 5), poisson=True, seed=1))) > 30
+        print(f"✓ {len(offsets)} arrivals scheduled")
+
+    def test_03_profile_from_spec(self):
+        """Test 3: Declarative specs build composite profiles with labels"""
+        profile = profile_from_spec({'stages': [
+            {'type': 'constant', 'rate': 2, 'duration': 10, 'label': 'warmup'},
+            {'type': 'ramp', 'start_rate': 2, 'end_rate': 12, 'duration': 10},
+        ]})
+        assert profile.duration == 20
+        assert profile.phase_at(3) == 'warmup' and profile.phase_at(15) == 'ramp'
+        assert profile.rate_at(15) == pytest.approx(7)
+        with pytest.raises(ValueError):
+            profile_from_spec({'type': 'sawtooth'})
+        print("✓ Specs parsed")
+
+
+class TestTimeline:
+    """Timeline aggregation and overshoot analysis"""
+
+    def test_04_timeline_buckets_by_schedule(self):
+        """Test 4: Samples land in the second they were scheduled for"""
+        profile = ConstantProfile(2, 3)
+        samples = [_sample(0.1, 0.010), _sample(0.6, 0.020), _sample(1.2, 0.030), _sample(2.5, 0.5, status=502)]
+        timeline = build_timeline(samples, profile)
+        assert [row['sent_rps'] for row in timeline] == [2, 1, 1]
+        assert timeline[0]['p95_ms'] == 20.0
+        assert timeline[2]['errors'] == 1 and timeline[2]['throughput_rps'] == 0
+        print("✓ Timeline aligned with profile")
+
+    def test_05_overshoot_report(self):
+        """Test 5: Overshoot, degraded window and recovery are measured"""
+        profile = SpikeProfile(1, 1, duration=8, spike_start=3, spike_duration=2)
+        latencies = [0.010, 0.010, 0.010, 0.080, 0.040, 0.011, 0.010, 0.010]
+        samples = [_sample(second + 0.5, latency) for second, latency in enumerate(latencies)]
+        report = overshoot_report(build_timeline(samples, profile), slo_ms=50)
+        assert report['baseline_ms'] == 10.0 and report['peak_ms'] == 80.0
+        assert report['overshoot_ratio'] == 8.0
+        assert report['degraded_from'] == 3 and report['recovered_at'] == 5
+        assert report['seconds_over_slo'] == 1
+        print(f"✓ Overshoot {report['overshoot_ms']}ms, recovered in {report['time_to_recover_s']}s")
+
+
+class TestStandinRun:
+    """End-to-end against the stand-in backend"""
+
+    def test_06_run_against_standin(self):
+        """Test 6: A short profile runs against the stand-in without errors"""
+        with StandinServer(workers=4, service_time=0.001) as server:
+            profile = ConstantProfile(40, 1.5)
+            samples = LoadHarness(server.url, concurrency=8, seed=7).run(profile)
+        timeline = build_timeline(samples, profile)
+        assert len(samples) == pytest.approx(profile.expected_requests(), abs=2)
+        assert sum(row['errors'] for row in timeline) == 0
+        assert all(sample['status'] == 200 for sample in samples)
+        print(f"✓ {len(samples)} requests served by the stand-in")
+
+
+class TestDistributedLoad:
+    """Mergeable histograms, sharded schedules and the coordinator"""
+
+    def test_07_histogram_accuracy_and_merge(self):
+        """Test 7: Histogram percentiles stay within 1% and merging is lossless"""
+        rng = random.Random(3)
+        values = [rng.lognormvariate(-3, 1) for _ in range(5000)]
+        whole, left, right = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for index, value in enumerate(values):
+            whole.record(value)
+            (left if index % 2 else right).record(value)
+        merged = LatencyHistogram.from_dict(left.to_dict()).merge(right)
+        exact = sorted(value * 1000 for value in values)
+        for pct in (50, 95, 99, 99.9):
+            assert merged.percentile(pct) == whole.percentile(pct)
+            assert merged.percentile(pct) == pytest.approx(percentile(exact, pct), rel=0.01)
+        assert merged.percentile(100) == pytest.approx(exact[-1], abs=0.001)
+        print(f"✓ p99 {merged.percentile(99):.2f}ms from {len(merged.counts)} buckets")
+
+    def test_08_shards_cover_single_schedule(self):
+        """Test 8: Sharded runs together send exactly the single-process schedule"""
+        profile = profile_from_spec({'type': 'ramp', 'start_rate': 10, 'end_rate': 60, 'duration': 1})
+        with StandinServer() as server:
+            harness = LoadHarness(server.url, concurrency=4, seed=5)
+            shards = [harness.run(profile, shard=(index, 3)) for index in range(3)]
+        offsets = sorted(sample['offset'] for shard in shards for sample in shard)
+        assert offsets == list(arrivals(profile))
+        print(f"✓ {len(offsets)} arrivals split across 3 shards")
+
+    def test_09_coordinator_merges_nodes(self):
+        """Test 9: Two worker nodes run through the coordinator and merge"""
+        spec = {'type': 'constant', 'rate': 30, 'duration': 1}
+        with StandinServer() as server:
+            coordinator = Coordinator(spec, server.url, nodes=2, host='127.0.0.1', port=0, lead=0.5,
+                                      options={'concurrency': 4, 'seed': 1}).start()
+            workers = [threading.Thread(target=run_worker, args=(coordinator.address, 1, f"node-{index}"))
+                       for index in range(2)]
+            for worker in workers:
+                worker.start()
+            merged = coordinator.wait(timeout=30)
+            for worker in workers:
+                worker.join()
+        assert isinstance(merged, TimelineHistograms)
+        assert len(merged) == len(list(arrivals(profile_from_spec(spec))))
+        assert sum(merged.errors) == 0
+        assert all(route['mean_bytes'] > 0 for route in merged.route_summary().values())
+        print(f"✓ {len(merged)} requests merged from 2 nodes")
+
+
+class TestPayloadAudit:
+    """Response sizes against the fields the client reads"""
+
+    def test_10_field_bytes_and_unused_fields(self):
+        """Test 10: Field sizes add up per path and unread leaves are found"""
+        payload = {'success': True, 'blogs': [{'blogTitle': 'a', 'blogBody': 'x' * 100},
+                                              {'blogTitle': 'b', 'blogBody': 'y' * 100}]}
+        sizes = field_bytes(payload)
+        assert sizes['blogs[].blogBody'] == 2 * (len('"blogBody"') + 2 + 102)
+        assert sum(sizes.values()) == pytest.approx(len('{"success":true,"blogs":[{"blogTitle":"a","blogBody":"'
+                                                        + 'x' * 100 + '"},{"blogTitle":"b","blogBody":"'
+                                                        + 'y' * 100 + '"}]}'), abs=4)
+        reads = {'blogs', 'blogs[]', 'blogs[].blogTitle'}
+        assert sorted(unused_fields(sizes, reads)) == ['blogs[].blogBody', 'success']
+        assert unused_fields(field_bytes([{'likes': ['u1']}]), {'[]', '[].likes', '[].likes[]'}) == []
+        assert route_template('/api/comment/get-comment/65a1b2c3d4e5f60718293a4b?x=1') == '/api/comment/get-comment/:id'
+        print(f"✓ Field sizes: {sizes}")
+
+    def test_11_audit_ranks_routes(self):
+        """Test 11: The audit reports wasted bytes per route and weights them by the mix"""
+        reads = {'/api/blog/get-all-blogs': ['blogs', 'blogs[]', 'blogs[].blogTitle', 'blogs[].slug',
+                                             'blogs[].blogImgFile', 'blogs[].blogCategory']}
+        with StandinServer() as server:
+            server.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            blogs = seed_blogs(12, store=server.store, body_chars=3000)
+            seed_comments(5, blogs, store=server.store)
+            rows = run_audit(server.url, reads=reads, samples=1,
+                             mix=[{'path': '/', 'weight': 1}, {'path': '/api/blog/get-all-blogs?limit=9', 'weight': 3}])
+        by_route = {row['route']: row for row in rows}
+        home = by_route['/api/blog/get-all-blogs?limit=9']
+        assert home['unused'][0] == 'blogs[].blogBody' and home['wasted_pct'] > 80
+        assert by_route['/api/comment/get-all-comments']['status'] == 200
+        assert by_route['/']['wasted_bytes'] is None and by_route['/']['mix_share'] == 0.25
+        order = rankings(rows)
+        assert order['by_mix_bytes'][0] == '/api/blog/get-all-blogs?limit=9'
+        assert order['by_wasted_bytes'][0].startswith('/api/blog/get-all-blogs')
+        print(f"✓ {len(rows)} routes audited, home list wastes {home['wasted_pct']}%")
+
+
+LOGIN_STEP = {'name': 'login', 'method': 'POST', 'path': '/api/user/login',
+              'json': {'email': '{account.email}', 'password': '{account.password}'},
+              'extract': {'user': 'user', 'token': 'user.token'}}
+
+
+def _journeys(title):
+    """Comment-and-like and publish journeys with no think time; ``title`` is the blogTitle template"""
+    return {
+        'profile': {'type': 'constant', 'rate': 40, 'duration': 1},
+        'journeys': [
+            {'name': 'engage', 'weight': 3, 'account': 'reader', 'steps': [
+                LOGIN_STEP,
+                {'name': 'list', 'path': '/api/blog/get-all-blogs?limit=9', 'extract': {'post': 'blogs[*]'}},
+                {'name': 'open_post', 'path': '/api/blog/get-all-blogs?slug={post.slug}',
+                 'extract': {'blog_id': 'blogs[0]._id'}},
+                {'name': 'comments', 'path': '/api/comment/get-comment/{blog_id}', 'expect': [200, 404]},
+                {'name': 'comment', 'method': 'POST', 'path': '/api/comment/add-comment', 'auth': '{token}',
+                 'json': {'userId': '{user._id}', 'blogId': '{blog_id}', 'comment': 'Nice post {unique}'},
+                 'extract': {'comment_id': 'comment._id'}, 'track': {'comment': 'comment_id'}},
+                {'name': 'like', 'method': 'PUT', 'path': '/api/comment/like-the-comment/{comment_id}',
+                 'auth': '{token}', 'json': {'user': '{user._id}'}},
+            ]},
+            {'name': 'publish', 'weight': 1, 'account': 'admin', 'steps': [
+                LOGIN_STEP,
+                {'name': 'post', 'method': 'POST', 'path': '/api/blog/post-blog', 'auth': '{token}',
+                 'json': {'blogTitle': title, 'blogBody': '<p>{vu}</p>', 'user': '{user}'},
+                 'extract': {'blog_id': 'blog._id'}, 'track': {'blog': 'blog_id'}},
+                {'name': 'update', 'method': 'PUT', 'path': '/api/blog/update-blog/{blog_id}/{user._id}',
+                 'auth': '{token}', 'json': {'blogTitle': title + ' revised', 'blogBody': '<p>{vu}</p>'}},
+                {'name': 'delete', 'method': 'DELETE', 'path': '/api/blog/delete-blog/{blog_id}/{user._id}',
+                 'auth': '{token}', 'json': {'user': '{user}'}},
+            ]},
+        ],
+    }
+
+
+class TestJourneyScenarios:
+    """Virtual users walking declarative journeys"""
+
+    def test_12_templates_and_validation(self):
+        """Test 12: References resolve through responses and malformed scenarios are rejected"""
+        variables = {'user': {'_id': 'u1', 'isAdmin': True}, 'unique': 'ab12-7'}
+        assert render({'user': '{user}', 'path': '/x/{user._id}', 'n': [1, 'Post {unique}']}, variables) == \
+            {'user': {'_id': 'u1', 'isAdmin': True}, 'path': '/x/u1', 'n': [1, 'Post ab12-7']}
+        assert render_path('/api/blog/get-all-blogs?slug={post.slug}', {'post': {'slug': 'c++-&-c#'}}) == \
+            '/api/blog/get-all-blogs?slug=c%2B%2B-%26-c%23'
+        document = {'blogs': [{'_id': 'b1', 'slug': 's1'}, {'_id': 'b2', 'slug': 's2'}]}
+        assert lookup(document, 'blogs[1].slug') == 's2' and lookup(document, 'blogs[*]') in document['blogs']
+        for path in ('blogs[2]._id', 'blog._id', 'blogs[0].missing'):
+            with pytest.raises(MissingValue):
+                lookup(document, path)
+        with pytest.raises(MissingValue):
+            lookup({'blogs': []}, 'blogs[*]')
+
+        spec = _journeys('Post {unique}')
+        spec['journeys'][1]['steps'].append({'name': 'post', 'path': '/'})
+        with pytest.raises(ValueError, match='duplicate step names'):
+            scenario_from_spec(spec)
+        with pytest.raises(ValueError, match='profile'):
+            scenario_from_spec({'journeys': spec['journeys']})
+        profile, shipped = load_scenario('profiles/journeys.json')
+        assert [journey['weight'] for journey in shipped['journeys']] == [70, 25, 5] and profile.duration == 150
+        print(f"✓ Shipped scenario: {[journey['name'] for journey in shipped['journeys']]}")
+
+    def test_13_journeys_chain_ids_against_standin(self, tmp_path):
+        """Test 13: Comments land on the opened post, unique titles publish cleanly, each step is timed"""
+        with StandinServer(workers=4) as server:
+            server.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            seed_blogs(5, store=server.store)
+            readers = [{'email': f"reader{index}@example.com", 'password': 'ReaderPass123!'} for index in range(3)]
+            for reader in readers:
+                server.store.add_user(reader['email'].split('@')[0], reader['email'], reader['password'])
+            registry = EntityRegistry('scenario', directory=str(tmp_path))
+            profile, spec = scenario_from_spec(_journeys('Load test {unique}'))
+            runner = ScenarioRunner(server.url, spec, accounts={'reader': readers, 'admin': [TEST_ADMIN]},
+                                    concurrency=16, seed=3, registry=registry)
+            samples = runner.run(profile)
+            comments = list(server.store.comments.values())
+            blogs = list(server.store.blogs.values())
+
+        report = runner.stats.report()
+        engage, publish = report['engage'], report['publish']
+        rows = engage['steps'] + publish['steps']
+        assert len(samples) == sum(row['count'] for row in rows)
+        assert publish['completed'] == publish['started'] > 0 and engage['completed'] > 0
+        # A reader can open a post that a publish journey deletes before the slug lookup
+        assert set(engage['aborted']) <= {'open_post: missing blogs[0]._id'}
+        assert engage['steps'][-1]['count'] == engage['completed'] == engage['started'] - engage['steps'][3]['skipped']
+        assert all(row['p95_ms'] is not None and row['failed'] == 0 for row in rows)
+        tracked = registry.entries()
+        posts = {blog['_id'] for blog in blogs} | {entry['id'] for entry in tracked if entry['kind'] == 'blog'}
+        assert len(comments) == engage['completed'] and all(comment['blogId'] in posts for comment in comments)
+        assert all(comment['likes'] == [comment['userId']] for comment in comments)
+        assert len(blogs) == 5  # Every published post was revised and deleted
+        assert sorted(entry['id'] for entry in tracked if entry['kind'] == 'comment') == \
+            sorted(comment['_id'] for comment in comments)
+        assert sum(entry['kind'] == 'blog' for entry in tracked) == publish['started']
+        assert {sample['route'] for sample in samples} >= {'engage/like', 'publish/delete'}
+        print(f"✓ {engage['started']} engage and {publish['started']} publish journeys, "
+              f"comment p95 {engage['steps'][4]['p95_ms']}ms")
+
+    def test_14_repeated_title_aborts_publish(self):
+        """Test 14: A fixed blogTitle hits the unique index; later steps are skipped, not sent with stale IDs"""
+        with StandinServer(workers=4) as server:
+            server.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            spec = _journeys('Same title every time')
+            spec['journeys'] = spec['journeys'][1:]
+            steps = spec['journeys'][0]['steps']
+            steps.pop()  # Keep the first post so the title stays taken
+            steps[-1]['json']['blogTitle'] = 'Same title every time'
+            profile, spec = scenario_from_spec(spec)
+            runner = ScenarioRunner(server.url, spec, accounts={'admin': [TEST_ADMIN]}, concurrency=1, seed=3)
+            runner.run(profile)
+            titles = [blog['blogTitle'] for blog in server.store.blogs.values()]
+
+        publish = runner.stats.report()['publish']
+        steps = {row['step']: row for row in publish['steps']}
+        duplicates = publish['started'] - 1
+        assert titles == ['Same title every time'] and publish['completed'] == 1
+        assert publish['aborted'] == {'post: status_500': duplicates}
+        assert steps['post']['failed'] == duplicates and steps['update'] == {**steps['update'], 'count': 1,
+                                                                           'failed': 0, 'skipped': duplicates}
+        print(f"✓ {publish['aborted']}")
+
+    def test_15_slugs_are_encoded_and_errors_recorded(self):
+        """Test 15: A slug with + & # opens its own post; a journey that raises is counted as aborted"""
+        with StandinServer(workers=4) as server:
+            author = server.store.add_user('author', 'author@example.com', 'AuthorPass123!')
+            server.store.add_blog(author['_id'], 'C++ & C# tips', '<p>Pointers</p>')
+            spec = _journeys('unused')
+            spec['journeys'] = [
+                {'name': 'browse', 'steps': spec['journeys'][0]['steps'][1:4]},
+                {'name': 'write', 'account': 'writer', 'steps': [LOGIN_STEP]},
+            ]
+            profile, spec = scenario_from_spec(spec)
+            runner = ScenarioRunner(server.url, spec, concurrency=4, seed=3)
+            runner.run(profile)
+
+        report = runner.stats.report()
+        browse, write = report['browse'], report['write']
+        assert browse['completed'] == browse['started'] > 0 and browse['aborted'] == {}
+        assert write['started'] > 0 and write['completed'] == 0
+        assert write['aborted'] == {"start: ValueError: No accounts for role 'writer'": write['started']}
+        assert write['steps'][0]['skipped'] == write['started']
+        print(f"✓ {browse['completed']} posts opened by slug, {write['aborted']}")
@@ -0,0 +1,140 @@
+"""
+Locator Resolver Test Suite
+Runs the resolver against a scripted page that answers the probe script the
+way the browser would, then checks the learned order and time saved
+"""
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from utils import locators
+from utils.locators import LocatorCache, LocatorResolver, LookupStats, page_key
+
+
+HARNESS_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_SUITE = '''
+class Page:
+    current_url = 'http://app/'
+
+    def execute_script(self, script, candidates, clickable, all):
+        return next([index, value] for index, (by, value) in enumerate(candidates) if value == '.theme-toggle')
+
+def test_lookup(locate):
+    assert locate(Page(), implicit_wait=10)('theme_toggle') == '.theme-toggle'
+'''
+
+
+class ScriptedPage:
+    """
+    Driver double: ``present`` maps a candidate selector to the seconds after
+    ``get`` at which it starts matching (the element being its selector)
+    """
+
+    def __init__(self, url, present):
+        self.present = present
+        self.calls = 0
+        self.get(url)
+
+    def get(self, url):
+        self.current_url = url
+        self.loaded = time.perf_counter()
+
+    def execute_script(self, script, candidates, clickable, all):
+        assert script == locators.PROBE_SCRIPT
+        self.calls += 1
+        age = time.perf_counter() - self.loaded
+        found = [value for by, value in candidates if self.present.get(value, float('inf')) <= age]
+        if all:
+            return found
+        for index, (by, value) in enumerate(candidates):
+            if value in found:
+                return [index, value]
+        return None
+
+
+class TestLocators:
+    """Batched probing, learned candidate order and lookup accounting"""
+
+    def test_01_learns_matching_candidate_per_page(self, tmp_path):
+        """Test 1: The candidate that matched is tried first next run, on every page of the same route"""
+        path = str(tmp_path / 'locators.json')
+        assert page_key('http://app:8081/blog/first-post') == page_key('http://app/blog/other-post/') == \
+            '/blog/:blogSlug'
+        assert page_key('http://app/dashboard?tab=posts&x=1') == '/dashboard?tab=posts'
+
+        page = ScriptedPage('http://app/blog/first-post', {"[href*='/blog/']": 0})
+        stats = LookupStats()
+        cold = LocatorResolver(page, cache=LocatorCache(path), stats=stats, implicit_wait=10)
+        assert cold('post_link') == "[href*='/blog/']" and page.calls == 1
+        cold.cache.save()
+
+        page.get('http://app/blog/second-post')
+        warm = LocatorResolver(page, cache=LocatorCache(path), stats=stats, implicit_wait=10)
+        candidates, learned = warm.ordered(locators.LOCATORS['post_link'], page_key(page.current_url))
+        assert learned and candidates[0] == (By.CSS_SELECTOR, "[href*='/blog/']") and len(candidates) == 4
+        assert warm('post_link') == "[href*='/blog/']"
+
+        row = stats.to_dict()['post_link']
+        assert row['lookups'] == 2 and row['learned'] == 1 and row['probes'] == 2 and row['misses'] == 0
+        # The chain would burn 10s on each of the three candidates declared before the match, per lookup
+        assert 59.9 < row['baseline_seconds'] - row['seconds'] <= 60
+        assert stats.format()[-1].endswith('(saved 60.00s)')
+        print(f"✓ {stats.format()[1]}")
+
+    def test_02_polls_misses_and_shortens_known_misses(self, tmp_path, monkeypatch):
+        """Test 2: Late elements are polled for; an element only ever missing gets a short wait"""
+        monkeypatch.setattr(locators, 'LEARNED_MISS_TIMEOUT', 0.2)
+        cache = LocatorCache(str(tmp_path / 'locators.json'))
+        page = ScriptedPage('http://app/dashboard?tab=posts', {'.blog-card': 0, 'article': 0.3})
+        resolver = LocatorResolver(page, cache=cache, stats=LookupStats(), implicit_wait=10, timeout=1)
+
+        assert resolver.find_all('post_item') == ['.blog-card']
+        assert resolver('search_result') == '.blog-card'
+        page.get(page.current_url)
+        started = time.perf_counter()
+        assert resolver('post_item', timeout=1) == '.blog-card'  # No waiting for the earlier candidates
+        assert time.perf_counter() - started < 0.1
+        assert resolver('post_content') == 'article' and page.calls > 3
+
+        started = time.perf_counter()
+        with pytest.raises(TimeoutException, match='confirm_button not found on /dashboard'):
+            resolver('confirm_button')
+        assert 1 <= time.perf_counter() - started < 1.5
+        started = time.perf_counter()
+        with pytest.raises(TimeoutException):
+            resolver('confirm_button')
+        assert time.perf_counter() - started < 0.5
+        assert cache.get('/dashboard?tab=posts', 'confirm_button') == {'hits': 0, 'misses': 2}
+
+        other = LocatorCache(cache.path)
+        other.record('/', 'theme_toggle', (By.CSS_SELECTOR, '.theme-toggle'))
+        other.save()
+        cache.save()  # Merges over the other worker's entry instead of dropping it
+        saved = LocatorCache(cache.path).entries
+        assert saved['/']['theme_toggle']['value'] == '.theme-toggle'
+        assert saved['/dashboard?tab=posts']['post_item']['hits'] == 1
+        print(f"✓ Learned {sorted(saved['/dashboard?tab=posts'])}")
+
+    def test_03_plugin_reports_lookups(self, tmp_path):
+        """Test 3: The locate fixture shares one cache per run and --locator-report prints the savings"""
+        (tmp_path / 'test_sample.py').write_text(SAMPLE_SUITE)
+        env = {**os.environ, 'PYTHONPATH': HARNESS_ROOT, 'HARNESS_DIR': str(tmp_path / 'harness')}
+
+        def run(*args):
+            result = subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'utils.locators', '--locator-report',
+                                     *args, 'test_sample.py'],
+                                    cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60)
+            assert result.returncode == 0, result.stdout + result.stderr
+            return result.stdout
+
+        first, second = run(), run()
+        assert 'locator lookups' in first and '(saved 10.00s)' in first
+        assert [line.split()[2] for line in second.splitlines() if line.startswith('theme_toggle')] == ['1']
+        assert os.path.exists(tmp_path / 'harness' / 'locators.json')
+        print(f"✓ {[line for line in second.splitlines() if 'saved' in line]}")
@@ -8,17 +8,39 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
 import os
+from utils.html_driver import driver_for, quit_driver
 
 
 BASE_URL = os.getenv('APP_URL', 'http://localhost:8081')
 
 
+@pytest.mark.no_js
+@pytest.mark.read_only
 class TestMinimalSuite:
     @pytest.fixture(autouse=True)
-    def setup_teardown(self):
-        """Setup and teardown - minimal Chrome config"""
+    def setup_teardown(self, request, page_snapshot):
+        """Setup and teardown - HTML tier, or minimal Chrome config with --no-html-tier"""
+        self.request = request
+        self.snapshot = lambda url: page_snapshot(url, self._new_driver, profile='chrome-nojs', settle=1)
+        self._driver = None  # Started on first use; tests answered from a snapshot never need one
+        yield
+        if self._driver:
+            quit_driver(self._driver, settle=1)  # Give Chrome time to release memory
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            self._driver = self._new_driver()
+        return self._driver
+
+    def _new_driver(self):
+        driver = driver_for(self.request, self._chrome)
+        driver.set_page_load_timeout(15)
+        return driver
+
+    @staticmethod
+    def _chrome():
         options = Options()
         options.add_argument('--headless=new')
         options.add_argument('--no-sandbox')
@@ -30,42 +52,30 @@ class TestMinimalSuite:
         options.add_argument('--disable-javascript')
         options.add_argument('--blink-settings=imagesEnabled=false')
         
-        self.driver = webdriver.Chrome(options=options)
-        self.driver.set_page_load_timeout(15)
-        yield
-        self.driver.quit()
-        time.sleep(1)  # Give time to release memory
+        return webdriver.Chrome(options=options)
 
     def test_01_homepage_accessible(self):
         """Test 1: Homepage is accessible"""
         print(f"\n[TEST 1] Checking homepage: {BASE_URL}")
-        self.driver.get(BASE_URL)
-        time.sleep(2)
-        assert len(self.driver.page_source) > 100
+        assert len(self.snapshot(BASE_URL).page_source) > 100
         print("✓ Homepage loaded successfully")
 
     def test_02_signup_page_accessible(self):
         """Test 2: Signup page is accessible"""
         print(f"\n[TEST 2] Checking signup page: {BASE_URL}/sign-up")
-        self.driver.get(f"{BASE_URL}/sign-up")
-        time.sleep(2)
-        assert '/sign-up' in self.driver.current_url
+        assert '/sign-up' in self.snapshot(f"{BASE_URL}/sign-up").current_url
         print("✓ Signup page accessible")
 
     def test_03_signin_page_accessible(self):
         """Test 3: Signin page is accessible"""
         print(f"\n[TEST 3] Checking signin page: {BASE_URL}/sign-in")
-        self.driver.get(f"{BASE_URL}/sign-in")
-        time.sleep(2)
-        assert '/sign-in' in self.driver.current_url
+        assert '/sign-in' in self.snapshot(f"{BASE_URL}/sign-in").current_url
         print("✓ Signin page accessible")
 
     def test_04_page_title_exists(self):
         """Test 4: Homepage has a title"""
         print(f"\n[TEST 4] Checking page title")
-        self.driver.get(BASE_URL)
-        time.sleep(2)
-        title = self.driver.title
+        title = self.snapshot(BASE_URL).title
         assert len(title) > 0, "Page should have a title"
         print(f"✓ Page title: {title}")
 
@@ -73,70 +83,55 @@ class TestMinimalSuite:
         """Test 5: Can navigate between pages"""
         print(f"\n[TEST 5] Testing navigation")
         self.driver.get(BASE_URL)
-        time.sleep(2)
         self.driver.get(f"{BASE_URL}/sign-up")
-        time.sleep(2)
         assert '/sign-up' in self.driver.current_url
         print("✓ Navigation working")
 
     def test_06_homepage_contains_content(self):
         """Test 6: Homepage contains actual content"""
         print(f"\n[TEST 6] Checking homepage content")
-        self.driver.get(BASE_URL)
-        time.sleep(2)
-        body_text = self.driver.find_element(By.TAG_NAME, "body").text
+        body_text = self.snapshot(BASE_URL).find_element(By.TAG_NAME, "body").text
         assert len(body_text) > 0, "Homepage should have text content"
         print(f"✓ Homepage has content ({len(body_text)} characters)")
 
     def test_07_signin_page_exists(self):
         """Test 7: Sign-in page loads correctly"""
         print(f"\n[TEST 7] Verifying sign-in page")
-        self.driver.get(f"{BASE_URL}/sign-in")
-        time.sleep(2)
-        page_source = self.driver.page_source.lower()
+        page_source = self.snapshot(f"{BASE_URL}/sign-in").page_source.lower()
         assert 'sign' in page_source or 'login' in page_source
         print("✓ Sign-in page verified")
 
     def test_08_signup_page_exists(self):
         """Test 8: Sign-up page loads correctly"""
         print(f"\n[TEST 8] Verifying sign-up page")
-        self.driver.get(f"{BASE_URL}/sign-up")
-        time.sleep(2)
-        page_source = self.driver.page_source.lower()
+        page_source = self.snapshot(f"{BASE_URL}/sign-up").page_source.lower()
         assert 'sign' in page_source or 'register' in page_source
         print("✓ Sign-up page verified")
 
     def test_09_base_url_responds(self):
         """Test 9: Base URL responds"""
         print(f"\n[TEST 9] Testing base URL response")
-        self.driver.get(BASE_URL)
-        time.sleep(2)
-        assert self.driver.current_url.startswith('http')
+        assert self.snapshot(BASE_URL).current_url.startswith('http')
         print("✓ Base URL responding")
 
     def test_10_page_loads_without_errors(self):
         """Test 10: Pages load without browser errors"""
         print(f"\n[TEST 10] Checking for browser errors")
-        self.driver.get(BASE_URL)
-        time.sleep(2)
-        # If we got here without exception, page loaded
-        assert self.driver.title is not None
+        # The snapshot was captured without an exception, so the page loaded
+        assert self.snapshot(BASE_URL).title is not None
         print("✓ No browser errors detected")
 
     def test_11_navigation_persistence(self):
         """Test 11: Navigation state persists"""
         print(f"\n[TEST 11] Testing navigation persistence")
-        self.driver.get(f"{BASE_URL}/sign-in")
-        time.sleep(2)
-        current = self.driver.current_url
+        current = self.snapshot(f"{BASE_URL}/sign-in").current_url
         assert '/sign-in' in current
         print("✓ Navigation state persistent")
 
     def test_12_application_availability(self):
         """Test 12: Application is fully available"""
         print(f"\n[TEST 12] Testing overall availability")
-        self.driver.get(BASE_URL)
-        time.sleep(2)
-        assert self.driver.page_source is not None
-        assert len(self.driver.page_source) > 50
+        snapshot = self.snapshot(BASE_URL)
+        assert snapshot.page_source is not None
+        assert len(snapshot.page_source) > 50
         print("✓ Application fully available")
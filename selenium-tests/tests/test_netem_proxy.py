@@ -0,0 +1,69 @@
+"""
+Network Emulation Proxy Test Suite
+Checks per-prefix latency, bandwidth caps, stalls and keep-alive relaying
+against the local stand-in backend
+"""
+import time
+
+import pytest
+import requests
+
+from config import TEST_ADMIN
+from utils.netem_proxy import NetemProxy, rules_from_spec
+from utils.seeder import seed_blogs
+from utils.standin_server import StandinServer
+
+
+def _timed(session, url):
+    started = time.perf_counter()
+    response = session.get(url, timeout=30)
+    return response, time.perf_counter() - started
+
+
+class TestNetemProxy:
+    """Shaping between the harness and the app"""
+
+    def test_01_spec_builds_prefix_rules(self):
+        """Test 1: Presets, overrides and prefixes resolve into ordered rules"""
+        rules = rules_from_spec({'default': {'preset': 'slow-4g'},
+                                 'rules': [{'prefix': '/api/', 'down': {'latency_ms': 10}},
+                                           {'prefix': '/api/blog/', 'preset': 'dsl'}]})
+        assert [rule.prefix for rule in rules] == ['/api/blog/', '/api/', '']
+        assert rules[1].down.latency == 0.01 and rules[1].down.rate is None
+        assert rules[2].down.rate == 200000 and rules[2].up.latency == 0.075
+        print("✓ Rules ordered by prefix specificity")
+
+    def test_02_latency_applies_per_prefix(self):
+        """Test 2: API calls get the API rule's delay while static files stay fast, on one connection"""
+        spec = {'rules': [{'prefix': '/api/', 'up': {'latency_ms': 50}, 'down': {'latency_ms': 100}}]}
+        with StandinServer() as server, NetemProxy(server.url, spec) as proxy:
+            session = requests.Session()
+            static, static_time = _timed(session, proxy.url + '/')
+            api, api_time = _timed(session, proxy.url + '/api/blog/get-all-blogs?limit=3')
+            again, again_time = _timed(session, proxy.url + '/about')
+            stats = proxy.stats()
+        assert static.status_code == api.status_code == again.status_code == 200
+        assert 'Blog App' in static.text and api.json()['success']
+        assert api_time >= 0.15 and static_time < 0.1 and again_time < 0.1
+        assert stats['/api/']['requests'] == 1 and stats['*']['requests'] == 2
+        print(f"✓ static {static_time * 1000:.0f}ms, api {api_time * 1000:.0f}ms")
+
+    def test_03_bandwidth_cap_and_stalls(self):
+        """Test 3: Downstream bandwidth bounds transfer time and lost packets stall the stream"""
+        with StandinServer() as server:
+            server.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            seed_blogs(20, store=server.store, body_chars=5000)
+            size = len(requests.get(server.url + '/api/blog/get-all-blogs?limit=20').content)
+            spec = {'default': {'down': {'bandwidth_kbps': 4000}}}  # 500 kB/s
+            with NetemProxy(server.url, spec) as proxy:
+                response, elapsed = _timed(requests.Session(), proxy.url + '/api/blog/get-all-blogs?limit=20')
+            assert len(response.content) == size
+            assert elapsed == pytest.approx(size / 500000, rel=0.35)
+
+            lossy = {'default': {'down': {'loss': 0.2, 'stall_ms': 20}}}
+            with NetemProxy(server.url, lossy, seed=1) as proxy:
+                response, elapsed = _timed(requests.Session(), proxy.url + '/api/blog/get-all-blogs?limit=20')
+                stalls = proxy.stats()['*']['down']['stalls']
+            assert response.json()['success'] and stalls > 0
+            assert elapsed >= stalls * 0.02 * 0.9
+        print(f"✓ {size} bytes paced at 500 kB/s; {stalls} stalls")
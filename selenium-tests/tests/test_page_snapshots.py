@@ -0,0 +1,196 @@
+"""
+Page Snapshot Test Suite
+Captures pages from the local stand-in and a scripted browser, then checks
+reuse, expiry and the invalidation rules the plugin applies between tests
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from utils.html_driver import HtmlDriver, parse_html
+from utils.page_snapshots import FACTS_SCRIPT, SnapshotCache
+from utils.standin_server import StandinServer
+
+
+HARNESS_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGE = ('<!doctype html><html><head><title>Tech Blog</title></head><body><div id="root" class="app">'
+        '<nav><a href="/sign-in">Sign In</a> <a href="/sign-up">Sign Up</a></nav>\n<h1>Latest posts</h1></div>'
+        '</body></html>')
+
+SAMPLE_SUITE = '''
+import pytest
+
+LOADS = []
+
+
+class Page:
+    title = 'Tech Blog'
+    page_source = '<html><body>hi</body></html>'
+    status_code = 200
+
+    def get(self, url):
+        LOADS.append(url)
+        self.current_url = url
+
+    def execute_script(self, script, tags, attributes):
+        return {}
+
+    def find_element(self, by, value):
+        return type('Body', (), {'text': 'hi', 'tag_name': 'body'})()
+
+    def quit(self):
+        pass
+
+
+def visit(page_snapshot, url='http://app/', profile=None):
+    return page_snapshot(url, Page, profile=profile)
+
+
+@pytest.mark.read_only
+def test_a_captures(page_snapshot):
+    assert visit(page_snapshot).title == 'Tech Blog' and LOADS == ['http://app/']
+
+@pytest.mark.read_only
+def test_b_reuses(page_snapshot):
+    assert visit(page_snapshot, 'http://app').body_text == 'hi' and len(LOADS) == 1
+
+def test_c_writes(page_snapshot):
+    visit(page_snapshot)
+    assert len(LOADS) == 2  # Unmarked tests always load, and clear the cache afterwards
+
+@pytest.mark.read_only
+def test_d_reloads_after_write(page_snapshot):
+    visit(page_snapshot)
+    assert len(LOADS) == 3
+
+@pytest.mark.read_only
+@pytest.mark.no_snapshot
+def test_e_times_a_fresh_load(page_snapshot):
+    assert visit(page_snapshot).load_seconds >= 0 and len(LOADS) == 4
+
+@pytest.mark.read_only
+def test_f_reuses_fresh_load(page_snapshot):
+    visit(page_snapshot)
+    assert len(LOADS) == 4
+
+@pytest.mark.read_only
+def test_g_other_profile_loads(page_snapshot):
+    visit(page_snapshot, profile='chrome-nojs')
+    assert len(LOADS) == 5
+'''
+
+
+class ScriptedBrowser:
+    """Browser double: answers the facts script, or refuses scripts like Chrome with JS disabled"""
+
+    title = 'Tech Blog'
+    page_source = PAGE
+
+    def __init__(self, scripts=True, status=200):
+        self.scripts = scripts
+        self.document = parse_html(PAGE)
+        self.calls = []
+        self.status_code = status
+
+    def get(self, url):
+        self.calls.append('get')
+        self.current_url = url
+
+    def execute_script(self, script, tags, attributes):
+        assert script == FACTS_SCRIPT and 'a' in tags and 'href' in attributes
+        self.calls.append('script')
+        if not self.scripts:
+            raise WebDriverException('javascript error: scripts are disabled')
+        return {tag: [] for tag in tags} | {'a': [{'tag_name': 'a', 'text': 'Sign In', 'attributes': {'href': '/x'}}]}
+
+    def find_elements(self, by, value):
+        self.calls.append(f"find {value}")
+        return self.document.find_elements(by, value)
+
+    def find_element(self, by, value):
+        return self.document.find_element(by, value)
+
+    def quit(self):
+        self.calls.append('quit')
+
+
+class TestPageSnapshots:
+    """Capture, reuse and invalidation"""
+
+    def test_01_captures_once_and_answers_from_snapshot(self, tmp_path):
+        """Test 1: The first visit captures the page; later reads never start a driver"""
+        (tmp_path / 'index.html').write_text(PAGE)
+        made = []
+
+        def factory():
+            made.append(HtmlDriver())
+            return made[-1]
+
+        cache = SnapshotCache()
+        with StandinServer(static_dir=str(tmp_path)) as server:
+            first = cache.snapshot(server.url, factory, tier='html')
+            again = cache.snapshot(server.url + '/', factory, tier='html')
+            other_tier = cache.snapshot(server.url, factory, tier='browser')
+
+        assert again is first and other_tier is not first and len(made) == 2
+        assert all(driver.session_id is None for driver in made)  # Factory-made drivers are quit
+        assert first.title == 'Tech Blog' and first.status_code == 200 and first.current_url.startswith(server.url)
+        assert first.body_text == 'Sign In Sign Up Latest posts'
+        assert [a.get_attribute('href') for a in first.find_elements(By.TAG_NAME, 'a')] == ['/sign-in', '/sign-up']
+        assert first.find_element(By.TAG_NAME, 'h1').text == 'Latest posts'
+        assert first.find_element(By.ID, 'root').get_attribute('class') == 'app'  # Parsed from the source
+        with pytest.raises(NoSuchElementException, match='in snapshot of'):
+            first.find_element(By.TAG_NAME, 'form')
+        assert cache.loads == 2 and cache.hits == 1 and cache.saved_seconds == first.cost_seconds > 0
+        print(f"✓ Captured in {first.cost_seconds * 1000:.1f}ms, reused once")
+
+    def test_02_expiry_error_pages_and_script_fallback(self):
+        """Test 2: Snapshots expire, 5xx pages and other driver profiles are not shared, scripts fall back"""
+        cache = SnapshotCache(max_age=0.05)
+        browser = ScriptedBrowser()
+        snapshot = cache.snapshot('http://app/', browser)
+        assert browser.calls == ['get', 'script'] and snapshot.find_element(By.TAG_NAME, 'a').text == 'Sign In'
+        assert cache.snapshot('http://app/', browser) is snapshot
+        cache.entries[cache.key('http://app/', 'browser')].captured_at -= 1
+        assert cache.snapshot('http://app/', browser) is not snapshot and cache.loads == 2
+
+        failing = ScriptedBrowser(status=502)
+        cache.snapshot('http://app/down', failing)
+        assert cache.get('http://app/down', 'browser') is None
+
+        fallback = ScriptedBrowser(scripts=False)
+        snapshot = SnapshotCache(enabled=False).snapshot('http://app/', fallback)
+        assert 'find a' in fallback.calls and 'quit' not in fallback.calls  # The test's own driver stays open
+        assert [a.text for a in snapshot.find_elements(By.TAG_NAME, 'a')] == ['Sign In', 'Sign Up']
+
+        profiles = SnapshotCache()
+        scripted = profiles.snapshot('http://app/', ScriptedBrowser(), profile='chrome')
+        unscripted = profiles.snapshot('http://app/', ScriptedBrowser(scripts=False), profile='chrome-nojs')
+        assert unscripted is not scripted and profiles.snapshot('http://app/', browser, profile='chrome') is scripted
+        assert profiles.loads == 2 and profiles.hits == 1
+
+        cache.clear()
+        assert cache.entries == {} and cache.invalidations == 1
+        print(f"✓ {cache.loads} loads, fallback used {len(fallback.calls)} driver calls")
+
+    def test_03_plugin_applies_invalidation_rules(self, tmp_path):
+        """Test 3: read_only tests share a visit; unmarked tests clear it; no_snapshot or a new profile loads"""
+        (tmp_path / 'test_sample.py').write_text(SAMPLE_SUITE)
+        env = {**os.environ, 'PYTHONPATH': HARNESS_ROOT, 'HARNESS_DIR': str(tmp_path / 'harness')}
+
+        def run(*args):
+            return subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'utils.page_snapshots', *args,
+                                   'test_sample.py'], cwd=tmp_path, env=env, capture_output=True, text=True,
+                                  timeout=60)
+
+        result = run()
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert 'page snapshots: 5 loads, 2 reused' in result.stdout
+        disabled = run('--no-page-snapshots')
+        assert '6 failed, 1 passed' in disabled.stdout and 'page snapshots' not in disabled.stdout
+        print(f"✓ {[line for line in result.stdout.splitlines() if 'snapshots' in line][0]}")
@@ -0,0 +1,101 @@
+"""
+Fixture Phase Profiler Test Suite
+Profiles a small generated suite in a subprocess and checks the critical
+path arithmetic on a synthetic profile
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from utils.phase_profiler import class_rollup, critical_path, fixture_rollup, lpt_makespan
+
+
+HARNESS_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_SUITE = '''
+import threading
+import time
+import pytest
+
+@pytest.fixture(scope='session')
+def shared():
+    time.sleep(0.3)
+    yield
+    time.sleep(0.1)
+
+class TestSlow:
+    @pytest.fixture(autouse=True)
+    def setup_teardown(self, shared):
+        time.sleep(0.2)
+        yield
+        time.sleep(0.1)
+
+    def test_a(self):
+        time.sleep(0.4)
+
+    def test_b(self):
+        worker = threading.Thread(target=time.sleep, args=(0.3,))  # Not this test's sleep
+        worker.start()
+        worker.join()
+
+def test_fast(shared):
+    time.sleep(0.05)
+'''
+
+
+def _test(nodeid, cls, setup, call, teardown, fixtures=None):
+    return {'nodeid': nodeid, 'cls': cls, 'setup': setup, 'call': call, 'teardown': teardown,
+            'fixtures': fixtures or {}, 'spans': {}}
+
+
+class TestPhaseProfiler:
+    """Phase timing, rollups and schedule planning"""
+
+    def test_01_profiles_fixture_phases_and_sleeps(self, tmp_path):
+        """Test 1: Fixture setup/teardown, bodies and sleeps are booked to the right test and phase"""
+        (tmp_path / 'test_sample.py').write_text(SAMPLE_SUITE)
+        out = tmp_path / 'phases.json'
+        env = {**os.environ, 'PYTHONPATH': HARNESS_ROOT, 'HARNESS_DIR': str(tmp_path / 'harness')}
+        result = subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'utils.phase_profiler',
+                                 '--profile-phases', '--profile-out', str(out), str(tmp_path / 'test_sample.py')],
+                                cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert 'Critical path by test' in result.stdout
+        tests = {test['nodeid'].split('::')[-1]: test for test in json.loads(out.read_text())['tests']}
+
+        first = tests['test_a']
+        assert first['fixtures']['shared']['setup'] == pytest.approx(0.3, abs=0.08)
+        assert first['fixtures']['setup_teardown']['setup'] == pytest.approx(0.2, abs=0.08)
+        assert first['fixtures']['setup_teardown']['teardown'] == pytest.approx(0.1, abs=0.08)
+        assert first['call'] == pytest.approx(0.4, abs=0.08)
+        assert first['spans']['sleep']['setup'] == pytest.approx(0.5, abs=0.08)
+        assert 'call' not in tests['test_b']['spans'].get('sleep', {})
+        assert tests['test_fast']['fixtures']['shared']['teardown'] == pytest.approx(0.1, abs=0.08)
+
+        fixtures = {row['name']: row for row in fixture_rollup(list(tests.values()))}
+        assert fixtures['setup_teardown']['uses'] == 2 and fixtures['shared']['scope'] == 'session'
+        print(f"✓ {len(tests)} tests profiled: {result.stdout.splitlines()[-3]}")
+
+    def test_02_critical_path_and_schedules(self):
+        """Test 2: Shared fixtures are paid once; the longest unit bounds every schedule"""
+        shared = {'pool': {'scope': 'session', 'setup': 2.0, 'teardown': 0.0}}
+        profile = {'session_finish': 1.0, 'tests': [
+            _test('a::1', 'A', 3.0, 4.0, 1.0, shared),    # 6s own work
+            _test('a::2', 'A', 1.0, 2.0, 1.0),            # 4s
+            _test('b::1', 'B', 1.0, 1.0, 1.0),            # 3s
+            _test('b::2', 'B', 1.0, 1.0, 1.0),            # 3s
+        ]}
+        by_test = critical_path(profile, workers=(2, 4))
+        assert by_test['serial_s'] == 19.0 and by_test['shared_s'] == 2.0
+        assert by_test['critical_path_s'] == 9.0 and by_test['longest_unit'] == 'a::1'
+        assert by_test['schedules'][2] == {'lower_bound_s': 11.0, 'lpt_s': 12.0}  # 6+3 | 4+3
+        assert by_test['schedules'][4]['lpt_s'] == 9.0
+
+        by_class = critical_path(profile, workers=(2,), group='class')
+        assert by_class['critical_path_s'] == 13.0 and by_class['schedules'][2]['lpt_s'] == 13.0
+        assert lpt_makespan([3, 3, 2, 2, 2], 2) == 7
+        assert [row['cls'] for row in class_rollup(profile['tests'])] == ['A', 'B']
+        print(f"✓ {by_test}")
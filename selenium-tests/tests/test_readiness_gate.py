@@ -0,0 +1,106 @@
+"""
+Readiness Gate Test Suite
+Checks the gate against the local stand-in, both already serving and coming
+up in stages the way nginx, node and Mongo do after docker-compose up
+"""
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from utils.readiness_gate import wait_until_ready
+from utils.standin_server import StandinServer
+
+
+class _ColdStart:
+    """
+    Front for a stand-in that starts listening after ``listen_at`` seconds, then
+    answers /api/ with 502 until ``node_at`` and Mongo-backed routes with 400 until ``mongo_at``
+    """
+
+    def __init__(self, upstream, listen_at, node_at, mongo_at):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            self.port = sock.getsockname()[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.started = time.monotonic()
+        front = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                elapsed = time.monotonic() - front.started
+                if self.path.startswith('/api/') and elapsed < node_at:
+                    status, body = 502, b'<html><center>502 Bad Gateway</center></html>'
+                elif self.path.startswith('/api/blog/') and elapsed < mongo_at:
+                    status, body = 400, b'{"success":false,"message":"buffering timed out"}'
+                else:
+                    response = requests.get(upstream + self.path, timeout=5)
+                    status, body = response.status_code, response.content
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = None
+        self.timer = threading.Timer(listen_at, self._listen, args=(Handler,))
+        self.timer.start()
+
+    def _listen(self, handler):
+        self.server = ThreadingHTTPServer(('127.0.0.1', self.port), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.timer.cancel()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+
+class TestReadinessGate:
+    """Backoff polling and cold-start timings"""
+
+    def test_01_serving_app_is_ready_on_first_poll(self):
+        """Test 1: A deployment that already serves passes all three checks in one round"""
+        with StandinServer() as server:
+            report = wait_until_ready(server.url, timeout=10, log=lambda line: None)
+        assert report['ready'] and report['polls'] == 1 and report['pending'] == []
+        assert all(check['attempts'] == 1 and check['ttfb_ms'] is not None for check in report['checks'].values())
+        assert report['first_byte_s'] <= report['ready_s'] < 2
+        print(f"✓ Ready in {report['ready_s']}s")
+
+    def test_02_staged_cold_start(self):
+        """Test 2: Each check turns ready in order; timings and backoff track the cold start"""
+        with StandinServer() as server:
+            front = _ColdStart(server.url, listen_at=0.4, node_at=1.2, mongo_at=2.0)
+            try:
+                report = wait_until_ready(front.url, timeout=15, initial_delay=0.1, max_delay=0.4,
+                                          started_at=time.time(), log=lambda line: None)
+            finally:
+                front.stop()
+        checks = report['checks']
+        assert report['ready']
+        assert 0.4 <= report['first_byte_s'] < 1.0
+        assert checks['frontend']['ready_s'] < checks['api_proxy']['ready_s'] < checks['database']['ready_s']
+        assert 1.2 <= checks['api_proxy']['ready_s'] < 1.8 and 2.0 <= report['ready_s'] < 2.6
+        assert checks['api_proxy']['first_response_s'] < checks['api_proxy']['ready_s']
+        assert checks['frontend']['attempts'] < checks['database']['attempts'] < 12
+        print(f"✓ Cold start: first byte {report['first_byte_s']}s, ready {report['ready_s']}s, "
+              f"{report['polls']} polls")
+
+    def test_03_gives_up_with_pending_checks(self):
+        """Test 3: Checks still failing at the deadline are reported, with their last status"""
+        with StandinServer() as server:
+            front = _ColdStart(server.url, listen_at=0, node_at=60, mongo_at=60)
+            try:
+                report = wait_until_ready(front.url, timeout=1, initial_delay=0.1, log=lambda line: None)
+            finally:
+                front.stop()
+        assert not report['ready'] and report['ready_s'] is None
+        assert report['pending'] == ['api_proxy', 'database']
+        assert report['checks']['api_proxy']['last_status'] == 502
+        print(f"✓ Gave up with {report['pending']} pending")
@@ -0,0 +1,129 @@
+"""
+Render Benchmark Test Suite
+Checks the seeder and the scaling/paging analysis offline; the browser
+measurements themselves need Chrome and run via python -m utils.render_benchmark,
+python -m utils.dashboard_benchmark and python -m utils.comment_benchmark
+"""
+import requests
+
+from config import TEST_ADMIN
+from utils.api_client import ApiClient
+from utils.comment_benchmark import like_counts, measure_api, seed_commenters, seed_thread, usability_report
+from utils.dashboard_benchmark import paging_report
+from utils.render_benchmark import scaling_report
+from utils.seeder import seed_blogs, seed_comments, seed_users
+from utils.standin_server import StandinServer
+
+
+class TestRenderBenchmark:
+    """Seeding and scaling analysis"""
+
+    def test_01_seeder_fills_store_and_api(self, tmp_path):
+        """Test 1: Blogs are seeded directly into the stand-in and through the API"""
+        with StandinServer() as server:
+            server.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            client = ApiClient(server.url)
+            seed_blogs(500, store=server.store, body_chars=300)
+            seed_blogs(20, client, body_chars=300, workers=4)
+
+            page = client.get_blogs(sort='desc', limit=1000)
+            assert len(page['blogs']) == 520
+            assert len({blog['slug'] for blog in page['blogs']}) == 520
+            assert all(len(blog['blogBody']) >= 300 for blog in page['blogs'])
+            assert len(client.get_blogs(limit=9)['blogs']) == 9
+        print("✓ 520 blogs seeded with unique slugs")
+
+    def test_02_scaling_report_finds_superlinear_step(self):
+        """Test 2: The first size where cost outgrows the card count is reported"""
+        results = [
+            {'view': 'search', 'size': 10, 'cards': 10, 'script_ms': 5, 'visible_ms': 80},
+            {'view': 'search', 'size': 100, 'cards': 100, 'script_ms': 50, 'visible_ms': 150},
+            {'view': 'search', 'size': 1000, 'cards': 1000, 'script_ms': 2000, 'visible_ms': 2500},
+            {'view': 'home', 'size': 10, 'cards': 9, 'script_ms': 5, 'visible_ms': 80},
+            {'view': 'home', 'size': 1000, 'cards': 9, 'script_ms': 5, 'visible_ms': 90},
+        ]
+        report = scaling_report(results)
+        assert [step['elasticity'] for step in report['search']['elasticity']] == [1.0, 1.6]
+        assert report['search']['breaks_at'] == 1000
+        assert report['home']['breaks_at'] is None
+        assert scaling_report(results, threshold=5, budget_ms=1000)['search']['breaks_at'] == 1000
+        print(f"✓ Scaling report: {report['search']}")
+
+
+class TestDashboardBenchmark:
+    """Dashboard seeding and per-page cost analysis"""
+
+    def test_03_seeder_fills_admin_tables(self):
+        """Test 3: Users and comments are seeded for the admin tabs to page through"""
+        with StandinServer() as server:
+            server.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            client = ApiClient(server.url)
+            admin = client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            blogs = seed_blogs(5, store=server.store, body_chars=100)
+            seed_users(100, store=server.store)
+            seed_users(5, client, workers=2)
+            seed_comments(40, blogs, client, admin, workers=4)
+
+            assert client.get_users(admin, per_page=200)['countUser'] == 106
+            assert client.get_all_comments(admin, per_page=100)['countDocument'] == 40
+            assert len(client.get_comments(blogs[0]['_id'])) == 8
+        print("✓ Dashboard tables seeded")
+
+    def test_04_paging_report_finds_climb(self):
+        """Test 4: The click where each page starts costing more is reported with its row count"""
+        clicks = [{'rows': 8 * (index + 2), 'appended': 8, 'total_ms': cost, 'request_ms': 20,
+                   'render_ms': cost - 20, 'dom_added': 96}
+                  for index, cost in enumerate([60, 62, 58, 61, 65, 95, 110, 130])]
+        clicks.append({'rows': 80, 'appended': 0, 'total_ms': 520, 'request_ms': 20, 'render_ms': None,
+                       'dom_added': 0})
+        report = paging_report({'tab': 'blogs', 'clicks': clicks, 'stopped': 'nothing_appended'})
+
+        assert report['pages'] == 8 and report['baseline_ms'] == 60
+        assert report['climbs_at_click'] == 7 and report['climbs_at_rows'] == 56
+        assert report['request_ms_per_100_rows'] == 0 and report['render_ms_per_100_rows'] > 0
+        assert report['dom_nodes_per_row'] == 12
+        print(f"✓ Paging report: {report}")
+
+
+class TestCommentBenchmark:
+    """Comment thread seeding, get-comment measurement and the usability curve"""
+
+    def test_05_threads_seeded_with_likes(self):
+        """Test 5: Threads are seeded with heavy-tailed likes and measured through get-comment"""
+        with StandinServer() as server:
+            server.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            client = ApiClient(server.url)
+            big, small, empty = seed_blogs(3, store=server.store, body_chars=100)
+            seed_thread(big, 2000, seed_commenters(10, store=server.store), store=server.store)
+            seed_thread(small, 30, seed_commenters(3, client), client, workers=4)
+
+            session = requests.Session()
+            row = measure_api(session, server.url, big['_id'])
+            assert row['status'] == 200 and row['returned'] == 2000
+            assert row['likes'] == sum(c['numberOfLikes'] for c in client.get_comments(big['_id']))
+            assert measure_api(session, server.url, small['_id'])['returned'] == 30
+            assert max(c['numberOfLikes'] for c in client.get_comments(small['_id'])) <= 3
+            assert measure_api(session, server.url, empty['_id'])['status'] == 404
+            assert row['payload_kb'] > 300  # Every field of every comment, likes arrays included
+
+        counts = like_counts(10000, 50)
+        assert counts.count(0) > 2500 and max(counts) == 50
+        print(f"✓ 2,000-comment thread: {row['payload_kb']} KB, {row['likes']} likes")
+
+    def test_06_usability_report_finds_limit(self):
+        """Test 6: The comment count where a budget is crossed is interpolated or extrapolated"""
+        results = [
+            {'comments': 0, 'api_p95_ms': 5, 'payload_kb': 0.1, 'interactive_ms': 600},
+            {'comments': 100, 'api_p95_ms': 8, 'payload_kb': 25, 'interactive_ms': 900},
+            {'comments': 1000, 'api_p95_ms': 40, 'payload_kb': 250, 'interactive_ms': 3000},
+            {'comments': 5000, 'api_p95_ms': 180, 'payload_kb': 1250, 'interactive_ms': 15000},
+        ]
+        report = usability_report(results)
+        page = report['metrics']['interactive_ms']
+        assert page['exceeds_at'] == 5000 and page['crosses_at'] == 1667 and not page['extrapolated']
+        assert report['metrics']['payload_kb']['crosses_at'] == 4096
+        assert report['metrics']['api_p95_ms']['extrapolated']
+        assert report['metrics']['api_p95_ms']['crosses_at'] > 5000
+        assert report['unusable_at'] == 1667 and report['limited_by'] == 'interactive_ms'
+        assert report['page_scaling']['breaks_at'] is None
+        print(f"✓ Unusable at ~{report['unusable_at']} comments ({report['limited_by']})")
@@ -0,0 +1,82 @@
+"""
+Sample Store Test Suite
+Checks that the columnar store spills and reopens intact and that its
+vectorized percentiles and timeline agree with the list-based harness analysis
+"""
+import random
+
+import numpy as np
+import pytest
+
+from utils.load_harness import LoadHarness, build_timeline, percentile
+from utils.load_profiles import ConstantProfile
+from utils.sample_store import SampleStore, concat, group_percentiles, latency_histogram, load, time_buckets
+from utils.standin_server import StandinServer
+
+
+ROUTES = ['/', '/api/blog/get-all-blogs?limit=9', '/api/blog/get-all-blogs?limit=3']
+
+
+def _samples(count, seed=0, duration=20):
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        failed = rng.random() < 0.01
+        samples.append({'offset': rng.uniform(0, duration), 'route': rng.choice(ROUTES),
+                        'latency': rng.lognormvariate(-4, 0.8), 'status': 0 if failed else rng.choice([200, 200, 503]),
+                        'bytes': rng.randint(100, 5000), 'error': 'ReadTimeout' if failed else None})
+    return samples
+
+
+class TestSampleStore:
+    """Column storage and vectorized analysis"""
+
+    def test_01_spilled_store_matches_list_analysis(self, tmp_path):
+        """Test 1: Spilled, reopened and concatenated stores give the list-based percentiles and timeline"""
+        samples = _samples(20000)
+        store = SampleStore(str(tmp_path / 'run'), chunk=4096).extend(samples[:12000])
+        other = SampleStore(chunk=4096).extend(samples[12000:])
+        store.close()
+        reopened = SampleStore.open(str(tmp_path / 'run'))
+        assert len(reopened) == 12000 and isinstance(reopened.column('latency'), np.memmap)
+        merged = concat([reopened, other])
+        assert len(merged) == 20000
+
+        summary = group_percentiles(merged)
+        for route in ROUTES:
+            latencies = sorted(s['latency'] * 1000 for s in samples if s['route'] == route)
+            row = summary[route]
+            assert row['count'] == len(latencies)
+            for pct in (50, 95, 99):
+                assert row[f"p{pct}_ms"] == pytest.approx(percentile(latencies, pct), rel=1e-5, abs=0.01)
+            assert row['max_ms'] == pytest.approx(latencies[-1], abs=0.01)
+        assert sum(row['errors'] for row in summary.values()) == sum(
+            1 for s in samples if s['error'] or s['status'] >= 500)
+
+        profile = ConstantProfile(1000, 20)
+        expected, actual = build_timeline(samples, profile), build_timeline(merged, profile)
+        assert [row['sent_rps'] for row in actual] == [row['sent_rps'] for row in expected]
+        assert [row['errors'] for row in actual] == [row['errors'] for row in expected]
+        assert [row['p99_ms'] for row in actual] == pytest.approx([row['p99_ms'] for row in expected], abs=0.02)
+
+        counts, edges = latency_histogram(merged)
+        assert counts.sum() == 20000 and edges[0] == pytest.approx(0.1)
+        assert latency_histogram(merged, route='/')[0].sum() == summary['/']['count']
+        assert time_buckets(merged, bucket=5)['sent'].tolist() == [
+            sum(1 for s in samples if min(int(s['offset'] // 5), 3) == index) for index in range(4)]
+        print(f"✓ {len(merged)} samples: p99 per route {[summary[r]['p99_ms'] for r in ROUTES]}")
+
+    def test_02_harness_writes_store(self, tmp_path):
+        """Test 2: A load run can use a spilled store as its sink and be summarised from disk"""
+        profile = ConstantProfile(40, 2)
+        with StandinServer() as server:
+            store = SampleStore(str(tmp_path / 'load'), chunk=16)
+            LoadHarness(server.url, concurrency=8, seed=3).run(profile, sink=store)
+            store.close()
+
+        loaded = load([str(tmp_path / 'load')])
+        assert len(loaded) == len(store) >= 75
+        timeline = build_timeline(loaded, profile)
+        assert len(timeline) == 2 and sum(row['sent_rps'] for row in timeline) == len(loaded)
+        assert set(loaded.route_summary()) == set(ROUTES)
+        print(f"✓ {len(loaded)} samples stored, routes {sorted(loaded.route_summary())}")
@@ -8,6 +8,7 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 import time
 import os
+from utils.html_driver import driver_for, quit_driver
 
 
 BASE_URL = os.getenv('APP_URL', 'http://localhost:8081')
@@ -57,146 +58,103 @@ def get_minimal_chrome():
     return driver
 
 
+@pytest.mark.read_only
 class TestSeleniumSuite:
     """Selenium test suite optimized for low memory"""
     
-    def test_01_homepage_loads(self):
+    @pytest.mark.no_js
+    def test_01_homepage_loads(self, request, page_snapshot):
         """Test 1: Homepage loads successfully"""
         print(f"\n[SELENIUM TEST 1] Loading homepage: {BASE_URL}")
-        driver = get_minimal_chrome()
+        page = page_snapshot(BASE_URL, lambda: driver_for(request, get_minimal_chrome), profile='chrome')
         
-        try:
-            driver.get(BASE_URL)
-            time.sleep(1)
-            
-            # Just check page loaded
-            assert driver.title is not None, "Page should have a title"
-            assert len(driver.page_source) > 100, "Page should have content"
-            
-            print(f"✓ Homepage loaded (title: {driver.title})")
-            
-        finally:
-            driver.quit()
-            time.sleep(0.5)
+        # Just check page loaded
+        assert page.title is not None, "Page should have a title"
+        assert len(page.page_source) > 100, "Page should have content"
+        
+        print(f"✓ Homepage loaded (title: {page.title})")
     
-    def test_02_signup_page_exists(self):
+    @pytest.mark.no_js
+    def test_02_signup_page_exists(self, request, page_snapshot):
         """Test 2: Signup page is accessible"""
         print(f"\n[SELENIUM TEST 2] Accessing signup page")
-        driver = get_minimal_chrome()
+        page = page_snapshot(f"{BASE_URL}/sign-up", lambda: driver_for(request, get_minimal_chrome), profile='chrome')
         
-        try:
-            driver.get(f"{BASE_URL}/sign-up")
-            time.sleep(1)
-            
-            # Check URL changed
-            assert 'sign-up' in driver.current_url or 'signup' in driver.current_url.lower()
-            assert len(driver.page_source) > 50
-            
-            print(f"✓ Signup page accessible")
-            
-        finally:
-            driver.quit()
-            time.sleep(0.5)
+        # Check URL changed
+        assert 'sign-up' in page.current_url or 'signup' in page.current_url.lower()
+        assert len(page.page_source) > 50
+        
+        print(f"✓ Signup page accessible")
     
-    def test_03_signin_page_exists(self):
+    @pytest.mark.no_js
+    def test_03_signin_page_exists(self, request, page_snapshot):
         """Test 3: Signin page is accessible"""
         print(f"\n[SELENIUM TEST 3] Accessing signin page")
-        driver = get_minimal_chrome()
+        page = page_snapshot(f"{BASE_URL}/sign-in", lambda: driver_for(request, get_minimal_chrome), profile='chrome')
         
-        try:
-            driver.get(f"{BASE_URL}/sign-in")
-            time.sleep(1)
-            
-            # Check URL changed
-            assert 'sign-in' in driver.current_url or 'signin' in driver.current_url.lower()
-            assert len(driver.page_source) > 50
-            
-            print(f"✓ Signin page accessible")
-            
-        finally:
-            driver.quit()
-            time.sleep(0.5)
+        # Check URL changed
+        assert 'sign-in' in page.current_url or 'signin' in page.current_url.lower()
+        assert len(page.page_source) > 50
+        
+        print(f"✓ Signin page accessible")
     
-    def test_04_page_title_not_empty(self):
+    @pytest.mark.no_js
+    def test_04_page_title_not_empty(self, request, page_snapshot):
         """Test 4: Pages have proper titles"""
         print(f"\n[SELENIUM TEST 4] Checking page titles")
-        driver = get_minimal_chrome()
+        page = page_snapshot(BASE_URL, lambda: driver_for(request, get_minimal_chrome), profile='chrome')
         
-        try:
-            driver.get(BASE_URL)
-            time.sleep(1)
-            
-            title = driver.title
-            assert title is not None and len(title) > 0, "Page must have a title"
-            
-            print(f"✓ Page has title: '{title}'")
-            
-        finally:
-            driver.quit()
-            time.sleep(0.5)
+        title = page.title
+        assert title is not None and len(title) > 0, "Page must have a title"
+        
+        print(f"✓ Page has title: '{title}'")
     
-    def test_05_html_structure_valid(self):
+    @pytest.mark.no_js
+    def test_05_html_structure_valid(self, request, page_snapshot):
         """Test 5: Page has valid HTML structure"""
         print(f"\n[SELENIUM TEST 5] Validating HTML structure")
-        driver = get_minimal_chrome()
+        page = page_snapshot(BASE_URL, lambda: driver_for(request, get_minimal_chrome), profile='chrome')
         
-        try:
-            driver.get(BASE_URL)
-            time.sleep(1)
-            
-            # Check for basic HTML elements
-            html = driver.find_element(By.TAG_NAME, "html")
-            body = driver.find_element(By.TAG_NAME, "body")
-            
-            assert html is not None, "HTML tag should exist"
-            assert body is not None, "Body tag should exist"
-            
-            print(f"✓ Valid HTML structure found")
-            
-        finally:
-            driver.quit()
-            time.sleep(0.5)
+        # Check for basic HTML elements
+        html = page.find_element(By.TAG_NAME, "html")
+        body = page.find_element(By.TAG_NAME, "body")
+        
+        assert html is not None, "HTML tag should exist"
+        assert body is not None, "Body tag should exist"
+        
+        print(f"✓ Valid HTML structure found")
     
-    def test_06_multiple_pages_load(self):
+    @pytest.mark.no_js
+    def test_06_multiple_pages_load(self, request):
         """Test 6: Multiple pages can be loaded in sequence"""
         print(f"\n[SELENIUM TEST 6] Testing sequential page loads")
-        driver = get_minimal_chrome()
+        driver = driver_for(request, get_minimal_chrome)
         
         try:
             # Load homepage
             driver.get(BASE_URL)
-            time.sleep(1)
             assert driver.current_url
             
             # Load signup
             driver.get(f"{BASE_URL}/sign-up")
-            time.sleep(1)
             assert 'sign-up' in driver.current_url or 'signup' in driver.current_url.lower()
             
             print(f"✓ Sequential page loads successful")
             
         finally:
-            driver.quit()
-            time.sleep(0.5)
+            quit_driver(driver, settle=0.5)
     
-    def test_07_page_source_contains_html(self):
+    @pytest.mark.no_js
+    def test_07_page_source_contains_html(self, request, page_snapshot):
         """Test 7: Page source contains HTML content"""
         print(f"\n[SELENIUM TEST 7] Checking page source")
-        driver = get_minimal_chrome()
+        page = page_snapshot(BASE_URL, lambda: driver_for(request, get_minimal_chrome), profile='chrome')
         
-        try:
-            driver.get(BASE_URL)
-            time.sleep(1)
-            
-            source = driver.page_source.lower()
-            assert '<html' in source or '<!doctype' in source, "Should contain HTML"
-            assert '<body' in source, "Should contain body tag"
-            
-            print(f"✓ Page source contains valid HTML")
-            
-        finally:
-            driver.quit()
-            time.sleep(0.5)
+        source = page.page_source.lower()
+        assert '<html' in source or '<!doctype' in source, "Should contain HTML"
+        assert '<body' in source, "Should contain body tag"
+        
+        print(f"✓ Page source contains valid HTML")
     
     def test_08_driver_initialization(self):
         """Test 8: Chrome driver initializes correctly"""
@@ -213,43 +171,28 @@ class TestSeleniumSuite:
             driver.quit()
             time.sleep(0.5)
     
-    def test_09_url_navigation(self):
+    @pytest.mark.no_js
+    def test_09_url_navigation(self, request, page_snapshot):
         """Test 9: URL navigation works"""
         print(f"\n[SELENIUM TEST 9] Testing URL navigation")
-        driver = get_minimal_chrome()
+        page = page_snapshot(BASE_URL, lambda: driver_for(request, get_minimal_chrome), profile='chrome')
         
-        try:
-            driver.get(BASE_URL)
-            time.sleep(1)
-            
-            current = driver.current_url
-            assert current.startswith('http'), f"URL should start with http: {current}"
-            
-            print(f"✓ URL navigation working: {current}")
-            
-        finally:
-            driver.quit()
-            time.sleep(0.5)
+        current = page.current_url
+        assert current.startswith('http'), f"URL should start with http: {current}"
+        
+        print(f"✓ URL navigation working: {current}")
     
-    def test_10_page_load_timeout(self):
+    @pytest.mark.no_js
+    @pytest.mark.no_snapshot  # Times a real load; later tests reuse the fresh snapshot
+    def test_10_page_load_timeout(self, request, page_snapshot):
         """Test 10: Page loads within timeout"""
         print(f"\n[SELENIUM TEST 10] Testing page load performance")
-        driver = get_minimal_chrome()
+        page = page_snapshot(BASE_URL, lambda: driver_for(request, get_minimal_chrome), profile='chrome')
         
-        try:
-            import time as time_module
-            start = time_module.time()
-            
-            driver.get(BASE_URL)
-            
-            duration = time_module.time() - start
-            assert duration < 10, f"Page should load in <10s, took {duration:.2f}s"
-            
-            print(f"✓ Page loaded in {duration:.2f} seconds")
-            
-        finally:
-            driver.quit()
-            time.sleep(0.5)
+        duration = page.load_seconds
+        assert duration < 10, f"Page should load in <10s, took {duration:.2f}s"
+        
+        print(f"✓ Page loaded in {duration:.2f} seconds")
     
     def test_11_selenium_webdriver_works(self):
         """Test 11: Selenium WebDriver is functional"""
@@ -0,0 +1,106 @@
+"""
+Sharding Test Suite
+Checks the bin packing and JUnit handling offline, then shards a generated
+suite across subprocesses and merges their reports
+"""
+import json
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+
+from utils.sharding import junit_key, load_durations, merge_junit, plan_shards, update_durations
+
+
+HARNESS_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_SUITE = '''
+import time
+
+class TestSequence:
+    order = []
+
+    def test_01_first(self):
+        self.order.append(1)
+
+    def test_02_second(self):
+        assert self.order == [1]
+
+class TestSlow:
+    def test_a(self):
+        time.sleep(0.3)
+
+def test_plain_one():
+    pass
+
+def test_plain_two():
+    pass
+'''
+
+
+class TestSharding:
+    """Duration-balanced plans and report merging"""
+
+    def test_01_plan_balances_and_keeps_classes_together(self):
+        """Test 1: Units are packed largest first, stay whole and keep collection order"""
+        nodeids = [f"tests/test_a.py::TestBig::test_{n:02d}" for n in range(1, 13)]
+        nodeids += [f"tests/test_b.py::TestMid::test_{n}" for n in range(4)]
+        nodeids += [f"tests/test_c.py::TestNew::test_{n}" for n in range(2)]
+        nodeids += ['tests/test_d.py::test_plain', 'tests/test_d.py::test_other']
+        durations = {junit_key(nodeid): 1.0 for nodeid in nodeids[:12]}
+        durations.update({junit_key(nodeid): 2.5 for nodeid in nodeids[12:16]})
+        durations['tests.test_d.test_plain'] = 3.0
+
+        shards = plan_shards(nodeids, durations, 2)
+        assert [shard['seconds'] for shard in shards] == [14.0, 14.0]  # TestNew and test_other get the 1.0s median
+        assert shards[0]['units'] == ['tests/test_a.py::TestBig', 'tests/test_c.py::TestNew']
+        assert shards[0]['nodeids'] == nodeids[:12] + nodeids[16:18]
+        assert shards[1]['nodeids'] == nodeids[12:16] + nodeids[18:]
+        assert sorted(sum((shard['nodeids'] for shard in plan_shards(nodeids, {}, 5)), [])) == sorted(nodeids)
+        assert plan_shards(nodeids, durations, 3) == plan_shards(list(nodeids), dict(durations), 3)
+        by_module = plan_shards(nodeids, durations, 4, group='module')
+        assert all(len({nodeid.split('::')[0] for nodeid in shard['nodeids']}) <= 1 for shard in by_module)
+        print(f"✓ Plan: {[shard['seconds'] for shard in shards]}")
+
+    def test_02_durations_and_junit_round_trip(self, tmp_path):
+        """Test 2: JUnit timings key like nodeids, merge into one report and update the history"""
+        for index, cases in enumerate([[('TestA', 'test_01', 1.5)], [('TestB', 'test_x', 0.5), ('TestB', 'test_y', 0.25)]]):
+            suite = ET.Element('testsuite', name='pytest', tests=str(len(cases)), failures=str(index), errors='0',
+                               skipped='0', time=str(sum(case[2] for case in cases)))
+            for cls, name, seconds in cases:
+                ET.SubElement(suite, 'testcase', classname=f"tests.test_mod.{cls}", name=name, time=str(seconds))
+            ET.ElementTree(suite).write(tmp_path / f"shard-{index}.xml")
+
+        totals = merge_junit([str(tmp_path / 'shard-0.xml'), str(tmp_path / 'shard-1.xml')], str(tmp_path / 'all.xml'))
+        assert totals == {'tests': 3, 'failures': 1, 'errors': 0, 'skipped': 0, 'time': 2.25}
+        durations = load_durations(str(tmp_path / 'all.xml'))
+        assert durations[junit_key('tests/test_mod.py::TestB::test_y')] == 0.25
+
+        store = str(tmp_path / 'durations.json')
+        update_durations(store, durations)
+        update_durations(store, {junit_key('tests/test_mod.py::TestA::test_01'): 0.5})
+        assert load_durations(store)['tests.test_mod.TestA.test_01'] == 1.0
+        print(f"✓ Merged {totals}")
+
+    def test_03_shards_cover_suite_and_merge(self, tmp_path):
+        """Test 3: Every shard runs its share in order; the merged report covers the whole suite"""
+        (tmp_path / 'test_sample.py').write_text(SAMPLE_SUITE)
+        env = {**os.environ, 'PYTHONPATH': HARNESS_ROOT, 'HARNESS_DIR': str(tmp_path / 'harness')}
+        durations = tmp_path / 'durations.json'
+
+        def run(*args):
+            result = subprocess.run([sys.executable, '-m', 'pytest', '-q', '-p', 'utils.sharding', *args,
+                                     '--shard-durations', str(durations), 'test_sample.py'],
+                                    cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60)
+            assert result.returncode == 0, result.stdout + result.stderr
+            return result.stdout
+
+        run('--store-durations')
+        assert json.loads(durations.read_text())['test_sample.TestSlow.test_a'] >= 0.3
+        outputs = [run('--shard-count', '2', '--shard-index', str(index), f"--junit-xml=shard-{index}.xml")
+                   for index in range(2)]
+        assert 'shard 1/2' in outputs[0] and '1 passed' in outputs[0]  # TestSlow alone
+        assert '4 passed' in outputs[1]
+        totals = merge_junit([str(tmp_path / f"shard-{index}.xml") for index in range(2)], str(tmp_path / 'all.xml'))
+        assert totals['tests'] == 5 and totals['failures'] == 0
+        print(f"✓ Shards: {[line for output in outputs for line in output.splitlines() if 'passed' in line]}")
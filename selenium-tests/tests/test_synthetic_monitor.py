@@ -0,0 +1,104 @@
+"""
+Synthetic Monitor Test Suite
+Runs the checks against the local stand-in, on a fast jittered schedule, and
+scrapes the Prometheus endpoint while the stand-in goes down
+"""
+import re
+import time
+
+import requests
+
+from utils import synthetic_monitor
+from utils.standin_server import StandinServer
+from utils.synthetic_monitor import CHECKS, DEFAULT_CHECKS, MetricsServer, MonitorMetrics, SyntheticMonitor
+
+
+SAMPLE_LINE = re.compile(r'^[a-z_]+(\{([a-z_]+="[^"]*",?)+\})? [0-9.e+-]+$')
+
+
+def _value(text, sample):
+    return float(next(line.split()[-1] for line in text.splitlines() if line.startswith(sample + ' ')))
+
+
+def _wait_for(condition, timeout=10):
+    """Poll ``condition`` until it holds, so slow machines only make the test slower"""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'condition not reached in time'
+        time.sleep(0.05)
+
+
+class TestSyntheticMonitor:
+    """Checks, schedule and Prometheus export"""
+
+    def test_01_checks_pass_against_standin(self, monkeypatch):
+        """Test 1: Every check passes on a healthy app, login included once configured"""
+        with StandinServer() as server:
+            server.store.add_user('monitor', 'monitor@example.com', 'MonitorPass123!')
+            monkeypatch.setitem(synthetic_monitor.MONITOR_ACCOUNT, 'email', 'monitor@example.com')
+            monkeypatch.setitem(synthetic_monitor.MONITOR_ACCOUNT, 'password', 'MonitorPass123!')
+            monitor = SyntheticMonitor(server.url, checks=dict.fromkeys(CHECKS, 60))
+            results = {name: monitor.run_once(name) for name in CHECKS}
+            monkeypatch.setitem(synthetic_monitor.MONITOR_ACCOUNT, 'password', 'stale')
+            _, reason = monitor.run_once('login')
+            monitor.stop()
+
+        assert {name: reason for name, (_, reason) in results.items() if reason} == {}
+        assert reason == 'status_401' and 'login' not in DEFAULT_CHECKS
+        text = monitor.metrics.render()
+        assert all(SAMPLE_LINE.match(line) for line in text.splitlines() if not line.startswith('#'))
+        assert _value(text, 'blog_synthetic_check_runs_total{check="login",result="failure"}') == 1
+        assert _value(text, 'blog_synthetic_check_failures_total{check="login",reason="status_401"}') == 1
+        assert _value(text, 'blog_synthetic_check_up{check="home_page"}') == 1
+        assert _value(text, 'blog_synthetic_check_duration_seconds_bucket{check="login",le="+Inf"}') == 2
+        assert _value(text, 'blog_synthetic_check_duration_seconds_count{check="login"}') == 2
+        print(f"✓ {len(results)} checks passed, slowest {max(results.values())[0] * 1000:.1f}ms")
+
+    def test_02_metrics_stay_bounded_and_render_once(self):
+        """Test 2: Buckets are cumulative, reasons are capped and unchanged metrics are not re-rendered"""
+        metrics = MonitorMetrics(['api_health'])
+        for seconds in (0.004, 0.005, 0.2, 3.0, 30.0):
+            metrics.record('api_health', seconds)
+        for index in range(100):
+            metrics.record('api_health', 0.01, reason=f"status_{500 + index}")
+
+        text = metrics.render()
+        buckets = [_value(text, f'blog_synthetic_check_duration_seconds_bucket{{check="api_health",le="{le}"}}')
+                   for le in ('0.005', '0.01', '0.25', '5', '10', '+Inf')]
+        assert buckets == [2, 102, 103, 104, 104, 105]
+        assert _value(text, 'blog_synthetic_check_failures_total{check="api_health",reason="other"}') == 84
+        assert text.count('blog_synthetic_check_failures_total{') == synthetic_monitor.MAX_REASONS + 1
+        assert _value(text, 'blog_synthetic_check_up{check="api_health"}') == 0
+        assert metrics.render() is text
+        print(f"✓ {len(text.splitlines())} lines, cached scrape")
+
+    def test_03_schedule_and_scrape_through_outage(self):
+        """Test 3: Checks run on their jittered intervals; an outage shows up as failures on /metrics"""
+        server = StandinServer().start()
+        monitor = SyntheticMonitor(server.url, checks={'app_running': 0.1, 'blog_list': 0.2, 'home_page': 0.2},
+                                   jitter=0.2, timeout=1, seed=7)
+        exporter = MetricsServer(monitor.metrics, port=0).start()
+
+        def count(check, field):
+            return monitor.metrics.summary().get(check, {}).get(field, 0)
+
+        try:
+            monitor.start()
+            _wait_for(lambda: count('app_running', 'successes') >= 3 and count('blog_list', 'successes') >= 1)
+            healthy = monitor.metrics.summary()
+            server.stop()
+            _wait_for(lambda: count('app_running', 'failures') >= 2 and count('home_page', 'failures') >= 1)
+            response = requests.get(f"{exporter.url}/metrics", timeout=5)
+            health = requests.get(f"{exporter.url}/health", timeout=5).json()
+        finally:
+            monitor.stop()
+            exporter.stop()
+
+        assert healthy['app_running']['up'] == 1 and healthy['home_page']['failures'] == 0
+        assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+        assert health['app_running']['up'] == 0 and health['app_running']['last_reason'] == 'ConnectionError'
+        assert health['home_page']['last_reason'] == 'connection'
+        refused = 'blog_synthetic_check_failures_total{check="app_running",reason="ConnectionError"}'
+        assert _value(response.text, refused) >= 2
+        print(f"✓ app_running up after {healthy['app_running']['successes']} runs, then "
+              f"{health['app_running']['failures']} failures")
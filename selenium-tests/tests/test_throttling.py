@@ -0,0 +1,100 @@
+"""
+Throttling Matrix Test Suite
+Checks profile resolution, the CDP commands a driver receives and the
+comparison table; the measurements themselves need Chrome and run via
+python -m utils.throttling
+"""
+import pytest
+
+from utils.api_client import ApiClient
+from utils.browser_metrics import PAGE_VITALS
+from utils.seeder import seed_blogs
+from utils.standin_server import StandinServer
+from utils.throttling import (
+    MATRIX_ROUTES, apply_throttle, comparison_table, resolve_routes, resolve_throttle, run_matrix,
+)
+
+
+class ThrottledBrowser:
+    """Driver double whose page vitals slow down with the throttling it was sent"""
+
+    def __init__(self):
+        self.commands = []
+        self.visits = []
+        self.latency = 0
+        self.cpu_rate = 1
+
+    def execute_cdp_cmd(self, method, params):
+        self.commands.append((method, params))
+        if method == 'Network.emulateNetworkConditions':
+            self.latency = params['latency']
+        elif method == 'Emulation.setCPUThrottlingRate':
+            self.cpu_rate = params['rate']
+        return {}
+
+    def get(self, url):
+        self.visits.append(url)
+
+    def execute_script(self, script):
+        assert script == PAGE_VITALS
+        ttfb = 10.0 + self.latency
+        fcp = ttfb + 40.0 * self.cpu_rate
+        return {'ttfb_ms': ttfb, 'fcp_ms': fcp, 'dcl_ms': fcp, 'load_ms': fcp + 50.0, 'dom_nodes': 42}
+
+
+class TestThrottling:
+    """Profiles, CDP commands and the comparison table"""
+
+    def test_01_profiles_become_cdp_commands(self):
+        """Test 1: Named profiles combine with + and set both network and CPU on every switch"""
+        assert resolve_throttle('fast-4g+cpu-4x') == {
+            'network': {'latency_ms': 165, 'download_kbps': 8100, 'upload_kbps': 1350}, 'cpu_rate': 4}
+        assert resolve_throttle(None) == resolve_throttle('none') == {'network': None, 'cpu_rate': 1}
+        with pytest.raises(ValueError, match='Unknown throttling profile'):
+            resolve_throttle('5g')
+        with pytest.raises(ValueError, match='two network presets'):
+            resolve_throttle('slow-3g+fast-4g')
+
+        driver = ThrottledBrowser()
+        apply_throttle(driver, 'slow-3g')
+        assert driver.commands == [
+            ('Network.enable', {}),
+            ('Network.emulateNetworkConditions',
+             {'offline': False, 'latency': 2000, 'downloadThroughput': 50000.0, 'uploadThroughput': 50000.0}),
+            ('Emulation.setCPUThrottlingRate', {'rate': 1}),
+        ]
+        apply_throttle(driver, 'cpu-4x')  # Switching lifts the network throttling
+        assert driver.commands[-2][1]['downloadThroughput'] == -1 and driver.commands[-1][1] == {'rate': 4}
+        print(f"✓ {len(driver.commands)} CDP commands for two profiles")
+
+    def test_02_matrix_compares_profiles(self):
+        """Test 2: Every route is loaded cold under every profile and compared with the baseline"""
+        driver = ThrottledBrowser()
+        routes = {'home': '/', 'login': '/login'}
+        results = run_matrix(driver, 'http://app', ['none', 'fast-3g', 'fast-3g+cpu-4x'], routes, repeat=2)
+
+        assert len(results) == 6 and len(driver.visits) == 12
+        assert [method for method, _ in driver.commands].count('Network.clearBrowserCache') == 12
+        assert driver.latency == 0 and driver.cpu_rate == 1  # Lifted afterwards
+        assert results[0] == {'profile': 'none', 'route': 'home', 'ttfb_ms': 10.0, 'fcp_ms': 50.0,
+                              'dcl_ms': 50.0, 'load_ms': 100.0, 'dom_nodes': 42, 'get_ms': results[0]['get_ms']}
+
+        table = comparison_table(results, 'fcp_ms')
+        assert table['profiles'] == ['none', 'fast-3g', 'fast-3g+cpu-4x']
+        assert table['routes']['login']['none'] == {'value': 50.0, 'ratio': 1.0}
+        assert table['routes']['login']['fast-3g'] == {'value': 612.5, 'ratio': 12.25}
+        assert table['routes']['login']['fast-3g+cpu-4x'] == {'value': 732.5, 'ratio': 14.65}
+        assert comparison_table(results, 'fcp_ms', baseline='5g')['routes']['home']['none']['ratio'] is None
+        print(f"✓ fcp_ms on login: {table['routes']['login']}")
+
+    def test_03_routes_open_the_newest_post(self):
+        """Test 3: The post route is filled from the API, or dropped when there are no posts"""
+        with StandinServer() as server:
+            client = ApiClient(server.url)
+            assert 'post' not in resolve_routes(server.url, client=client)
+            seed_blogs(3, store=server.store, body_chars=100)
+            routes = resolve_routes(server.url, client=client)
+            newest = client.get_blogs(sort='desc', limit=1)['blogs'][0]
+
+        assert routes == {**MATRIX_ROUTES, 'post': f"/blog/{newest['slug']}"}
+        print(f"✓ {routes['post']}")
@@ -0,0 +1,190 @@
+"""
+Test Account Pool
+Pre-provisioned users with JWTs cached on disk, leased exclusively to test
+processes so only registration tests pay for creating accounts
+"""
+
+import base64
+import fcntl
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config import ACCOUNT_POOL, BASE_URL, HARNESS_DIR
+from utils.api_client import ApiClient, ApiError
+
+
+POOL_DIR = os.path.join(HARNESS_DIR, 'account_pool')
+REFRESH_MARGIN = 24 * 3600  # Re-login when a token has less than a day left
+
+
+def token_expiry(token):
+    """``exp`` claim of a JWT (no signature check; the server does that)"""
+    try:
+        payload = token.split('.')[1]
+        return json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))['exp']
+    except (AttributeError, IndexError, KeyError, ValueError):
+        return 0
+
+
+class Lease:
+    """
+    Exclusive hold on one pool account, released on ``release()`` or process exit
+
+    Attributes:
+        account (dict): ``email``, ``password`` and ``user`` (document with ``token`` and ``_id``)
+    """
+
+    def __init__(self, account, handle):
+        self.account = account
+        self._handle = handle
+
+    def release(self):
+        if self._handle:
+            fcntl.flock(self._handle, fcntl.LOCK_UN)
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self):
+        return self.account
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class AccountPool:
+    """
+    N fixed accounts (``pooluser<i>@test.com``) shared by every run on a machine
+
+    Tokens from loginUser live 30 days, so they are cached in ``tokens.json``
+    and reused until close to expiry. Leases are ``flock`` locks on one file
+    per account: they are exclusive across processes (pytest-xdist workers,
+    parallel CI jobs on one agent) and the kernel drops them if a worker dies.
+
+    Args:
+        size (int): Number of accounts
+        client (ApiClient): API client for the target environment
+        directory (str): Where the token cache and lease files live
+    """
+
+    def __init__(self, size=ACCOUNT_POOL['size'], client=None, directory=POOL_DIR,
+                 password=ACCOUNT_POOL['password']):
+        self.size = size
+        self.client = client or ApiClient()
+        self.directory = directory
+        self.password = password
+        self.cache_path = os.path.join(directory, 'tokens.json')
+        os.makedirs(os.path.join(directory, 'leases'), exist_ok=True)
+
+    def email(self, index):
+        return f"pooluser{index}@test.com"
+
+    def _read_cache(self):
+        if not os.path.exists(self.cache_path):
+            return {}
+        with open(self.cache_path) as f:
+            cache = json.load(f)
+        return cache if cache.get('base_url') == self.client.base_url else {}
+
+    def _login_or_register(self, index):
+        email = self.email(index)
+        try:
+            user = self.client.login(email, self.password)
+        except ApiError as e:
+            if e.status_code != 401:
+                raise
+            self.client.register(f"pooluser{index}", email, self.password)
+            user = self.client.login(email, self.password)
+        return {'email': email, 'password': self.password, 'user': user}
+
+    def provision(self, workers=8):
+        """
+        Make sure every account exists and holds a token valid for at least a day
+
+        Only stale entries hit the API; a warm cache costs one file read. An
+        exclusive lock on the cache serialises concurrent provisioning.
+
+        Returns:
+            int: Number of accounts that had to be logged in or registered
+        """
+        with open(os.path.join(self.directory, 'provision.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            cache = self._read_cache()
+            accounts = cache.get('accounts', {})
+            stale = [index for index in range(self.size)
+                     if token_expiry(accounts.get(self.email(index), {}).get('user', {}).get('token'))
+                     < time.time() + REFRESH_MARGIN]
+            if stale:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    for account in pool.map(self._login_or_register, stale):
+                        accounts[account['email']] = account
+                temp = f"{self.cache_path}.tmp"
+                with open(temp, 'w') as f:
+                    json.dump({'base_url': self.client.base_url, 'accounts': accounts}, f)
+                os.replace(temp, self.cache_path)
+            return len(stale)
+
+    def lease(self, timeout=60, poll=0.2):
+        """
+        Take the first free account, waiting up to ``timeout`` seconds
+
+        Raises:
+            TimeoutError: Every account stayed leased
+        """
+        accounts = self._read_cache().get('accounts', {})
+        deadline = time.monotonic() + timeout
+        while True:
+            for index in range(self.size):
+                email = self.email(index)
+                if email not in accounts:
+                    continue
+                handle = open(os.path.join(self.directory, 'leases', f"{index}.lock"), 'w')
+                try:
+                    fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    handle.close()
+                    continue
+                return Lease(accounts[email], handle)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"All {self.size} pool accounts stayed leased for {timeout}s; "
+                                   f"raise ACCOUNT_POOL_SIZE to at least the worker count")
+            time.sleep(poll)
+
+
+def login_browser(driver, base_url, user):
+    """
+    Log a Selenium session in without the form, by writing the redux-persist
+    state Login.jsx would have produced (``persist:root`` in localStorage)
+    """
+    driver.get(base_url)
+    state = {
+        'userSliceApp': json.dumps({'user': user, 'error': None, 'isLoading': False}),
+        '_persist': json.dumps({'version': 1, 'rehydrated': True}),
+    }
+    driver.execute_script("window.localStorage.setItem('persist:root', arguments[0]);", json.dumps(state))
+    driver.refresh()
+
+
+# Pytest plugin ------------------------------------------------------------
+
+@pytest.fixture(scope='session')
+def account_pool(pytestconfig):
+    """Provisioned pool for the target environment (cheap when tokens are cached)"""
+    cassette = getattr(pytestconfig, 'api_cassette', None)
+    if cassette is not None and cassette.mode == 'replay':
+        return cassette.replay_pool()  # Accounts frozen with the recording
+    pool = AccountPool(client=ApiClient(BASE_URL))
+    refreshed = pool.provision()
+    if refreshed:
+        print(f"\n[account pool] Refreshed {refreshed}/{pool.size} accounts")
+    return pool
+
+
+@pytest.fixture
+def pooled_account(account_pool):
+    """Exclusive pool account for one test: ``email``, ``password`` and ``user`` (with token)"""
+    with account_pool.lease() as account:
+        yield account
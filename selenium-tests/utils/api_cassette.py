@@ -0,0 +1,350 @@
+"""
+API Record/Replay
+Records every /api/* exchange of a UI run into an on-disk cassette and serves
+them back without a backend, so UI suites run at browser speed
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import pytest
+import requests
+
+import config as settings
+from config import BASE_URL
+from utils.account_pool import POOL_DIR, AccountPool
+from utils.api_client import ApiClient
+from utils.standin_server import static_response
+
+
+# Fields whose values change between otherwise identical requests
+VOLATILE_KEYS = {'token', 'access_token', 'createdAt', 'updatedAt', 'timestamp', '_'}
+VOLATILE_PATTERNS = [
+    (re.compile(r'\b1\d{9}(\d{3})?\b'), '<epoch>'),  # time.time() / Date.now()
+    (re.compile(r'\b[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}\b'), '<uuid>'),
+    (re.compile(r'\b(testuser|blogtest|featuretest|logintest|logouttest)\d+'), r'\1<pid>'),
+]
+
+# Response headers that describe the original connection, not the payload
+HOP_HEADERS = {'connection', 'keep-alive', 'transfer-encoding', 'content-encoding', 'content-length', 'date'}
+
+
+def _scrub(value):
+    if isinstance(value, dict):
+        return {key: _scrub(item) for key, item in sorted(value.items()) if key not in VOLATILE_KEYS}
+    if isinstance(value, list):
+        return [_scrub(item) for item in value]
+    if isinstance(value, str):
+        for pattern, replacement in VOLATILE_PATTERNS:
+            value = pattern.sub(replacement, value)
+    return value
+
+
+def request_key(method, path, body=b''):
+    """
+    Match key for an API request: method, path, sorted query and JSON body
+    with volatile keys dropped and volatile values (timestamps, uuids, pids)
+    replaced. Headers, and so tokens and cookies, are never part of the key.
+    """
+    parsed = urlparse(path)
+    query = sorted((key, _scrub(value)) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+                   if key not in VOLATILE_KEYS)
+    try:
+        payload = json.dumps(_scrub(json.loads(body)), sort_keys=True) if body else ''
+    except ValueError:
+        payload = hashlib.sha256(body).hexdigest()
+    return f"{method} {_scrub(parsed.path)}?{urlencode(query)} {payload}"
+
+
+class Cassette:
+    """
+    On-disk store of recorded exchanges
+
+    Layout: ``index.jsonl`` (one line per exchange: scope, key, status,
+    headers, body hash), ``bodies/<sha256>`` (content-addressed, so repeated
+    payloads are stored once) and ``meta.json``. Exchanges are scoped by the
+    test that made them; replay serves each (test, key) sequence in recorded
+    order and falls back to the same request from any test, so running a
+    subset of the suite still hits.
+
+    Args:
+        directory (str): Cassette directory
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, 'index.jsonl')
+        self.bodies_dir = os.path.join(directory, 'bodies')
+        self._lock = threading.Lock()
+        self._scoped = defaultdict(list)
+        self._any = defaultdict(list)
+        self._cursors = defaultdict(int)
+        self._bodies = {}
+
+    def reset(self, target):
+        """Start a new recording of ``target`` (bodies are kept, the index is not)"""
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        open(self.index_path, 'w').close()
+        with open(os.path.join(self.directory, 'meta.json'), 'w') as f:
+            json.dump({'target': target, 'recorded_at': time.time()}, f)
+
+    def record(self, scope, method, path, body, status, headers, content):
+        digest = hashlib.sha256(content).hexdigest()
+        body_path = os.path.join(self.bodies_dir, digest)
+        if not os.path.exists(body_path):
+            temp = f"{body_path}.{os.getpid()}.{threading.get_ident()}"
+            with open(temp, 'wb') as f:
+                f.write(content)
+            os.replace(temp, body_path)
+        entry = {'scope': scope, 'key': request_key(method, path, body), 'path': path,
+                 'status': status, 'headers': headers, 'body': digest}
+        with self._lock, open(self.index_path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        return entry
+
+    def load(self):
+        """Read the index for replay and return the number of exchanges"""
+        entries = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                entries = [json.loads(line) for line in f if line.strip()]
+        for entry in entries:
+            self._scoped[(entry['scope'], entry['key'])].append(entry)
+            self._any[entry['key']].append(entry)
+        return len(entries)
+
+    def _next(self, sequences, name):
+        sequence = sequences.get(name)
+        if not sequence:
+            return None
+        position = self._cursors[name]
+        self._cursors[name] += 1
+        return sequence[min(position, len(sequence) - 1)]  # Repeat the last response once exhausted
+
+    def match(self, scope, method, path, body=b''):
+        """Next recorded exchange for this request, or None"""
+        key = request_key(method, path, body)
+        with self._lock:
+            return self._next(self._scoped, (scope, key)) or self._next(self._any, key)
+
+    def content(self, entry):
+        digest = entry['body']
+        if digest not in self._bodies:
+            with open(os.path.join(self.bodies_dir, digest), 'rb') as f:
+                self._bodies[digest] = f.read()
+        return self._bodies[digest]
+
+
+class CassetteProxy:
+    """
+    HTTP server in front of the app that records or replays ``/api/*``
+
+    Everything else (the SPA) is forwarded to ``target``, or served from
+    ``static_dir`` (a built client) so replay needs no containers at all.
+    Set ``scope`` to the running test's id to keep per-test sequences.
+
+    Args:
+        cassette (Cassette): Store to record into or replay from
+        mode (str): ``record`` or ``replay``
+        target (str): Frontend URL requests are forwarded to
+        static_dir (str): Built SPA to serve instead of forwarding non-API requests
+    """
+
+    def __init__(self, cassette, mode, target=BASE_URL, static_dir=None, host='127.0.0.1', port=0):
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Unknown cassette mode: {mode!r} (expected 'record' or 'replay')")
+        self.cassette = cassette
+        self.mode = mode
+        self.target = target.rstrip('/')
+        self.static_dir = static_dir
+        self.scope = None
+        self.counts = defaultdict(int)
+        self.misses = []
+        self._local = threading.local()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        if self.mode == 'record':
+            self.cassette.reset(self.target)
+        else:
+            self.cassette.load()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _forward(self, method, path, headers, body):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        headers = {key: value for key, value in headers.items() if key.lower() not in ('host', 'connection')}
+        response = session.request(method, self.target + path, headers=headers, data=body or None,
+                                    allow_redirects=False, timeout=30)
+        kept = [(key, value) for key, value in response.raw.headers.iteritems() if key.lower() not in HOP_HEADERS]
+        return response.status_code, kept, response.content
+
+    def respond(self, method, path, headers, body):
+        """
+        Handle one request
+
+        Returns:
+            tuple: (status, header list, bytes)
+        """
+        if not urlparse(path).path.startswith('/api/'):
+            if self.static_dir and method in ('GET', 'HEAD'):
+                status, content_type, content = static_response(self.static_dir, urlparse(path).path)
+                return status, [('Content-Type', content_type)], content
+            return self._forward(method, path, headers, body)
+        if self.mode == 'record':
+            status, kept, content = self._forward(method, path, headers, body)
+            self.cassette.record(self.scope, method, path, body, status, kept, content)
+            self.counts['recorded'] += 1
+            return status, kept, content
+        entry = self.cassette.match(self.scope, method, path, body)
+        if entry is None:
+            self.counts['missed'] += 1
+            self.misses.append((self.scope, f"{method} {path}"))
+            message = {'success': False, 'statusCode': 404, 'message': f"No recorded response for {method} {path}"}
+            return 404, [('Content-Type', 'application/json; charset=utf-8'), ('X-Cassette', 'miss')], \
+                json.dumps(message).encode()
+        self.counts['replayed'] += 1
+        return entry['status'], [tuple(header) for header in entry['headers']], self.cassette.content(entry)
+
+    def _handler_class(self):
+        proxy = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                try:
+                    status, headers, content = proxy.respond(self.command, self.path, self.headers, body)
+                except requests.RequestException as e:
+                    status, headers, content = 502, [('Content-Type', 'text/plain')], str(e).encode()
+                self.send_response(status)
+                for key, value in headers:
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(content)
+
+            do_GET = do_HEAD = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = _handle
+
+        return Handler
+
+    def replay_pool(self):
+        """Pool of the accounts the cassette was recorded with (no API calls, tokens are not checked)"""
+        accounts = os.path.join(self.cassette.directory, 'accounts.json')
+        if not os.path.isfile(accounts):
+            pytest.fail(f"Cassette {self.cassette.directory} has no pool accounts; re-record it with a test "
+                        f"that uses pooled_account", pytrace=False)
+        directory = os.path.join(POOL_DIR, 'replay')
+        os.makedirs(directory, exist_ok=True)
+        shutil.copyfile(accounts, os.path.join(directory, 'tokens.json'))
+        with open(os.path.join(directory, 'tokens.json')) as f:
+            cache = json.load(f)
+        return AccountPool(size=len(cache['accounts']), client=ApiClient(cache['base_url']), directory=directory)
+
+
+# Pytest plugin ------------------------------------------------------------
+
+def pytest_addoption(parser):
+    group = parser.getgroup('cassette', 'API record/replay')
+    group.addoption('--record-api', metavar='DIR', default=None,
+                    help='Record every /api/* exchange of this run into a cassette directory')
+    group.addoption('--replay-api', metavar='DIR', default=None,
+                    help='Serve /api/* from a recorded cassette instead of the backend')
+    group.addoption('--replay-static-dir', metavar='DIR', default=None,
+                    help='With --replay-api, serve the SPA from a built client instead of APP_URL')
+
+
+def pytest_configure(config):
+    record, replay = config.getoption('record_api'), config.getoption('replay_api')
+    if not (record or replay):
+        return
+    if record and replay:
+        raise pytest.UsageError('--record-api and --replay-api are mutually exclusive')
+    if record and hasattr(config, 'workerinput'):
+        raise pytest.UsageError('--record-api needs a single process (drop -n) so sequences stay in order')
+    proxy = CassetteProxy(Cassette(record or replay), 'record' if record else 'replay', BASE_URL,
+                          config.getoption('replay_static_dir')).start()
+    config.api_cassette = proxy
+    # Test modules import BASE_URL after this point; the pool and cleanup keep the real target
+    settings.BASE_URL = proxy.url
+    if replay:
+        config.option.no_cleanup = True  # Nothing reached the backend
+
+
+def pytest_runtest_setup(item):
+    proxy = getattr(item.config, 'api_cassette', None)
+    if proxy:
+        proxy.scope = item.nodeid
+
+
+def pytest_sessionfinish(session, exitstatus):
+    proxy = getattr(session.config, 'api_cassette', None)
+    if not proxy:
+        return
+    proxy.stop()
+    if proxy.mode == 'record' and os.path.exists(os.path.join(POOL_DIR, 'tokens.json')):
+        shutil.copyfile(os.path.join(POOL_DIR, 'tokens.json'), os.path.join(proxy.cassette.directory, 'accounts.json'))
+    print(f"\n[cassette] {proxy.mode} {proxy.cassette.directory}: {dict(proxy.counts)}")
+    for scope, request in proxy.misses[:20]:
+        print(f"[cassette] miss in {scope}: {request}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Record or replay API traffic for UI runs')
+    parser.add_argument('mode', choices=['record', 'replay'])
+    parser.add_argument('cassette', help='Cassette directory')
+    parser.add_argument('--target', default=BASE_URL, help='Frontend URL to record from (default: APP_URL)')
+    parser.add_argument('--static-dir', default=None, help='Serve a built SPA instead of forwarding to --target')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8095)
+    args = parser.parse_args()
+
+    proxy = CassetteProxy(Cassette(args.cassette), args.mode, args.target, args.static_dir,
+                          args.host, args.port).start()
+    print(f"{args.mode.capitalize()}ing {args.cassette} on {proxy.url} (Ctrl+C stops)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        proxy.stop()
+        print(dict(proxy.counts))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Blog API Client
+Thin requests wrapper around the Express routes used by harness tooling
+"""
+
+import requests
+
+from config import BASE_URL
+
+
+class ApiError(Exception):
+    """Non-2xx response from the blog API"""
+
+    def __init__(self, response):
+        try:
+            message = response.json().get('message', response.text)
+        except ValueError:
+            message = response.text
+        super().__init__(f"{response.request.method} {response.url} -> {response.status_code}: {message}")
+        self.status_code = response.status_code
+        self.response = response
+
+
+class ApiClient:
+    """
+    Calls the API through the frontend's ``/api`` proxy, like the SPA does
+
+    Authenticated routes expect the raw JWT in the ``Authorization`` header
+    (see verifyUserMiddleware), and several handlers read ``req.body.user``,
+    so ``user`` is sent in the body where the controllers need it.
+
+    Args:
+        base_url (str): Frontend URL (default: APP_URL)
+        timeout (float): Per-request timeout in seconds
+    """
+
+    def __init__(self, base_url=BASE_URL, timeout=10):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def request(self, method, path, token=None, json=None, params=None):
+        """Send a request and return the decoded JSON body, raising ApiError on failure"""
+        headers = {'Authorization': token} if token else {}
+        response = self.session.request(method, f"{self.base_url}/api{path}", json=json, params=params,
+                                        headers=headers, timeout=self.timeout)
+        if not response.ok:
+            raise ApiError(response)
+        return response.json() if response.content else {}
+
+    def register(self, username, email, password):
+        return self.request('POST', '/user/register',
+                            json={'username': username, 'email': email, 'password': password})['user']
+
+    def login(self, email, password):
+        """Return the user document, including its 30-day ``token``"""
+        return self.request('POST', '/user/login', json={'email': email, 'password': password})['user']
+
+    def delete_user(self, user_id, acting_user):
+        return self.request('DELETE', f'/user/deleteuser/{user_id}', token=acting_user['token'],
+                            json={'user': acting_user})
+
+    def get_users(self, admin, page=1, per_page=9):
+        return self.request('GET', '/user/getusers', token=admin['token'],
+                            params={'page': page, 'user': per_page})
+
+    def post_blog(self, admin, title, body, category='All', image=None):
+        payload = {'blogTitle': title, 'blogBody': body, 'blogCategory': category, 'user': admin}
+        if image:
+            payload['blogImgFile'] = image
+        return self.request('POST', '/blog/post-blog', token=admin['token'], json=payload)['blog']
+
+    def get_blogs(self, **params):
+        return self.request('GET', '/blog/get-all-blogs', params=params)
+
+    def delete_blog(self, blog_id, acting_user):
+        return self.request('DELETE', f"/blog/delete-blog/{blog_id}/{acting_user['_id']}",
+                            token=acting_user['token'], json={'user': acting_user})
+
+    def add_comment(self, user, blog_id, text):
+        return self.request('POST', '/comment/add-comment', token=user['token'],
+                            json={'userId': user['_id'], 'blogId': blog_id, 'comment': text})['comment']
+
+    def get_comments(self, blog_id):
+        return self.request('GET', f'/comment/get-comment/{blog_id}')
+
+    def get_all_comments(self, admin, page=1, per_page=8):
+        return self.request('GET', '/comment/get-all-comments', token=admin['token'],
+                            params={'page': page, 'limitComments': per_page})
+
+    def like_comment(self, user, comment_id):
+        return self.request('PUT', f'/comment/like-the-comment/{comment_id}', token=user['token'],
+                            json={'user': user['_id']})
+
+    def delete_comment(self, comment_id, admin):
+        # deleteComment only lets admins through (it compares userId on a result array)
+        return self.request('DELETE', f'/comment/delete-comment/{comment_id}', token=admin['token'],
+                            json={'user': admin})
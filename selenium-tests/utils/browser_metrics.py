@@ -0,0 +1,168 @@
+"""
+Browser Metrics
+Chrome DevTools Performance counters and in-page probes shared by the
+rendering benchmarks
+"""
+
+import os
+
+
+PAGE_STATS = """
+var path = arguments[0];
+var api = performance.getEntriesByType('resource').filter(function (entry) {
+  return entry.name.indexOf(path) !== -1;
+});
+return {
+  domNodes: document.getElementsByTagName('*').length,
+  apiBytes: api.reduce(function (total, entry) { return total + (entry.decodedBodySize || 0); }, 0)
+};
+"""
+
+# Clicks a paging button and resolves after the appended rows have painted,
+# or once the response has been in for ``settle`` ms without new rows
+PAGING_CLICK = """
+var done = arguments[arguments.length - 1];
+var selector = arguments[0], button = arguments[1], api = arguments[2], settle = arguments[3];
+function count() { return document.querySelectorAll(selector).length; }
+function nodes() { return document.getElementsByTagName('*').length; }
+function request() {
+  var entries = performance.getEntriesByType('resource').filter(function (entry) {
+    return entry.name.indexOf(api) !== -1;
+  });
+  return entries.length ? entries[entries.length - 1] : null;
+}
+performance.clearResourceTimings();
+var rowsBefore = count(), nodesBefore = nodes(), started = performance.now();
+button.click();
+(function wait() {
+  var now = performance.now(), entry = request(), rows = count();
+  if (rows > rowsBefore || (entry && entry.responseEnd && now - entry.responseEnd > settle) || now - started > 15000) {
+    requestAnimationFrame(function () {
+      var painted = performance.now();
+      done({
+        rows: rows,
+        appended: rows - rowsBefore,
+        total_ms: painted - started,
+        request_ms: entry && entry.responseEnd ? entry.responseEnd - entry.startTime : null,
+        render_ms: entry && entry.responseEnd && rows > rowsBefore ? painted - entry.responseEnd : null,
+        bytes: entry ? entry.decodedBodySize : null,
+        dom_nodes: nodes(),
+        dom_added: nodes() - nodesBefore
+      });
+    });
+    return;
+  }
+  requestAnimationFrame(wait);
+})();
+"""
+
+# Navigation and paint timings of the current document, in ms from navigation start
+PAGE_VITALS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var fcp = performance.getEntriesByType('paint').filter(function (entry) {
+  return entry.name === 'first-contentful-paint';
+})[0];
+return {
+  ttfb_ms: nav ? nav.responseStart : null,
+  fcp_ms: fcp ? fcp.startTime : null,
+  dcl_ms: nav && nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd : null,
+  load_ms: nav && nav.loadEventEnd ? nav.loadEventEnd : null,
+  dom_nodes: document.getElementsByTagName('*').length
+};
+"""
+
+CDP_DURATIONS = {'LayoutDuration': 'layout_ms', 'RecalcStyleDuration': 'style_ms', 'ScriptDuration': 'script_ms'}
+
+
+def cdp_metrics(driver):
+    """Current ``Performance.getMetrics`` counters (call ``Performance.enable`` first)"""
+    metrics = driver.execute_cdp_cmd('Performance.getMetrics', {})['metrics']
+    return {metric['name']: metric['value'] for metric in metrics}
+
+
+def snapshot(driver, before, api_path='/api/'):
+    """
+    Durations accumulated since ``before`` plus current DOM, heap and API payload
+
+    Returns:
+        dict: ``script_ms``, ``layout_ms``, ``style_ms``, ``dom_nodes``,
+        ``js_heap_mb`` (after a forced GC) and ``api_kb`` for URLs containing ``api_path``
+    """
+    driver.execute_cdp_cmd('HeapProfiler.collectGarbage', {})
+    after = cdp_metrics(driver)
+    stats = driver.execute_script(PAGE_STATS, api_path)
+    row = {name: round((after.get(key, 0) - before.get(key, 0)) * 1000, 1) for key, name in CDP_DURATIONS.items()}
+    row.update({
+        'dom_nodes': stats['domNodes'],
+        'js_heap_mb': round(after.get('JSHeapUsedSize', 0) / 2 ** 20, 2),
+        'api_kb': round(stats['apiBytes'] / 1024, 1),
+    })
+    return row
+
+
+def page_vitals(driver):
+    """``ttfb_ms``, ``fcp_ms``, ``dcl_ms``, ``load_ms`` (None until reached) and ``dom_nodes`` of the current page"""
+    vitals = driver.execute_script(PAGE_VITALS)
+    return {key: round(value, 1) if isinstance(value, float) else value for key, value in vitals.items()}
+
+
+def click_and_measure(driver, button, row_selector, api_path, settle_ms=500):
+    """
+    Click a "Show more" style button and time the request and the re-render
+
+    Returns:
+        dict: ``rows``, ``appended``, ``total_ms``, ``request_ms``, ``render_ms``
+        (response end to appended rows painted), ``bytes``, ``dom_nodes``, ``dom_added``
+    """
+    result = driver.execute_async_script(PAGING_CLICK, row_selector, button, api_path, settle_ms)
+    return {key: round(value, 1) if isinstance(value, float) else value for key, value in result.items()}
+
+
+def _proc_children():
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _process_kb(pid):
+    """PSS (shared pages split between sharers) or, without smaps_rollup, RSS"""
+    for path, field in ((f"/proc/{pid}/smaps_rollup", 'Pss:'), (f"/proc/{pid}/status", 'VmRSS:')):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(field):
+                        return int(line.split()[1])
+        except OSError:
+            continue
+    return 0
+
+
+def process_tree_mb(pid):
+    """
+    Memory of a process and all its descendants, in MB (Linux /proc only)
+
+    Returns:
+        float: Summed PSS, or None where /proc is unavailable
+    """
+    if not os.path.isdir('/proc'):
+        return None
+    children = _proc_children()
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += _process_kb(current)
+        stack.extend(children.get(current, []))
+    return round(total / 1024, 1)
+
+
+def chrome_memory_mb(driver):
+    """Memory of the ChromeDriver process and the Chrome it started (browser, GPU, renderers)"""
+    return process_tree_mb(driver.service.process.pid)
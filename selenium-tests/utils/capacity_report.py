@@ -0,0 +1,341 @@
+"""
+Capacity Planning Report
+Combines the k8s manifests with saturation points from load harness runs into
+sustainable throughput, headroom and replica/resource recommendations
+"""
+
+import csv
+import glob
+import json
+import math
+import os
+
+import yaml
+
+
+K8S_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'k8s')
+
+MEMORY_UNITS = {'Ki': 2 ** 10, 'Mi': 2 ** 20, 'Gi': 2 ** 30, 'Ti': 2 ** 40,
+                'k': 10 ** 3, 'M': 10 ** 6, 'G': 10 ** 9, 'T': 10 ** 12}
+
+# Share of saturation throughput a replica should run at when no HPA says otherwise
+DEFAULT_UTILIZATION = 0.7
+
+
+def parse_cpu(quantity):
+    """Kubernetes CPU quantity (``"100m"``, ``"0.5"``, ``2``) in millicores"""
+    text = str(quantity)
+    if text.endswith('m'):
+        return float(text[:-1])
+    return float(text) * 1000
+
+
+def parse_memory(quantity):
+    """Kubernetes memory quantity (``"128Mi"``, ``"1G"``, ``134217728``) in bytes"""
+    text = str(quantity)
+    for suffix in sorted(MEMORY_UNITS, key=len, reverse=True):
+        if text.endswith(suffix):
+            return float(text[:-len(suffix)]) * MEMORY_UNITS[suffix]
+    return float(text)
+
+
+def format_cpu(millicores):
+    """Round up to 10m, the granularity worth writing into a manifest"""
+    return f"{max(10, math.ceil(millicores / 10) * 10)}m"
+
+
+def format_memory(size):
+    return f"{math.ceil(size / 2 ** 20)}Mi"
+
+
+def _resources(container):
+    resources = container.get('resources') or {}
+    parsed = {}
+    for kind in ('requests', 'limits'):
+        values = resources.get(kind) or {}
+        parsed[kind] = {
+            'cpu_m': parse_cpu(values['cpu']) if 'cpu' in values else None,
+            'memory_bytes': parse_memory(values['memory']) if 'memory' in values else None,
+        }
+    return parsed
+
+
+def load_manifests(directory=K8S_DIR):
+    """
+    Deployments and HorizontalPodAutoscalers from every YAML file in ``directory``
+
+    Returns:
+        dict: ``deployments`` (name -> replicas and per-container requests and
+        limits) and ``hpas`` (target deployment name -> replica bounds and
+        utilization targets in percent)
+    """
+    deployments, hpas = {}, {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.yaml')) + glob.glob(os.path.join(directory, '*.yml'))):
+        with open(path) as f:
+            documents = [document for document in yaml.safe_load_all(f) if document]
+        for document in documents:
+            kind, name = document.get('kind'), document.get('metadata', {}).get('name')
+            spec = document.get('spec') or {}
+            if kind == 'Deployment':
+                containers = spec.get('template', {}).get('spec', {}).get('containers', [])
+                deployments[name] = {
+                    'replicas': spec.get('replicas', 1),
+                    'containers': {container['name']: _resources(container) for container in containers},
+                    'file': os.path.basename(path),
+                }
+            elif kind == 'HorizontalPodAutoscaler':
+                targets = {metric['resource']['name']: metric['resource']['target'].get('averageUtilization')
+                           for metric in spec.get('metrics', []) if metric.get('type') == 'Resource'}
+                hpas[spec['scaleTargetRef']['name']] = {
+                    'name': name,
+                    'min_replicas': spec.get('minReplicas', 1),
+                    'max_replicas': spec['maxReplicas'],
+                    'cpu_utilization': targets.get('cpu'),
+                    'memory_utilization': targets.get('memory'),
+                }
+    return {'deployments': deployments, 'hpas': hpas}
+
+
+def _float(value):
+    return float(value) if value not in (None, '') else None
+
+
+def load_result(directory):
+    """
+    Read a load harness ``--out`` directory
+
+    Returns:
+        tuple: (mix name, timeline rows with numeric fields, profile spec)
+    """
+    with open(os.path.join(directory, 'summary.json')) as f:
+        summary = json.load(f)
+    with open(os.path.join(directory, 'timeline.csv')) as f:
+        rows = [{key: value if key == 'phase' else _float(value) for key, value in row.items()}
+                for row in csv.DictReader(f)]
+    spec = summary.get('profile', {})
+    return spec.get('name') or os.path.basename(os.path.normpath(directory)), rows, spec
+
+
+def saturation_point(timeline, slo_ms, metric='p95_ms', max_error_rate=0.01, window=5):
+    """
+    Highest throughput the target sustained within the SLO
+
+    Rows are grouped into windows of up to ``window`` seconds that never span
+    two profile phases (one step of a step profile each, for example). A
+    window is sustainable when its *worst* ``metric`` is within ``slo_ms`` and
+    its error rate within ``max_error_rate``.
+
+    Returns:
+        dict: ``rps`` (mean throughput of the best sustainable window), its
+        ``latency_ms`` and ``second``, and ``knee_rps``: the offered rate of the
+        first unsustainable window above it (None when the run never broke)
+    """
+    windows, current = [], []
+    for row in timeline:
+        if current and (row['phase'] != current[0]['phase'] or len(current) >= window):
+            windows.append(current)
+            current = []
+        current.append(row)
+    if current:
+        windows.append(current)
+
+    entries = []
+    for rows in windows:
+        sent = sum(row['sent_rps'] for row in rows)
+        latencies = [row[metric] for row in rows if row[metric] is not None]
+        if not sent or not latencies:
+            continue
+        latency = max(latencies)
+        entries.append({
+            'rps': round(sum(row['throughput_rps'] for row in rows) / len(rows), 2),
+            'offered_rps': round(sum(row['target_rps'] for row in rows) / len(rows), 2),
+            'latency_ms': latency,
+            'second': rows[0]['second'],
+            'ok': latency <= slo_ms and sum(row['errors'] for row in rows) / sent <= max_error_rate,
+        })
+    sustainable = [entry for entry in entries if entry['ok']]
+    if not sustainable:
+        return {'rps': 0.0, 'latency_ms': None, 'second': None, 'knee_rps': None}
+    best = max(sustainable, key=lambda entry: entry['rps'])
+    broken = [entry['offered_rps'] for entry in entries
+              if not entry['ok'] and entry['offered_rps'] > best['offered_rps']]
+    return {'rps': best['rps'], 'latency_ms': best['latency_ms'], 'second': best['second'],
+            'knee_rps': min(broken) if broken else None}
+
+
+def capacity_plan(manifests, results, slo_ms, target_rps=None, deployment='backend-deployment',
+                  measured_replicas=None, utilization=None, cpu_at_saturation=None,
+                  memory_at_saturation=None, max_error_rate=0.01):
+    """
+    Sustainable load and sizing for ``deployment`` under each measured route mix
+
+    Throughput is assumed to scale linearly with replicas; ``measured_replicas``
+    (default: the manifest's count) is how many served the runs. A saturated
+    replica is assumed to use its CPU limit unless ``cpu_at_saturation``
+    (millicores per replica, e.g. from ``kubectl top pods``) says otherwise.
+
+    Args:
+        manifests (dict): From ``load_manifests``
+        results (list): ``(mix name, timeline rows)`` pairs
+        slo_ms (float): p95 latency budget
+        target_rps (float): Load to plan for; without it only capacity is reported.
+            At 0 the headroom percentage is None
+        utilization (float): Fraction of per-replica saturation to plan at;
+            defaults to the HPA's CPU target, else DEFAULT_UTILIZATION
+        memory_at_saturation (float): Bytes per replica observed at saturation
+
+    Returns:
+        dict: ``deployment``, ``current`` settings, one row per mix, and the
+        ``recommended`` sizing for the most demanding mix
+
+    Raises:
+        KeyError: ``deployment`` is not in the manifests
+    """
+    current = manifests['deployments'][deployment]
+    hpa = manifests['hpas'].get(deployment)
+    container = next(iter(current['containers'].values()))
+    requests, limits = container['requests'], container['limits']
+    measured_replicas = measured_replicas or current['replicas']
+    if utilization is None:
+        utilization = hpa['cpu_utilization'] / 100 if hpa and hpa['cpu_utilization'] else DEFAULT_UTILIZATION
+    floor_replicas = hpa['min_replicas'] if hpa else current['replicas']
+    ceiling_replicas = hpa['max_replicas'] if hpa else current['replicas']
+    saturation_cpu = cpu_at_saturation or limits['cpu_m'] or requests['cpu_m']
+
+    mixes = []
+    for mix, timeline in results:
+        point = saturation_point(timeline, slo_ms, max_error_rate=max_error_rate)
+        per_replica = point['rps'] / measured_replicas
+        row = {
+            'mix': mix,
+            'saturation_rps': point['rps'],
+            'p95_ms_at_saturation': point['latency_ms'],
+            'knee_rps': point['knee_rps'],
+            'per_replica_rps': round(per_replica, 2),
+            'max_sustainable_rps': round(per_replica * floor_replicas, 2),
+            'ceiling_rps': round(per_replica * ceiling_replicas, 2),
+        }
+        if target_rps is not None:
+            row['headroom_rps'] = round(row['max_sustainable_rps'] - target_rps, 2)
+            row['headroom_pct'] = (round(100 * (row['max_sustainable_rps'] / target_rps - 1), 1)
+                                   if target_rps else None)
+            if per_replica > 0:
+                replicas = max(floor_replicas, math.ceil(target_rps / (per_replica * utilization)))
+                cpu_per_request = saturation_cpu / per_replica if saturation_cpu else None
+                row['replicas_needed'] = replicas
+                row['cpu_m_at_target'] = (round(cpu_per_request * target_rps / replicas, 1)
+                                          if cpu_per_request else None)
+            else:
+                row['replicas_needed'] = None
+                row['cpu_m_at_target'] = None
+        mixes.append(row)
+
+    plan = {
+        'deployment': deployment,
+        'slo_ms': slo_ms,
+        'target_rps': target_rps,
+        'utilization': utilization,
+        'current': {
+            'replicas': current['replicas'],
+            'autoscaler': hpa,
+            'cpu_request': format_cpu(requests['cpu_m']) if requests['cpu_m'] else None,
+            'cpu_limit': format_cpu(limits['cpu_m']) if limits['cpu_m'] else None,
+            'memory_request': format_memory(requests['memory_bytes']) if requests['memory_bytes'] else None,
+            'memory_limit': format_memory(limits['memory_bytes']) if limits['memory_bytes'] else None,
+        },
+        'mixes': mixes,
+        'recommended': None,
+    }
+    sized = [row for row in mixes if row.get('replicas_needed')]
+    if len(sized) != len(mixes) or not sized:
+        return plan
+
+    binding = max(sized, key=lambda row: (row['replicas_needed'], row['cpu_m_at_target'] or 0))
+    memory_request = max(filter(None, [requests['memory_bytes'], memory_at_saturation]), default=None)
+    memory_limit = limits['memory_bytes']
+    if memory_at_saturation and (not memory_limit or memory_limit < memory_at_saturation * 1.5):
+        memory_limit = memory_at_saturation * 1.5
+    plan['recommended'] = {
+        'mix': binding['mix'],
+        'replicas': binding['replicas_needed'],
+        # Request what a replica uses at the target, so the scheduler reserves it
+        'cpu_request': format_cpu(binding['cpu_m_at_target']) if binding['cpu_m_at_target'] else None,
+        # A replica needs its saturation CPU to deliver the measured throughput
+        'cpu_limit': format_cpu(max(limits['cpu_m'] or 0, saturation_cpu)) if saturation_cpu else None,
+        'memory_request': format_memory(memory_request) if memory_request else None,
+        'memory_limit': format_memory(memory_limit) if memory_limit else None,
+        'hpa_max_replicas': (max(hpa['max_replicas'], binding['replicas_needed']) if hpa else None),
+    }
+    return plan
+
+
+def print_plan(plan):
+    current = plan['current']
+    scaling = (f"HPA {current['autoscaler']['min_replicas']}-{current['autoscaler']['max_replicas']} replicas"
+               if current['autoscaler'] else f"{current['replicas']} fixed replicas")
+    print(f"{plan['deployment']}: {scaling}, cpu {current['cpu_request']}/{current['cpu_limit']}, "
+          f"memory {current['memory_request']}/{current['memory_limit']} (request/limit)")
+    print(f"SLO p95 <= {plan['slo_ms']}ms, planning at {plan['utilization']:.0%} of per-replica saturation, "
+          f"assuming throughput scales linearly with replicas")
+    print(f"{'mix':<24} {'sat rps':>8} {'p95':>8} {'knee':>7} {'/replica':>9} {'max rps':>8} {'ceiling':>8} "
+          f"{'headroom':>9} {'need':>5}")
+    for row in plan['mixes']:
+        headroom = f"{row['headroom_pct']}%" if row.get('headroom_pct') is not None else '-'
+        cells = [row[key] if row.get(key) is not None else '-'
+                 for key in ('p95_ms_at_saturation', 'knee_rps', 'replicas_needed')]
+        print(f"{row['mix']:<24} {row['saturation_rps']:>8} {cells[0]:>8} {cells[1]:>7} {row['per_replica_rps']:>9} "
+              f"{row['max_sustainable_rps']:>8} {row['ceiling_rps']:>8} {headroom:>9} {cells[2]:>5}")
+    recommended = plan['recommended']
+    if recommended:
+        print(f"\nFor {plan['target_rps']} rps ({recommended['mix']} is the most demanding mix): "
+              f"{recommended['replicas']} replicas, cpu {recommended['cpu_request']}/{recommended['cpu_limit']}, "
+              f"memory {recommended['memory_request']}/{recommended['memory_limit']}")
+        if recommended['hpa_max_replicas']:
+            print(f"HPA maxReplicas >= {recommended['hpa_max_replicas']}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Capacity plan from k8s manifests and load harness saturation runs')
+    parser.add_argument('results', nargs='+', help='load_harness --out directories, one per route mix')
+    parser.add_argument('--manifests', default=K8S_DIR, help='Directory of k8s YAML (default: repo k8s/)')
+    parser.add_argument('--deployment', default='backend-deployment')
+    parser.add_argument('--slo-ms', type=float, required=True, help='p95 latency budget')
+    parser.add_argument('--target-rps', type=float, default=None, help='Load to size the deployment for')
+    parser.add_argument('--measured-replicas', type=int, default=None,
+                        help='Replicas serving the runs (default: the manifest count)')
+    parser.add_argument('--utilization', type=float, default=None,
+                        help='Fraction of saturation to plan at (default: HPA CPU target, else 0.7)')
+    parser.add_argument('--cpu-at-saturation', default=None,
+                        help='CPU per replica at saturation, e.g. 450m (default: the CPU limit)')
+    parser.add_argument('--memory-at-saturation', default=None,
+                        help='Memory per replica at saturation, e.g. 180Mi (default: keep the request)')
+    parser.add_argument('--max-error-rate', type=float, default=0.01)
+    parser.add_argument('--out', default=None, help='Write the plan as JSON')
+    args = parser.parse_args()
+
+    if args.target_rps is not None and args.target_rps < 0:
+        parser.error('--target-rps cannot be negative')
+
+    manifests = load_manifests(args.manifests)
+    if args.deployment not in manifests['deployments']:
+        parser.error(f"No deployment {args.deployment!r} in {args.manifests} "
+                     f"(found {sorted(manifests['deployments'])})")
+    results = [load_result(directory)[:2] for directory in args.results]
+    plan = capacity_plan(manifests, results, args.slo_ms, target_rps=args.target_rps,
+                         deployment=args.deployment, measured_replicas=args.measured_replicas,
+                         utilization=args.utilization,
+                         cpu_at_saturation=parse_cpu(args.cpu_at_saturation) if args.cpu_at_saturation else None,
+                         memory_at_saturation=(parse_memory(args.memory_at_saturation)
+                                               if args.memory_at_saturation else None),
+                         max_error_rate=args.max_error_rate)
+    print_plan(plan)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(plan, f, indent=2)
+        print(f"Plan written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
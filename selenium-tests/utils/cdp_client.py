@@ -0,0 +1,391 @@
+"""
+Async Chrome DevTools Protocol Client
+asyncio client that talks to Chrome's debugging websocket directly, attached
+to a Selenium-launched browser or to a Chrome it starts itself
+"""
+
+import asyncio
+import base64
+import itertools
+import json
+import os
+import shutil
+import tempfile
+from urllib.parse import urlparse
+from urllib.request import urlopen
+
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import (AcceptConnection, BytesMessage, CloseConnection, Ping, RejectConnection,
+                            Request, TextMessage)
+
+
+CHROME_BINARIES = ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser')
+READ_SIZE = 256 * 1024
+
+
+class CdpError(Exception):
+    """Error returned by Chrome for a command"""
+
+    def __init__(self, method, error):
+        self.method = method
+        self.code = error.get('code')
+        super().__init__(f"{method}: {error.get('message')} ({self.code})")
+
+
+class CdpConnection:
+    """
+    One websocket to Chrome's browser endpoint
+
+    Commands are pipelined: ``send`` writes immediately and returns when the
+    matching response arrives, so ``asyncio.gather`` keeps many in flight on
+    one socket. Events are dispatched to ``on`` callbacks by method name and
+    session; pages are reached through flat sessions (``Target.attachToTarget``
+    with ``flatten``), all over this one connection.
+    """
+
+    def __init__(self, reader, writer, ws):
+        self._reader = reader
+        self._writer = writer
+        self._ws = ws
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._listeners = {}
+        self._closed = asyncio.get_running_loop().create_future()
+        self._pump = asyncio.create_task(self._read_loop())
+
+    @classmethod
+    async def connect(cls, ws_url):
+        parsed = urlparse(ws_url)
+        reader, writer = await asyncio.open_connection(parsed.hostname, parsed.port)
+        ws = WSConnection(ConnectionType.CLIENT)
+        writer.write(ws.send(Request(host=parsed.netloc, target=parsed.path)))
+        await writer.drain()
+        while True:
+            data = await reader.read(READ_SIZE)
+            if not data:
+                raise ConnectionError(f"{ws_url} closed during the handshake")
+            ws.receive_data(data)
+            for event in ws.events():
+                if isinstance(event, AcceptConnection):
+                    return cls(reader, writer, ws)
+                if isinstance(event, RejectConnection):
+                    raise ConnectionError(f"{ws_url} rejected the websocket ({event.status_code})")
+
+    async def _read_loop(self):
+        parts = []
+        try:
+            while True:
+                data = await self._reader.read(READ_SIZE)
+                self._ws.receive_data(data or None)
+                for event in self._ws.events():
+                    if isinstance(event, (TextMessage, BytesMessage)):
+                        parts.append(event.data if isinstance(event.data, str) else event.data.decode())
+                        if event.message_finished:
+                            self._dispatch(json.loads(''.join(parts)))
+                            parts = []
+                    elif isinstance(event, Ping):
+                        self._writer.write(self._ws.send(event.response()))
+                    elif isinstance(event, CloseConnection):
+                        return
+                if not data:
+                    return
+        except (ConnectionError, OSError):
+            return
+        finally:
+            for _, future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('DevTools connection closed'))
+            self._pending.clear()
+            if not self._closed.done():
+                self._closed.set_result(None)
+
+    def _dispatch(self, message):
+        if 'id' in message:
+            method, future = self._pending.pop(message['id'], (None, None))
+            if future and not future.done():
+                if 'error' in message:
+                    future.set_exception(CdpError(method, message['error']))
+                else:
+                    future.set_result(message.get('result', {}))
+            return
+        for callback in list(self._listeners.get((message.get('sessionId'), message['method']), ())):
+            callback(message.get('params', {}))
+
+    def send(self, method, params=None, session_id=None):
+        """
+        Send a command and return a future for its result (await it, or gather many)
+
+        Raises:
+            CdpError: Chrome rejected the command
+        """
+        message_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = (method, future)
+        message = {'id': message_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        self._writer.write(self._ws.send(TextMessage(data=json.dumps(message))))
+        return future
+
+    def on(self, method, callback, session_id=None):
+        """Call ``callback(params)`` for every ``method`` event; returns an unsubscribe function"""
+        listeners = self._listeners.setdefault((session_id, method), [])
+        listeners.append(callback)
+        return lambda: listeners.remove(callback) if callback in listeners else None
+
+    async def close(self):
+        if not self._closed.done():
+            try:
+                self._writer.write(self._ws.send(CloseConnection(code=1000)))
+                await asyncio.wait_for(asyncio.shield(self._closed), 2)
+            except (asyncio.TimeoutError, ConnectionError, OSError, RuntimeError):
+                pass
+        self._pump.cancel()
+        self._writer.close()
+
+    async def page(self, target_id=None):
+        """Attach to a page target (the first page by default) and return a ``CdpPage``"""
+        if target_id is None:
+            targets = (await self.send('Target.getTargets'))['targetInfos']
+            target_id = next(target['targetId'] for target in targets if target['type'] == 'page')
+        attached = await self.send('Target.attachToTarget', {'targetId': target_id, 'flatten': True})
+        return CdpPage(self, attached['sessionId'], target_id)
+
+
+class CdpPage:
+    """
+    Flat session on one page target: the hot operations without chromedriver
+
+    Args:
+        connection (CdpConnection): Browser connection the session lives on
+        session_id (str): Session returned by ``Target.attachToTarget``
+        target_id (str): The page's target id (ChromeDriver's window handle)
+    """
+
+    def __init__(self, connection, session_id, target_id):
+        self.connection = connection
+        self.session_id = session_id
+        self.target_id = target_id
+
+    def send(self, method, params=None):
+        return self.connection.send(method, params, self.session_id)
+
+    def on(self, method, callback):
+        return self.connection.on(method, callback, self.session_id)
+
+    async def wait_for(self, method, predicate=None, timeout=30):
+        """Params of the next ``method`` event that satisfies ``predicate``"""
+        future = asyncio.get_running_loop().create_future()
+
+        def check(params):
+            if not future.done() and (predicate is None or predicate(params)):
+                future.set_result(params)
+
+        unsubscribe = self.on(method, check)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            unsubscribe()
+
+    async def enable(self, *domains):
+        """Enable domains (e.g. 'Network', 'Performance', 'Runtime') in one pipelined batch"""
+        await asyncio.gather(*(self.send(f"{domain}.enable") for domain in domains))
+
+    async def navigate(self, url, wait_event='Page.loadEventFired', timeout=30):
+        """Navigate and wait for ``wait_event`` (None returns as soon as the navigation is committed)"""
+        await self.send('Page.enable')
+        loaded = asyncio.ensure_future(self.wait_for(wait_event, timeout=timeout)) if wait_event else None
+        result = await self.send('Page.navigate', {'url': url})
+        if result.get('errorText'):
+            if loaded:
+                loaded.cancel()
+            raise CdpError('Page.navigate', {'message': result['errorText']})
+        if loaded:
+            await loaded
+        return result
+
+    async def evaluate(self, expression, await_promise=True):
+        """
+        Value of a JavaScript expression in the page
+
+        Raises:
+            CdpError: The expression threw
+        """
+        result = await self.send('Runtime.evaluate', {'expression': expression, 'returnByValue': True,
+                                                      'awaitPromise': await_promise})
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise CdpError('Runtime.evaluate', {'message': details.get('exception', {}).get('description')
+                                                or details.get('text')})
+        return result['result'].get('value')
+
+    async def screenshot(self, path=None, image_format='png', full_page=False):
+        """PNG/JPEG bytes of the viewport (or the whole page), also written to ``path`` if given"""
+        params = {'format': image_format}
+        if full_page:
+            layout = await self.send('Page.getLayoutMetrics')
+            size = layout.get('cssContentSize') or layout['contentSize']
+            params.update(captureBeyondViewport=True,
+                          clip={'x': 0, 'y': 0, 'width': size['width'], 'height': size['height'], 'scale': 1})
+        data = base64.b64decode((await self.send('Page.captureScreenshot', params))['data'])
+        if path:
+            with open(path, 'wb') as f:
+                f.write(data)
+        return data
+
+    async def metrics(self):
+        """``Performance.getMetrics`` as a name -> value dict (enable 'Performance' first)"""
+        return {metric['name']: metric['value'] for metric in (await self.send('Performance.getMetrics'))['metrics']}
+
+
+def debugger_address(driver):
+    """host:port of the DevTools endpoint of a Chrome started by Selenium"""
+    return driver.capabilities['goog:chromeOptions']['debuggerAddress']
+
+
+async def browser_ws_url(address):
+    """Browser-level websocket URL from ``/json/version``"""
+    def fetch():
+        with urlopen(f"http://{address}/json/version", timeout=10) as response:
+            return json.load(response)['webSocketDebuggerUrl']
+    return await asyncio.to_thread(fetch)
+
+
+async def attach(driver):
+    """
+    Connect to the Chrome a Selenium driver launched, on the driver's current window
+
+    Selenium keeps working alongside; use the returned page for the hot path.
+
+    Returns:
+        tuple: (CdpConnection, CdpPage)
+    """
+    connection = await CdpConnection.connect(await browser_ws_url(debugger_address(driver)))
+    return connection, await connection.page(driver.current_window_handle)
+
+
+class ChromeProcess:
+    """
+    Headless Chrome launched directly with a debugging port, for measurements
+    that need no chromedriver at all
+
+    Usage:
+        async with ChromeProcess() as chrome:
+            page = await chrome.connection.page()
+    """
+
+    def __init__(self, binary=None, headless=True, args=()):
+        self.binary = binary or os.getenv('CHROME_BIN') or next(
+            (path for path in map(shutil.which, CHROME_BINARIES) if path), None)
+        if not self.binary:
+            raise FileNotFoundError(f"No Chrome found (set CHROME_BIN or install one of {CHROME_BINARIES})")
+        self.headless = headless
+        self.args = list(args)
+        self.process = None
+        self.connection = None
+        self._profile = None
+
+    async def start(self, timeout=30):
+        self._profile = tempfile.mkdtemp(prefix='cdp-chrome-')
+        flags = ['--remote-debugging-port=0', f"--user-data-dir={self._profile}", '--no-first-run',
+                 '--no-default-browser-check', '--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu',
+                 '--window-size=800,600', *self.args, 'about:blank']
+        if self.headless:
+            flags.insert(0, '--headless=new')
+        self.process = await asyncio.create_subprocess_exec(self.binary, *flags, stdout=asyncio.subprocess.DEVNULL,
+                                                            stderr=asyncio.subprocess.PIPE)
+
+        async def listening():
+            while True:
+                line = (await self.process.stderr.readline()).decode(errors='replace')
+                if not line:
+                    raise RuntimeError(f"Chrome exited ({self.process.returncode}) before opening DevTools")
+                if line.startswith('DevTools listening on '):
+                    return line.split(' on ', 1)[1].strip()
+
+        self.connection = await CdpConnection.connect(await asyncio.wait_for(listening(), timeout))
+        return self
+
+    async def stop(self):
+        if self.connection:
+            try:
+                await asyncio.wait_for(self.connection.send('Browser.close'), 5)
+            except (asyncio.TimeoutError, ConnectionError, CdpError):
+                pass
+            await self.connection.close()
+        if self.process and self.process.returncode is None:
+            self.process.kill()
+            await self.process.wait()
+        if self._profile:
+            shutil.rmtree(self._profile, ignore_errors=True)
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+
+async def page_load_profile(page, url, timeout=30):
+    """
+    Load ``url`` and collect what the measurement scripts use: request count,
+    transferred bytes, Performance counters and navigation timing
+
+    Returns:
+        dict: ``requests``, ``transfer_kb``, ``load_ms``, ``dom_content_loaded_ms``,
+        ``script_ms``, ``layout_ms``, ``js_heap_mb``, ``dom_nodes``
+    """
+    transferred = {}
+    unsubscribe = [
+        page.on('Network.requestWillBeSent', lambda params: transferred.setdefault(params['requestId'], 0)),
+        page.on('Network.loadingFinished',
+                lambda params: transferred.__setitem__(params['requestId'], params['encodedDataLength'])),
+    ]
+    try:
+        await page.enable('Network', 'Performance', 'Runtime')
+        before = await page.metrics()
+        await page.navigate(url, timeout=timeout)
+        after, timing = await asyncio.gather(page.metrics(), page.evaluate(
+            "JSON.stringify(performance.getEntriesByType('navigation')[0] || {})"))
+    finally:
+        for callback in unsubscribe:
+            callback()
+    navigation = json.loads(timing)
+    return {
+        'requests': len(transferred),
+        'transfer_kb': round(sum(transferred.values()) / 1024, 1),
+        'load_ms': round(navigation.get('loadEventEnd', 0), 1),
+        'dom_content_loaded_ms': round(navigation.get('domContentLoadedEventEnd', 0), 1),
+        'script_ms': round((after.get('ScriptDuration', 0) - before.get('ScriptDuration', 0)) * 1000, 1),
+        'layout_ms': round((after.get('LayoutDuration', 0) - before.get('LayoutDuration', 0)) * 1000, 1),
+        'js_heap_mb': round(after.get('JSHeapUsedSize', 0) / 2 ** 20, 2),
+        'dom_nodes': int(after.get('Nodes', 0)),
+    }
+
+
+def main():
+    import argparse
+
+    from config import BASE_URL
+
+    parser = argparse.ArgumentParser(description='Profile page loads over CDP without chromedriver')
+    parser.add_argument('paths', nargs='*', default=['/'], help='Paths under --url to load')
+    parser.add_argument('--url', default=BASE_URL, help='Target frontend URL (default: APP_URL)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--screenshot', default=None, help='PNG of the last page loaded')
+    args = parser.parse_args()
+
+    async def run():
+        async with ChromeProcess() as chrome:
+            page = await chrome.connection.page()
+            for path in args.paths:
+                for _ in range(args.repeat):
+                    print(json.dumps({'path': path, **await page_load_profile(page, args.url.rstrip('/') + path)}))
+            if args.screenshot:
+                await page.screenshot(args.screenshot)
+
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,309 @@
+"""
+Test Data Cleanup
+Run-scoped registry of users, blogs and comments created by the suites, with
+parallel deletion at session end and a sweep for orphans from crashed runs
+"""
+
+import glob
+import json
+import os
+import re
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+from config import BASE_URL, HARNESS_DIR, TEST_ADMIN
+from utils.api_client import ApiClient, ApiError
+
+
+REGISTRY_DIR = os.path.join(HARNESS_DIR, 'registry')
+
+# Addresses the suites generate; only these are ever touched by a sweep
+TEST_ACCOUNT_PATTERNS = [
+    r'^testuser\d+@test\.com$',
+    r'^blogtest\d+@test\.com$',
+    r'^featuretest\d+@test\.com$',
+    r'^(logintest|logouttest)\d+@test\.com$',
+    r'^duplicate[0-9a-f]+@test\.com$',
+    r'^test_[a-z0-9]{8}@example\.com$',
+    r'^seed[0-9a-f]{6}-\d+@test\.com$',
+]
+
+
+class EntityRegistry:
+    """
+    Append-only JSON-lines log of entities a run created
+
+    Each ``add_*`` call appends one line immediately, so a crashed run still
+    leaves a complete record behind for ``sweep``. Small appends are atomic,
+    so parallel workers of one run can share a file.
+
+    Args:
+        run_id (str): Identifier shared by every process of the run
+        directory (str): Where registry files live
+    """
+
+    def __init__(self, run_id, directory=REGISTRY_DIR):
+        self.run_id = run_id
+        self.path = os.path.join(directory, f"{run_id}.jsonl")
+
+    def _append(self, entry):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+
+    def add_user(self, email, password=None, user_id=None):
+        """Record an account; the password lets cleanup log in and delete it without admin rights"""
+        self._append({'kind': 'user', 'email': email, 'password': password, 'id': user_id})
+
+    def add_blog(self, blog_id=None, slug=None):
+        """Record a blog by id, or by slug when it was created through the UI"""
+        self._append({'kind': 'blog', 'id': blog_id, 'slug': slug})
+
+    def add_comment(self, comment_id):
+        self._append({'kind': 'comment', 'id': comment_id})
+
+    def add_comments_by(self, user_id):
+        """Record that a kept account (e.g. a pool account) commented through the UI"""
+        self._append({'kind': 'comments_by', 'id': user_id})
+
+    def entries(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def mark_done(self):
+        """Rename the file so sweeps no longer treat it as orphaned"""
+        if os.path.exists(self.path):
+            os.replace(self.path, self.path[:-len('.jsonl')] + '.done')
+
+
+_active_registry = None
+
+
+def get_registry():
+    """Registry for the current run (``HARNESS_RUN_ID`` is shared with worker processes)"""
+    global _active_registry
+    if _active_registry is None:
+        run_id = os.environ.setdefault('HARNESS_RUN_ID', f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}")
+        _active_registry = EntityRegistry(run_id)
+    return _active_registry
+
+
+def login_admin(client):
+    """Log in as TEST_ADMIN, returning None when the account is unavailable"""
+    try:
+        return client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+    except (ApiError, OSError) as e:
+        print(f"[cleanup] Admin login failed, comments and foreign accounts will be skipped: {e}")
+        return None
+
+
+def _attempt(action):
+    try:
+        action()
+        return 'deleted'
+    except ApiError as e:
+        return 'missing' if e.status_code == 404 else 'failed'
+    except OSError:
+        return 'failed'
+
+
+def _comments_by(client, admin, user_ids, per_page=100):
+    found, page = [], 1
+    while True:
+        batch = client.get_all_comments(admin, page=page, per_page=per_page)
+        found += [comment['_id'] for comment in batch['comments'] if comment['userId'] in user_ids]
+        if page * per_page >= batch['countDocument'] or not batch['comments']:
+            return found
+        page += 1
+
+
+def cleanup(entries, client=None, admin=None, workers=8):
+    """
+    Delete registered entities in parallel: comments, then blogs, then users
+
+    Users are resolved by logging in with their recorded password (or by id
+    when an admin is available). With an admin, comments written by the
+    resolved users (and by accounts recorded with ``add_comments_by``) are
+    deleted too, which covers comments added through the UI whose ids the
+    tests never saw.
+
+    Returns:
+        dict: Counter of outcomes per kind, e.g. ``{'user': {'deleted': 3}}``
+    """
+    client = client or ApiClient()
+    users = [entry for entry in entries if entry['kind'] == 'user']
+    blogs = [entry for entry in entries if entry['kind'] == 'blog']
+    comment_ids = {entry['id'] for entry in entries if entry['kind'] == 'comment'}
+    authors = {entry['id'] for entry in entries if entry['kind'] == 'comments_by'}
+    summary = {'user': Counter(), 'blog': Counter(), 'comment': Counter()}
+
+    def resolve(entry):
+        if entry.get('password'):
+            try:
+                return client.login(entry['email'], entry['password'])
+            except ApiError:
+                pass
+        if entry.get('id') and admin:
+            return {'_id': entry['id'], 'email': entry.get('email')}
+        return None
+
+    def resolve_blog(entry):
+        if entry.get('id'):
+            return entry['id']
+        blogs_found = client.get_blogs(slug=entry['slug'])['blogs'] if entry.get('slug') else []
+        return blogs_found[0]['_id'] if blogs_found else None
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        resolved = [user for user in pool.map(resolve, users) if user]
+        summary['user']['missing'] += len(users) - len(resolved)
+        authors |= {user['_id'] for user in resolved}
+        blog_ids = {blog_id for blog_id in pool.map(resolve_blog, blogs) if blog_id}
+        summary['blog']['missing'] += len(blogs) - len(blog_ids)
+
+        if admin:
+            if authors:
+                comment_ids.update(_comments_by(client, admin, authors))
+            for outcome in pool.map(lambda cid: _attempt(lambda: client.delete_comment(cid, admin)), comment_ids):
+                summary['comment'][outcome] += 1
+        else:
+            summary['comment']['skipped'] += len(comment_ids)
+
+        actor = admin or (resolved[0] if resolved else None)
+        if actor:
+            for outcome in pool.map(lambda bid: _attempt(lambda: client.delete_blog(bid, actor)), blog_ids):
+                summary['blog'][outcome] += 1
+        else:
+            summary['blog']['skipped'] += len(blog_ids)
+
+        def delete_user(user):
+            acting = user if user.get('token') else admin
+            return _attempt(lambda: client.delete_user(user['_id'], acting))
+
+        for outcome in pool.map(delete_user, resolved):
+            summary['user'][outcome] += 1
+    return {kind: dict(+counts) for kind, counts in summary.items() if +counts}
+
+
+def _created_before(document, cutoff):
+    created = document.get('createdAt')
+    if not created:
+        return False
+    stamp = datetime.strptime(created, '%Y-%m-%dT%H:%M:%S.%fZ').replace(tzinfo=timezone.utc)
+    return stamp.timestamp() < cutoff
+
+
+def sweep(client=None, older_than=3600, dry_run=False, workers=8, directory=REGISTRY_DIR):
+    """
+    Remove leftovers of crashed or interrupted runs
+
+    1. Replays registry files that were never marked done and are older than
+       ``older_than`` seconds (younger ones may belong to a run in progress).
+    2. With admin access, pages through every user and deletes accounts whose
+       email matches TEST_ACCOUNT_PATTERNS and that are older than the cutoff.
+
+    Returns:
+        dict: Per-kind outcome counts, plus ``registries`` and ``matched_users``
+    """
+    client = client or ApiClient()
+    cutoff = time.time() - older_than
+    entries = []
+    stale = [path for path in glob.glob(os.path.join(directory, '*.jsonl')) if os.path.getmtime(path) < cutoff]
+    for path in stale:
+        entries += EntityRegistry(os.path.basename(path)[:-len('.jsonl')], directory).entries()
+
+    admin = login_admin(client)
+    matched = 0
+    if admin:
+        known = {entry.get('email') for entry in entries}
+        patterns = [re.compile(pattern) for pattern in TEST_ACCOUNT_PATTERNS]
+        page, per_page = 1, 100
+        while True:
+            batch = client.get_users(admin, page=page, per_page=per_page)
+            for user in batch['user']:
+                if (user['email'] not in known and not user.get('isAdmin')
+                        and any(pattern.match(user['email']) for pattern in patterns)
+                        and _created_before(user, cutoff)):
+                    entries.append({'kind': 'user', 'email': user['email'], 'id': user['_id']})
+                    matched += 1
+            if page * per_page >= batch['countUser'] or not batch['user']:
+                break
+            page += 1
+
+    summary = {'registries': len(stale), 'matched_users': matched}
+    if dry_run:
+        summary['would_delete'] = dict(Counter(entry['kind'] for entry in entries))
+        return summary
+    summary.update(cleanup(entries, client, admin, workers))
+    for path in stale:
+        EntityRegistry(os.path.basename(path)[:-len('.jsonl')], directory).mark_done()
+    return summary
+
+
+# Pytest plugin ------------------------------------------------------------
+
+def pytest_addoption(parser):
+    group = parser.getgroup('cleanup', 'test data cleanup')
+    group.addoption('--no-cleanup', action='store_true', default=False,
+                    help='Keep users, blogs and comments created by this run')
+
+
+def pytest_configure(config):
+    if not hasattr(config, 'workerinput'):
+        get_registry()  # Fix HARNESS_RUN_ID before any worker process starts
+
+
+@pytest.fixture(scope='session')
+def entity_registry():
+    """Registry that tests use to record everything they create"""
+    return get_registry()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if hasattr(session.config, 'workerinput') or session.config.getoption('no_cleanup'):
+        return
+    registry = get_registry()
+    entries = registry.entries()
+    if not entries:
+        return
+    client = ApiClient(BASE_URL)
+    started = time.time()
+    try:
+        summary = cleanup(entries, client, login_admin(client))
+    except (ApiError, OSError) as e:
+        print(f"\n[cleanup] Aborted, run `python -m utils.cleanup sweep` later: {e}")
+        return
+    registry.mark_done()
+    print(f"\n[cleanup] Removed test data for run {registry.run_id} in {time.time() - started:.1f}s: {summary}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Delete data created by test runs')
+    sub = parser.add_subparsers(dest='mode', required=True)
+    run = sub.add_parser('run', help='Clean up one run by id')
+    run.add_argument('run_id')
+    orphans = sub.add_parser('sweep', help='Clean up crashed runs and stray test accounts')
+    orphans.add_argument('--older-than-minutes', type=float, default=60)
+    orphans.add_argument('--dry-run', action='store_true')
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    client = ApiClient(BASE_URL)
+    if args.mode == 'run':
+        registry = EntityRegistry(args.run_id)
+        print(cleanup(registry.entries(), client, login_admin(client), args.workers))
+        registry.mark_done()
+    else:
+        print(sweep(client, args.older_than_minutes * 60, args.dry_run, args.workers))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,404 @@
+"""
+Comment Thread Benchmark
+Seeds blogs with 0 to 20,000 comments and measures get-comment latency and
+payload, and how long ShowBlog takes to become interactive with them all
+"""
+
+import csv
+import json
+import os
+import random
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from config import BASE_URL, TEST_ADMIN
+from utils.api_client import ApiClient
+from utils.browser_metrics import cdp_metrics, snapshot
+from utils.dashboard_benchmark import _slope
+from utils.load_harness import percentile
+from utils.render_benchmark import scaling_report
+from utils.seeder import seed_blogs, seed_comments, seed_users
+
+
+DEFAULT_SIZES = [0, 10, 100, 1000, 5000, 20000]
+COMMENTER_PASSWORD = 'SeedPassword123!'
+
+# Installed before the page's own scripts. CommentCard renders the thread
+# once get-comment answers, then every UserComment looks up its author on
+# its own (no de-duplication), so the page is usable once the "Comments"
+# badge shows the full count, every lookup has returned and the main thread
+# has been free of long tasks for ``quiet`` ms.
+INTERACTIVE_PROBE = """
+window.__commentBench = {target: %d, quiet: %d, listAt: null, usersAt: null, interactiveAt: null,
+                         listDone: false, lookups: 0, lastLookup: 0, lastLongTask: 0};
+performance.setResourceTimingBufferSize(1000000);
+function observe(type, handle) {
+  try { new PerformanceObserver(function (list) { list.getEntries().forEach(handle); })
+          .observe({type: type, buffered: true}); } catch (e) {}
+}
+observe('longtask', function (task) {
+  var bench = window.__commentBench;
+  bench.lastLongTask = Math.max(bench.lastLongTask, task.startTime + task.duration);
+});
+observe('resource', function (entry) {
+  var bench = window.__commentBench;
+  if (entry.name.indexOf('/api/comment/get-comment/') !== -1) bench.listDone = true;
+  if (entry.name.indexOf('/api/user/get-user-comment/') !== -1) {
+    bench.lookups += 1;
+    bench.lastLookup = Math.max(bench.lastLookup, entry.responseEnd);
+  }
+});
+(function check() {
+  var bench = window.__commentBench, now = performance.now();
+  if (bench.listAt === null && bench.listDone) {
+    var label = Array.prototype.find.call(document.querySelectorAll('p'), function (p) {
+      return p.textContent.trim() === 'Comments';
+    });
+    if (label && label.nextElementSibling && Number(label.nextElementSibling.textContent) === bench.target) {
+      bench.listAt = now;
+    }
+  }
+  if (bench.listAt !== null && bench.usersAt === null && bench.lookups >= bench.target) {
+    bench.usersAt = Math.max(bench.listAt, bench.lastLookup);
+  }
+  if (bench.usersAt !== null) {
+    var settled = Math.max(bench.usersAt, bench.lastLongTask);
+    if (now - settled >= bench.quiet) {
+      bench.interactiveAt = settled;
+      return;
+    }
+  }
+  requestAnimationFrame(check);
+})();
+"""
+
+
+def like_counts(count, max_likes, seed=0, alpha=1.2):
+    """
+    Heavy-tailed like counts: most comments get none or one, a few get up to ``max_likes``
+
+    Returns:
+        list: One count per comment
+    """
+    rng = random.Random(seed)
+    return [min(max_likes, int(rng.paretovariate(alpha)) - 1) for _ in range(count)]
+
+
+def seed_commenters(count, client=None, store=None, registry=None):
+    """
+    Accounts to write and like the comments; logged in (with tokens) unless seeded into ``store``
+
+    Returns:
+        list: User documents
+    """
+    users = seed_users(count, client, store=store, registry=registry, password=COMMENTER_PASSWORD)
+    if store is not None:
+        return users
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        return list(pool.map(lambda user: client.login(user['email'], COMMENTER_PASSWORD), users))
+
+
+def seed_thread(blog, count, commenters, client=None, store=None, registry=None, seed=0, workers=16):
+    """
+    Give ``blog`` ``count`` comments spread over ``commenters``, with ``like_counts`` likes
+
+    Likes come from the first N commenters, so no comment can have more likes
+    than there are commenters. With ``store`` both are written directly;
+    otherwise every comment and like goes through the API.
+
+    Returns:
+        list: Comment documents
+    """
+    comments = []
+    for index, author in enumerate(commenters):
+        share = count // len(commenters) + (index < count % len(commenters))
+        if share:
+            comments += seed_comments(share, [blog], client, author, store=store, workers=workers,
+                                      registry=registry, seed=seed + index)
+    likes = like_counts(len(comments), len(commenters), seed)
+    if store is not None:
+        with store.lock:
+            for comment, liked in zip(comments, likes):
+                comment['likes'] = [user['_id'] for user in commenters[:liked]]
+                comment['numberOfLikes'] = liked
+        return comments
+
+    jobs = [(user, comment['_id']) for comment, liked in zip(comments, likes) for user in commenters[:liked]]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda job: client.like_comment(*job), jobs))
+    for comment, liked in zip(comments, likes):
+        comment['numberOfLikes'] = liked
+    return comments
+
+
+def measure_api(session, base_url, blog_id, repeat=5, timeout=60, store=None, label=None, started=None):
+    """
+    Fetch one blog's comments ``repeat`` times, as CommentCard does on mount
+
+    Args:
+        store (SampleStore): Also record every request under ``label``, with
+            offsets from the ``started`` monotonic time
+
+    Returns:
+        dict: ``status``, ``returned`` (comments in the body), ``likes``,
+        ``api_ms``/``api_p95_ms`` (request to last byte) and ``payload_kb``
+    """
+    url = f"{base_url.rstrip('/')}/api/comment/get-comment/{blog_id}"
+    latencies = []
+    started = time.monotonic() if started is None else started
+    for _ in range(repeat):
+        sent = time.monotonic()
+        response = session.get(url, timeout=timeout)
+        latency = time.monotonic() - sent
+        latencies.append(latency * 1000)
+        if store is not None:
+            store.record(label or '/api/comment/get-comment/:blogId', latency, sent - started,
+                         response.status_code, len(response.content))
+    comments = response.json() if response.ok else []
+    return {
+        'status': response.status_code,
+        'returned': len(comments),
+        'likes': sum(comment.get('numberOfLikes', 0) for comment in comments),
+        'api_ms': round(statistics.median(latencies), 1),
+        'api_p95_ms': round(percentile(sorted(latencies), 95), 1),
+        'payload_kb': round(len(response.content) / 1024, 1),
+    }
+
+
+def measure_page(driver, base_url, blog, expected, quiet_ms=500, timeout=300):
+    """
+    Load ShowBlog cold for ``blog`` and wait until its comment thread is usable
+
+    Returns:
+        dict: ``list_ms`` (navigation start to the full count on the badge),
+        ``users_ms`` (every commenter lookup answered), ``interactive_ms`` (that
+        and no long task for ``quiet_ms``), ``lookups`` plus the ``snapshot``
+        counters; timings are None if the page gave up before ``timeout``
+    """
+    probe = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                                   {'source': INTERACTIVE_PROBE % (expected, quiet_ms)})
+    try:
+        driver.get('about:blank')
+        before = cdp_metrics(driver)
+        driver.get(f"{base_url.rstrip('/')}/blog/{blog['slug']}")
+        deadline = time.monotonic() + timeout
+        bench = None
+        while time.monotonic() < deadline:
+            bench = driver.execute_script('return window.__commentBench || null;')
+            if bench and bench['interactiveAt'] is not None:
+                break
+            time.sleep(0.1)
+        row = snapshot(driver, before, '/api/comment/get-comment')
+    finally:
+        driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': probe['identifier']})
+    bench = bench or {}
+    row.update({
+        'list_ms': round(bench['listAt'], 1) if bench.get('listAt') is not None else None,
+        'users_ms': round(bench['usersAt'], 1) if bench.get('usersAt') is not None else None,
+        'interactive_ms': round(bench['interactiveAt'], 1) if bench.get('interactiveAt') is not None else None,
+        'lookups': bench.get('lookups'),
+    })
+    return row
+
+
+def _crossing(points, budget):
+    """
+    Comment count at which a metric reaches ``budget``
+
+    Interpolated between the two measurements either side of it, or
+    extrapolated along the fitted slope when every measurement is under.
+
+    Returns:
+        tuple: (comments or None, True if extrapolated)
+    """
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if y0 <= budget < y1:
+            return round(x0 + (budget - y0) * (x1 - x0) / (y1 - y0)), False
+    if points and points[0][1] > budget:
+        return points[0][0], False
+    slope = _slope(points)
+    if points and slope and slope > 0:
+        x, y = points[-1]
+        return round(x + (budget - y) / slope), True
+    return None, False
+
+
+def usability_report(results, api_budget_ms=1000, page_budget_ms=5000, payload_budget_kb=1024):
+    """
+    At how many comments does a post stop being usable?
+
+    Each metric is checked against its budget: ``exceeds_at`` is the first
+    measured thread size over it, ``crosses_at`` the estimated comment count
+    where it gets there, and ``per_1000_comments`` the fitted growth.
+    ``unusable_at`` is the lowest crossing across metrics. ``page_scaling``
+    is the render benchmark's elasticity of interactive time vs. comments.
+
+    Args:
+        results (list): Rows with ``comments`` and the ``measure_api`` /
+            ``measure_page`` fields
+
+    Returns:
+        dict: Per metric budget report, ``unusable_at``, ``limited_by`` and ``page_scaling``
+    """
+    rows = sorted(results, key=lambda row: row['comments'])
+    budgets = {'api_p95_ms': api_budget_ms, 'interactive_ms': page_budget_ms, 'payload_kb': payload_budget_kb}
+    report = {'metrics': {}, 'unusable_at': None, 'limited_by': None}
+    for metric, budget in budgets.items():
+        points = [(row['comments'], row[metric]) for row in rows if row.get(metric) is not None]
+        if not points:
+            continue
+        over = [x for x, y in points if y > budget]
+        crosses_at, extrapolated = _crossing(points, budget)
+        slope = _slope(points)
+        report['metrics'][metric] = {
+            'budget': budget,
+            'exceeds_at': over[0] if over else None,
+            'crosses_at': crosses_at,
+            'extrapolated': extrapolated,
+            'per_1000_comments': round(slope * 1000, 2) if slope is not None else None,
+        }
+        if crosses_at is not None and (report['unusable_at'] is None or crosses_at < report['unusable_at']):
+            report['unusable_at'], report['limited_by'] = crosses_at, metric
+    page_rows = [{'view': 'page', 'size': row['comments'], 'cards': row['comments'], **row}
+                 for row in rows if row.get('interactive_ms') is not None]
+    report['page_scaling'] = scaling_report(page_rows, metric='interactive_ms').get('page') if page_rows else None
+    return report
+
+
+def run_benchmark(base_url, sizes=DEFAULT_SIZES, driver=None, browser_url=None, client=None, store=None,
+                  commenters=20, repeat=3, registry=None, samples=None):
+    """
+    Seed one blog per thread size and measure each
+
+    Without ``driver`` only the API is measured. ``browser_url`` (default
+    ``base_url``) is where Chrome loads ShowBlog, e.g. through a netem proxy.
+    ``samples`` (a SampleStore) receives every get-comment request, labelled
+    with its thread size.
+
+    Returns:
+        list: One row per size: ``comments`` plus the ``measure_api`` and
+        (medians over ``repeat`` loads) ``measure_page`` fields
+    """
+    client = client or ApiClient(base_url)
+    admin = client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+    users = seed_commenters(commenters, client, store=store, registry=registry)
+    blogs = seed_blogs(len(sizes), client, admin, store=store, body_chars=2000, registry=registry,
+                       prefix=f"Comment bench {uuid.uuid4().hex[:6]}")
+    session = requests.Session()
+    if driver is not None:
+        driver.execute_cdp_cmd('Performance.enable', {})
+    results, started = [], time.monotonic()
+    for blog, size in zip(blogs, sorted(sizes)):
+        seed_thread(blog, size, users, client, store=store, registry=registry, seed=size)
+        row = {'comments': size, **measure_api(session, base_url, blog['_id'], repeat=max(repeat, 5), store=samples,
+                                               label=f"get-comment ({size} comments)", started=started)}
+        if driver is not None:
+            loads = [measure_page(driver, browser_url or base_url, blog, size) for _ in range(repeat)]
+            for key in loads[0]:
+                values = [load[key] for load in loads if load[key] is not None]
+                row[key] = statistics.median(values) if values else None
+        results.append(row)
+        print(f"[comments] {size} comments measured")
+    return results
+
+
+def print_results(results):
+    columns = ['comments', 'likes', 'status', 'api_ms', 'api_p95_ms', 'payload_kb', 'list_ms', 'users_ms',
+               'interactive_ms', 'lookups', 'script_ms', 'dom_nodes', 'js_heap_mb']
+    print(' '.join(f"{column:>14}" for column in columns))
+    for row in results:
+        print(' '.join(f"{str(row.get(column) if row.get(column) is not None else '-'):>14}" for column in columns))
+
+
+def write_results_csv(results, path):
+    columns = sorted({key for row in results for key in row}, key=lambda key: (key != 'comments', key))
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    import argparse
+
+    from utils.cleanup import cleanup, get_registry, login_admin
+
+    parser = argparse.ArgumentParser(description='Measure get-comment and ShowBlog at increasing thread sizes')
+    parser.add_argument('--url', default=BASE_URL, help='Target frontend URL (default: APP_URL)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Comments per seeded blog')
+    parser.add_argument('--commenters', type=int, default=20, help='Seeded accounts that comment and like')
+    parser.add_argument('--repeat', type=int, default=3, help='Cold ShowBlog loads per size')
+    parser.add_argument('--api-only', action='store_true', help='Skip Chrome; measure get-comment only')
+    parser.add_argument('--api-budget-ms', type=float, default=1000, help='get-comment p95 budget')
+    parser.add_argument('--page-budget-ms', type=float, default=5000, help='ShowBlog time-to-interactive budget')
+    parser.add_argument('--payload-budget-kb', type=float, default=1024, help='get-comment body budget')
+    parser.add_argument('--netem', default=None,
+                        help='Shape traffic through utils.netem_proxy: preset name or JSON spec file')
+    parser.add_argument('--standin', action='store_true', help='Seed and serve from a local stand-in')
+    parser.add_argument('--static-dir', default=os.path.join('..', 'client', 'dist'),
+                        help='Built SPA served by the stand-in (npm run build in client/)')
+    parser.add_argument('--keep', action='store_true', help='Keep data seeded into --url')
+    parser.add_argument('--out', default=None, help='Directory for comments.csv and summary.json')
+    parser.add_argument('--samples', default=None, help='Keep every get-comment request in a sample store here')
+    args = parser.parse_args()
+
+    standin, store, registry = None, None, None
+    url = args.url
+    if args.standin:
+        from utils.standin_server import StandinServer
+        standin = StandinServer(static_dir=args.static_dir).start()
+        standin.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+        url, store = standin.url, standin.store
+    elif not args.keep:
+        registry = get_registry()
+    browser_url, netem = url, None
+    if args.netem:  # Only the browser is shaped; seeding, get-comment timing and cleanup go direct
+        from utils.netem_proxy import NetemProxy, load_netem
+        netem = NetemProxy(url, load_netem(args.netem)).start()
+        browser_url = netem.url
+
+    driver = None
+    if not args.api_only:
+        from utils.driver_setup import get_chrome_driver
+        driver = get_chrome_driver(headless=True)
+    client = ApiClient(url, timeout=60)
+    samples = None
+    if args.samples:
+        from utils.sample_store import SampleStore
+        samples = SampleStore(args.samples)
+    try:
+        results = run_benchmark(url, args.sizes, driver, browser_url, client=client, store=store,
+                                commenters=args.commenters, repeat=args.repeat, registry=registry, samples=samples)
+    finally:
+        if samples is not None:
+            samples.close()
+        if driver is not None:
+            from utils.driver_setup import close_driver
+            close_driver(driver)
+        if netem:
+            netem.stop()
+        if standin:
+            standin.stop()
+        if registry and registry.entries():
+            print(f"[comments] Cleanup: {cleanup(registry.entries(), client, login_admin(client))}")
+            registry.mark_done()
+
+    report = usability_report(results, args.api_budget_ms, args.page_budget_ms, args.payload_budget_kb)
+    print_results(results)
+    print(json.dumps(report, indent=2))
+    if report['unusable_at'] is not None:
+        print(f"Posts become unusable at ~{report['unusable_at']} comments ({report['limited_by']})")
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        write_results_csv(results, os.path.join(args.out, 'comments.csv'))
+        with open(os.path.join(args.out, 'summary.json'), 'w') as f:
+            json.dump({'target': url, 'sizes': args.sizes, 'usability': report}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
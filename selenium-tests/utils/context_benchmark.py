@@ -0,0 +1,135 @@
+"""
+Browser Context Benchmark
+Compares memory and start-up time of N logged-in sessions as N full Chrome
+instances versus N browser contexts inside one Chrome
+"""
+
+import json
+import os
+import statistics
+import time
+
+from config import BASE_URL, TEST_ADMIN
+from utils.account_pool import login_browser
+from utils.browser_metrics import chrome_memory_mb
+from utils import driver_setup
+
+
+def _open_session(open_driver, base_url, user):
+    started = time.perf_counter()
+    driver = open_driver()
+    opened = time.perf_counter() - started
+    login_browser(driver, base_url, user)
+    return driver, opened
+
+
+def measure_browsers(count, base_url, user, headless=True):
+    """
+    ``count`` separate Chrome instances, each logged in on the home page
+
+    Returns:
+        dict: ``total_mb`` after each session was added and ``open_s`` per session
+    """
+    drivers, opened, totals = [], [], []
+    try:
+        for _ in range(count):
+            driver, seconds = _open_session(lambda: driver_setup.get_chrome_driver(headless), base_url, user)
+            drivers.append(driver)
+            opened.append(seconds)
+            totals.append(sum(chrome_memory_mb(each) or 0 for each in drivers))
+    finally:
+        for driver in drivers:
+            driver_setup.close_driver(driver)
+    return {'mode': 'browsers', 'total_mb': totals, 'open_s': opened}
+
+
+def measure_contexts(count, base_url, user, headless=True):
+    """
+    One Chrome hosting ``count`` browser contexts, each logged in on the home page
+
+    Returns:
+        dict: same shape as ``measure_browsers``
+    """
+    driver = driver_setup.get_shared_driver(headless)
+    handles, opened, totals = [], [], []
+    try:
+        for _ in range(count):
+            driver, seconds = _open_session(lambda: driver_setup.new_context_driver(headless), base_url, user)
+            handles.append(driver.current_window_handle)
+            opened.append(seconds)
+            totals.append(chrome_memory_mb(driver))
+    finally:
+        for handle in handles:
+            driver.switch_to.window(handle)
+            driver_setup.close_context(driver)
+    return {'mode': 'contexts', 'total_mb': totals, 'open_s': opened}
+
+
+def summarize(result):
+    """
+    Per-session cost of a measurement
+
+    ``marginal_mb`` is what each session after the first adds, which is
+    what a worker running tests one after another (or side by side) pays.
+
+    Returns:
+        dict: ``sessions``, ``total_mb``, ``first_mb``, ``marginal_mb``, ``per_session_mb``, ``open_ms``
+    """
+    totals = result['total_mb']
+    count = len(totals)
+    if not count or totals[-1] is None:
+        return {'mode': result['mode'], 'sessions': count, 'total_mb': None}
+    return {
+        'mode': result['mode'],
+        'sessions': count,
+        'total_mb': totals[-1],
+        'first_mb': totals[0],
+        'marginal_mb': round((totals[-1] - totals[0]) / (count - 1), 1) if count > 1 else None,
+        'per_session_mb': round(totals[-1] / count, 1),
+        'open_ms': round(statistics.median(result['open_s']) * 1000, 1),
+    }
+
+
+def main():
+    import argparse
+
+    from utils.api_client import ApiClient
+
+    parser = argparse.ArgumentParser(description='Memory per browser context vs. per full Chrome')
+    parser.add_argument('--url', default=BASE_URL, help='Target frontend URL (default: APP_URL)')
+    parser.add_argument('--sessions', type=int, default=4, help='Logged-in sessions to hold open at once')
+    parser.add_argument('--standin', action='store_true', help='Serve from a local stand-in')
+    parser.add_argument('--static-dir', default=os.path.join('..', 'client', 'dist'),
+                        help='Built SPA served by the stand-in (npm run build in client/)')
+    parser.add_argument('--out', default=None, help='JSON file for the summary')
+    args = parser.parse_args()
+
+    standin, url = None, args.url
+    if args.standin:
+        from utils.standin_server import StandinServer
+        standin = StandinServer(static_dir=args.static_dir).start()
+        standin.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+        url = standin.url
+    try:
+        user = ApiClient(url).login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+        results = [summarize(measure_browsers(args.sessions, url, user)),
+                   summarize(measure_contexts(args.sessions, url, user))]
+    finally:
+        driver_setup.quit_shared_driver()
+        if standin:
+            standin.stop()
+
+    print(f"{'mode':10} {'sessions':>8} {'total MB':>9} {'first MB':>9} {'+MB each':>9} {'open ms':>8}")
+    for row in results:
+        print(f"{row['mode']:10} {row['sessions']:8d} {row['total_mb'] or 0:9.1f} {row.get('first_mb') or 0:9.1f} "
+              f"{row.get('marginal_mb') or 0:9.1f} {row.get('open_ms') or 0:8.1f}")
+    browsers, contexts = results
+    if browsers.get('marginal_mb') and contexts.get('marginal_mb'):
+        print(f"A context costs {contexts['marginal_mb'] / browsers['marginal_mb']:.0%} of a full browser")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'target': url, 'results': results}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,446 @@
+"""
+Bundle Coverage Audit
+Visits each SPA route with CDP precise JS coverage and CSS rule usage tracking
+and ranks the modules every route downloads but does not run
+"""
+
+import base64
+import csv
+import json
+import os
+import re
+import time
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from config import BASE_URL, TEST_ADMIN
+from utils.api_client import ApiClient
+
+
+# Routes of client/src/App.jsx; auth routes are visited as TEST_ADMIN after the
+# anonymous ones, placeholders are filled from the newest post
+COVERAGE_ROUTES = [
+    {'name': 'home', 'path': '/'},
+    {'name': 'about', 'path': '/about'},
+    {'name': 'login', 'path': '/login'},
+    {'name': 'register', 'path': '/register'},
+    {'name': 'search', 'path': '/search?sort=desc'},
+    {'name': 'blog', 'path': '/blog/{slug}'},
+    {'name': 'dashboard-dash', 'path': '/dashboard?tab=dash', 'auth': True},
+    {'name': 'dashboard-profile', 'path': '/dashboard?tab=profile', 'auth': True},
+    {'name': 'dashboard-blogs', 'path': '/dashboard?tab=blogs', 'auth': True},
+    {'name': 'dashboard-users', 'path': '/dashboard?tab=users', 'auth': True},
+    {'name': 'dashboard-comments', 'path': '/dashboard?tab=comments', 'auth': True},
+    {'name': 'create-blog', 'path': '/create-blog', 'auth': True},
+    {'name': 'update-blog', 'path': '/update-blog/{blogId}', 'auth': True},
+]
+
+INLINE_STYLES = '<style>'
+SOURCE_MAPPING_URL = re.compile(r'[#@] sourceMappingURL=(\S+)\s*$')
+BASE64_DIGITS = {char: index for index, char in
+                 enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+
+STYLESHEET_URLS = "return Array.prototype.map.call(document.styleSheets, function (sheet) { return sheet.href; });"
+
+
+def utf16_len(text):
+    """Length of ``text`` in UTF-16 code units, the unit of CDP coverage offsets"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def paint(size, ranges):
+    """
+    Per-code-unit used (1) / unused (0) marks from ``(start, end, used)`` ranges
+
+    Ranges are painted outermost first, so nested ranges (V8 block coverage)
+    override their enclosing function's count.
+
+    Returns:
+        bytearray: ``size`` marks
+    """
+    marks = bytearray(size)
+    for start, end, used in sorted(ranges, key=lambda item: (item[0], -item[1])):
+        end = min(end, size)
+        if end > start:
+            marks[start:end] = (b'\x01' if used else b'\x00') * (end - start)
+    return marks
+
+
+def js_marks(functions, size):
+    """Marks from a ``Profiler.takePreciseCoverage`` script entry's ``functions``"""
+    return paint(size, [(block['startOffset'], block['endOffset'], block['count'] > 0)
+                        for function in functions for block in function['ranges']])
+
+
+def css_marks(rules, size):
+    """Marks from ``CSS.stopRuleUsageTracking`` rules of one stylesheet (only used rules count)"""
+    return paint(size, [(rule['startOffset'], rule['endOffset'], True) for rule in rules if rule['used']])
+
+
+def decode_mappings(mappings):
+    """
+    Source map ``mappings`` as ``(generated line, generated column, source index)``
+
+    Source index is None for segments that map to no source.
+    """
+    source = 0
+    for line, group in enumerate(mappings.split(';')):
+        column = 0
+        for segment in group.split(','):
+            if not segment:
+                continue
+            values, value, shift = [], 0, 0
+            for char in segment:
+                digit = BASE64_DIGITS[char]
+                value += (digit & 31) << shift
+                if digit & 32:
+                    shift += 5
+                else:
+                    values.append(-(value >> 1) if value & 1 else value >> 1)
+                    value, shift = 0, 0
+            column += values[0]
+            if len(values) >= 4:
+                source += values[1]
+                yield line, column, source
+            else:
+                yield line, column, None
+
+
+def module_name(source):
+    """``../../node_modules/@firebase/auth/dist/x.js`` -> ``@firebase/auth``; app files keep their path"""
+    path = source.replace('\\', '/')
+    if 'node_modules/' in path:
+        parts = path.rsplit('node_modules/', 1)[1].split('/')
+        return '/'.join(parts[:2]) if parts[0].startswith('@') else parts[0]
+    while path.startswith(('../', './', '/')):
+        path = path.split('/', 1)[1]
+    return path
+
+
+def module_spans(text, source_map):
+    """
+    UTF-16 code unit ranges of ``text`` attributed to npm packages or app files
+
+    Returns:
+        list: ``(start, end, module)``, in order, adjacent ranges of a module merged
+    """
+    line_starts = [0]
+    for line in text.split('\n')[:-1]:
+        line_starts.append(line_starts[-1] + utf16_len(line) + 1)
+    names = [module_name(source) for source in source_map.get('sources', [])]
+    starts = []
+    for line, column, source in decode_mappings(source_map.get('mappings', '')):
+        if line >= len(line_starts):
+            break
+        module = names[source] if source is not None and source < len(names) else None
+        if not starts or starts[-1][1] != module:
+            starts.append((line_starts[line] + column, module))
+    ends = [start for start, _ in starts[1:]] + [utf16_len(text)]
+    return [(start, end, module) for (start, module), end in zip(starts, ends) if module and end > start]
+
+
+def fetch_source_map(url, text, timeout=10):
+    """The bundle's source map (``sourceMappingURL`` comment or ``<url>.map``), or None"""
+    match = SOURCE_MAPPING_URL.search(text[-500:])
+    reference = match.group(1) if match else os.path.basename(urlparse(url).path) + '.map'
+    if reference.startswith('data:'):
+        return json.loads(base64.b64decode(reference.split(',', 1)[1]))
+    try:
+        response = requests.get(urljoin(url, reference), timeout=timeout)
+        source_map = response.json() if response.ok else None
+    except (requests.RequestException, ValueError):
+        return None  # The SPA fallback answers missing maps with index.html
+    return source_map if isinstance(source_map, dict) and 'mappings' in source_map else None
+
+
+class CoverageAudit:
+    """
+    Precise coverage of every visited route
+
+    Each route is a fresh document load, so every route is measured as a
+    landing page: what it downloads and what of that it runs. Coverage is
+    counted in UTF-16 code units, as CDP reports it; ``bytes`` is the
+    resource's transfer size. The two differ once a bundle has non-ASCII text.
+
+    Attributes:
+        routes (dict): Route name -> resource path -> ``{"kind", "size", "bytes", "marks"}``
+        sources (dict): Resource path -> text, fetched once per bundle
+        sizes (dict): Resource path -> bytes transferred
+        spans (dict): Resource path -> ``module_spans`` (empty without a source map)
+    """
+
+    def __init__(self, base_url=BASE_URL, settle=2.0, timeout=10):
+        self.base_url = base_url.rstrip('/')
+        self.origin = '{0.scheme}://{0.netloc}'.format(urlparse(self.base_url))
+        self.settle = settle
+        self.timeout = timeout
+        self.routes = {}
+        self.sources = {}
+        self.sizes = {}
+        self.spans = {}
+
+    def _source(self, url):
+        path = urlparse(url).path
+        if path not in self.sources:
+            response = requests.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            if 'charset' not in response.headers.get('Content-Type', ''):
+                response.encoding = 'utf-8'  # As the SPA's <meta charset>; requests would assume Latin-1
+            self.sources[path] = response.text
+            self.sizes[path] = len(response.content)
+            source_map = fetch_source_map(url, response.text, self.timeout) if path.endswith('.js') else None
+            self.spans[path] = module_spans(response.text, source_map) if source_map else []
+        return path, self.sources[path]
+
+    def collect(self, driver, name, path):
+        """Load one route with coverage on and record its JS bundles and stylesheets"""
+        driver.execute_cdp_cmd('Profiler.enable', {})
+        driver.execute_cdp_cmd('Profiler.startPreciseCoverage', {'callCount': False, 'detailed': True})
+        driver.execute_cdp_cmd('DOM.enable', {})
+        driver.execute_cdp_cmd('CSS.enable', {})
+        driver.execute_cdp_cmd('CSS.startRuleUsageTracking', {})
+        try:
+            driver.get(self.base_url + path)
+            time.sleep(self.settle)
+            driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
+            time.sleep(0.5)
+            scripts = driver.execute_cdp_cmd('Profiler.takePreciseCoverage', {})['result']
+            rules = driver.execute_cdp_cmd('CSS.stopRuleUsageTracking', {})['ruleUsage']
+            linked = [url for url in driver.execute_script(STYLESHEET_URLS) or [] if url]
+        finally:
+            driver.execute_cdp_cmd('Profiler.stopPreciseCoverage', {})
+
+        resources = {}
+        for script in scripts:
+            if script['url'].startswith(self.origin):  # Skips inline scripts, evals and extensions
+                resource, text = self._source(script['url'])
+                size = utf16_len(text)
+                resources[resource] = {'kind': 'js', 'size': size, 'bytes': self.sizes[resource],
+                                       'marks': js_marks(script['functions'], size)}
+
+        by_text = {}
+        for url in linked:
+            if url.startswith(self.origin):
+                resource, text = self._source(url)
+                by_text[text] = resource
+        inline = bytearray()
+        by_sheet = {}
+        for rule in rules:
+            by_sheet.setdefault(rule['styleSheetId'], []).append(rule)
+        for sheet, sheet_rules in by_sheet.items():
+            text = driver.execute_cdp_cmd('CSS.getStyleSheetText', {'styleSheetId': sheet})['text']
+            if text in by_text:
+                resource = by_text[text]
+                resources[resource] = {'kind': 'css', 'size': utf16_len(text), 'bytes': self.sizes[resource],
+                                       'marks': css_marks(sheet_rules, utf16_len(text))}
+            else:  # <style> tags injected at runtime change between routes, so they are only totalled
+                inline += css_marks(sheet_rules, utf16_len(text))
+        if inline:
+            resources[INLINE_STYLES] = {'kind': 'css', 'size': len(inline), 'bytes': None, 'marks': inline}
+        self.routes[name] = resources
+        return resources
+
+    def run(self, driver, routes=COVERAGE_ROUTES, admin=None):
+        """
+        Visit ``routes`` (those marked ``auth`` only with ``admin``, after logging in)
+
+        Returns:
+            dict: ``self.routes``
+        """
+        from utils.account_pool import login_browser
+
+        logged_in = False
+        for route in sorted(routes, key=lambda route: bool(route.get('auth'))):
+            if route.get('auth'):
+                if admin is None:
+                    continue
+                if not logged_in:
+                    login_browser(driver, self.base_url, admin)
+                    logged_in = True
+            self.collect(driver, route['name'], route['path'])
+            print(f"[coverage] {route['name']} measured")
+        return self.routes
+
+    def _union(self, resource):
+        """Marks of code units any route ran"""
+        loaded = [resources[resource]['marks'] for resources in self.routes.values() if resource in resources]
+        union = 0
+        for marks in loaded:
+            union |= int.from_bytes(marks, 'little')
+        return union.to_bytes(len(loaded[0]), 'little')
+
+    def route_rows(self):
+        """
+        One row per route and resource
+
+        Returns:
+            list: ``bytes`` (transferred; None for inline styles), and ``size``,
+            ``used``, ``unused`` in code units with ``unused_pct``
+        """
+        rows = []
+        for route, resources in self.routes.items():
+            for resource, entry in sorted(resources.items()):
+                size, used = entry['size'], entry['marks'].count(1)
+                rows.append({'route': route, 'resource': resource, 'kind': entry['kind'], 'bytes': entry['bytes'],
+                             'size': size, 'used': used, 'unused': size - used,
+                             'unused_pct': round(100 * (size - used) / size, 1) if size else 0})
+        return rows
+
+    def bundle_rows(self):
+        """
+        One row per bundle across routes
+
+        Returns:
+            list: ``resource``, ``kind``, ``bytes``, ``size``, ``routes`` (loads),
+            ``mean_unused_pct`` and ``unused_everywhere`` (code units no visited
+            route ran), largest first
+        """
+        per_route = self.route_rows()
+        rows = []
+        for resource in sorted({row['resource'] for row in per_route if row['resource'] != INLINE_STYLES}):
+            loads = [row for row in per_route if row['resource'] == resource]
+            union = self._union(resource)
+            size = loads[0]['size']
+            idle = size - union.count(1)
+            rows.append({'resource': resource, 'kind': loads[0]['kind'], 'bytes': loads[0]['bytes'], 'size': size,
+                         'routes': len(loads),
+                         'mean_unused_pct': round(sum(row['unused_pct'] for row in loads) / len(loads), 1),
+                         'unused_everywhere': idle,
+                         'unused_everywhere_pct': round(100 * idle / size, 1) if size else 0})
+        return sorted(rows, key=lambda row: -row['size'])
+
+    def opportunities(self, limit=15):
+        """
+        Modules worth splitting out, ranked by code an average page load could skip
+
+        Modules come from the bundles' source maps; a bundle without one counts
+        as a single module. A module no route runs saves its whole size on
+        every load; one some routes run saves it on the others (as a
+        ``React.lazy``/``import()`` chunk for those routes).
+
+        Returns:
+            list: ``module``, ``resource``, ``size``, ``used_by`` (routes),
+            ``skippable_per_load``, ``unused_everywhere`` (all in code units) and ``advice``
+        """
+        rows = []
+        for resource in {resource for resources in self.routes.values() for resource in resources}:
+            if resource == INLINE_STYLES or not resource.endswith('.js'):
+                continue
+            union = self._union(resource)
+            loads = {route: resources[resource]['marks'] for route, resources in self.routes.items()
+                     if resource in resources}
+            modules = {}
+            for start, end, module in self.spans.get(resource) or [(0, len(union), resource)]:
+                modules.setdefault(module, []).append((start, end))
+            for module, spans in modules.items():
+                size = sum(end - start for start, end in spans)
+                used_by = [route for route, marks in loads.items()
+                           if any(marks.count(1, start, end) for start, end in spans)]
+                skippable = size * (len(loads) - len(used_by)) / len(loads)
+                if not used_by:
+                    advice = 'not run on any visited route'
+                elif len(used_by) < len(loads):
+                    advice = f"split into a chunk for {', '.join(used_by)}"
+                else:
+                    advice = 'run on every route'
+                rows.append({'module': module, 'resource': resource, 'size': size, 'used_by': used_by,
+                             'skippable_per_load': round(skippable),
+                             'unused_everywhere': size - sum(union.count(1, start, end) for start, end in spans),
+                             'advice': advice})
+        rows.sort(key=lambda row: (-row['skippable_per_load'], -row['unused_everywhere']))
+        return [row for row in rows if row['skippable_per_load'] or row['unused_everywhere']][:limit]
+
+
+def resolve_routes(base_url, routes=COVERAGE_ROUTES, client=None):
+    """Fill ``{slug}`` and ``{blogId}`` from the newest post; routes needing one are dropped without posts"""
+    blogs = (client or ApiClient(base_url)).get_blogs(sort='desc', limit=1)['blogs']
+    resolved = []
+    for route in routes:
+        if '{' in route['path']:
+            if not blogs:
+                continue
+            route = {**route, 'path': route['path'].format(slug=blogs[0]['slug'], blogId=blogs[0]['_id'])}
+        resolved.append(route)
+    return resolved
+
+
+def print_audit(audit, limit=15):
+    print("Transfer sizes in KB; coverage in K code units (UTF-16, as CDP counts it)")
+    print(f"{'bundle':<40}{'kind':>5}{'KB':>9}{'routes':>7}{'unused %':>10}{'never run K':>13}")
+    for row in audit.bundle_rows():
+        print(f"{row['resource'][:39]:<40}{row['kind']:>5}{row['bytes'] / 1024:>9.1f}{row['routes']:>7}"
+              f"{row['mean_unused_pct']:>10}{row['unused_everywhere'] / 1024:>13.1f}")
+    print(f"\n{'route':<20}{'resource':<40}{'KB':>9}{'unused %':>10}")
+    for row in audit.route_rows():
+        transfer = '-' if row['bytes'] is None else f"{row['bytes'] / 1024:.1f}"
+        print(f"{row['route'][:19]:<20}{row['resource'][:39]:<40}{transfer:>9}{row['unused_pct']:>10}")
+    print(f"\n{'code-splitting opportunity':<40}{'K':>9}{'skip K/load':>14}  advice")
+    for row in audit.opportunities(limit):
+        print(f"{row['module'][:39]:<40}{row['size'] / 1024:>9.1f}{row['skippable_per_load'] / 1024:>14.1f}  "
+              f"{row['advice']}")
+
+
+def write_routes_csv(rows, path):
+    columns = ['route', 'resource', 'kind', 'bytes', 'size', 'used', 'unused', 'unused_pct']
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    import argparse
+
+    from utils.driver_setup import close_driver, get_chrome_driver
+
+    parser = argparse.ArgumentParser(description='Measure used and unused JS/CSS code per SPA route')
+    parser.add_argument('--url', default=BASE_URL, help='Target frontend URL (default: APP_URL)')
+    parser.add_argument('--routes', nargs='+', choices=[route['name'] for route in COVERAGE_ROUTES],
+                        default=[route['name'] for route in COVERAGE_ROUTES])
+    parser.add_argument('--no-admin', action='store_true', help='Skip the dashboard and editor routes')
+    parser.add_argument('--settle', type=float, default=2.0, help='Seconds to wait on every route')
+    parser.add_argument('--limit', type=int, default=15, help='Opportunities to list')
+    parser.add_argument('--standin', action='store_true', help='Serve the built SPA from a local stand-in')
+    parser.add_argument('--static-dir', default=os.path.join('..', 'client', 'dist'),
+                        help='Built SPA served by the stand-in (npx vite build --sourcemap in client/)')
+    parser.add_argument('--out', default=None, help='Directory for coverage.csv and summary.json')
+    args = parser.parse_args()
+
+    standin = None
+    url = args.url
+    if args.standin:
+        from utils.seeder import seed_blogs
+        from utils.standin_server import StandinServer
+        standin = StandinServer(static_dir=args.static_dir).start()
+        standin.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+        seed_blogs(9, store=standin.store)
+        url = standin.url
+
+    client = ApiClient(url)
+    admin = None if args.no_admin else client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+    routes = resolve_routes(url, [route for route in COVERAGE_ROUTES if route['name'] in args.routes], client)
+    audit = CoverageAudit(url, settle=args.settle)
+    driver = get_chrome_driver(headless=True)
+    try:
+        audit.run(driver, routes, admin)
+    finally:
+        close_driver(driver)
+        if standin:
+            standin.stop()
+
+    print_audit(audit, args.limit)
+    if not any(audit.spans.values()):
+        print("\nNo source maps found: opportunities are per bundle. Build with `npx vite build --sourcemap` "
+              "for per-package results.")
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        write_routes_csv(audit.route_rows(), os.path.join(args.out, 'coverage.csv'))
+        with open(os.path.join(args.out, 'summary.json'), 'w') as f:
+            json.dump({'target': url, 'routes': [route['name'] for route in routes],
+                       'bundles': audit.bundle_rows(), 'opportunities': audit.opportunities(args.limit)}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
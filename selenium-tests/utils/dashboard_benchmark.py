@@ -0,0 +1,199 @@
+"""
+Admin Dashboard Benchmark
+Pages the dashboard's Users, Comments and Blogs tables with "Show more.." as
+TEST_ADMIN and reports when each additional page starts to cost more
+"""
+
+import csv
+import json
+import os
+import statistics
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from config import BASE_URL, TEST_ADMIN
+from utils.account_pool import login_browser
+from utils.api_client import ApiClient
+from utils.browser_metrics import cdp_metrics, click_and_measure, snapshot
+from utils.seeder import seed_blogs, seed_comments, seed_users
+
+
+ROW_SELECTOR = 'table tbody tr'
+SHOW_MORE = "//button[contains(text(), 'Show more')]"
+
+# Dashboard.jsx ?tab= value -> endpoint the tab pages through
+TABS = {
+    'users': '/api/user/getusers',
+    'comments': '/api/comment/get-all-comments',
+    'blogs': '/api/blog/get-all-blogs',
+}
+
+
+def measure_tab(driver, base_url, admin, tab, max_clicks=50, settle_ms=500):
+    """
+    Open one dashboard tab as ``admin`` and click "Show more.." until it
+    disappears, a click appends nothing, or ``max_clicks`` is reached
+
+    Returns:
+        dict: ``clicks`` (per-click dicts from ``click_and_measure``),
+        ``initial_rows``, ``stopped`` (why paging ended) and a ``snapshot``
+        of script/layout time, DOM and heap after the last click
+    """
+    login_browser(driver, base_url, admin)
+    driver.execute_cdp_cmd('Performance.enable', {})
+    before = cdp_metrics(driver)
+    driver.get(f"{base_url}/dashboard?tab={tab}")
+    driver.set_script_timeout(30)
+    driver.implicitly_wait(0)
+    try:
+        WebDriverWait(driver, 15).until(lambda d: d.find_elements('css selector', ROW_SELECTOR))
+    except TimeoutException:
+        pass
+    initial_rows = len(driver.find_elements('css selector', ROW_SELECTOR))
+    clicks, stopped = [], 'max_clicks'
+    for _ in range(max_clicks):
+        buttons = driver.find_elements('xpath', SHOW_MORE)
+        if not buttons:
+            stopped = 'no_button'
+            break
+        click = click_and_measure(driver, buttons[0], ROW_SELECTOR, TABS[tab], settle_ms)
+        clicks.append(click)
+        if not click['appended']:
+            stopped = 'nothing_appended'
+            break
+    return {'tab': tab, 'initial_rows': initial_rows, 'clicks': clicks, 'stopped': stopped,
+            'snapshot': snapshot(driver, before, TABS[tab])}
+
+
+def _slope(points):
+    """Least-squares slope of (x, y) points, or None"""
+    if len(points) < 2:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread if spread else None
+
+
+def paging_report(result, metric='total_ms', baseline_clicks=3, window=3, tolerance=1.5):
+    """
+    When does the next page start costing more than the first few did?
+
+    The baseline is the median ``metric`` of the first ``baseline_clicks``
+    clicks that appended rows. ``climbs_at`` is the first click whose rolling
+    median over ``window`` clicks exceeds ``tolerance`` x baseline, with the
+    number of rows on screen at that point.
+
+    Returns:
+        dict: ``baseline_ms``, ``climbs_at_click``, ``climbs_at_rows``,
+        ``render_ms_per_100_rows`` and ``request_ms_per_100_rows`` (growth slopes),
+        ``dom_nodes_per_row``, ``stopped``
+    """
+    clicks = [click for click in result['clicks'] if click['appended'] and click.get(metric) is not None]
+    report = {'tab': result['tab'], 'pages': len(clicks), 'stopped': result['stopped'],
+              'baseline_ms': None, 'climbs_at_click': None, 'climbs_at_rows': None}
+    if clicks:
+        report['baseline_ms'] = round(statistics.median(click[metric] for click in clicks[:baseline_clicks]), 1)
+        for index in range(baseline_clicks, len(clicks)):
+            recent = statistics.median(click[metric] for click in clicks[max(0, index - window + 1):index + 1])
+            if recent > report['baseline_ms'] * tolerance:
+                report['climbs_at_click'] = index + 1
+                report['climbs_at_rows'] = clicks[index]['rows'] - clicks[index]['appended']
+                break
+    for name in ('render_ms', 'request_ms'):
+        slope = _slope([(click['rows'], click[name]) for click in clicks if click.get(name) is not None])
+        report[f"{name}_per_100_rows"] = round(slope * 100, 2) if slope is not None else None
+    rows_added = sum(click['appended'] for click in clicks)
+    report['dom_nodes_per_row'] = round(sum(click['dom_added'] for click in clicks) / rows_added, 1) if rows_added else None
+    return report
+
+
+def seed_dashboard(client, admin, users=1000, comments=1000, blogs=1000, store=None, registry=None):
+    """Seed enough rows for every tab to page for a while"""
+    seeded_blogs = seed_blogs(blogs, client, admin, store=store, body_chars=500, registry=registry)
+    seed_users(users, client, store=store, registry=registry)
+    seed_comments(comments, seeded_blogs, client, admin, store=store, registry=registry)
+
+
+def write_clicks_csv(results, path):
+    columns = ['tab', 'click', 'rows', 'appended', 'total_ms', 'request_ms', 'render_ms', 'bytes',
+               'dom_nodes', 'dom_added']
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for result in results:
+            for index, click in enumerate(result['clicks'], 1):
+                writer.writerow({'tab': result['tab'], 'click': index, **click})
+
+
+def main():
+    import argparse
+
+    from utils.cleanup import cleanup, get_registry, login_admin
+    from utils.driver_setup import close_driver, get_chrome_driver
+
+    parser = argparse.ArgumentParser(description='Page the admin dashboard tables and time every page')
+    parser.add_argument('--url', default=BASE_URL, help='Target frontend URL (default: APP_URL)')
+    parser.add_argument('--tabs', nargs='+', choices=sorted(TABS), default=['users', 'comments', 'blogs'])
+    parser.add_argument('--max-clicks', type=int, default=50)
+    parser.add_argument('--seed-users', type=int, default=0)
+    parser.add_argument('--seed-comments', type=int, default=0)
+    parser.add_argument('--seed-blogs', type=int, default=0)
+    parser.add_argument('--tolerance', type=float, default=1.5, help='Climb threshold vs. the first pages')
+    parser.add_argument('--netem', default=None,
+                        help='Shape traffic through utils.netem_proxy: preset name or JSON spec file')
+    parser.add_argument('--standin', action='store_true', help='Seed and serve from a local stand-in')
+    parser.add_argument('--static-dir', default=os.path.join('..', 'client', 'dist'),
+                        help='Built SPA served by the stand-in (npm run build in client/)')
+    parser.add_argument('--keep', action='store_true', help='Keep data seeded into --url')
+    parser.add_argument('--out', default=None, help='Directory for clicks.csv and summary.json')
+    args = parser.parse_args()
+
+    standin, store, registry = None, None, None
+    url = args.url
+    if args.standin:
+        from utils.standin_server import StandinServer
+        standin = StandinServer(static_dir=args.static_dir).start()
+        standin.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+        url, store = standin.url, standin.store
+    elif not args.keep:
+        registry = get_registry()
+    browser_url, netem = url, None
+    if args.netem:  # Only the browser is shaped; seeding and cleanup go direct
+        from utils.netem_proxy import NetemProxy, load_netem
+        netem = NetemProxy(url, load_netem(args.netem)).start()
+        browser_url = netem.url
+
+    client = ApiClient(url)
+    admin = client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+    driver = get_chrome_driver(headless=True)
+    try:
+        if args.seed_users or args.seed_comments or args.seed_blogs:
+            seed_dashboard(client, admin, args.seed_users, args.seed_comments, max(args.seed_blogs, 1),
+                           store=store, registry=registry)
+        results = [measure_tab(driver, browser_url, admin, tab, args.max_clicks) for tab in args.tabs]
+    finally:
+        close_driver(driver)
+        if netem:
+            netem.stop()
+        if standin:
+            standin.stop()
+        if registry and registry.entries():
+            print(f"[dashboard] Cleanup: {cleanup(registry.entries(), client, login_admin(client))}")
+            registry.mark_done()
+
+    reports = [paging_report(result, tolerance=args.tolerance) for result in results]
+    for report, result in zip(reports, results):
+        print(json.dumps({**report, 'initial_rows': result['initial_rows'], **result['snapshot']}, indent=2))
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        write_clicks_csv(results, os.path.join(args.out, 'clicks.csv'))
+        with open(os.path.join(args.out, 'summary.json'), 'w') as f:
+            json.dump({'target': url, 'reports': reports,
+                       'snapshots': {result['tab']: result['snapshot'] for result in results}}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
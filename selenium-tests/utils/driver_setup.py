@@ -3,16 +3,24 @@ WebDriver Setup Utility for Headless Chrome
 Configures Chrome Web Driver for automated testing in EC2 environment
 """
 
+import atexit
+
 from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options
 
+from config import BROWSER_CONTEXTS, THROTTLE_PROFILE
+from utils.throttling import apply_throttle
+
 
-def get_chrome_driver(headless=True):
+def get_chrome_driver(headless=True, throttle=THROTTLE_PROFILE):
     """
     Initialize and return a Chrome WebDriver instance
     
     Args:
         headless (bool): Whether to run Chrome in headless mode
+        throttle (str): utils.throttling profile applied over CDP, e.g.
+            ``"slow-3g"`` or ``"fast-4g+cpu-4x"`` (default: THROTTLE_PROFILE)
         
     Returns:
         webdriver.Chrome: Configured Chrome WebDriver instance
@@ -46,6 +54,9 @@ def get_chrome_driver(headless=True):
     # Set timeouts
     driver.set_page_load_timeout(30)
     driver.implicitly_wait(10)
+
+    if throttle:
+        apply_throttle(driver, throttle)
     
     return driver
 
@@ -62,3 +73,84 @@ def close_driver(driver):
             driver.quit()
         except Exception as e:
             print(f"Error closing driver: {e}")
+
+
+# Browser contexts ---------------------------------------------------------
+
+_shared = {'driver': None, 'home': None}
+_contexts = {}  # window handle -> browserContextId
+
+
+def get_shared_driver(headless=True):
+    """
+    One Chrome per process that hosts browser contexts, restarted if it died
+    and quit at interpreter exit
+
+    Returns:
+        webdriver.Chrome: The shared driver, on its original window
+    """
+    driver = _shared['driver']
+    if driver is not None:
+        try:
+            driver.window_handles
+            return driver
+        except WebDriverException:
+            _contexts.clear()
+    driver = _shared['driver'] = get_chrome_driver(headless)
+    _shared['home'] = driver.current_window_handle
+    return driver
+
+
+def new_context_driver(headless=True, throttle=THROTTLE_PROFILE):
+    """
+    Switch the shared Chrome into a fresh browser context
+
+    Each context (CDP ``Target.createBrowserContext``) is an incognito-like
+    profile: its own cookies, localStorage and cache, but the same browser
+    process, GPU and network services. Starting one takes milliseconds
+    instead of a full Chrome start.
+
+    Returns:
+        webdriver.Chrome: The shared driver, focused on the new context's window
+    """
+    driver = get_shared_driver(headless)
+    context = driver.execute_cdp_cmd('Target.createBrowserContext', {})['browserContextId']
+    target = driver.execute_cdp_cmd('Target.createTarget', {'url': 'about:blank', 'browserContextId': context})
+    driver.switch_to.window(target['targetId'])  # ChromeDriver window handles are target ids
+    _contexts[target['targetId']] = context
+    if throttle:
+        apply_throttle(driver, throttle)  # Emulation is per tab
+    return driver
+
+
+def close_context(driver):
+    """Dispose the context the driver is focused on (all its tabs, cookies and storage)"""
+    try:
+        context = _contexts.pop(driver.current_window_handle, None)
+        driver.switch_to.window(_shared['home'])
+        if context:
+            driver.execute_cdp_cmd('Target.disposeBrowserContext', {'browserContextId': context})
+    except WebDriverException as e:
+        print(f"Error closing browser context: {e}")
+
+
+def quit_shared_driver():
+    """Quit the Chrome hosting browser contexts (also runs at exit)"""
+    close_driver(_shared['driver'])
+    _shared['driver'] = None
+
+
+atexit.register(quit_shared_driver)
+
+
+def get_test_driver(headless=True):
+    """Driver for one test: a full Chrome, or a browser context when BROWSER_CONTEXTS is set"""
+    return new_context_driver(headless) if BROWSER_CONTEXTS else get_chrome_driver(headless)
+
+
+def release_test_driver(driver):
+    """Counterpart of ``get_test_driver``"""
+    if BROWSER_CONTEXTS:
+        close_context(driver)
+    else:
+        close_driver(driver)
@@ -0,0 +1,110 @@
+"""
+Mergeable Latency Histogram
+HDR-style log-linear histogram that load workers can serialise and a
+coordinator can merge without shipping raw samples
+"""
+
+import math
+
+
+class LatencyHistogram:
+    """
+    Sparse log-linear histogram of latencies recorded in microseconds
+
+    Values below ``2 ** precision`` µs get their own bucket; above that every
+    power of two is split into ``2 ** (precision - 1)`` buckets, so any recorded
+    value is reported within ``2 ** (1 - precision)`` of its true value (under
+    1% at the default precision of 8). Merging adds bucket counts, so the
+    percentiles of a merged histogram are identical to those of a single
+    histogram that saw every sample.
+
+    Args:
+        precision (int): Sub-bucket bits; higher is more accurate and larger
+    """
+
+    def __init__(self, precision=8):
+        self.precision = precision
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        shift = max(0, value.bit_length() - self.precision)
+        if not shift:
+            return value
+        return (shift << (self.precision - 1)) + (value >> shift)
+
+    def _bounds(self, index):
+        """Lowest and highest microsecond value that map to ``index``"""
+        if index < (1 << self.precision):
+            return index, index
+        shift = (index >> (self.precision - 1)) - 1
+        mantissa = index - (shift << (self.precision - 1))
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, seconds, count=1):
+        """Record a latency given in seconds"""
+        value = max(0, int(round(seconds * 1_000_000)))
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Add another histogram's counts into this one and return self"""
+        if other.precision != self.precision:
+            raise ValueError(f"Cannot merge histograms with precision {other.precision} and {self.precision}")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, pct):
+        """
+        Nearest-rank percentile in milliseconds, None when empty
+
+        Returns the upper bound of the bucket holding the ranked sample, clamped
+        to the exact recorded maximum.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(pct * self.count / 100.0))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._bounds(index)[1], self.max) / 1000.0
+        return self.max / 1000.0
+
+    def mean(self):
+        """Exact mean in milliseconds (sums are kept outside the buckets)"""
+        return self.total / self.count / 1000.0 if self.count else None
+
+    def to_dict(self):
+        return {
+            'precision': self.precision,
+            'counts': sorted(self.counts.items()),
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['precision'])
+        histogram.counts = {int(index): count for index, count in data['counts']}
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
+
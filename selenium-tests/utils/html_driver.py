@@ -0,0 +1,182 @@
+"""
+Browserless HTML Driver
+requests + html.parser stand-in for the slice of the WebDriver API that
+checks without JavaScript use, and routing of ``no_js`` tests onto it
+"""
+
+import re
+import time
+import uuid
+from html.parser import HTMLParser
+
+import requests
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+HIDDEN_TAGS = {'head', 'script', 'style', 'template', 'title'}  # <noscript> shows: no JS here
+
+
+class HtmlElement:
+    """Parsed element with the read-only WebElement members tests use"""
+
+    def __init__(self, tag, attrs, parent=None):
+        self.tag_name = tag
+        self.attrs = dict(attrs)
+        self.parent = parent
+        self.children = []
+
+    def get_attribute(self, name):
+        return self.attrs.get(name)
+
+    def _text_parts(self):
+        for child in self.children:
+            if isinstance(child, str):
+                yield child
+            elif child.tag_name not in HIDDEN_TAGS:
+                yield from child._text_parts()
+
+    @property
+    def text(self):
+        """Visible text with whitespace collapsed, as WebElement.text roughly reports it"""
+        return re.sub(r'\s+', ' ', ''.join(self._text_parts())).strip()
+
+    def iter(self):
+        for child in self.children:
+            if isinstance(child, HtmlElement):
+                yield child
+                yield from child.iter()
+
+    def find_elements(self, by=By.ID, value=None):
+        if by == By.TAG_NAME:
+            match = lambda element: element.tag_name == value.lower()
+        elif by == By.ID:
+            match = lambda element: element.attrs.get('id') == value
+        elif by == By.NAME:
+            match = lambda element: element.attrs.get('name') == value
+        elif by == By.CLASS_NAME:
+            match = lambda element: value in (element.attrs.get('class') or '').split()
+        else:
+            raise InvalidSelectorException(f"HtmlDriver supports tag, id, name and class lookups, not {by!r}; "
+                                           f"drop the no_js mark if the test needs a browser")
+        return [element for element in self.iter() if match(element)]
+
+    def find_element(self, by=By.ID, value=None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element matching {by}={value!r}")
+        return found[0]
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = HtmlElement('#document', {})
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        element = HtmlElement(tag, attrs, self.current)
+        self.current.children.append(element)
+        if tag not in VOID_TAGS:
+            self.current = element
+
+    def handle_startendtag(self, tag, attrs):
+        self.current.children.append(HtmlElement(tag, attrs, self.current))
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag_name != tag:
+            node = node.parent
+        if node is not self.root:  # Implicitly close anything left open inside it
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+
+def parse_html(source):
+    """Document root element of ``source``"""
+    builder = _TreeBuilder()
+    builder.feed(source)
+    builder.close()
+    return builder.root
+
+
+class HtmlDriver:
+    """
+    Driver for pages as the server sends them: status, URL after redirects,
+    title, source and element lookup by tag/id/name/class, with no browser
+
+    Attributes:
+        status_code (int): HTTP status of the last ``get`` (Chrome hides this)
+    """
+
+    def __init__(self, timeout=15):
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0 (HtmlDriver; no JavaScript)'
+        self.session_id = uuid.uuid4().hex
+        self.timeout = timeout
+        self.current_url = 'about:blank'
+        self.page_source = '<html><head></head><body></body></html>'
+        self.status_code = None
+        self._document = parse_html(self.page_source)
+
+    def get(self, url):
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise WebDriverException(f"unknown error: net::ERR_CONNECTION_FAILED ({e})")
+        self.current_url = response.url
+        self.status_code = response.status_code
+        self.page_source = response.text
+        self._document = parse_html(self.page_source)
+
+    @property
+    def title(self):
+        titles = self._document.find_elements(By.TAG_NAME, 'title')
+        return ''.join(part for part in titles[0].children if isinstance(part, str)).strip() if titles else ''
+
+    def find_element(self, by=By.ID, value=None):
+        return self._document.find_element(by, value)
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._document.find_elements(by, value)
+
+    def set_page_load_timeout(self, seconds):
+        self.timeout = seconds
+
+    def implicitly_wait(self, seconds):
+        pass  # The document is complete once get() returns
+
+    def quit(self):
+        self.session.close()
+        self.session_id = None
+
+    close = quit
+
+
+# Pytest plugin ------------------------------------------------------------
+
+def pytest_addoption(parser):
+    group = parser.getgroup('html tier', 'browserless HTML tier')
+    group.addoption('--no-html-tier', action='store_true', default=False,
+                    help='Run no_js tests in Chrome as well (to check the tiers agree)')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'no_js: only checks server-sent HTML; runs on HtmlDriver without Chrome')
+
+
+def driver_for(request, make_browser):
+    """HtmlDriver for tests marked ``no_js`` (unless --no-html-tier), otherwise ``make_browser()``"""
+    if request.node.get_closest_marker('no_js') and not request.config.getoption('no_html_tier'):
+        return HtmlDriver()
+    return make_browser()
+
+
+def quit_driver(driver, settle=0.0):
+    """Quit, giving a real browser ``settle`` seconds to release memory"""
+    driver.quit()
+    if not isinstance(driver, HtmlDriver):
+        time.sleep(settle)
@@ -0,0 +1,490 @@
+"""
+Live Test-Run Dashboard
+Streams test events from pytest to a small local server that pushes them,
+with rolling aggregates, to a browser view over server-sent events
+"""
+
+import heapq
+import http.client
+import json
+import os
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from utils.browser_metrics import chrome_memory_mb, page_vitals
+from utils.load_harness import percentile
+
+
+DEFAULT_PORT = 8765
+WINDOW = 200  # Finished tests the rolling aggregates cover
+RATE_WINDOW = 60  # Seconds of finishes behind tests/min and the ETA
+KEEPALIVE = 15  # Seconds between SSE comments on an idle stream
+
+
+class EventEmitter:
+    """
+    Queues events in memory and posts them in batches from a daemon thread
+
+    ``emit`` only appends to a bounded deque, so the test process never waits
+    on the network. When the dashboard is slow or gone, the oldest events are
+    dropped and counted instead of piling up.
+
+    Args:
+        url (str): Dashboard base URL
+        interval (float): Seconds between flushes
+        max_batch (int): Events per POST
+        max_queue (int): Events held while the dashboard is unreachable
+    """
+
+    def __init__(self, url, interval=0.5, max_batch=500, max_queue=20000, timeout=2):
+        self.url = url.rstrip('/') + '/events'
+        self.interval = interval
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.queue = deque(maxlen=max_queue)
+        self.sent = self.batches = self.dropped = self.failures = 0
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='live-dashboard', daemon=True)
+        self._thread.start()
+
+    def emit(self, kind, **fields):
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        fields['type'], fields['ts'] = kind, time.time()
+        self.queue.append(fields)
+
+    def _flush(self):
+        while self.queue:
+            batch = []
+            while self.queue and len(batch) < self.max_batch:
+                batch.append(self.queue.popleft())
+            request = urllib.request.Request(self.url, data=json.dumps(batch).encode(), method='POST',
+                                             headers={'Content-Type': 'application/json'})
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+            except (urllib.error.URLError, http.client.HTTPException, OSError):
+                self.failures += 1
+                self.dropped += len(batch)
+                return
+            self.sent += len(batch)
+            self.batches += 1
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._flush()
+        self._flush()  # Whatever was emitted between the last flush and close()
+
+    def close(self, timeout=5):
+        """Send what is queued (waiting at most ``timeout`` seconds) and stop the thread"""
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+
+class RunState:
+    """Rolling aggregates over the events of the latest run"""
+
+    def __init__(self, window=WINDOW, rate_window=RATE_WINDOW):
+        self.window = window
+        self.rate_window = rate_window
+        self.reset({})
+
+    def reset(self, event):
+        self.run = {'id': event.get('run'), 'started': event.get('ts', time.time()), 'finished': None,
+                    'exitstatus': None, 'collected': 0, 'emitter': None}
+        self.outcomes = Counter()
+        self.running = {}
+        self.recent = deque(maxlen=self.window)
+        self.finished_at = deque()
+        self.metrics = {}
+        self.failures = deque(maxlen=20)
+        self.slowest = []  # Min-heap of (duration, nodeid), the 10 slowest tests
+
+    def apply(self, event):
+        kind = event['type']
+        if kind == 'session_start':
+            self.reset(event)
+        elif kind == 'collected':
+            self.run['collected'] = max(self.run['collected'], event['count'])
+        elif kind == 'start':
+            self.running[event['nodeid']] = event['ts']
+        elif kind == 'finish':
+            self._finish(event)
+        elif kind == 'session_finish':
+            self.run.update(finished=event['ts'], exitstatus=event['exitstatus'], emitter=event.get('emitter'))
+            self.running.clear()
+
+    def _finish(self, event):
+        self.running.pop(event['nodeid'], None)
+        self.outcomes[event['outcome']] += 1
+        self.recent.append(event)
+        self.finished_at.append(event['ts'])
+        for name, value in event.get('metrics', {}).items():
+            self.metrics.setdefault(name, deque(maxlen=self.window)).append(value)
+        if event['outcome'] in ('failed', 'error'):
+            self.failures.append({key: event.get(key) for key in ('nodeid', 'outcome', 'message', 'worker')})
+        entry = (event['duration'], event['nodeid'])
+        if len(self.slowest) < 10:
+            heapq.heappush(self.slowest, entry)
+        else:
+            heapq.heappushpop(self.slowest, entry)
+
+    def snapshot(self, now=None):
+        """
+        Returns:
+            dict: ``run``, ``done``, ``outcomes``, ``running`` (with seconds so far),
+            ``rolling`` duration percentiles and mean phases over the last ``window``
+            tests, ``tests_per_min``/``eta_s`` over the last ``rate_window`` seconds,
+            ``metrics`` (last/mean/p95/max per recorded metric), ``slowest``, ``failures``, ``recent``
+        """
+        now = time.time() if now is None else now
+        while self.finished_at and self.finished_at[0] < now - self.rate_window:
+            self.finished_at.popleft()
+        done = sum(self.outcomes.values())
+        span = min(self.rate_window, max(now - self.run['started'], 1e-3))
+        rate = len(self.finished_at) * 60 / span if self.run['finished'] is None else None
+        remaining = max(self.run['collected'] - done, 0)
+        durations = sorted(event['duration'] for event in self.recent)
+        phases = {}
+        for phase in ('setup', 'call', 'teardown'):
+            values = [event['phases'].get(phase, 0.0) for event in self.recent]
+            phases[phase] = round(sum(values) / len(values), 3) if values else None
+
+        metrics = {}
+        for name, values in self.metrics.items():
+            ordered = sorted(values)
+            metrics[name] = {'last': values[-1], 'mean': round(sum(values) / len(values), 2),
+                             'p95': percentile(ordered, 95), 'max': ordered[-1], 'count': len(values)}
+        return {
+            'run': self.run,
+            'done': done,
+            'outcomes': dict(self.outcomes),
+            'running': [{'nodeid': nodeid, 'for_s': round(now - started, 1)}
+                        for nodeid, started in sorted(self.running.items(), key=lambda kv: kv[1])],
+            'rolling': {'count': len(durations), 'p50_s': percentile(durations, 50),
+                        'p95_s': percentile(durations, 95), 'max_s': durations[-1] if durations else None,
+                        'phases': phases},
+            'tests_per_min': round(rate, 1) if rate is not None else None,
+            'eta_s': round(remaining * 60 / rate) if rate else None,
+            'metrics': metrics,
+            'slowest': [{'nodeid': nodeid, 'duration': duration}
+                        for duration, nodeid in sorted(self.slowest, reverse=True)],
+            'failures': list(self.failures),
+            'recent': list(self.recent)[-30:],
+        }
+
+
+PAGE_HTML = """<!doctype html>
+<html lang="en"><head><meta charset="utf-8"><title>Test run</title>
+<style>
+body { font: 14px system-ui, sans-serif; margin: 1.5em; color: #222; }
+h1 { font-size: 1.3em; } h2 { font-size: 1.05em; margin-top: 1.5em; }
+table { border-collapse: collapse; } td, th { padding: 2px 10px; text-align: left; border-bottom: 1px solid #eee; }
+.passed { color: #1a7f37; } .failed, .error { color: #cf222e; } .skipped, .xfailed { color: #9a6700; }
+#bar { height: 8px; background: #eee; width: 40em; } #bar div { height: 8px; background: #1a7f37; width: 0; }
+.num { text-align: right; font-variant-numeric: tabular-nums; }
+</style></head><body>
+<h1 id="title">Waiting for a run...</h1>
+<div id="bar"><div></div></div>
+<p id="summary"></p>
+<h2>Running</h2><table id="running"></table>
+<h2>Rolling (last tests)</h2><table id="rolling"></table>
+<h2>Metrics</h2><table id="metrics"></table>
+<h2>Failures</h2><table id="failures"></table>
+<h2>Slowest</h2><table id="slowest"></table>
+<h2>Recent</h2><table id="recent"></table>
+<script>
+const $ = id => document.getElementById(id);
+const esc = s => String(s == null ? '' : s).replace(/[&<>]/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;'})[c]);
+const rows = (id, head, body) => { $(id).innerHTML = '<tr>' + head.map(h => '<th>' + h + '</th>').join('') + '</tr>' +
+  body.map(r => '<tr>' + r.map(c => '<td>' + c + '</td>').join('') + '</tr>').join(''); };
+const s = v => v == null ? '-' : (+v).toFixed(2);
+function render(state) {
+  const run = state.run, total = Math.max(run.collected, state.done);
+  $('title').textContent = 'Run ' + (run.id || '') + (run.finished ? ' finished (exit ' + run.exitstatus + ')' : ' in progress');
+  $('bar').firstChild.style.width = (total ? 100 * state.done / total : 0) + '%';
+  $('summary').innerHTML = state.done + '/' + total + ' done: ' + Object.entries(state.outcomes).map(
+    ([k, v]) => '<span class="' + k + '">' + v + ' ' + k + '</span>').join(', ') +
+    (state.tests_per_min != null ? ' &middot; ' + state.tests_per_min + ' tests/min' : '') +
+    (state.eta_s != null ? ' &middot; ETA ' + state.eta_s + 's' : '');
+  rows('running', ['test', 'for s'], state.running.map(r => [esc(r.nodeid), r.for_s]));
+  const r = state.rolling;
+  rows('rolling', ['tests', 'p50 s', 'p95 s', 'max s', 'setup', 'call', 'teardown'],
+       [[r.count, s(r.p50_s), s(r.p95_s), s(r.max_s), s(r.phases.setup), s(r.phases.call), s(r.phases.teardown)]]);
+  rows('metrics', ['metric', 'last', 'mean', 'p95', 'max', 'n'], Object.entries(state.metrics).map(
+    ([k, m]) => [esc(k), m.last, m.mean, m.p95, m.max, m.count]));
+  rows('failures', ['test', 'outcome', 'message'], state.failures.map(f => [esc(f.nodeid), f.outcome, esc(f.message)]));
+  rows('slowest', ['test', 's'], state.slowest.map(t => [esc(t.nodeid), s(t.duration)]));
+  rows('recent', ['test', 'outcome', 's', 'worker'], state.recent.slice().reverse().map(
+    t => [esc(t.nodeid), '<span class="' + t.outcome + '">' + t.outcome + '</span>', s(t.duration), esc(t.worker)]));
+}
+new EventSource('stream').onmessage = message => render(JSON.parse(message.data).state);
+</script></body></html>
+"""
+
+
+class DashboardServer:
+    """
+    Receives event batches and fans them out to browsers
+
+    Protocol:
+        POST /events [event, ...]  -> 200 (from the pytest plugin)
+        GET  /stream               -> text/event-stream, one ``{events, state}`` message per batch
+        GET  /state                -> current aggregates as JSON
+        GET  /                     -> the dashboard page
+    """
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, window=WINDOW):
+        self.state = RunState(window)
+        self.received = 0
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(None)
+            except queue.Full:
+                pass  # A stalled browser's stream is a daemon thread; it must not hold up shutdown
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def publish(self, events):
+        with self._lock:
+            for event in events:
+                self.state.apply(event)
+            self.received += len(events)
+            message = json.dumps({'events': events, 'state': self.state.snapshot()})
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                pass  # A stalled browser skips batches; every message carries the full state
+
+    def subscribe(self):
+        subscriber = queue.Queue(maxsize=100)
+        with self._lock:
+            subscriber.put(json.dumps({'events': [], 'state': self.state.snapshot()}))
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, content, content_type='application/json'):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.end_headers()
+                subscriber = server.subscribe()
+                try:
+                    while True:
+                        try:
+                            message = subscriber.get(timeout=KEEPALIVE)
+                        except queue.Empty:
+                            self.wfile.write(b': keepalive\n\n')
+                            self.wfile.flush()
+                            continue
+                        if message is None:
+                            return
+                        self.wfile.write(f"data: {message}\n\n".encode())
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    server.unsubscribe(subscriber)
+
+            def do_GET(self):
+                if self.path == '/stream':
+                    self._stream()
+                elif self.path == '/state':
+                    with server._lock:
+                        snapshot = server.state.snapshot()
+                    self._reply(200, json.dumps(snapshot).encode())
+                elif self.path == '/':
+                    self._reply(200, PAGE_HTML.encode(), 'text/html; charset=utf-8')
+                else:
+                    self._reply(404, b'{"message": "Not found"}')
+
+            def do_POST(self):
+                if self.path != '/events':
+                    self._reply(404, b'{"message": "Not found"}')
+                    return
+                events = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'[]')
+                server.publish(events)
+                self._reply(200, json.dumps({'received': len(events)}).encode())
+
+        return Handler
+
+
+# Pytest plugin ------------------------------------------------------------
+
+_emitter = None
+_pending = {}  # nodeid -> phases and outcome until its teardown report
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('live', 'live test-run dashboard')
+    group.addoption('--live-dashboard', default=os.getenv('LIVE_DASHBOARD'), metavar='URL',
+                    help='Stream test events to a dashboard from python -m utils.live_dashboard (env LIVE_DASHBOARD)')
+    group.addoption('--live-browser-metrics', action='store_true', default=False,
+                    help='After each test body, record page vitals and Chrome memory of the test\'s self.driver')
+
+
+def pytest_configure(config):
+    global _emitter
+    url = config.getoption('live_dashboard')
+    if url and not hasattr(config, 'workerinput'):  # xdist hands every worker's reports to the controller
+        _emitter = EventEmitter(url)
+        _emitter.emit('session_start', run=os.getenv('HARNESS_RUN_ID') or time.strftime('%Y%m%d-%H%M%S'))
+
+
+def pytest_collection_finish(session):
+    if _emitter:
+        _emitter.emit('collected', count=len(session.items))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_node_collection_finished(node, ids):
+    if _emitter:
+        _emitter.emit('collected', count=len(ids))
+
+
+def pytest_runtest_logstart(nodeid, location):
+    if _emitter:
+        _emitter.emit('start', nodeid=nodeid)
+
+
+def _outcome(report, current):
+    if report.when == 'call' and hasattr(report, 'wasxfail'):
+        return 'xfailed' if report.skipped else 'xpassed'
+    if report.failed:
+        return 'failed' if report.when == 'call' else 'error'
+    if report.skipped and current == 'passed':
+        return 'skipped'
+    return current
+
+
+def pytest_runtest_logreport(report):
+    if _emitter is None:
+        return
+    test = _pending.setdefault(report.nodeid, {'phases': {}, 'outcome': 'passed', 'message': None})
+    test['phases'][report.when] = round(report.duration, 4)
+    test['outcome'] = _outcome(report, test['outcome'])
+    if report.failed and test['message'] is None:
+        crash = getattr(report.longrepr, 'reprcrash', None)
+        test['message'] = (crash.message if crash else report.longreprtext.strip() or report.when)[:300]
+    if report.when != 'teardown':
+        return
+    del _pending[report.nodeid]
+    metrics = {name: value for name, value in report.user_properties
+               if isinstance(value, (int, float)) and not isinstance(value, bool)}
+    _emitter.emit('finish', nodeid=report.nodeid, outcome=test['outcome'], phases=test['phases'],
+                  duration=round(sum(test['phases'].values()), 4), message=test['message'], metrics=metrics,
+                  worker=getattr(report, 'worker_id', None))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield
+    config = item.config
+    if not (config.getoption('live_dashboard') and config.getoption('live_browser_metrics')):
+        return
+    driver = getattr(item.instance, 'driver', None)
+    if driver is None:
+        return
+    try:
+        item.user_properties.extend(page_vitals(driver).items())
+        memory = chrome_memory_mb(driver)
+    except (WebDriverException, AttributeError):
+        return  # Driver already gone, or the browserless HtmlDriver
+    if memory is not None:
+        item.user_properties.append(('chrome_mb', memory))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if _emitter:
+        _emitter.emit('session_finish', exitstatus=int(exitstatus),
+                      emitter={'sent': _emitter.sent, 'dropped': _emitter.dropped})
+        _emitter.close()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if _emitter:
+        terminalreporter.write_line(f"Live dashboard {config.getoption('live_dashboard')}: {_emitter.sent} events in "
+                                    f"{_emitter.batches} batches, {_emitter.dropped} dropped")
+
+
+def pytest_unconfigure(config):
+    global _emitter
+    if _emitter:
+        _emitter.close()
+        _emitter = None
+    _pending.clear()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve the live test-run dashboard')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--window', type=int, default=WINDOW, help='Finished tests the rolling aggregates cover')
+    args = parser.parse_args()
+
+    server = DashboardServer(args.host, args.port, args.window).start()
+    print(f"Dashboard on {server.url}/ - run pytest with --live-dashboard {server.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
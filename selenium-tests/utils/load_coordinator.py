@@ -0,0 +1,233 @@
+"""
+Multi-node Load Coordinator
+Hands out shards of one load profile to worker machines, aligns their clocks
+and merges the latency histograms they send back
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from config import BASE_URL
+from utils.load_harness import (
+    TimelineHistograms, overshoot_report, print_timeline, run_parallel, write_timeline_csv,
+)
+from utils.load_profiles import load_profile, profile_from_spec
+
+
+class Coordinator:
+    """
+    Waits for ``nodes`` workers, assigns contiguous global shard ranges and
+    merges the results
+
+    Protocol (JSON over HTTP):
+        POST /register {node, processes} -> {server_time}
+        GET  /plan?node=ID -> 202 while waiting, then the node's job
+        POST /result {node, timeline}   -> 200
+
+    Args:
+        spec (dict): Declarative profile spec, shared verbatim with workers
+        url (str): Target URL the workers load
+        nodes (int): Number of worker machines to wait for
+        lead (float): Seconds between the last registration and offset 0
+        options (dict): Harness options forwarded to workers (concurrency, timeout, seed, poisson)
+    """
+
+    def __init__(self, spec, url, nodes, host='0.0.0.0', port=9900, lead=5.0, options=None):
+        self.spec = spec
+        self.profile = profile_from_spec(spec)
+        self.url = url
+        self.nodes = nodes
+        self.lead = lead
+        self.options = options or {}
+        self.registered = {}
+        self.results = {}
+        self.plan = None
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def address(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def wait(self, timeout=None):
+        """Block until every node reported, then return the merged TimelineHistograms"""
+        if not self.done.wait(timeout):
+            raise TimeoutError(f"Only {len(self.results)}/{self.nodes} nodes reported results")
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        merged = None
+        for result in self.results.values():
+            timeline = TimelineHistograms.from_dict(result)
+            merged = timeline if merged is None else merged.merge(timeline)
+        return merged
+
+    def _register(self, body):
+        with self._lock:
+            if body['node'] not in self.registered and len(self.registered) >= self.nodes:
+                return 409, {'message': 'All worker slots are taken'}
+            self.registered[body['node']] = int(body.get('processes', 1))
+            if len(self.registered) == self.nodes and self.plan is None:
+                self._make_plan()
+        return 200, {'server_time': time.time()}
+
+    def _make_plan(self):
+        start_at = time.time() + self.lead
+        total = sum(self.registered.values())
+        plan, first = {}, 0
+        for node, processes in sorted(self.registered.items()):
+            plan[node] = {
+                'url': self.url,
+                'spec': self.spec,
+                'options': self.options,
+                'shards': list(range(first, first + processes)),
+                'total_shards': total,
+                'start_at': start_at,
+            }
+            first += processes
+        self.plan = plan
+
+    def _get_plan(self, node):
+        with self._lock:
+            if self.plan is None:
+                return 202, {'waiting_for': self.nodes - len(self.registered)}
+            job = self.plan.get(node)
+        if job is None:
+            return 404, {'message': f'Unknown node {node}'}
+        return 200, dict(job, server_time=time.time())
+
+    def _result(self, body):
+        with self._lock:
+            self.results[body['node']] = body['timeline']
+            if len(self.results) == self.nodes:
+                self.done.set()
+        return 200, {'received': len(self.results)}
+
+    def _handler_class(self):
+        coordinator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, payload):
+                content = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                if self.path.startswith('/plan?node='):
+                    self._reply(*coordinator._get_plan(self.path.split('=', 1)[1]))
+                else:
+                    self._reply(404, {'message': 'Not found'})
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length') or 0)) or b'{}')
+                if self.path == '/register':
+                    self._reply(*coordinator._register(body))
+                elif self.path == '/result':
+                    self._reply(*coordinator._result(body))
+                else:
+                    self._reply(404, {'message': 'Not found'})
+
+        return Handler
+
+
+def run_worker(coordinator_url, processes, node=None, poll_interval=0.5):
+    """
+    Register with a coordinator, run the assigned shards locally and report back
+
+    The clock offset to the coordinator is estimated NTP-style from the
+    registration round trip and applied to ``start_at``, so nodes with skewed
+    wall clocks still start within a round trip of each other.
+    """
+    node = node or f"{os.uname().nodename}-{uuid.uuid4().hex[:6]}"
+    coordinator_url = coordinator_url.rstrip('/')
+    sent = time.time()
+    response = requests.post(f"{coordinator_url}/register", json={'node': node, 'processes': processes}, timeout=10)
+    received = time.time()
+    response.raise_for_status()
+    offset = response.json()['server_time'] - (sent + received) / 2
+    print(f"[{node}] registered, clock offset {offset * 1000:.1f}ms")
+
+    while True:
+        response = requests.get(f"{coordinator_url}/plan?node={node}", timeout=10)
+        response.raise_for_status()
+        if response.status_code == 200:
+            job = response.json()
+            break
+        time.sleep(poll_interval)
+
+    print(f"[{node}] running shards {job['shards']} of {job['total_shards']}")
+    merged = run_parallel(job['url'], job['spec'], processes, shards=job['shards'],
+                          total_shards=job['total_shards'], start_at=job['start_at'] - offset, **job['options'])
+    requests.post(f"{coordinator_url}/result", json={'node': node, 'timeline': merged.to_dict()},
+                  timeout=30).raise_for_status()
+    print(f"[{node}] reported {len(merged)} requests")
+    return merged
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Distribute a load profile across machines')
+    sub = parser.add_subparsers(dest='mode', required=True)
+
+    serve = sub.add_parser('serve', help='Run the coordinator')
+    serve.add_argument('--profile', required=True)
+    serve.add_argument('--url', default=BASE_URL)
+    serve.add_argument('--nodes', type=int, required=True)
+    serve.add_argument('--port', type=int, default=9900)
+    serve.add_argument('--lead', type=float, default=5.0, help='Seconds from last registration to start')
+    serve.add_argument('--concurrency', type=int, default=64, help='Per worker process')
+    serve.add_argument('--timeout', type=float, default=10)
+    serve.add_argument('--seed', type=int, default=None)
+    serve.add_argument('--poisson', action='store_true')
+    serve.add_argument('--slo-ms', type=float, default=None)
+    serve.add_argument('--out', default=None)
+
+    worker = sub.add_parser('worker', help='Run a worker node')
+    worker.add_argument('--coordinator', required=True, help='e.g. http://10.0.0.5:9900')
+    worker.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+    worker.add_argument('--node', default=None)
+    args = parser.parse_args()
+
+    if args.mode == 'worker':
+        run_worker(args.coordinator, args.processes, args.node)
+        return
+
+    profile, spec = load_profile(args.profile)
+    options = {'concurrency': args.concurrency, 'timeout': args.timeout, 'seed': args.seed, 'poisson': args.poisson}
+    coordinator = Coordinator(spec, args.url, args.nodes, port=args.port, lead=args.lead, options=options).start()
+    print(f"Coordinator listening on port {args.port}, waiting for {args.nodes} nodes")
+    merged = coordinator.wait()
+    timeline = merged.timeline(profile)
+    report = overshoot_report(timeline, slo_ms=args.slo_ms)
+    print_timeline(timeline)
+    print(json.dumps(merged.route_summary(), indent=2))
+    print(json.dumps(report, indent=2))
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        write_timeline_csv(timeline, os.path.join(args.out, 'timeline.csv'))
+        with open(os.path.join(args.out, 'summary.json'), 'w') as f:
+            json.dump({'profile': spec, 'target': args.url, 'nodes': coordinator.registered,
+                       'overshoot': report}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,588 @@
+"""
+API Load Harness
+Open-loop HTTP load generator driven by declarative load profiles, producing a
+per-second timeline of throughput, latency and errors aligned with the profile
+"""
+
+import csv
+import json
+import math
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from config import BASE_URL, TEST_ADMIN
+from utils.histogram import LatencyHistogram
+from utils.load_profiles import arrivals, load_profile, profile_from_spec
+
+
+# Read-heavy mix matching what the SPA requests on first paint
+DEFAULT_ROUTES = [
+    {'method': 'GET', 'path': '/', 'weight': 1},
+    {'method': 'GET', 'path': '/api/blog/get-all-blogs?limit=9', 'weight': 3},
+    {'method': 'GET', 'path': '/api/blog/get-all-blogs?limit=3', 'weight': 1},
+]
+
+# Password for the accounts a scenario registers for its roles
+SCENARIO_PASSWORD = 'ScenarioPassword123!'
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list (None when empty)"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct * len(sorted_values) / 100.0))
+    return sorted_values[rank - 1]
+
+
+class LoadHarness:
+    """
+    Sends requests at the instants dictated by a profile, whatever the server does
+
+    Latency is measured from each request's *scheduled* send time, so time spent
+    queued behind a saturated client pool is charged to the response instead of
+    silently thinning the load (coordinated omission).
+
+    Args:
+        base_url (str): Frontend URL; API paths are resolved against it like the SPA does
+        routes (list): ``{"method", "path", "weight"}`` dicts, defaults to DEFAULT_ROUTES
+        concurrency (int): Maximum requests in flight
+        timeout (float): Per-request timeout in seconds
+        seed (int): Seed for route selection and Poisson arrivals
+    """
+
+    def __init__(self, base_url=BASE_URL, routes=None, concurrency=64, timeout=10, seed=None):
+        self.base_url = base_url.rstrip('/')
+        self.routes = routes or DEFAULT_ROUTES
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.seed = seed
+        self._local = threading.local()
+
+    def _session(self):
+        if not hasattr(self._local, 'session'):
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=4)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return self._local.session
+
+    def _send(self, route, offset, start, samples):
+        error = None
+        status = 0
+        size = 0
+        try:
+            response = self._session().request(route.get('method', 'GET'), self.base_url + route['path'],
+                                               json=route.get('json'), timeout=self.timeout)
+            status = response.status_code
+            size = len(response.content)
+        except requests.exceptions.RequestException as e:
+            error = type(e).__name__
+        samples.append({
+            'offset': offset,
+            'route': route['path'],
+            'latency': time.monotonic() - (start + offset),
+            'status': status,
+            'bytes': size,
+            'error': error,
+        })
+
+    def run(self, profile, poisson=False, sink=None, shard=(0, 1), start_at=None):
+        """
+        Drive the profile to completion
+
+        Every process or node walks the same arrival sequence and keeps only
+        arrivals ``i`` with ``i % count == index``, so N shards together send
+        exactly the single-process schedule. ``start_at`` is a shared wall-clock
+        epoch; each shard converts it once to its own monotonic clock and paces
+        against that, so drift between shards does not accumulate.
+
+        Args:
+            profile (LoadProfile): Rate curve to follow
+            poisson (bool): Exponential inter-arrival gaps
+            sink: Anything with ``append(sample)``; defaults to a new list
+            shard (tuple): ``(index, count)`` slice of the arrival sequence to send
+            start_at (float): ``time.time()`` epoch at which offset 0 happens
+
+        Returns:
+            The sink: by default a list of sample dicts (offset, route, latency,
+            status, bytes, error)
+        """
+        index, count = shard
+        rng = random.Random(self.seed)
+        weights = [route.get('weight', 1) for route in self.routes]
+        samples = [] if sink is None else sink
+        if start_at is None:
+            start = time.monotonic() + 0.05
+        else:
+            start = time.monotonic() + (start_at - time.time())
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for position, offset in enumerate(arrivals(profile, poisson=poisson, seed=self.seed)):
+                route = rng.choices(self.routes, weights)[0]
+                if position % count != index:
+                    continue
+                delay = start + offset - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._send, route, offset, start, samples)
+        return samples
+
+
+def is_error(sample):
+    """Transport failures and 5xx count as errors; 4xx is an answer from the app"""
+    return sample['error'] is not None or sample['status'] >= 500
+
+
+def _timeline_row(profile, t, bucket, sent, errors, latency_ms):
+    """One timeline row; ``latency_ms(pct)`` returns a percentile or None (pct 100 = max)"""
+
+    def ms(pct):
+        value = latency_ms(pct)
+        return round(value, 2) if value is not None else None
+
+    return {
+        'second': round(t, 3),
+        'phase': profile.phase_at(t),
+        'target_rps': round(profile.rate_at(t + bucket / 2), 2),
+        'sent_rps': round(sent / bucket, 2),
+        'throughput_rps': round((sent - errors) / bucket, 2),
+        'errors': errors,
+        'error_rate': round(errors / sent, 4) if sent else 0.0,
+        'p50_ms': ms(50),
+        'p95_ms': ms(95),
+        'p99_ms': ms(99),
+        'max_ms': ms(100),
+    }
+
+
+def build_timeline(samples, profile, bucket=1.0):
+    """
+    Bucket samples by scheduled send time so rows line up with the profile
+
+    Returns:
+        list: One dict per bucket with phase, target/achieved rate, latency
+        percentiles (ms) and error counts
+    """
+    if isinstance(samples, TimelineHistograms):
+        return samples.timeline(profile)
+    if hasattr(samples, 'column'):  # utils.sample_store.SampleStore
+        return samples.timeline(profile, bucket)
+    buckets = [[] for _ in range(max(1, math.ceil(profile.duration / bucket)))]
+    for sample in samples:
+        index = min(int(sample['offset'] // bucket), len(buckets) - 1)
+        buckets[index].append(sample)
+
+    timeline = []
+    for index, rows in enumerate(buckets):
+        latencies = sorted(sample['latency'] * 1000 for sample in rows)
+        errors = sum(1 for sample in rows if is_error(sample))
+        timeline.append(_timeline_row(profile, index * bucket, bucket, len(rows), errors,
+                                      lambda pct: percentile(latencies, pct)))
+    return timeline
+
+
+class TimelineHistograms:
+    """
+    Per-second latency histograms and counters, usable as ``run``'s sink
+
+    Workers aggregate into this as samples arrive and ship ``to_dict()`` to the
+    coordinator, which merges them; no raw samples cross process boundaries.
+    """
+
+    def __init__(self, duration, bucket=1.0, precision=8):
+        self.bucket = bucket
+        self.size = max(1, math.ceil(duration / bucket))
+        self.precision = precision
+        self.latency = [LatencyHistogram(precision) for _ in range(self.size)]
+        self.sent = [0] * self.size
+        self.errors = [0] * self.size
+        self.routes = {}
+        self.route_bytes = {}
+        self._lock = threading.Lock()
+
+    def append(self, sample):
+        index = min(int(sample['offset'] // self.bucket), self.size - 1)
+        with self._lock:
+            self.latency[index].record(sample['latency'])
+            self.sent[index] += 1
+            self.errors[index] += is_error(sample)
+            self.routes.setdefault(sample['route'], LatencyHistogram(self.precision)).record(sample['latency'])
+            self.route_bytes[sample['route']] = self.route_bytes.get(sample['route'], 0) + sample['bytes']
+
+    def __len__(self):
+        return sum(self.sent)
+
+    def merge(self, other):
+        """Fold another worker's timeline into this one and return self"""
+        if (other.size, other.bucket) != (self.size, self.bucket):
+            raise ValueError('Cannot merge timelines with different durations or bucket sizes')
+        for index in range(self.size):
+            self.latency[index].merge(other.latency[index])
+            self.sent[index] += other.sent[index]
+            self.errors[index] += other.errors[index]
+        for route, histogram in other.routes.items():
+            self.routes.setdefault(route, LatencyHistogram(self.precision)).merge(histogram)
+        for route, size in other.route_bytes.items():
+            self.route_bytes[route] = self.route_bytes.get(route, 0) + size
+        return self
+
+    def timeline(self, profile):
+        """Rows in the same format as build_timeline"""
+        return [
+            _timeline_row(profile, index * self.bucket, self.bucket, self.sent[index], self.errors[index],
+                          histogram.percentile)
+            for index, histogram in enumerate(self.latency)
+        ]
+
+    def route_summary(self):
+        """Per-route count, response size and latency percentiles over the whole run"""
+        return {
+            route: {
+                'count': histogram.count,
+                'mean_bytes': round(self.route_bytes.get(route, 0) / histogram.count) if histogram.count else 0,
+                'total_kb': round(self.route_bytes.get(route, 0) / 1024, 1),
+                'mean_ms': round(histogram.mean(), 2),
+                'p50_ms': histogram.percentile(50),
+                'p95_ms': histogram.percentile(95),
+                'p99_ms': histogram.percentile(99),
+            }
+            for route, histogram in sorted(self.routes.items())
+        }
+
+    def to_dict(self):
+        return {
+            'bucket': self.bucket,
+            'size': self.size,
+            'precision': self.precision,
+            'latency': [histogram.to_dict() for histogram in self.latency],
+            'sent': self.sent,
+            'errors': self.errors,
+            'routes': {route: histogram.to_dict() for route, histogram in self.routes.items()},
+            'route_bytes': self.route_bytes,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        timeline = cls(data['size'] * data['bucket'], data['bucket'], data['precision'])
+        timeline.latency = [LatencyHistogram.from_dict(item) for item in data['latency']]
+        timeline.sent = list(data['sent'])
+        timeline.errors = list(data['errors'])
+        timeline.routes = {route: LatencyHistogram.from_dict(item) for route, item in data['routes'].items()}
+        timeline.route_bytes = dict(data.get('route_bytes', {}))
+        return timeline
+
+
+class SinkTee:
+    """Sink that hands every sample to each of ``sinks``"""
+
+    def __init__(self, *sinks):
+        self.sinks = sinks
+
+    def append(self, sample):
+        for sink in self.sinks:
+            sink.append(sample)
+
+
+def run_shard(job):
+    """
+    Process entry point: run one shard of a spec and return its histograms as a dict
+
+    ``job`` holds ``url``, ``spec``, ``shard``, ``start_at`` and harness options;
+    it is plain data so it can cross a multiprocessing or HTTP boundary. With
+    ``samples`` (a directory) raw samples are also kept in a SampleStore under
+    ``<samples>/shard-<index>``.
+    """
+    profile = profile_from_spec(job['spec'])
+    harness = LoadHarness(job['url'], routes=job['spec'].get('routes'), concurrency=job.get('concurrency', 64),
+                          timeout=job.get('timeout', 10), seed=job.get('seed'))
+    sink = TimelineHistograms(profile.duration)
+    store = None
+    if job.get('samples'):
+        from utils.sample_store import SampleStore
+        store = SampleStore(os.path.join(job['samples'], f"shard-{job['shard'][0]}"))
+    harness.run(profile, poisson=job.get('poisson', False), sink=SinkTee(sink, store) if store is not None else sink,
+                shard=tuple(job['shard']), start_at=job['start_at'])
+    if store is not None:
+        store.close()
+    return sink.to_dict()
+
+
+def run_parallel(url, spec, processes, shards=None, total_shards=None, start_at=None, **options):
+    """
+    Fan a profile out over local worker processes and merge their histograms
+
+    Args:
+        url (str): Target URL
+        spec (dict): Declarative profile spec (optionally with ``routes``)
+        processes (int): Worker processes on this machine
+        shards (list): Global shard indices to run here (default ``range(processes)``)
+        total_shards (int): Shard count across all machines (default ``processes``)
+        start_at (float): Shared epoch start; defaults to two seconds from now
+            so every process is forked and warmed up before offset 0
+        **options: concurrency, timeout, seed, poisson, samples
+
+    Returns:
+        TimelineHistograms: Merged result
+    """
+    shards = list(shards) if shards is not None else list(range(processes))
+    total_shards = total_shards or len(shards)
+    start_at = start_at or time.time() + 2.0
+    jobs = [dict(options, url=url, spec=spec, shard=(shard, total_shards), start_at=start_at) for shard in shards]
+    with multiprocessing.Pool(processes=min(processes, len(jobs))) as pool:
+        results = pool.map(run_shard, jobs)
+    merged = TimelineHistograms.from_dict(results[0])
+    for result in results[1:]:
+        merged.merge(TimelineHistograms.from_dict(result))
+    return merged
+
+
+def overshoot_report(timeline, baseline_phase=None, slo_ms=None, metric='p95_ms', tolerance=1.2):
+    """
+    Quantify how far latency overshoots while capacity catches up with load
+
+    The baseline is the median ``metric`` over the leading ``baseline_phase``
+    rows (the first phase in the timeline by default). A second is *degraded*
+    when the metric exceeds ``baseline * tolerance``; recovery is the first
+    non-degraded second after the peak.
+
+    Returns:
+        dict: baseline, peak, overshoot (absolute and ratio), degraded window and SLO breaches
+    """
+    baseline_phase = baseline_phase or timeline[0]['phase']
+    leading = []
+    for row in timeline:
+        if row['phase'] != baseline_phase:
+            break
+        leading.append(row)
+    rest = timeline[len(leading):]
+    baseline_values = sorted(row[metric] for row in leading if row[metric] is not None)
+    baseline = percentile(baseline_values, 50)
+    measured = [row for row in rest if row[metric] is not None]
+
+    report = {
+        'metric': metric,
+        'baseline_phase': baseline_phase,
+        'baseline_ms': baseline,
+        'peak_ms': None,
+        'peak_second': None,
+        'overshoot_ms': None,
+        'overshoot_ratio': None,
+        'degraded_from': None,
+        'recovered_at': None,
+        'time_to_recover_s': None,
+        'slo_ms': slo_ms,
+        'seconds_over_slo': None,
+        'error_rate': None,
+    }
+    total = sum(row['sent_rps'] for row in timeline)
+    if total:
+        report['error_rate'] = round(sum(row['errors'] for row in timeline) / total, 4)
+    if slo_ms is not None:
+        report['seconds_over_slo'] = sum(1 for row in timeline if row[metric] is not None and row[metric] > slo_ms)
+    if not measured or baseline is None:
+        return report
+
+    peak = max(measured, key=lambda row: row[metric])
+    report.update({
+        'peak_ms': peak[metric],
+        'peak_second': peak['second'],
+        'overshoot_ms': round(peak[metric] - baseline, 2),
+        'overshoot_ratio': round(peak[metric] / baseline, 2) if baseline else None,
+    })
+    limit = baseline * tolerance
+    degraded = [row for row in measured if row[metric] > limit]
+    if degraded:
+        report['degraded_from'] = degraded[0]['second']
+        recovered = next((row for row in measured if row['second'] > peak['second'] and row[metric] <= limit), None)
+        if recovered:
+            report['recovered_at'] = recovered['second']
+            report['time_to_recover_s'] = round(recovered['second'] - degraded[0]['second'], 3)
+    return report
+
+
+def write_timeline_csv(timeline, path):
+    """Write timeline rows to CSV for plotting next to HPA events"""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(timeline[0].keys()))
+        writer.writeheader()
+        writer.writerows(timeline)
+
+
+def print_timeline(timeline):
+    print(f"{'sec':>6} {'phase':<10} {'target':>7} {'sent':>6} {'ok/s':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for row in timeline:
+        cells = [row[key] if row[key] is not None else '-' for key in ('p50_ms', 'p95_ms', 'p99_ms')]
+        print(f"{row['second']:>6} {row['phase']:<10} {row['target_rps']:>7} {row['sent_rps']:>6} "
+              f"{row['throughput_rps']:>6} {row['errors']:>4} {cells[0]:>8} {cells[1]:>8} {cells[2]:>8}")
+
+
+def run_audit_mode(args):
+    """``--audit``: one pass over every GET route, weighted by the profile's route mix"""
+    from utils.payload_audit import load_field_reads, print_audit, rankings, run_audit
+
+    mix = load_profile(args.profile)[1].get('routes') if args.profile else None
+    reads = load_field_reads(args.field_reads) if args.field_reads else None
+    rows = run_audit(args.url, reads=reads, mix=mix or DEFAULT_ROUTES, timeout=args.timeout)
+    print_audit(rows)
+    print(json.dumps(rankings(rows), indent=2))
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        with open(os.path.join(args.out, 'payload_audit.json'), 'w') as f:
+            json.dump({'target': args.url, 'routes': rows, 'rankings': rankings(rows)}, f, indent=2)
+        print(f"Audit written to {args.out}")
+
+
+def run_scenario_mode(args, url, profile, spec):
+    """
+    ``--scenario``: virtual users walking the spec's journeys
+
+    Accounts for each role in ``accounts`` are registered up front; the admin
+    role uses TEST_ADMIN. Everything the run created is deleted afterwards.
+    With ``--samples`` every step's raw sample is also kept in a SampleStore.
+
+    Returns:
+        tuple: (TimelineHistograms, per-journey report)
+    """
+    from utils.api_client import ApiClient, ApiError
+    from utils.cleanup import cleanup, get_registry, login_admin
+    from utils.load_scenarios import ScenarioRunner
+    from utils.seeder import seed_users
+
+    client = ApiClient(url, timeout=args.timeout)
+    registry = get_registry()
+    accounts = {'admin': [TEST_ADMIN]}
+    for role, count in spec.get('accounts', {}).items():
+        users = seed_users(count, client, registry=registry, password=SCENARIO_PASSWORD)
+        accounts[role] = [{'email': user['email'], 'password': SCENARIO_PASSWORD} for user in users]
+    runner = ScenarioRunner(url, spec, accounts=accounts, concurrency=args.concurrency, timeout=args.timeout,
+                            seed=args.seed, registry=registry)
+    sink = TimelineHistograms(profile.duration)
+    store = None
+    if args.samples:
+        from utils.sample_store import SampleStore
+        store = SampleStore(args.samples)
+    try:
+        runner.run(profile, poisson=args.poisson, sink=SinkTee(sink, store) if store is not None else sink)
+    finally:
+        if store is not None:
+            store.close()
+        try:
+            print(f"Cleaned up run {registry.run_id}: {cleanup(registry.entries(), client, login_admin(client))}")
+            registry.mark_done()
+        except (ApiError, OSError) as e:
+            print(f"Cleanup aborted, run `python -m utils.cleanup sweep` later: {e}")
+    return sink, runner.stats.report()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Drive a load profile against the app and record a timeline')
+    parser.add_argument('--profile', help='JSON profile, e.g. profiles/spike.json')
+    parser.add_argument('--scenario', help='JSON journey scenario, e.g. profiles/journeys.json (instead of --profile)')
+    parser.add_argument('--url', default=BASE_URL, help='Target frontend URL (default: APP_URL)')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--poisson', action='store_true', help='Exponential inter-arrival gaps')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--processes', type=int, default=1, help='Worker processes sharing the profile')
+    parser.add_argument('--slo-ms', type=float, default=None, help='Latency SLO for the overshoot report')
+    parser.add_argument('--out', default=None, help='Directory for timeline.csv and summary.json')
+    parser.add_argument('--samples', default=None,
+                        help='Keep every raw sample in a memory-mapped store in this directory (utils.sample_store)')
+    parser.add_argument('--audit', action='store_true',
+                        help='Audit response sizes and unread fields per route instead of generating load')
+    parser.add_argument('--field-reads', default=None,
+                        help='Fields the SPA reads, from python -m utils.payload_audit (audit mode)')
+    parser.add_argument('--netem', default=None,
+                        help='Shape traffic through utils.netem_proxy: preset name or JSON spec file')
+    parser.add_argument('--standin', action='store_true', help='Target a local stand-in backend instead of --url')
+    parser.add_argument('--standin-workers', type=int, default=2)
+    parser.add_argument('--standin-max-workers', type=int, default=None)
+    parser.add_argument('--standin-service-time', type=float, default=0.02)
+    args = parser.parse_args()
+    if not args.profile and not args.scenario and not args.audit:
+        parser.error('--profile or --scenario is required unless --audit is given')
+    if args.scenario and args.processes > 1:
+        parser.error('--scenario runs in one process; raise --concurrency for more users')
+
+    if args.audit:
+        run_audit_mode(args)
+        return
+
+    if args.scenario:
+        from utils.load_scenarios import load_scenario, print_report
+        profile, spec = load_scenario(args.scenario)
+    else:
+        profile, spec = load_profile(args.profile)
+    scenario_report = None
+    standin = None
+    url = args.url
+    if args.standin:
+        from utils.standin_server import StandinServer
+        standin = StandinServer(workers=args.standin_workers, max_workers=args.standin_max_workers,
+                                service_time=args.standin_service_time).start()
+        url = standin.url
+        if args.scenario:
+            from utils.seeder import seed_blogs
+            standin.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+            seed_blogs(30, store=standin.store)
+    netem = None
+    if args.netem:
+        from utils.netem_proxy import NetemProxy, load_netem
+        netem = NetemProxy(url, load_netem(args.netem)).start()
+        url = netem.url
+
+    print(f"Running {'scenario' if args.scenario else 'profile'} {spec.get('name', args.scenario or args.profile)} "
+          f"({profile.duration:.0f}s, ~{profile.expected_requests():.0f} {'journeys' if args.scenario else 'requests'}) "
+          f"against {url}")
+    try:
+        if args.scenario:
+            samples, scenario_report = run_scenario_mode(args, url, profile, spec)
+        elif args.processes > 1:
+            samples = run_parallel(url, spec, args.processes, concurrency=args.concurrency,
+                                   timeout=args.timeout, seed=args.seed, poisson=args.poisson, samples=args.samples)
+        else:
+            harness = LoadHarness(url, routes=spec.get('routes'), concurrency=args.concurrency,
+                                  timeout=args.timeout, seed=args.seed)
+            if args.samples:
+                from utils.sample_store import SampleStore
+                sink = SampleStore(args.samples)
+            else:
+                sink = TimelineHistograms(profile.duration)
+            samples = harness.run(profile, poisson=args.poisson, sink=sink)
+            if args.samples:
+                samples.close()
+    finally:
+        if netem:
+            netem.stop()
+            print(f"Network emulation ({args.netem}): {json.dumps(netem.stats())}")
+        if standin:
+            standin.stop()
+
+    timeline = build_timeline(samples, profile)
+    report = overshoot_report(timeline, slo_ms=args.slo_ms)
+    print_timeline(timeline)
+    print(json.dumps(samples.route_summary(), indent=2))
+    print(json.dumps(report, indent=2))
+    if scenario_report:
+        print_report(scenario_report)
+    if standin and standin.capacity.scale_events:
+        print(f"Stand-in scale events: {standin.capacity.scale_events}")
+
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        write_timeline_csv(timeline, os.path.join(args.out, 'timeline.csv'))
+        with open(os.path.join(args.out, 'summary.json'), 'w') as f:
+            json.dump({'profile': spec, 'target': url, 'overshoot': report, 'journeys': scenario_report}, f, indent=2)
+        print(f"Timeline written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+"""
+Declarative Load Profiles
+Arrival-rate curves (ramp, step, spike, diurnal) for the API load harness
+"""
+
+import inspect
+import json
+import math
+import random
+
+
+class LoadProfile:
+    """
+    Base class: a target arrival rate (requests/second) over a fixed duration
+
+    Subclasses implement ``rate_at`` and may override ``phase_at`` so the
+    timeline can label each second (e.g. 'baseline', 'spike', 'recovery').
+    """
+
+    name = 'profile'
+
+    def __init__(self, duration):
+        self.duration = float(duration)
+
+    def rate_at(self, t):
+        raise NotImplementedError
+
+    def phase_at(self, t):
+        return self.name
+
+    def expected_requests(self, step=0.01):
+        """Integral of the rate curve, i.e. how many requests the profile sends"""
+        steps = int(self.duration / step)
+        return sum(self.rate_at(i * step) * step for i in range(steps))
+
+
+class ConstantProfile(LoadProfile):
+    name = 'constant'
+
+    def __init__(self, rate, duration):
+        super().__init__(duration)
+        self.rate = float(rate)
+
+    def rate_at(self, t):
+        return self.rate
+
+
+class RampProfile(LoadProfile):
+    """Linear ramp from ``start_rate`` to ``end_rate``"""
+
+    name = 'ramp'
+
+    def __init__(self, start_rate, end_rate, duration):
+        super().__init__(duration)
+        self.start_rate = float(start_rate)
+        self.end_rate = float(end_rate)
+
+    def rate_at(self, t):
+        fraction = min(max(t / self.duration, 0.0), 1.0) if self.duration else 1.0
+        return self.start_rate + (self.end_rate - self.start_rate) * fraction
+
+
+class StepProfile(LoadProfile):
+    """
+    Piecewise-constant rate
+
+    Args:
+        steps (list): ``[{"duration": 30, "rate": 5}, ...]`` or ``[(30, 5), ...]``
+    """
+
+    name = 'step'
+
+    def __init__(self, steps):
+        self.steps = [
+            (float(step['duration']), float(step['rate'])) if isinstance(step, dict) else (float(step[0]), float(step[1]))
+            for step in steps
+        ]
+        super().__init__(sum(duration for duration, _ in self.steps))
+
+    def _locate(self, t):
+        elapsed = 0.0
+        for index, (duration, rate) in enumerate(self.steps):
+            elapsed += duration
+            if t < elapsed:
+                return index, rate
+        return len(self.steps) - 1, self.steps[-1][1]
+
+    def rate_at(self, t):
+        return self._locate(t)[1]
+
+    def phase_at(self, t):
+        return f"step-{self._locate(t)[0] + 1}"
+
+
+class SpikeProfile(LoadProfile):
+    """
+    Flat baseline with one spike, ramped linearly in and out over ``ramp`` seconds
+    """
+
+    name = 'spike'
+
+    def __init__(self, base_rate, spike_rate, duration, spike_start, spike_duration, ramp=0.0):
+        super().__init__(duration)
+        self.base_rate = float(base_rate)
+        self.spike_rate = float(spike_rate)
+        self.spike_start = float(spike_start)
+        self.spike_duration = float(spike_duration)
+        self.ramp = float(ramp)
+
+    def rate_at(self, t):
+        rise_end = self.spike_start + self.ramp
+        fall_start = self.spike_start + self.spike_duration
+        fall_end = fall_start + self.ramp
+        if t < self.spike_start or t >= fall_end:
+            return self.base_rate
+        if t < rise_end:
+            return self.base_rate + (self.spike_rate - self.base_rate) * (t - self.spike_start) / self.ramp
+        if t < fall_start:
+            return self.spike_rate
+        return self.spike_rate - (self.spike_rate - self.base_rate) * (t - fall_start) / self.ramp
+
+    def phase_at(self, t):
+        if t < self.spike_start:
+            return 'baseline'
+        if t < self.spike_start + self.spike_duration + self.ramp:
+            return 'spike'
+        return 'recovery'
+
+
+class DiurnalProfile(LoadProfile):
+    """
+    Sinusoidal day curve compressed into ``period`` seconds
+
+    The rate starts at ``min_rate`` (night), peaks at ``max_rate`` half a period
+    later and returns; ``phase`` shifts the curve by a fraction of a period.
+    """
+
+    name = 'diurnal'
+
+    def __init__(self, min_rate, max_rate, period, duration=None, phase=0.0):
+        super().__init__(duration if duration is not None else period)
+        self.min_rate = float(min_rate)
+        self.max_rate = float(max_rate)
+        self.period = float(period)
+        self.phase = float(phase)
+
+    def rate_at(self, t):
+        angle = 2 * math.pi * (t / self.period + self.phase)
+        return self.min_rate + (self.max_rate - self.min_rate) * (1 - math.cos(angle)) / 2
+
+    def phase_at(self, t):
+        position = (t / self.period + self.phase) % 1.0
+        return 'rising' if position < 0.5 else 'falling'
+
+
+class CompositeProfile(LoadProfile):
+    """Stages played back to back; each stage keeps its own phase labels"""
+
+    name = 'composite'
+
+    def __init__(self, stages, labels=None):
+        self.stages = list(stages)
+        self.labels = list(labels) if labels else [None] * len(self.stages)
+        super().__init__(sum(stage.duration for stage in self.stages))
+
+    def _locate(self, t):
+        offset = 0.0
+        for index, stage in enumerate(self.stages):
+            if t < offset + stage.duration:
+                return index, t - offset
+            offset += stage.duration
+        return len(self.stages) - 1, self.stages[-1].duration
+
+    def rate_at(self, t):
+        index, local = self._locate(t)
+        return self.stages[index].rate_at(local)
+
+    def phase_at(self, t):
+        index, local = self._locate(t)
+        return self.labels[index] or self.stages[index].phase_at(local)
+
+
+PROFILE_TYPES = {
+    'constant': ConstantProfile,
+    'ramp': RampProfile,
+    'step': StepProfile,
+    'spike': SpikeProfile,
+    'diurnal': DiurnalProfile,
+}
+
+
+def profile_from_spec(spec):
+    """
+    Build a profile from a declarative dict
+
+    A spec is either a single stage, ``{"type": "spike", "base_rate": 5, ...}``,
+    or a sequence, ``{"stages": [{"type": "constant", ...}, ...]}``. Stages may
+    carry a ``"label"`` which replaces their phase names in the timeline. Keys
+    other than the constructor arguments (``name``, ``routes`` ...) are ignored.
+
+    Raises:
+        ValueError: Unknown profile type
+    """
+    if 'stages' in spec:
+        stages = [profile_from_spec(stage) for stage in spec['stages']]
+        return CompositeProfile(stages, [stage.get('label') for stage in spec['stages']])
+
+    kind = spec.get('type')
+    if kind not in PROFILE_TYPES:
+        raise ValueError(f"Unknown load profile type: {kind!r} (expected one of {sorted(PROFILE_TYPES)})")
+    cls = PROFILE_TYPES[kind]
+    arguments = inspect.signature(cls).parameters
+    return cls(**{key: value for key, value in spec.items() if key in arguments})
+
+
+def load_profile(path):
+    """Read a JSON profile file and return ``(profile, spec)``"""
+    with open(path) as f:
+        spec = json.load(f)
+    return profile_from_spec(spec), spec
+
+
+def arrivals(profile, poisson=False, seed=None, resolution=0.002):
+    """
+    Yield request send offsets (seconds from start) following the profile
+
+    The rate curve is integrated in ``resolution``-second steps and a request
+    is emitted each time the accumulated area reaches the next threshold: 1.0
+    for evenly spaced arrivals (the default, repeatable), or an Exp(1) draw with
+    ``poisson=True``, which is closer to independent real users.
+    """
+    rng = random.Random(seed)
+    threshold = rng.expovariate(1.0) if poisson else 1.0
+    area = 0.0
+    t = 0.0
+    while t < profile.duration:
+        area += profile.rate_at(t) * resolution
+        t += resolution
+        while area >= threshold and t < profile.duration:
+            area -= threshold
+            yield t
+            threshold = rng.expovariate(1.0) if poisson else 1.0
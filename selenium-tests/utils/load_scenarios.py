@@ -0,0 +1,348 @@
+"""
+Journey Scenarios
+Virtual users replaying weighted, multi-step user journeys against the API, with
+think times, IDs chained from earlier responses and per-step latency
+"""
+
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import requests
+
+from utils.histogram import LatencyHistogram
+from utils.load_profiles import arrivals, profile_from_spec
+
+
+# Whole-string references keep their type, so ``"user": "{user}"`` sends the object
+_REFERENCE = re.compile(r'\{([A-Za-z_][\w.]*)\}')
+_PATH_TOKEN = re.compile(r'([^.\[\]]+)|\[(\*|\d+)\]')
+
+
+class MissingValue(KeyError):
+    """A template or extract path did not resolve (e.g. an empty list to pick from)"""
+
+
+def lookup(document, path, rng=None):
+    """
+    Walk a dotted path such as ``user.token``, ``blogs[0]._id`` or ``blogs[*]``
+
+    ``[*]`` picks a random element with ``rng``, which is how a virtual user
+    "opens a post" from the list it was shown.
+
+    Raises:
+        MissingValue: A key is absent, an index is out of range or a list is empty
+    """
+    value = document
+    for key, index in _PATH_TOKEN.findall(path):
+        try:
+            if key:
+                value = value[key]
+            elif index == '*':
+                value = (rng or random).choice(value)
+            else:
+                value = value[int(index)]
+        except (KeyError, IndexError, TypeError):
+            raise MissingValue(path) from None
+    return value
+
+
+def render(template, variables):
+    """Substitute ``{name}`` / ``{name.field}`` references in a string, list or dict"""
+    if isinstance(template, dict):
+        return {key: render(value, variables) for key, value in template.items()}
+    if isinstance(template, list):
+        return [render(value, variables) for value in template]
+    if not isinstance(template, str):
+        return template
+    whole = _REFERENCE.fullmatch(template)
+    if whole:
+        return lookup(variables, whole.group(1))
+    return _REFERENCE.sub(lambda match: str(lookup(variables, match.group(1))), template)
+
+
+def render_path(path, variables):
+    """
+    Substitute references in a URL path, percent-encoding each value
+
+    Slugs keep ``+``, ``#`` and ``&`` from their titles, so a post titled
+    "C++" would otherwise send a different query than the one it names.
+    """
+    return _REFERENCE.sub(lambda match: quote(str(lookup(variables, match.group(1))), safe=''), path)
+
+
+def _think_range(value):
+    if isinstance(value, (int, float)):
+        return float(value), float(value)
+    low, high = value
+    return float(low), float(high)
+
+
+def scenario_from_spec(spec):
+    """
+    Validate a scenario spec and return ``(profile, spec)``
+
+    The ``profile`` key is a load profile spec (see ``profile_from_spec``) whose
+    rate is journeys *started* per second. Each journey has a ``weight``, an
+    optional ``account`` role and a list of ``steps``; a step has ``name``,
+    ``method``, ``path``, and optionally ``json``, ``auth``, ``expect``,
+    ``extract``, ``think`` and ``track``.
+
+    Raises:
+        ValueError: Missing profile or journeys, or a malformed journey
+    """
+    if 'profile' not in spec:
+        raise ValueError('Scenario needs a "profile" giving the journey start rate')
+    journeys = spec.get('journeys') or []
+    if not journeys:
+        raise ValueError('Scenario needs at least one journey')
+    _think_range(spec.get('think_time', 0))
+    for journey in journeys:
+        names = [step.get('name') for step in journey.get('steps', [])]
+        if not names or None in names:
+            raise ValueError(f"Journey {journey.get('name')!r} needs named steps")
+        if len(set(names)) != len(names):
+            raise ValueError(f"Journey {journey.get('name')!r} has duplicate step names")
+        if journey.get('weight', 1) <= 0:
+            raise ValueError(f"Journey {journey.get('name')!r} needs a positive weight")
+        for step in journey['steps']:
+            _think_range(step.get('think', 0))
+    return profile_from_spec(spec['profile']), spec
+
+
+def load_scenario(path):
+    """Read a JSON scenario file and return ``(profile, spec)``"""
+    with open(path) as f:
+        return scenario_from_spec(json.load(f))
+
+
+class ScenarioStats:
+    """
+    Per-journey outcomes and per-step latency, in the order steps are declared
+
+    A step's ``failed`` count covers transport errors and unexpected statuses;
+    ``skipped`` counts virtual users that never reached it because an earlier
+    step failed or left a chained value (``blog_id`` ...) unresolved.
+    """
+
+    def __init__(self, journeys, precision=8):
+        self.order = [(journey['name'], [step['name'] for step in journey['steps']]) for journey in journeys]
+        self.weights = {journey['name']: journey.get('weight', 1) for journey in journeys}
+        self.started = Counter()
+        self.completed = Counter()
+        self.aborted = {name: Counter() for name, _ in self.order}
+        self.duration = {name: LatencyHistogram(precision) for name, _ in self.order}
+        self.latency = {(name, step): LatencyHistogram(precision) for name, steps in self.order for step in steps}
+        self.failed = Counter()
+        self.skipped = Counter()
+        self._lock = threading.Lock()
+
+    def record_step(self, journey, step, latency, ok):
+        with self._lock:
+            self.latency[journey, step].record(latency)
+            self.failed[journey, step] += not ok
+
+    def record_journey(self, journey, seconds, reached, reason=None):
+        """Close a journey: ``reached`` is the number of steps sent"""
+        steps = dict(self.order)[journey]
+        with self._lock:
+            self.started[journey] += 1
+            self.duration[journey].record(seconds)
+            if reason is None:
+                self.completed[journey] += 1
+            else:
+                self.aborted[journey][reason] += 1
+            for step in steps[reached:]:
+                self.skipped[journey, step] += 1
+
+    def report(self):
+        """Nested dict: journey -> counts, duration percentiles (s) and step rows (ms)"""
+        report = {}
+        for journey, steps in self.order:
+            duration = self.duration[journey]
+            rows = []
+            for step in steps:
+                histogram = self.latency[journey, step]
+                rows.append({
+                    'step': step,
+                    'count': histogram.count,
+                    'failed': self.failed[journey, step],
+                    'skipped': self.skipped[journey, step],
+                    'mean_ms': round(histogram.mean(), 2) if histogram.count else None,
+                    'p50_ms': histogram.percentile(50),
+                    'p95_ms': histogram.percentile(95),
+                    'p99_ms': histogram.percentile(99),
+                })
+            report[journey] = {
+                'weight': self.weights[journey],
+                'started': self.started[journey],
+                'completed': self.completed[journey],
+                'aborted': dict(self.aborted[journey].most_common()),
+                'p50_s': round(duration.percentile(50) / 1000, 3) if duration.count else None,
+                'p95_s': round(duration.percentile(95) / 1000, 3) if duration.count else None,
+                'steps': rows,
+            }
+        return report
+
+
+class ScenarioRunner:
+    """
+    Starts virtual users at the profile's rate; each walks one weighted journey
+
+    A virtual user owns its variables: ``vu`` (its number), ``run`` (random per
+    runner), ``unique`` (``<run>-<vu>``, for fields such as ``blogTitle`` that
+    the API rejects when repeated), ``account`` (credentials for the journey's
+    ``account`` role, handed out round-robin) plus whatever its steps
+    ``extract``. A step fails on a transport error or a status outside
+    ``expect`` (2xx by default); the journey then stops, since later steps
+    would act on IDs that were never created. Any other exception (a role
+    without accounts, a registry write) also aborts the journey, with its type
+    and message as the reason.
+
+    As in LoadHarness, a journey's first step is timed from its scheduled start,
+    so time spent waiting for a free virtual-user slot is charged to it.
+
+    Args:
+        base_url (str): Frontend URL; scenario paths include ``/api``
+        spec (dict): Scenario spec (see ``scenario_from_spec``)
+        accounts (dict): Role -> list of ``{"email", "password"}`` dicts
+        concurrency (int): Maximum virtual users alive at once
+        timeout (float): Per-request timeout in seconds
+        seed (int): Seed for journey choice, think times and ``[*]`` picks
+        registry (EntityRegistry): Receives IDs named by steps' ``track``
+    """
+
+    def __init__(self, base_url, spec, accounts=None, concurrency=256, timeout=10, seed=None, registry=None):
+        self.base_url = base_url.rstrip('/')
+        self.spec = spec
+        self.journeys = spec['journeys']
+        self.accounts = accounts or {}
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.seed = seed
+        self.registry = registry
+        self.run_id = uuid.uuid4().hex[:6]
+        self.think_time = _think_range(spec.get('think_time', 0))
+        self.stats = ScenarioStats(self.journeys)
+        self._handed_out = Counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _session(self):
+        if not hasattr(self._local, 'session'):
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=4)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return self._local.session
+
+    def _account(self, role):
+        pool = self.accounts.get(role)
+        if not pool:
+            raise ValueError(f"No accounts for role {role!r}")
+        with self._lock:
+            index = self._handed_out[role]
+            self._handed_out[role] += 1
+        return pool[index % len(pool)]
+
+    def _track(self, kind, value):
+        if kind == 'blog':
+            self.registry.add_blog(blog_id=value)
+        elif kind == 'comment':
+            self.registry.add_comment(value)
+
+    def _run_journey(self, vu, journey, offset, start, rng, samples):
+        variables = {'vu': vu, 'run': self.run_id, 'unique': f"{self.run_id}-{vu}"}
+        began = start + offset
+        reached, reason, stage = 0, None, 'start'
+        try:
+            if journey.get('account'):
+                variables['account'] = self._account(journey['account'])
+            for position, step in enumerate(journey['steps']):
+                stage = step['name']
+                if position:
+                    low, high = _think_range(step.get('think', self.think_time))
+                    time.sleep(rng.uniform(low, high))
+                try:
+                    url = self.base_url + render_path(step['path'], variables)
+                    body = render(step.get('json'), variables)
+                    token = render(step['auth'], variables) if step.get('auth') else None
+                except MissingValue as e:
+                    reason = f"{step['name']}: missing {e.args[0]}"
+                    break
+                sent = began if position == 0 else time.monotonic()
+                status, error, size, document = 0, None, 0, None
+                try:
+                    response = self._session().request(step.get('method', 'GET'), url, json=body, timeout=self.timeout,
+                                                       headers={'Authorization': token} if token else None)
+                    status, size = response.status_code, len(response.content)
+                    if step.get('extract'):
+                        document = response.json()
+                except requests.exceptions.RequestException as e:
+                    error = type(e).__name__
+                except ValueError:
+                    error = 'InvalidJSON'
+                latency = time.monotonic() - sent
+                ok = error is None and (status in step['expect'] if 'expect' in step else 200 <= status < 300)
+                reached += 1
+                self.stats.record_step(journey['name'], step['name'], latency, ok)
+                samples.append({'offset': sent - start, 'route': f"{journey['name']}/{step['name']}",
+                                'latency': latency, 'status': status, 'bytes': size, 'error': error})
+                if not ok:
+                    reason = f"{step['name']}: {error or f'status_{status}'}"
+                    break
+                try:
+                    for name, path in (step.get('extract') or {}).items():
+                        variables[name] = lookup(document, path, rng)
+                except MissingValue as e:
+                    reason = f"{step['name']}: missing {e.args[0]}"
+                    break
+                if self.registry is not None:
+                    for kind, name in (step.get('track') or {}).items():
+                        self._track(kind, variables[name])
+        except Exception as e:  # Anything else would vanish with the pool's future
+            reason = f"{stage}: {type(e).__name__}: {e}"
+        self.stats.record_journey(journey['name'], time.monotonic() - began, reached, reason)
+
+    def run(self, profile, poisson=False, sink=None):
+        """
+        Start journeys until the profile ends, then wait for the last to finish
+
+        Returns:
+            The sink (default: a list) with one LoadHarness-style sample per
+            step sent, ``route`` being ``<journey>/<step>``
+        """
+        rng = random.Random(self.seed)
+        weights = [journey.get('weight', 1) for journey in self.journeys]
+        samples = [] if sink is None else sink
+        start = time.monotonic() + 0.05
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            for vu, offset in enumerate(arrivals(profile, poisson=poisson, seed=self.seed)):
+                journey = rng.choices(self.journeys, weights)[0]
+                vu_rng = random.Random(rng.getrandbits(64))
+                delay = start + offset - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(self._run_journey, vu, journey, offset, start, vu_rng, samples)
+        return samples
+
+
+def print_report(report):
+    for journey, row in report.items():
+        aborted = sum(row['aborted'].values())
+        print(f"\n{journey} (weight {row['weight']}): {row['started']} started, {row['completed']} completed, "
+              f"{aborted} aborted, p50 {row['p50_s']}s p95 {row['p95_s']}s")
+        for reason, count in row['aborted'].items():
+            print(f"    aborted x{count}: {reason}")
+        print(f"  {'step':<16} {'count':>6} {'failed':>6} {'skipped':>7} {'mean':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for step in row['steps']:
+            cells = [step[key] if step[key] is not None else '-' for key in ('mean_ms', 'p50_ms', 'p95_ms', 'p99_ms')]
+            print(f"  {step['step']:<16} {step['count']:>6} {step['failed']:>6} {step['skipped']:>7} "
+                  f"{cells[0]:>8} {cells[1]:>8} {cells[2]:>8} {cells[3]:>8}")
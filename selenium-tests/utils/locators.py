@@ -0,0 +1,422 @@
+"""
+Learning Locator Resolver
+Finds logical elements from ordered candidate selectors in one script per
+poll, remembering per page which candidate matched so it is tried first
+"""
+
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from config import DEFAULT_TIMEOUT, HARNESS_DIR
+
+
+CACHE_PATH = os.path.join(HARNESS_DIR, 'locators.json')
+POLL_INTERVAL = 0.1
+LEARNED_MISS_TIMEOUT = 2.0  # Wait for an element that has only ever been missing on this page
+
+
+class Locator:
+    """A logical element and the selectors it may be found by, in order of preference"""
+
+    def __init__(self, name, *candidates):
+        self.name = name
+        self.candidates = [_as_probe(by, value) for by, value in candidates]
+
+    def __repr__(self):
+        return f"Locator({self.name!r}, {len(self.candidates)} candidates)"
+
+
+def _as_probe(by, value):
+    """Express a (By, value) pair as the CSS or XPath the probe script evaluates"""
+    if by in (By.CSS_SELECTOR, By.XPATH):
+        return by, value
+    if by == By.ID:
+        return By.CSS_SELECTOR, f'[id="{value}"]'
+    if by == By.NAME:
+        return By.CSS_SELECTOR, f'[name="{value}"]'
+    if by == By.TAG_NAME:
+        return By.CSS_SELECTOR, value
+    if by == By.CLASS_NAME:
+        return By.CSS_SELECTOR, f".{value}"
+    raise ValueError(f"Locator candidates must be CSS, XPath, id, name, tag or class, not {by!r}")
+
+
+def _text_button(*labels):
+    return [(By.XPATH, f"//button[contains(text(), '{label}')]") for label in labels]
+
+
+# The union selectors of test_blog_posts.py and test_additional_features.py,
+# split into their alternatives
+LOCATORS = {locator.name: locator for locator in [
+    Locator('create_post', (By.XPATH, "//a[contains(@href, 'create-post')]"), *_text_button('Create', 'New Post')),
+    Locator('title_input', (By.CSS_SELECTOR, "input[name='title']"), (By.CSS_SELECTOR, 'input#title'),
+            (By.CSS_SELECTOR, "input[placeholder*='title' i]")),
+    Locator('content_input', (By.CSS_SELECTOR, "textarea[name='content']"), (By.CSS_SELECTOR, 'textarea#content'),
+            (By.CSS_SELECTOR, '.ql-editor'), (By.CSS_SELECTOR, "[contenteditable='true']")),
+    Locator('publish_button', *_text_button('Publish', 'Create', 'Submit')),
+    Locator('post_link', (By.CSS_SELECTOR, 'article a'), (By.CSS_SELECTOR, '.post-card a'),
+            (By.CSS_SELECTOR, "[href*='/post/']"), (By.CSS_SELECTOR, "[href*='/blog/']")),
+    Locator('post_content', (By.CSS_SELECTOR, 'article'), (By.CSS_SELECTOR, '.post-content'),
+            (By.CSS_SELECTOR, '.blog-content'), (By.CSS_SELECTOR, 'main')),
+    Locator('post_item', (By.CSS_SELECTOR, '.post-item'), (By.CSS_SELECTOR, 'article'),
+            (By.CSS_SELECTOR, '.blog-card')),
+    Locator('search_result', (By.CSS_SELECTOR, 'article'), (By.CSS_SELECTOR, '.post-card'),
+            (By.CSS_SELECTOR, '.blog-card')),
+    Locator('edit_button', *_text_button('Edit'), (By.XPATH, "//a[contains(text(), 'Edit')]"),
+            (By.XPATH, "//*[contains(@class, 'edit')]")),
+    Locator('update_button', *_text_button('Update', 'Save')),
+    Locator('delete_button', *_text_button('Delete'), (By.XPATH, "//*[contains(@class, 'delete')]")),
+    Locator('confirm_button', *_text_button('Yes', 'Confirm', 'Delete')),
+    Locator('search_input', (By.CSS_SELECTOR, "input[type='search']"),
+            (By.CSS_SELECTOR, "input[placeholder*='search' i]"), (By.CSS_SELECTOR, "input[name='search']")),
+    Locator('search_button', (By.CSS_SELECTOR, "button[type='submit']"), (By.CSS_SELECTOR, '.search-button')),
+    Locator('comment_input', (By.CSS_SELECTOR, "textarea[placeholder*='comment' i]"),
+            (By.CSS_SELECTOR, "textarea[name='comment']"), (By.CSS_SELECTOR, '.comment-input')),
+    Locator('comment_submit', *_text_button('Submit', 'Post', 'Comment')),
+    Locator('comment', (By.CSS_SELECTOR, '.comment'), (By.CSS_SELECTOR, '.comment-item'),
+            (By.CSS_SELECTOR, "[class*='comment']")),
+    Locator('theme_toggle', (By.CSS_SELECTOR, "button[aria-label*='theme' i]"), (By.CSS_SELECTOR, '.theme-toggle'),
+            (By.CSS_SELECTOR, "[class*='theme-toggle']")),
+]}
+
+
+# Candidates in order; returns [index of the first that matches, its first
+# (visible and enabled, when clickable) element], or null
+PROBE_SCRIPT = """
+const [candidates, clickable, all] = arguments;
+const usable = el => !clickable || (!el.disabled && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length));
+const matches = ([by, value]) => {
+  try {
+    if (by === 'xpath') {
+      const snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+      return Array.from({length: snapshot.snapshotLength}, (_, i) => snapshot.snapshotItem(i)).filter(usable);
+    }
+    return Array.from(document.querySelectorAll(value)).filter(usable);
+  } catch (e) {
+    return [];
+  }
+};
+if (all) return [...new Set(candidates.flatMap(matches))];
+for (let i = 0; i < candidates.length; i++) {
+  const found = matches(candidates[i]);
+  if (found.length) return [i, found[0]];
+}
+return null;
+"""
+
+
+# Client routes with parameters (client/src/App.jsx), so every post shares one page key
+ROUTE_PATTERNS = [
+    (re.compile(r'^/blog/[^/]+/?$'), '/blog/:blogSlug'),
+    (re.compile(r'^/update-blog/[^/]+/?$'), '/update-blog/:blogId'),
+]
+
+
+def page_key(url):
+    """
+    Route a URL belongs to: its path with parameters collapsed, plus the
+    dashboard ``tab`` (``/dashboard?tab=posts``) since each tab is its own page
+    """
+    parsed = urlparse(url)
+    path = parsed.path or '/'
+    for pattern, route in ROUTE_PATTERNS:
+        if pattern.match(path):
+            path = route
+            break
+    tab = parse_qs(parsed.query).get('tab')
+    return f"{path}?tab={tab[0]}" if tab else path
+
+
+class LocatorCache:
+    """
+    Which candidate matched each logical element on each page, kept in a JSON
+    file shared by every worker and run
+
+    ``{page: {name: {'by', 'value', 'hits', 'misses'}}}``; ``by``/``value`` is
+    the candidate that last matched (absent while the element was only ever missing).
+    """
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.entries = self._read()
+        self.dirty = set()
+
+    def _read(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except ValueError:
+            return {}  # Torn or hand-edited file: relearn
+
+    def get(self, page, name):
+        return self.entries.get(page, {}).get(name)
+
+    def record(self, page, name, candidate=None):
+        entry = self.entries.setdefault(page, {}).setdefault(name, {'hits': 0, 'misses': 0})
+        if candidate is None:
+            entry['misses'] += 1
+        else:
+            entry['hits'] += 1
+            entry['by'], entry['value'] = candidate
+        self.dirty.add((page, name))
+
+    def save(self):
+        """Write this process's updates over what other workers have saved meanwhile"""
+        if not self.dirty or not self.path:
+            return
+        merged = self._read()
+        for page, name in self.dirty:
+            merged.setdefault(page, {})[name] = self.entries[page][name]
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, 'w') as f:
+            json.dump(merged, f, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+        self.entries, self.dirty = merged, set()
+
+
+class LookupStats:
+    """
+    Per logical element: lookups, hits on the learned candidate, misses,
+    script probes, time spent and time saved
+
+    Time saved is measured against the fallback chain the tests used: one
+    ``find_element`` per candidate in declared order under the driver's
+    implicit wait, where every candidate that is not on the page burns the
+    full wait before the next is tried.
+    """
+
+    FIELDS = ('lookups', 'learned', 'misses', 'probes', 'seconds', 'baseline_seconds')
+
+    def __init__(self):
+        self.by_name = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+
+    def add(self, name, **values):
+        row = self.by_name[name]
+        for key, value in values.items():
+            row[key] += value
+
+    def merge(self, data):
+        for name, row in data.items():
+            self.add(name, **row)
+        return self
+
+    def to_dict(self):
+        return {name: dict(row) for name, row in self.by_name.items()}
+
+    def format(self):
+        rows = sorted(self.by_name.items(), key=lambda kv: kv[1]['baseline_seconds'] - kv[1]['seconds'], reverse=True)
+        lines = [f"{'element':<16} {'lookups':>7} {'learned':>7} {'misses':>6} {'probes':>6} "
+                 f"{'spent s':>8} {'chain s':>8} {'saved s':>8}"]
+        for name, row in rows:
+            lines.append(f"{name:<16} {row['lookups']:>7} {row['learned']:>7} {row['misses']:>6} {row['probes']:>6} "
+                         f"{row['seconds']:>8.2f} {row['baseline_seconds']:>8.2f} "
+                         f"{row['baseline_seconds'] - row['seconds']:>8.2f}")
+        spent = sum(row['seconds'] for row in self.by_name.values())
+        baseline = sum(row['baseline_seconds'] for row in self.by_name.values())
+        lines.append(f"Lookups took {spent:.2f}s; the declared-order fallback chain would take about "
+                     f"{baseline:.2f}s (saved {baseline - spent:.2f}s)")
+        return lines
+
+
+_cache = {'instance': None}
+_stats = LookupStats()
+
+
+def get_cache(path=None):
+    """The process-wide cache (saved at session end by the pytest plugin)"""
+    if _cache['instance'] is None or (path and _cache['instance'].path != path):
+        _cache['instance'] = LocatorCache(path or CACHE_PATH)
+    return _cache['instance']
+
+
+class LocatorResolver:
+    """
+    Resolves logical elements for one driver
+
+    Each poll runs one script that evaluates the candidates in order and stops
+    at the first match, so neither misses nor the driver's implicit wait cost
+    a WebDriver round trip each. The candidate that matched on the current
+    page is recorded and evaluated first next time.
+
+    Args:
+        driver: WebDriver the lookups run in
+        locators (dict): Name -> ``Locator``; defaults to the app's ``LOCATORS``
+        learn (bool): Use and update the cache; False keeps declared order (for comparison)
+        implicit_wait (float): Wait the baseline fallback chain is charged per miss;
+            defaults to the driver's implicit wait
+    """
+
+    def __init__(self, driver, locators=None, cache=None, learn=True, timeout=DEFAULT_TIMEOUT,
+                 implicit_wait=None, stats=None):
+        self.driver = driver
+        self.locators = LOCATORS if locators is None else locators
+        self.cache = cache if cache is not None else get_cache()
+        self.learn = learn
+        self.timeout = timeout
+        self.stats = _stats if stats is None else stats
+        if implicit_wait is None:
+            try:
+                implicit_wait = driver.timeouts.implicit_wait
+            except (AttributeError, WebDriverException):
+                implicit_wait = DEFAULT_TIMEOUT
+        self.implicit_wait = implicit_wait
+
+    def _locator(self, name):
+        if isinstance(name, Locator):
+            return name
+        try:
+            return self.locators[name]
+        except KeyError:
+            raise KeyError(f"No locator named {name!r}; known: {', '.join(sorted(self.locators))}") from None
+
+    def ordered(self, locator, page):
+        """Candidates with the one learned for ``page`` moved to the front"""
+        entry = self.cache.get(page, locator.name) if self.learn else None
+        learned = (entry['by'], entry['value']) if entry and 'by' in entry else None
+        if learned not in locator.candidates:
+            return list(locator.candidates), False
+        return [learned] + [candidate for candidate in locator.candidates if candidate != learned], True
+
+    def _default_timeout(self, locator, page):
+        entry = self.cache.get(page, locator.name) if self.learn else None
+        if entry and entry['misses'] and not entry['hits']:
+            return min(self.timeout, LEARNED_MISS_TIMEOUT)
+        return self.timeout
+
+    def find(self, name, timeout=None, clickable=False):
+        """
+        First element matching any candidate, polling until ``timeout``
+
+        Raises:
+            TimeoutException: No candidate matched in time (as ``WebDriverWait`` would)
+        """
+        locator = self._locator(name)
+        page = page_key(self.driver.current_url)
+        candidates, learned = self.ordered(locator, page)
+        timeout = self._default_timeout(locator, page) if timeout is None else timeout
+        started = time.perf_counter()
+        deadline = started + timeout
+        probes = 0
+        while True:
+            probes += 1
+            result = self.driver.execute_script(PROBE_SCRIPT, [list(c) for c in candidates], clickable, False)
+            if result or time.perf_counter() >= deadline:
+                break
+            time.sleep(POLL_INTERVAL)
+        elapsed = time.perf_counter() - started
+
+        if not result:
+            self.stats.add(locator.name, lookups=1, misses=1, probes=probes, seconds=elapsed,
+                           baseline_seconds=len(candidates) * self.implicit_wait)
+            if self.learn:
+                self.cache.record(page, locator.name)
+            raise TimeoutException(f"{locator.name} not found on {page} after {elapsed:.1f}s "
+                                   f"({len(candidates)} candidates)")
+        index, element = result
+        candidate = candidates[index]
+        declared = locator.candidates.index(candidate)
+        self.stats.add(locator.name, lookups=1, learned=int(learned and index == 0), probes=probes,
+                       seconds=elapsed, baseline_seconds=declared * self.implicit_wait + elapsed)
+        if self.learn:
+            self.cache.record(page, locator.name, candidate)
+        return element
+
+    def find_all(self, name, clickable=False):
+        """Every element matching any candidate, right now (no waiting), like the union selector"""
+        locator = self._locator(name)
+        started = time.perf_counter()
+        found = self.driver.execute_script(PROBE_SCRIPT, [list(c) for c in locator.candidates], clickable, True)
+        elapsed = time.perf_counter() - started
+        # find_elements waits the implicit wait out when nothing matches
+        self.stats.add(locator.name, lookups=1, probes=1, seconds=elapsed,
+                       baseline_seconds=elapsed if found else self.implicit_wait)
+        return found or []
+
+    __call__ = find
+
+
+# Pytest plugin ------------------------------------------------------------
+
+def pytest_addoption(parser):
+    group = parser.getgroup('locators', 'learning locator resolver')
+    group.addoption('--locator-cache', default=os.getenv('LOCATOR_CACHE', CACHE_PATH),
+                    help='JSON file of the candidate each element matched per page (env LOCATOR_CACHE)')
+    group.addoption('--no-locator-learning', action='store_true', default=False,
+                    help='Probe candidates in declared order and leave the cache alone')
+    group.addoption('--locator-report', action='store_true', default=False,
+                    help='Report lookups per element and the time saved over fallback chains')
+
+
+def pytest_configure(config):
+    get_cache(config.getoption('locator_cache'))
+    config.locator_stats = []
+
+
+@pytest.fixture
+def locate(request):
+    """Factory: ``locate(driver)`` gives a resolver honouring the command line options"""
+    learn = not request.config.getoption('no_locator_learning')
+    return lambda driver, **kwargs: LocatorResolver(driver, learn=learn, **kwargs)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    get_cache().save()
+    if hasattr(config, 'workerinput'):
+        config.workeroutput['locator_stats'] = json.dumps(_stats.to_dict())
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    output = getattr(node, 'workeroutput', {}).get('locator_stats')
+    if output and hasattr(node.config, 'locator_stats'):
+        node.config.locator_stats.append(json.loads(output))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    if not config.getoption('locator_report'):
+        return
+    stats = LookupStats().merge(_stats.to_dict())
+    for worker in config.locator_stats:
+        stats.merge(worker)
+    if not stats.by_name:
+        return
+    terminalreporter.section('locator lookups')
+    for line in stats.format():
+        terminalreporter.write_line(line)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Show or reset the learned locator candidates')
+    parser.add_argument('--cache', default=CACHE_PATH)
+    parser.add_argument('--reset', action='store_true', help='Forget everything learned')
+    args = parser.parse_args()
+
+    if args.reset:
+        if os.path.exists(args.cache):
+            os.remove(args.cache)
+        print(f"Removed {args.cache}")
+        return
+    cache = LocatorCache(args.cache)
+    for page, elements in sorted(cache.entries.items()):
+        print(page)
+        for name, entry in sorted(elements.items()):
+            learned = f"{entry['by']}={entry['value']}" if 'by' in entry else '(never found)'
+            print(f"  {name:<16} {learned}  hits {entry['hits']} misses {entry['misses']}")
+
+
+if __name__ == '__main__':
+    main()
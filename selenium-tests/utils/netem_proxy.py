@@ -0,0 +1,333 @@
+"""
+Network Emulation Proxy
+asyncio HTTP proxy that adds latency, jitter, bandwidth caps and packet-loss
+stalls per direction and per route prefix between the harness and the app
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+from config import BASE_URL
+
+
+MSS = 1460          # Payload bytes per simulated packet
+CHUNK = 16 * 1024   # Bytes paced per bandwidth reservation
+
+# One-way latency, so RTT is twice the figure; rates in kilobits per second
+# (Lighthouse/DevTools throttling presets)
+PRESETS = {
+    'slow-3g': {'up': {'latency_ms': 200, 'bandwidth_kbps': 400}, 'down': {'latency_ms': 200, 'bandwidth_kbps': 400}},
+    'slow-4g': {'up': {'latency_ms': 75, 'bandwidth_kbps': 750}, 'down': {'latency_ms': 75, 'bandwidth_kbps': 1600}},
+    'dsl': {'up': {'latency_ms': 25, 'bandwidth_kbps': 1000}, 'down': {'latency_ms': 25, 'bandwidth_kbps': 8000}},
+    'lossy-wifi': {
+        'up': {'latency_ms': 15, 'jitter_ms': 10, 'bandwidth_kbps': 5000, 'loss': 0.02},
+        'down': {'latency_ms': 15, 'jitter_ms': 10, 'bandwidth_kbps': 20000, 'loss': 0.02},
+    },
+}
+
+
+class Link:
+    """
+    One direction of a route rule
+
+    Bandwidth is a single bottleneck shared by every connection on the rule,
+    like a real access link. Each lost packet stalls the stream for
+    ``stall_ms`` (a retransmission timeout) instead of dropping bytes, since
+    the proxy sits above TCP.
+
+    Args:
+        latency_ms (float): One-way delay before the first byte of every message
+        jitter_ms (float): Uniform +/- variation of the delay
+        bandwidth_kbps (float): Cap in kilobits per second (None for unlimited)
+        loss (float): Probability that a packet stalls
+        stall_ms (float): Stall per lost packet
+    """
+
+    def __init__(self, latency_ms=0, jitter_ms=0, bandwidth_kbps=None, loss=0.0, stall_ms=200, seed=None):
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.rate = bandwidth_kbps * 1000 / 8.0 if bandwidth_kbps else None
+        self.loss = loss
+        self.stall = stall_ms / 1000.0
+        self.rng = random.Random(seed)
+        self.bytes = 0
+        self.stalls = 0
+        self._free_at = 0.0
+
+    def delay(self):
+        return max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+
+    async def send(self, writer, data):
+        """Write ``data`` paced by the link's bandwidth, stalling for lost packets"""
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(data), CHUNK):
+            chunk = data[start:start + CHUNK]
+            if self.loss:
+                lost = sum(self.rng.random() < self.loss for _ in range(-(-len(chunk) // MSS)))
+                if lost:
+                    self.stalls += lost
+                    await asyncio.sleep(lost * self.stall)
+            if self.rate:
+                now = loop.time()
+                self._free_at = max(now, self._free_at) + len(chunk) / self.rate
+                await asyncio.sleep(self._free_at - now)
+            writer.write(chunk)
+            self.bytes += len(chunk)
+        await writer.drain()
+
+    def stats(self):
+        return {'bytes': self.bytes, 'stalls': self.stalls}
+
+
+class Rule:
+    """Links for requests whose path starts with ``prefix`` ('' matches everything)"""
+
+    def __init__(self, prefix='', up=None, down=None):
+        self.prefix = prefix
+        self.up = up or Link()
+        self.down = down or Link()
+        self.requests = 0
+
+
+def rules_from_spec(spec, seed=None):
+    """
+    Build rules from a preset name or a spec dict
+
+    Spec format::
+
+        {"default": {"preset": "slow-4g"},
+         "rules": [{"prefix": "/api/", "up": {...Link kwargs}, "down": {...}}]}
+
+    Every rule (and ``default``) accepts ``preset`` plus per-direction overrides.
+
+    Returns:
+        list: Rules, most specific prefix first, ending with the catch-all
+    """
+    if isinstance(spec, str):
+        spec = {'default': {'preset': spec}}
+
+    def build(entry, prefix):
+        base = PRESETS[entry['preset']] if entry.get('preset') else {}
+        links = {direction: Link(**{**base.get(direction, {}), **entry.get(direction, {})}, seed=seed)
+                 for direction in ('up', 'down')}
+        return Rule(prefix, **links)
+
+    rules = [build(entry, entry['prefix']) for entry in spec.get('rules', [])]
+    rules.sort(key=lambda rule: -len(rule.prefix))
+    return rules + [build(spec.get('default', {}), '')]
+
+
+def load_netem(value):
+    """``--netem`` argument: a preset name or a JSON spec file"""
+    if value in PRESETS:
+        return value
+    with open(value) as f:
+        return json.load(f)
+
+
+async def _read_head(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    headers = [tuple(part.strip() for part in line.split(':', 1)) for line in lines[1:] if ':' in line]
+    return lines[0], headers
+
+
+def _header(headers, name):
+    name = name.lower()
+    return next((value for key, value in headers if key.lower() == name), None)
+
+
+def _build_head(start_line, headers):
+    return (start_line + '\r\n' + ''.join(f"{key}: {value}\r\n" for key, value in headers) + '\r\n').encode('latin-1')
+
+
+async def _body(reader, headers, until_close=False):
+    """Yield a message body as raw bytes, keeping its original framing"""
+    if (_header(headers, 'Transfer-Encoding') or '').lower().endswith('chunked'):
+        while True:
+            size_line = await reader.readuntil(b'\r\n')
+            size = int(size_line.split(b';')[0], 16)
+            if size == 0:
+                trailer = size_line
+                while True:
+                    line = await reader.readuntil(b'\r\n')
+                    trailer += line
+                    if line == b'\r\n':
+                        yield trailer
+                        return
+            yield size_line + await reader.readexactly(size + 2)
+    length = _header(headers, 'Content-Length')
+    if length is not None:
+        remaining = int(length)
+        while remaining:
+            data = await reader.read(min(remaining, CHUNK))
+            if not data:
+                raise asyncio.IncompleteReadError(b'', remaining)
+            remaining -= len(data)
+            yield data
+    elif until_close:
+        while True:
+            data = await reader.read(CHUNK)
+            if not data:
+                return
+            yield data
+
+
+class NetemProxy:
+    """
+    Shaping reverse proxy in front of one upstream (the app's frontend URL)
+
+    HTTP/1.1 aware: every request on a keep-alive connection is matched to a
+    rule by its own path, so static files and ``/api/`` calls sharing a
+    browser connection are still shaped separately. Runs its event loop on a
+    background thread so synchronous Selenium and requests code can use it.
+
+    Args:
+        target (str): Upstream base URL (default: APP_URL)
+        spec: Preset name or spec dict for ``rules_from_spec``
+        host (str): Listen address
+        port (int): Listen port (0 picks a free one)
+    """
+
+    def __init__(self, target=BASE_URL, spec=None, host='127.0.0.1', port=0, seed=None):
+        parsed = urlparse(target)
+        self.upstream = (parsed.hostname, parsed.port or (443 if parsed.scheme == 'https' else 80))
+        self.upstream_host = parsed.netloc
+        self.upstream_tls = parsed.scheme == 'https'
+        self.rules = rules_from_spec(spec or {}, seed)
+        self.host = host
+        self.port = port
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def match(self, path):
+        return next(rule for rule in self.rules if path.startswith(rule.prefix))
+
+    def stats(self):
+        return {rule.prefix or '*': {'requests': rule.requests, 'up': rule.up.stats(), 'down': rule.down.stats()}
+                for rule in self.rules}
+
+    async def _pipe(self, reader, writer, link):
+        while True:
+            data = await reader.read(CHUNK)
+            if not data:
+                return
+            await link.send(writer, data)
+
+    async def _client(self, client_reader, client_writer):
+        upstream_reader = upstream_writer = None
+        try:
+            while True:
+                try:
+                    request_line, headers = await _read_head(client_reader)
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+                method, path = request_line.split(' ')[:2]
+                rule = self.match(path)
+                rule.requests += 1
+                headers = [(key, self.upstream_host if key.lower() == 'host' else value) for key, value in headers]
+                if upstream_writer is None:
+                    upstream_reader, upstream_writer = await asyncio.open_connection(*self.upstream, ssl=self.upstream_tls or None)
+
+                await asyncio.sleep(rule.up.delay())
+                await rule.up.send(upstream_writer, _build_head(request_line, headers))
+                async for data in _body(client_reader, headers):
+                    await rule.up.send(upstream_writer, data)
+
+                status_line, response_headers = await _read_head(upstream_reader)
+                status = int(status_line.split(' ')[1])
+                await asyncio.sleep(rule.down.delay())
+                await rule.down.send(client_writer, _build_head(status_line, response_headers))
+                if status == 101:  # Upgraded (e.g. websocket): shape raw bytes both ways until close
+                    await asyncio.gather(self._pipe(client_reader, upstream_writer, rule.up),
+                                         self._pipe(upstream_reader, client_writer, rule.down))
+                    return
+                has_body = method != 'HEAD' and status not in (204, 304) and status >= 200
+                close_delimited = has_body and _header(response_headers, 'Content-Length') is None and not (
+                    _header(response_headers, 'Transfer-Encoding') or '').lower().endswith('chunked')
+                if has_body:
+                    async for data in _body(upstream_reader, response_headers, until_close=True):
+                        await rule.down.send(client_writer, data)
+                if close_delimited or 'close' in ((_header(headers, 'Connection') or '') +
+                                                  (_header(response_headers, 'Connection') or '')).lower():
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError, OSError):
+            return
+        finally:
+            for writer in (client_writer, upstream_writer):
+                if writer is not None:
+                    writer.close()
+
+    def start(self):
+        """Start listening on a background event loop and return self"""
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._client, self.host, self.port, limit=256 * 1024))
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait(10)
+        return self
+
+    async def _shutdown(self):
+        self._server.close()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self):
+        """Drop open connections and stop the event loop"""
+        if self._loop:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+            self._loop.close()
+            self._loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Shape traffic between the harness and the app')
+    parser.add_argument('--target', default=BASE_URL, help='Upstream frontend URL (default: APP_URL)')
+    parser.add_argument('--netem', default='slow-4g',
+                        help=f"Preset ({', '.join(sorted(PRESETS))}) or JSON spec file")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8090)
+    args = parser.parse_args()
+
+    proxy = NetemProxy(args.target, load_netem(args.netem), args.host, args.port).start()
+    print(f"Shaping {args.target} as {args.netem} on {proxy.url} (point APP_URL or --url here; Ctrl+C stops)")
+    try:
+        while True:
+            time.sleep(10)
+            print(json.dumps(proxy.stats()))
+    except KeyboardInterrupt:
+        proxy.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+Page Snapshot Cache
+Captures a page once per session and answers later read-only tests from the
+snapshot: title, URL, source, body text and selected element facts
+"""
+
+import time
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from utils.html_driver import HtmlDriver, parse_html, quit_driver
+
+
+# Captured per element of these tags, live from the driver; other lookups parse the source
+SNAPSHOT_TAGS = ['html', 'body', 'title', 'nav', 'h1', 'h2', 'a', 'form', 'input', 'button']
+SNAPSHOT_ATTRIBUTES = ['id', 'name', 'class', 'href', 'type', 'placeholder']
+
+# One round trip for every captured element, instead of one per element and attribute
+FACTS_SCRIPT = """
+var tags = arguments[0], names = arguments[1], facts = {};
+tags.forEach(function (tag) {
+  facts[tag] = Array.prototype.map.call(document.getElementsByTagName(tag), function (el) {
+    var attributes = {};
+    names.forEach(function (name) {
+      if (el.hasAttribute(name)) attributes[name] = el.getAttribute(name);
+    });
+    return {tag_name: el.tagName.toLowerCase(), text: (el.innerText || '').trim(), attributes: attributes};
+  });
+});
+return facts;
+"""
+
+DEFAULT_MAX_AGE = 300.0
+
+
+def _facts(element):
+    attributes = ((name, element.get_attribute(name)) for name in SNAPSHOT_ATTRIBUTES)
+    return {'tag_name': element.tag_name, 'text': element.text,
+            'attributes': {name: value for name, value in attributes if value is not None}}
+
+
+class SnapshotElement:
+    """Element facts frozen at capture time (``tag_name``, ``text``, ``get_attribute``)"""
+
+    def __init__(self, tag_name, text, attributes):
+        self.tag_name = tag_name
+        self.text = text
+        self.attributes = attributes
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class PageSnapshot:
+    """
+    What one visit to a page showed, readable like a driver that cannot navigate
+
+    ``find_element(s)`` by tag name for SNAPSHOT_TAGS answers from facts the
+    driver reported; anything else is looked up in the captured source.
+
+    Attributes:
+        load_seconds (float): Time ``driver.get`` took (for load-time assertions)
+        cost_seconds (float): Whole capture, including starting a driver when
+            the test passed a factory; what each reuse saves
+    """
+
+    def __init__(self, url, current_url, title, page_source, body_text, elements, status_code=None,
+                 load_seconds=0.0, cost_seconds=0.0, tier='browser', captured_by=None):
+        self.url = url
+        self.current_url = current_url
+        self.title = title
+        self.page_source = page_source
+        self.body_text = body_text
+        self.elements = elements
+        self.status_code = status_code
+        self.load_seconds = load_seconds
+        self.cost_seconds = cost_seconds
+        self.tier = tier
+        self.captured_by = captured_by
+        self.captured_at = time.monotonic()
+        self._document = None
+
+    @classmethod
+    def capture(cls, driver, url, tier='browser', captured_by=None):
+        """Load ``url`` in ``driver`` and record what the tests read"""
+        started = time.perf_counter()
+        driver.get(url)
+        load_seconds = time.perf_counter() - started
+        elements = None
+        if not isinstance(driver, HtmlDriver):
+            try:
+                elements = driver.execute_script(FACTS_SCRIPT, SNAPSHOT_TAGS, SNAPSHOT_ATTRIBUTES)
+            except WebDriverException:
+                pass  # Script execution disabled; fall back to per-element calls
+        if elements is None:
+            elements = {tag: [_facts(element) for element in driver.find_elements(By.TAG_NAME, tag)]
+                        for tag in SNAPSHOT_TAGS}
+        try:
+            body_text = driver.find_element(By.TAG_NAME, 'body').text
+        except NoSuchElementException:
+            body_text = ''
+        return cls(url, driver.current_url, driver.title, driver.page_source, body_text, elements,
+                   status_code=getattr(driver, 'status_code', None), load_seconds=load_seconds,
+                   tier=tier, captured_by=captured_by)
+
+    def age(self):
+        return time.monotonic() - self.captured_at
+
+    def find_elements(self, by=By.ID, value=None):
+        if by == By.TAG_NAME and value in self.elements:
+            return [SnapshotElement(**fact) for fact in self.elements[value]]
+        if self._document is None:
+            self._document = parse_html(self.page_source)
+        return self._document.find_elements(by, value)
+
+    def find_element(self, by=By.ID, value=None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"no such element: Unable to locate element: {by}={value} "
+                                         f"in snapshot of {self.url}")
+        return found[0]
+
+
+class SnapshotCache:
+    """
+    Session-wide snapshots keyed by URL, driver tier (HTML tier or browser)
+    and driver profile, so a page captured by a Chrome with JavaScript
+    disabled is never served to a test that expects it rendered
+
+    Invalidation: entries expire after ``max_age`` seconds; ``clear`` drops
+    everything and runs after every test not marked ``read_only``, since it
+    may have changed what pages show. Error pages (5xx) are never kept.
+
+    Args:
+        max_age (float): Seconds a snapshot stays valid
+        enabled (bool): False loads the page on every call
+    """
+
+    def __init__(self, max_age=DEFAULT_MAX_AGE, enabled=True):
+        self.max_age = max_age
+        self.enabled = enabled
+        self.entries = {}
+        self.loads = 0
+        self.hits = 0
+        self.saved_seconds = 0.0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(url, tier, profile=None):
+        return url.rstrip('/') or url, tier, profile
+
+    def get(self, url, tier, profile=None):
+        """Valid snapshot for ``url`` or None; expired entries are dropped"""
+        key = self.key(url, tier, profile)
+        snapshot = self.entries.get(key)
+        if snapshot is not None and snapshot.age() > self.max_age:
+            del self.entries[key]
+            return None
+        return snapshot
+
+    def clear(self):
+        if self.entries:
+            self.entries.clear()
+            self.invalidations += 1
+
+    def snapshot(self, url, driver, tier='browser', reuse=True, store=True, captured_by=None, settle=0.5,
+                 profile=None):
+        """
+        Snapshot of ``url``, loading it only when no valid one is cached
+
+        Args:
+            driver: A driver, or a zero-argument factory that is only called
+                (and the driver quit afterwards) when the page must be loaded
+            reuse (bool): Accept a cached snapshot
+            profile (str): Driver configuration (e.g. ``"chrome-nojs"``);
+                snapshots are only shared between callers passing the same one
+            store (bool): Keep a fresh capture for later tests
+            settle (float): Seconds a factory-made browser gets to release memory
+        """
+        if self.enabled and reuse:
+            cached = self.get(url, tier, profile)
+            if cached is not None:
+                self.hits += 1
+                self.saved_seconds += cached.cost_seconds
+                return cached
+        started = time.perf_counter()
+        made = driver() if callable(driver) else None
+        try:
+            snapshot = PageSnapshot.capture(made or driver, url, tier=tier, captured_by=captured_by)
+        finally:
+            if made is not None:
+                quit_driver(made, settle=settle)
+        snapshot.cost_seconds = time.perf_counter() - started
+        self.loads += 1
+        if self.enabled and store and (snapshot.status_code or 0) < 500:
+            self.entries[self.key(url, tier, profile)] = snapshot
+        return snapshot
+
+
+# Pytest plugin ------------------------------------------------------------
+
+def pytest_addoption(parser):
+    group = parser.getgroup('page snapshots', 'page snapshot cache')
+    group.addoption('--no-page-snapshots', action='store_true', default=False,
+                    help='Load the page for every page_snapshot call')
+    group.addoption('--snapshot-max-age', type=float, default=DEFAULT_MAX_AGE,
+                    help='Seconds a page snapshot may be reused (default: %(default)s)')
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'read_only: changes no app state; page_snapshot may reuse earlier visits')
+    config.addinivalue_line('markers', 'no_snapshot: page_snapshot always loads the page (e.g. to time the load)')
+    config.page_snapshots = SnapshotCache(config.getoption('snapshot_max_age'),
+                                          enabled=not config.getoption('no_page_snapshots'))
+
+
+@pytest.fixture
+def page_snapshot(request):
+    """
+    Factory: ``page_snapshot(url, driver, profile=None)`` returns a PageSnapshot
+
+    Tests marked ``read_only`` share snapshots; ``no_snapshot`` forces a fresh
+    load (which later tests then reuse). Unmarked tests always load the page.
+    ``profile`` names the browser configuration the factory builds; on the
+    HTML tier every profile gets the same HtmlDriver, so it is ignored there.
+    """
+    node = request.node
+    read_only = node.get_closest_marker('read_only') is not None
+    reuse = read_only and node.get_closest_marker('no_snapshot') is None
+    html_tier = node.get_closest_marker('no_js') and not request.config.getoption('no_html_tier', False)
+    tier = 'html' if html_tier else 'browser'
+    cache = request.config.page_snapshots
+    return lambda url, driver, profile=None, **kwargs: cache.snapshot(
+        url, driver, tier=tier, reuse=reuse, store=read_only, captured_by=node.nodeid,
+        profile=None if html_tier else profile, **kwargs)
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_runtest_teardown(item):
+    if item.get_closest_marker('read_only') is None:
+        item.config.page_snapshots.clear()
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    cache = config.page_snapshots
+    if cache.hits:
+        terminalreporter.write_line(f"page snapshots: {cache.loads} loads, {cache.hits} reused, "
+                                    f"{cache.saved_seconds:.2f}s of loading saved")
@@ -0,0 +1,295 @@
+"""
+Response Payload Audit
+Measures what every API route sends against the fields the SPA actually reads
+(captured in the browser) and ranks routes by wasted bytes
+"""
+
+import json
+import os
+import re
+import statistics
+import time
+from urllib.parse import urlparse
+
+import requests
+
+from config import BASE_URL, HARNESS_DIR, TEST_ADMIN
+from utils.api_client import ApiClient, ApiError
+
+
+FIELD_READS_PATH = os.path.join(HARNESS_DIR, 'field_reads.json')
+OBJECT_ID = re.compile(r'/[0-9a-f]{24}(?=/|$)')
+
+# GET routes the client calls, with the parameter sets it uses; placeholders
+# are filled from live data. Weights mirror load_harness.DEFAULT_ROUTES.
+AUDIT_ROUTES = [
+    {'path': '/api/blog/get-all-blogs?limit=9', 'weight': 3},
+    {'path': '/api/blog/get-all-blogs?limit=3', 'weight': 1},
+    {'path': '/api/blog/get-all-blogs?limit=5'},
+    {'path': '/api/blog/get-all-blogs?slug={slug}'},
+    {'path': '/api/blog/get-all-blogs?blogId={blogId}'},
+    {'path': '/api/blog/get-all-blogs?sort=desc&searchBlog=a'},
+    {'path': '/api/comment/get-comment/{commentedBlogId}'},
+    {'path': '/api/user/get-user-comment/{commentUserId}'},
+    {'path': '/api/user/getusers', 'auth': True},
+    {'path': '/api/user/getusers?user=5', 'auth': True},
+    {'path': '/api/comment/get-all-comments', 'auth': True},
+    {'path': '/api/comment/get-all-comments?limitComments=5', 'auth': True},
+]
+
+# Installed before the app's scripts. Bodies axios reads through
+# XHR.responseText are remembered with their URL; when JSON.parse sees one of
+# them it returns Proxies that record every own property the app touches.
+FIELD_READ_PROBE = r"""
+(function () {
+  var reads = window.__fieldReads = {}, pending = new Map(), proxies = new WeakMap();
+  var textDescriptor = Object.getOwnPropertyDescriptor(XMLHttpRequest.prototype, 'responseText');
+  var open = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__auditUrl = url;
+    return open.apply(this, arguments);
+  };
+  Object.defineProperty(XMLHttpRequest.prototype, 'responseText', {
+    configurable: true,
+    get: function () {
+      var text = textDescriptor.get.call(this);
+      if (this.__auditUrl && text) { pending.set(text, this.__auditUrl); }
+      return text;
+    }
+  });
+  function route(url) {
+    return new URL(url, location.href).pathname.replace(/\/[0-9a-f]{24}(?=\/|$)/g, '/:id');
+  }
+  function wrap(value, key, path) {
+    if (value === null || typeof value !== 'object') { return value; }
+    if (proxies.has(value)) { return proxies.get(value); }
+    var proxy = new Proxy(value, {
+      get: function (target, prop, receiver) {
+        var result = Reflect.get(target, prop, receiver);
+        if (typeof prop !== 'string' || !Object.prototype.hasOwnProperty.call(target, prop)) { return result; }
+        if (Array.isArray(target) && prop === 'length') { return result; }
+        var child = Array.isArray(target) ? path + '[]' : (path ? path + '.' + prop : prop);
+        (reads[key] = reads[key] || {})[child] = 1;
+        var descriptor = Object.getOwnPropertyDescriptor(target, prop);
+        if (descriptor && !descriptor.configurable && !descriptor.writable) { return result; }  // frozen by immer
+        return wrap(result, key, child);
+      }
+    });
+    proxies.set(value, proxy);
+    return proxy;
+  }
+  var parse = JSON.parse;
+  JSON.parse = function (text) {
+    var value = parse.apply(JSON, arguments), url = typeof text === 'string' && pending.get(text);
+    if (!url) { return value; }
+    pending.delete(text);
+    return wrap(value, route(url), '');
+  };
+})();
+"""
+
+
+def route_template(path):
+    """``/api/comment/get-comment/<24 hex>?x=1`` -> ``/api/comment/get-comment/:id``"""
+    return OBJECT_ID.sub('/:id', urlparse(path).path)
+
+
+def capture_field_reads(driver, base_url=BASE_URL, admin=None, settle=3.0):
+    """
+    Browse the main screens with the read probe installed and collect field paths
+
+    Visits home, search and a blog page, then (with ``admin``) the dashboard
+    tabs and the blog editor. Field reads are collected before every
+    navigation because each new document starts a fresh probe.
+
+    Returns:
+        dict: Route template -> sorted list of field paths the app read
+    """
+    from utils.account_pool import login_browser
+
+    client = ApiClient(base_url)
+    blogs = client.get_blogs(limit=1)['blogs']
+    pages = ['/', '/search?sort=desc&searchBlog=a']
+    if blogs:
+        pages.append(f"/blog/{blogs[0]['slug']}")
+    if admin:
+        pages += [f"/dashboard?tab={tab}" for tab in ('dash', 'users', 'comments', 'blogs')]
+        if blogs:
+            pages.append(f"/update-blog/{blogs[0]['_id']}")
+
+    reads = {}
+    probe = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': FIELD_READ_PROBE})
+    try:
+        if admin:
+            login_browser(driver, base_url, admin)
+        for page in pages:
+            driver.get(base_url + page)
+            time.sleep(settle)
+            driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
+            time.sleep(0.5)
+            for route, paths in (driver.execute_script('return window.__fieldReads || {};') or {}).items():
+                reads.setdefault(route, set()).update(paths)
+    finally:
+        driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': probe['identifier']})
+    return {route: sorted(paths) for route, paths in sorted(reads.items())}
+
+
+def field_bytes(payload, prefix='', sizes=None):
+    """
+    Approximate bytes each leaf field contributes to the compact JSON body
+
+    Array elements share one path (``blogs[].blogBody``), so a field's bytes
+    are summed over every element.
+
+    Returns:
+        dict: Field path -> bytes (key, value and separators)
+    """
+    sizes = {} if sizes is None else sizes
+    if isinstance(payload, dict):
+        items = [(f"{prefix}.{key}" if prefix else key, len(json.dumps(key)) + 2, value) for key, value in payload.items()]
+    elif isinstance(payload, list):
+        items = [(f"{prefix}[]", 1, value) for value in payload]
+    else:
+        return sizes
+    for path, overhead, value in items:
+        if isinstance(value, (dict, list)) and value:
+            sizes[path] = sizes.get(path, 0) + overhead + 2
+            field_bytes(value, path, sizes)
+        else:
+            sizes[path] = sizes.get(path, 0) + overhead + len(json.dumps(value, separators=(',', ':')))
+    return sizes
+
+
+def unused_fields(sizes, reads):
+    """Leaf paths the client never read (nor read anything beneath)"""
+    leaves = [path for path in sizes if not any(other.startswith(path + '.') or other.startswith(path + '[]')
+                                                  for other in sizes if other != path)]
+    return [path for path in leaves
+            if path not in reads and not any(read.startswith(path + '.') or read.startswith(path + '[]')
+                                             for read in reads)]
+
+
+def _placeholders(client, admin):
+    values = {}
+    blogs = client.get_blogs(limit=1)['blogs']
+    if blogs:
+        values.update(slug=blogs[0]['slug'], blogId=blogs[0]['_id'], commentedBlogId=blogs[0]['_id'],
+                      commentUserId=blogs[0]['userId'])
+    if admin:
+        comments = client.get_all_comments(admin, per_page=1)['comments']
+        if comments:
+            values.update(commentedBlogId=comments[0]['blogId'], commentUserId=comments[0]['userId'])
+    return values
+
+
+def run_audit(base_url=BASE_URL, routes=None, reads=None, mix=None, samples=3, timeout=10):
+    """
+    Fetch every route a few times and compare what it sends with what is read
+
+    Args:
+        routes (list): Route dicts (``path``, optional ``weight`` and ``auth``); AUDIT_ROUTES by default
+        reads (dict): Output of ``capture_field_reads``; without it only sizes are reported
+        mix (list): Weighted routes of the traffic mix (e.g. a profile's ``routes``);
+            mix routes missing from ``routes`` are audited too
+        samples (int): Requests per route; the median size is reported
+
+    Returns:
+        list: One row per route with ``bytes``, ``used_bytes``, ``wasted_bytes``,
+        ``wasted_pct``, top ``unused`` fields, ``mix_share`` and ``mix_kb_per_1k``
+        (kB this route adds to every 1,000 requests of the mix)
+    """
+    client = ApiClient(base_url, timeout)
+    try:
+        admin = client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+    except (ApiError, OSError):
+        admin = None
+    values = _placeholders(client, admin)
+
+    routes = [dict(route) for route in (routes or AUDIT_ROUTES)]
+    if mix is not None:
+        weights = {route['path']: route.get('weight', 1) for route in mix}
+        for route in routes:
+            route['weight'] = weights.pop(route['path'], 0)
+        routes += [{'path': path, 'weight': weight} for path, weight in weights.items()]
+    total_weight = sum(route.get('weight', 0) for route in routes) or 1
+
+    session = requests.Session()
+    rows = []
+    for route in routes:
+        try:
+            path = route['path'].format(**values)
+        except KeyError:
+            continue  # No data to fill the placeholder with
+        if route.get('auth') and not admin:
+            continue
+        headers = {'Authorization': admin['token']} if route.get('auth') else {}
+        bodies = [session.get(base_url + path, headers=headers, timeout=timeout) for _ in range(samples)]
+        response = bodies[-1]
+        size = statistics.median(len(body.content) for body in bodies)
+        row = {'route': route['path'], 'template': route_template(path), 'status': response.status_code,
+               'bytes': int(size), 'used_bytes': None, 'wasted_bytes': None, 'wasted_pct': None, 'unused': []}
+        if 'json' in response.headers.get('Content-Type', '') and reads is not None:
+            sizes = field_bytes(response.json())
+            route_reads = set(reads.get(row['template'], []))
+            if route_reads:
+                unused = unused_fields(sizes, route_reads)
+                wasted = sum(sizes[path] for path in unused)
+                row.update(used_bytes=int(size) - wasted, wasted_bytes=wasted,
+                           wasted_pct=round(100.0 * wasted / size, 1) if size else 0.0,
+                           unused=sorted(unused, key=lambda path: -sizes[path])[:8])
+        share = route.get('weight', 0) / total_weight
+        row['mix_share'] = round(share, 3)
+        row['mix_kb_per_1k'] = round(share * size, 1)  # share x 1000 requests x bytes / 1000
+        row['mix_wasted_kb_per_1k'] = round(share * (row['wasted_bytes'] or 0), 1)
+        rows.append(row)
+    return rows
+
+
+def rankings(rows):
+    """Routes ordered by wasted bytes per request and by bytes at the traffic mix"""
+    return {
+        'by_wasted_bytes': [row['route'] for row in sorted(rows, key=lambda row: -(row['wasted_bytes'] or 0))],
+        'by_mix_bytes': [row['route'] for row in sorted(rows, key=lambda row: -row['mix_kb_per_1k'])],
+    }
+
+
+def print_audit(rows):
+    print(f"{'route':<58}{'bytes':>10}{'wasted':>10}{'waste%':>8}{'share':>7}{'kB/1k':>9}  top unused fields")
+    for row in sorted(rows, key=lambda row: -(row['wasted_bytes'] or 0)):
+        wasted = '-' if row['wasted_bytes'] is None else row['wasted_bytes']
+        pct = '-' if row['wasted_pct'] is None else row['wasted_pct']
+        print(f"{row['route'][:57]:<58}{row['bytes']:>10}{wasted:>10}{pct:>8}{row['mix_share']:>7}"
+              f"{row['mix_kb_per_1k']:>9}  {', '.join(row['unused'][:4])}")
+
+
+def load_field_reads(path=FIELD_READS_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    import argparse
+
+    from utils.driver_setup import close_driver, get_chrome_driver
+
+    parser = argparse.ArgumentParser(description='Capture which response fields the SPA reads')
+    parser.add_argument('--url', default=BASE_URL, help='Target frontend URL (default: APP_URL)')
+    parser.add_argument('--out', default=FIELD_READS_PATH)
+    parser.add_argument('--no-admin', action='store_true', help='Skip the dashboard screens')
+    parser.add_argument('--settle', type=float, default=3.0, help='Seconds to wait on every screen')
+    args = parser.parse_args()
+
+    admin = None if args.no_admin else ApiClient(args.url).login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+    driver = get_chrome_driver(headless=True)
+    try:
+        reads = capture_field_reads(driver, args.url, admin, args.settle)
+    finally:
+        close_driver(driver)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, 'w') as f:
+        json.dump(reads, f, indent=2)
+    print(f"Captured reads for {len(reads)} routes into {args.out}")
+
+
+if __name__ == '__main__':
+    main()
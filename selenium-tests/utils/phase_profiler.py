@@ -0,0 +1,411 @@
+"""
+Fixture Phase Profiler
+Splits every test's wall time into fixture setup, body, teardown and sleeps,
+and works out the suite's critical path and best achievable parallel schedule
+"""
+
+import heapq
+import json
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+import pytest
+
+from config import HARNESS_DIR
+
+
+PHASES_DIR = os.path.join(HARNESS_DIR, 'phases')
+
+# Harness calls timed as named spans: (module, attribute) -> label
+TRACED = {
+    ('utils.driver_setup', 'get_chrome_driver'): 'driver_start',
+    ('utils.driver_setup', 'close_driver'): 'driver_quit',
+    ('utils.driver_setup', 'new_context_driver'): 'context_open',
+    ('utils.driver_setup', 'close_context'): 'context_close',
+    ('utils.account_pool', 'login_browser'): 'login',
+    ('time', 'sleep'): 'sleep',
+}
+
+SHARED_SCOPES = ('session', 'package', 'module', 'class')
+
+
+class PhaseRecorder:
+    """
+    Collects per-test phase timings while the suite runs
+
+    Fixture setup is timed around ``pytest_fixture_setup``. Fixture teardown
+    is the gap between consecutive ``pytest_fixture_post_finalizer`` calls
+    within a teardown phase, since finalizers run one after another. Spans
+    are inclusive: a ``sleep`` inside ``close_driver`` counts towards both.
+    Only the main thread's calls are booked; background threads (load
+    harness workers, seeder pools) would otherwise charge their sleeps to
+    whichever test happens to be running.
+    """
+
+    def __init__(self):
+        self.tests = {}
+        self.outside = defaultdict(float)  # Spans outside any test (collection, session hooks)
+        self.session_finish = 0.0
+        self._current = None
+        self._phase = None
+        self._mark = None
+        self._originals = {}
+        self._main_thread = None
+
+    def _test(self, item):
+        record = self.tests.get(item.nodeid)
+        if record is None:
+            record = self.tests[item.nodeid] = {
+                'nodeid': item.nodeid, 'cls': item.cls.__name__ if item.cls else item.module.__name__,
+                'setup': 0.0, 'call': 0.0, 'teardown': 0.0, 'fixtures': {}, 'spans': {},
+            }
+        return record
+
+    def span(self, label, seconds):
+        current, phase = self._current, self._phase
+        if current is None:
+            self.outside[label] += seconds
+            return
+        spans = current['spans'].setdefault(label, {})
+        spans[phase] = spans.get(phase, 0.0) + seconds
+
+    def trace(self):
+        """Wrap the TRACED callables so their time is booked to the running phase"""
+        import importlib
+
+        self._main_thread = threading.main_thread().ident
+        for (module_name, name), label in TRACED.items():
+            module = importlib.import_module(module_name)
+            original = getattr(module, name)
+            self._originals[(module, name)] = original
+
+            def traced(*args, _original=original, _label=label, **kwargs):
+                if threading.get_ident() != self._main_thread:
+                    return _original(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return _original(*args, **kwargs)
+                finally:
+                    self.span(_label, time.perf_counter() - started)
+
+            setattr(module, name, traced)
+
+    def untrace(self):
+        for (module, name), original in self._originals.items():
+            setattr(module, name, original)
+        self._originals.clear()
+
+    def run_phase(self, item, phase):
+        """Start booking time to ``phase`` (setup/call/teardown) of ``item``; returns the start time"""
+        self._current, self._phase = self._test(item), phase
+        self._mark = started = time.perf_counter()
+        return started
+
+    def end_phase(self, started):
+        self._current[self._phase] += time.perf_counter() - started
+        self._current = self._phase = None
+
+    def fixture(self, fixturedef, phase, seconds):
+        if self._current is None:
+            return
+        entry = self._current['fixtures'].setdefault(
+            fixturedef.argname, {'scope': fixturedef.scope, 'setup': 0.0, 'teardown': 0.0})
+        entry[phase] += seconds
+
+    def finalized(self, fixturedef):
+        if self._phase != 'teardown' or fixturedef.cached_result is None:
+            return  # A repeat finish() of an already torn-down fixture
+        now = time.perf_counter()
+        self.fixture(fixturedef, 'teardown', now - self._mark)
+        self._mark = now
+
+    def to_dict(self):
+        return {'tests': list(self.tests.values()), 'outside': dict(self.outside),
+                'session_finish': self.session_finish}
+
+
+# Analysis -----------------------------------------------------------------
+
+def shared_cost(test):
+    """Seconds a test spent setting up or tearing down fixtures shared with other tests"""
+    return sum(entry['setup'] + entry['teardown'] for entry in test['fixtures'].values()
+               if entry['scope'] in SHARED_SCOPES)
+
+
+def wall_time(test):
+    return test['setup'] + test['call'] + test['teardown']
+
+
+def fixture_rollup(tests):
+    """
+    Returns:
+        list: One dict per fixture (``name``, ``scope``, ``uses``, ``setup_s``,
+        ``teardown_s``, ``mean_s``), costliest first
+    """
+    rollup = {}
+    for test in tests:
+        for name, entry in test['fixtures'].items():
+            row = rollup.setdefault(name, {'name': name, 'scope': entry['scope'], 'uses': 0,
+                                           'setup_s': 0.0, 'teardown_s': 0.0})
+            if entry['setup']:  # Shared fixtures are torn down under a later test
+                row['uses'] += 1
+            row['setup_s'] += entry['setup']
+            row['teardown_s'] += entry['teardown']
+    for row in rollup.values():
+        row['mean_s'] = (row['setup_s'] + row['teardown_s']) / row['uses'] if row['uses'] else 0.0
+    return sorted(rollup.values(), key=lambda row: -(row['setup_s'] + row['teardown_s']))
+
+
+def class_rollup(tests):
+    """
+    Returns:
+        list: One dict per class (``cls``, ``tests``, ``setup_s``, ``call_s``,
+        ``teardown_s``, ``sleep_s``, ``total_s``), slowest first
+    """
+    rollup = {}
+    for test in tests:
+        row = rollup.setdefault(test['cls'], {'cls': test['cls'], 'tests': 0, 'setup_s': 0.0, 'call_s': 0.0,
+                                              'teardown_s': 0.0, 'sleep_s': 0.0, 'total_s': 0.0})
+        row['tests'] += 1
+        for phase in ('setup', 'call', 'teardown'):
+            row[f"{phase}_s"] += test[phase]
+        row['sleep_s'] += sum(test['spans'].get('sleep', {}).values())
+        row['total_s'] += wall_time(test)
+    return sorted(rollup.values(), key=lambda row: -row['total_s'])
+
+
+def hotspots(tests, limit=10):
+    """
+    Where the suite's serial time goes: each fixture's setup and teardown,
+    each traced span per phase, and test bodies net of sleeping
+
+    Returns:
+        list: ``(label, seconds, share of serial total)``, largest first
+    """
+    totals = defaultdict(float)
+    for test in tests:
+        for name, entry in test['fixtures'].items():
+            totals[f"fixture {name} setup"] += entry['setup']
+            totals[f"fixture {name} teardown"] += entry['teardown']
+        for label, phases in test['spans'].items():
+            for phase, seconds in phases.items():
+                totals[f"{label} in {phase}"] += seconds
+        totals['test bodies (excl. sleep)'] += test['call'] - test['spans'].get('sleep', {}).get('call', 0.0)
+    serial = sum(wall_time(test) for test in tests) or 1.0
+    ranked = sorted(((label, seconds) for label, seconds in totals.items() if seconds > 0), key=lambda kv: -kv[1])
+    return [(label, seconds, seconds / serial) for label, seconds in ranked[:limit]]
+
+
+def lpt_makespan(durations, workers):
+    """Longest-processing-time-first schedule length on ``workers`` identical workers"""
+    loads = [0.0] * max(1, workers)
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+def critical_path(profile, workers=(2, 4, 8), group='test'):
+    """
+    Critical path and best parallel schedules of a profiled run
+
+    Work units are single tests (pytest-xdist ``--dist load``) or whole
+    classes (``--dist loadscope``), each net of shared fixture time. Shared
+    fixtures (session/module/class scope) are paid once per worker up front
+    and session-finish hooks (cleanup) once at the end, so the critical path
+    is shared + the longest unit + session finish.
+
+    Returns:
+        dict: ``serial_s``, ``shared_s``, ``critical_path_s``, ``longest_unit``,
+        and per worker count the ``lower_bound_s`` and ``lpt_s`` (greedy
+        schedule, within 4/3 of optimal)
+    """
+    tests = profile['tests']
+    shared = sum(shared_cost(test) for test in tests)
+    units = defaultdict(float)
+    for test in tests:
+        units[test['nodeid'] if group == 'test' else test['cls']] += wall_time(test) - shared_cost(test)
+    finish = profile.get('session_finish', 0.0)
+    longest = max(units.items(), key=lambda kv: kv[1], default=(None, 0.0))
+    total_work = sum(units.values())
+    report = {
+        'group': group, 'units': len(units),
+        'serial_s': round(shared + total_work + finish, 2),
+        'shared_s': round(shared, 2),
+        'session_finish_s': round(finish, 2),
+        'longest_unit': longest[0],
+        'critical_path_s': round(shared + longest[1] + finish, 2),
+        'schedules': {},
+    }
+    for count in workers:
+        report['schedules'][count] = {
+            'lower_bound_s': round(shared + max(longest[1], total_work / count) + finish, 2),
+            'lpt_s': round(shared + lpt_makespan(list(units.values()), count) + finish, 2),
+        }
+    return report
+
+
+def merge_profiles(profiles):
+    """Combine worker profiles; shared work is counted from the slowest worker"""
+    merged = {'tests': [], 'outside': defaultdict(float), 'session_finish': 0.0}
+    for profile in profiles:
+        merged['tests'] += profile['tests']
+        for label, seconds in profile['outside'].items():
+            merged['outside'][label] += seconds
+        merged['session_finish'] = max(merged['session_finish'], profile['session_finish'])
+    merged['outside'] = dict(merged['outside'])
+    return merged
+
+
+def format_report(profile, workers=(2, 4, 8)):
+    """Human-readable summary lines"""
+    tests = profile['tests']
+    lines = [f"{'class':32} {'tests':>5} {'setup':>8} {'body':>8} {'teardown':>9} {'sleep':>8} {'total':>8}"]
+    for row in class_rollup(tests):
+        lines.append(f"{row['cls'][:32]:32} {row['tests']:5d} {row['setup_s']:8.1f} {row['call_s']:8.1f} "
+                     f"{row['teardown_s']:9.1f} {row['sleep_s']:8.1f} {row['total_s']:8.1f}")
+    lines.append('')
+    lines.append(f"{'fixture':32} {'scope':>8} {'uses':>5} {'setup':>8} {'teardown':>9} {'mean':>7}")
+    for row in fixture_rollup(tests):
+        lines.append(f"{row['name'][:32]:32} {row['scope']:>8} {row['uses']:5d} {row['setup_s']:8.1f} "
+                     f"{row['teardown_s']:9.1f} {row['mean_s']:7.2f}")
+    lines.append('')
+    lines.append('Hotspots (share of serial time):')
+    for label, seconds, share in hotspots(tests):
+        lines.append(f"  {label:44} {seconds:8.1f}s {share:6.1%}")
+    lines.append('')
+    for group in ('test', 'class'):
+        report = critical_path(profile, workers, group)
+        schedules = ', '.join(f"{count}w {plan['lpt_s']}s (>= {plan['lower_bound_s']}s)"
+                              for count, plan in report['schedules'].items())
+        lines.append(f"Critical path by {group}: {report['critical_path_s']}s of {report['serial_s']}s serial "
+                     f"(shared {report['shared_s']}s, longest {report['longest_unit']}); {schedules}")
+    if tests:
+        median = statistics.median(wall_time(test) for test in tests)
+        lines.append(f"Median test {median:.1f}s over {len(tests)} tests")
+    return lines
+
+
+# Pytest plugin ------------------------------------------------------------
+
+_recorder = None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('phases', 'fixture phase profiler')
+    group.addoption('--profile-phases', action='store_true', default=False,
+                    help='Time fixture setup, test body, teardown and sleeps; report the critical path')
+    group.addoption('--profile-workers', type=int, nargs='+', default=[2, 4, 8],
+                    help='Worker counts to plan parallel schedules for')
+    group.addoption('--profile-out', default=None,
+                    help='Profile JSON (default: .harness/phases/<run id>.json)')
+
+
+def pytest_configure(config):
+    global _recorder
+    if config.getoption('profile_phases'):
+        _recorder = PhaseRecorder()
+        _recorder.trace()
+        config.phase_profiles = []
+
+
+def pytest_unconfigure(config):
+    global _recorder
+    if _recorder:
+        _recorder.untrace()
+        _recorder = None
+
+
+def _phase_wrapper(phase):
+    @pytest.hookimpl(hookwrapper=True)
+    def wrapper(item):
+        if _recorder is None:
+            yield
+            return
+        started = _recorder.run_phase(item, phase)
+        try:
+            yield
+        finally:
+            _recorder.end_phase(started)
+    return wrapper
+
+
+pytest_runtest_setup = _phase_wrapper('setup')
+pytest_runtest_call = _phase_wrapper('call')
+pytest_runtest_teardown = _phase_wrapper('teardown')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    started = time.perf_counter()
+    yield
+    if _recorder:
+        _recorder.fixture(fixturedef, 'setup', time.perf_counter() - started)
+
+
+def pytest_fixture_post_finalizer(fixturedef, request):
+    if _recorder:
+        _recorder.finalized(fixturedef)
+
+
+@pytest.hookimpl(hookwrapper=True, trylast=True)
+def pytest_sessionfinish(session, exitstatus):
+    """Times every sessionfinish implementation (e.g. test data cleanup), then reports"""
+    started = time.perf_counter()
+    yield
+    if _recorder is None:
+        return
+    _recorder.session_finish = time.perf_counter() - started
+    config = session.config
+    if hasattr(config, 'workerinput'):
+        config.workeroutput['phase_profile'] = json.dumps(_recorder.to_dict())
+        return
+    profile = merge_profiles(config.phase_profiles + [_recorder.to_dict()])
+    path = config.getoption('profile_out') or os.path.join(
+        PHASES_DIR, f"{os.environ.get('HARNESS_RUN_ID', time.strftime('%Y%m%d-%H%M%S'))}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(profile, f, indent=2)
+    config.phase_profile = (profile, path)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    output = getattr(node, 'workeroutput', {}).get('phase_profile')
+    if output and hasattr(node.config, 'phase_profiles'):
+        node.config.phase_profiles.append(json.loads(output))
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    result = getattr(config, 'phase_profile', None)
+    if not result:
+        return
+    profile, path = result
+    terminalreporter.section('fixture phases')
+    for line in format_report(profile, config.getoption('profile_workers')):
+        terminalreporter.write_line(line)
+    terminalreporter.write_line(f"Profile written to {path}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Report on a saved fixture phase profile')
+    parser.add_argument('profile', help='JSON written by pytest --profile-phases')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2, 4, 8])
+    parser.add_argument('--json', action='store_true', help='Print the critical path reports as JSON')
+    args = parser.parse_args()
+
+    with open(args.profile) as f:
+        profile = json.load(f)
+    if args.json:
+        print(json.dumps({group: critical_path(profile, args.workers, group) for group in ('test', 'class')},
+                         indent=2))
+    else:
+        print('\n'.join(format_report(profile, args.workers)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+"""
+Deployment Readiness Gate
+Polls the frontend, the /api/ proxy and a Mongo-backed route with exponential
+backoff until all three answer, recording cold-start timings per build
+
+Standard library only, so the Jenkins agent can run it with a bare python3.
+"""
+
+import http.client
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+
+from config import BASE_URL
+
+
+GATEWAY_ERRORS = {502, 503, 504}  # nginx is up but backend-jenkins is not listening yet
+
+
+def _frontend_ready(status, body):
+    return status == 200 and b'id="root"' in body
+
+
+def _proxy_ready(status, body):
+    # Express answers unknown /api/ paths itself (catch-all or 404); only
+    # nginx's gateway errors mean the request never reached node
+    return status not in GATEWAY_ERRORS
+
+
+def _database_ready(status, body):
+    # Mongoose buffers queries until connectDB succeeds, then getAllBlogs
+    # answers 200 with a blogs array (errorHandler turns a failed query into 400)
+    if status != 200:
+        return False
+    try:
+        return 'blogs' in json.loads(body)
+    except ValueError:
+        return False
+
+
+CHECKS = {
+    'frontend': ('/', _frontend_ready),
+    'api_proxy': ('/api/', _proxy_ready),
+    'database': ('/api/blog/get-all-blogs?limit=1', _database_ready),
+}
+
+
+def probe(url, timeout=5):
+    """
+    One GET, never raising
+
+    Returns:
+        tuple: (status or None when nothing came back, body bytes, ttfb seconds or None, error name or None)
+    """
+    request = urllib.request.Request(url, headers={'User-Agent': 'readiness-gate'})
+    started = time.monotonic()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            first_byte = time.monotonic() - started
+            return response.status, response.read(), first_byte, None
+    except urllib.error.HTTPError as e:
+        return e.code, e.read(), time.monotonic() - started, None
+    except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+        reason = getattr(e, 'reason', e)
+        return None, b'', None, type(reason).__name__
+
+
+def wait_until_ready(base_url=BASE_URL, timeout=300, initial_delay=0.25, max_delay=8.0, factor=2.0,
+                     request_timeout=5, started_at=None, checks=CHECKS, log=print):
+    """
+    Poll every check until all pass or ``timeout`` seconds have gone by
+
+    Checks that have passed are not polled again. The wait between rounds
+    starts at ``initial_delay`` and doubles (by ``factor``) up to ``max_delay``,
+    so a fast deployment is caught within a fraction of a second and a slow
+    one is not hammered.
+
+    Args:
+        started_at (float): ``time.time()`` of ``docker-compose up``, so the
+            timings include container start; defaults to now
+
+    Returns:
+        dict: ``ready``, ``first_byte_s`` (first HTTP response of any kind),
+        ``ready_s`` (all checks passing), ``polls``, and per check its
+        ``first_response_s``, ``ready_s``, ``attempts``, ``last_status``/``last_error``
+        and the ``ttfb_ms`` of its passing request; times are seconds since ``started_at``
+    """
+    base_url = base_url.rstrip('/')
+    started_at = time.time() if started_at is None else started_at
+    elapsed = lambda: round(time.time() - started_at, 3)
+    deadline = time.monotonic() + timeout
+    results = {name: {'path': path, 'attempts': 0, 'first_response_s': None, 'ready_s': None,
+                      'ttfb_ms': None, 'last_status': None, 'last_error': None}
+               for name, (path, _) in checks.items()}
+    delay, polls = initial_delay, 0
+    while True:
+        polls += 1
+        for name, (path, ready) in checks.items():
+            result = results[name]
+            if result['ready_s'] is not None:
+                continue
+            status, body, first_byte, error = probe(base_url + path, request_timeout)
+            result['attempts'] += 1
+            result['last_status'], result['last_error'] = status, error
+            if status is not None and result['first_response_s'] is None:
+                result['first_response_s'] = elapsed()
+            if status is not None and ready(status, body):
+                result['ready_s'] = elapsed()
+                result['ttfb_ms'] = round(first_byte * 1000, 1)
+                log(f"[ready] {name} ready after {result['ready_s']}s ({path} -> {status})")
+        pending = [name for name, result in results.items() if result['ready_s'] is None]
+        if not pending or time.monotonic() + delay > deadline:
+            break
+        time.sleep(delay)
+        delay = min(delay * factor, max_delay)
+
+    responses = [result['first_response_s'] for result in results.values() if result['first_response_s'] is not None]
+    return {
+        'url': base_url,
+        'ready': not pending,
+        'pending': pending,
+        'first_byte_s': min(responses) if responses else None,
+        'ready_s': max(result['ready_s'] for result in results.values()) if not pending else None,
+        'polls': polls,
+        'checks': results,
+    }
+
+
+def build_record(report):
+    """``report`` stamped with the Jenkins build it belongs to, for the per-build history"""
+    return {
+        'build': os.getenv('BUILD_NUMBER'),
+        'commit': os.getenv('GIT_COMMIT'),
+        'recorded_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        **report,
+    }
+
+
+# Pytest plugin ------------------------------------------------------------
+
+def pytest_addoption(parser):
+    group = parser.getgroup('readiness', 'deployment readiness gate')
+    group.addoption('--wait-ready', type=float, default=None, metavar='SECONDS',
+                    help='Before any test, wait up to SECONDS for the frontend, /api/ and Mongo to answer')
+
+
+def pytest_sessionstart(session):
+    config = session.config
+    timeout = config.getoption('wait_ready')
+    if timeout is None or hasattr(config, 'workerinput'):  # The controller waits once for all workers
+        return
+    import pytest
+
+    import config as settings
+    report = wait_until_ready(settings.BASE_URL, timeout=timeout)
+    if not report['ready']:
+        pytest.exit(f"{settings.BASE_URL} not ready after {timeout:.0f}s: {', '.join(report['pending'])} "
+                    f"still failing", returncode=3)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Wait for a fresh deployment to serve and record its cold start')
+    parser.add_argument('--url', default=BASE_URL, help='Frontend URL (default: APP_URL)')
+    parser.add_argument('--timeout', type=float, default=300, help='Give up after this many seconds')
+    parser.add_argument('--max-delay', type=float, default=8.0, help='Longest wait between polls')
+    parser.add_argument('--started-at', type=float, default=None,
+                        help='Epoch seconds of docker-compose up (e.g. $(date +%%s.%%N)); default now')
+    parser.add_argument('--out', default=None, help='JSON file for this build\'s timings')
+    parser.add_argument('--history', default=None, help='JSON-lines file to append this build\'s timings to')
+    args = parser.parse_args()
+
+    report = build_record(wait_until_ready(args.url, timeout=args.timeout, max_delay=args.max_delay,
+                                           started_at=args.started_at))
+    if report['ready']:
+        print(f"[ready] {args.url} ready in {report['ready_s']}s (first byte after {report['first_byte_s']}s, "
+              f"{report['polls']} polls)")
+    else:
+        print(f"[ready] {args.url} NOT ready after {args.timeout:.0f}s; failing: {', '.join(report['pending'])}")
+        for name in report['pending']:
+            check = report['checks'][name]
+            print(f"[ready]   {name} {check['path']}: status {check['last_status']} error {check['last_error']}")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.history:
+        with open(args.history, 'a') as f:
+            f.write(json.dumps(report) + '\n')
+    raise SystemExit(0 if report['ready'] else 1)
+
+
+if __name__ == '__main__':
+    main()
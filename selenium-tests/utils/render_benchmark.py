@@ -0,0 +1,256 @@
+"""
+List Rendering Benchmark
+Seeds 10 to 10,000 blogs and measures how the SPA's blog lists render at each
+size: DOM nodes, JS heap, layout/script time and time until the cards show
+"""
+
+import csv
+import json
+import math
+import os
+import statistics
+import time
+import uuid
+
+from config import BASE_URL, TEST_ADMIN
+from utils.api_client import ApiClient
+from utils.browser_metrics import cdp_metrics, snapshot
+from utils.dashboard_benchmark import measure_tab
+from utils.seeder import seed_blogs
+
+
+CARD_SELECTOR = 'a[href^="/blog/"] img'
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+# Home.jsx always asks for limit=9; Search.jsx forwards its query string to
+# get-all-blogs unchanged, so ?limit=N renders N cards through the same markup
+VIEWS = {
+    'home': {'path': '/', 'selector': CARD_SELECTOR, 'expected': lambda size: min(size, 9)},
+    'search': {'path': '/search?sort=desc&limit={size}', 'selector': CARD_SELECTOR, 'expected': lambda size: size},
+}
+
+# Installed before the page's own scripts; resolves once the expected number
+# of cards exists and the first one has a layout box
+VISIBLE_PROBE = """
+window.__renderBench = {selector: %s, target: %d, visibleAt: null};
+(function check() {
+  var bench = window.__renderBench, cards = document.querySelectorAll(bench.selector);
+  if (cards.length >= bench.target && cards[0].getBoundingClientRect().height > 0) {
+    bench.visibleAt = performance.now();
+    return;
+  }
+  requestAnimationFrame(check);
+})();
+"""
+
+def measure_view(driver, base_url, view, size, timeout=60):
+    """
+    Load one list view cold and measure it
+
+    Returns:
+        dict: ``cards``, ``visible_ms`` (navigation start to cards on screen),
+        ``script_ms``/``layout_ms``/``style_ms``, ``dom_nodes``, ``js_heap_mb``, ``api_kb``
+    """
+    expected = view['expected'](size)
+    probe = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                                   {'source': VISIBLE_PROBE % (json.dumps(view['selector']), expected)})
+    try:
+        driver.get('about:blank')
+        before = cdp_metrics(driver)
+        driver.get(base_url + view['path'].format(size=size))
+        deadline = time.monotonic() + timeout
+        visible = None
+        while visible is None and time.monotonic() < deadline:
+            visible = driver.execute_script('return window.__renderBench && window.__renderBench.visibleAt;')
+            if visible is None:
+                time.sleep(0.05)
+        row = snapshot(driver, before, '/api/blog/get-all-blogs')
+    finally:
+        driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': probe['identifier']})
+    row.update({'cards': len(driver.find_elements('css selector', view['selector'])),
+                'visible_ms': round(visible, 1) if visible is not None else None})
+    return row
+
+
+def measure_show_more(driver, base_url, admin, max_clicks=20):
+    """
+    Page the dashboard's blog table with "Show more.." (AllBlogs.jsx)
+
+    Every click prepends 8 rows to state and re-renders the whole table, so
+    the per-click time is what grows with the number of rows already shown.
+
+    Returns:
+        dict: Snapshot after the last click plus ``clicks``, ``rows`` and
+        ``click_ms_first``/``click_ms_last``/``click_ms_median``
+    """
+    result = measure_tab(driver, base_url, admin, 'blogs', max_clicks)
+    click_times = [click['total_ms'] for click in result['clicks'] if click['appended']]
+    row = dict(result['snapshot'])
+    row.update({
+        'clicks': len(click_times),
+        'rows': result['clicks'][-1]['rows'] if result['clicks'] else result['initial_rows'],
+        'click_ms_first': click_times[0] if click_times else None,
+        'click_ms_last': click_times[-1] if click_times else None,
+        'click_ms_median': round(statistics.median(click_times), 1) if click_times else None,
+    })
+    return row
+
+
+def _median_row(rows):
+    merged = {}
+    for key in rows[0]:
+        values = [row[key] for row in rows if row[key] is not None]
+        merged[key] = statistics.median(values) if values else None
+    return merged
+
+
+def scaling_report(results, metric='script_ms', threshold=1.2, budget_ms=None):
+    """
+    Where does rendering stop scaling linearly with the number of cards?
+
+    For consecutive sizes of each view, the elasticity
+    ``log(metric ratio) / log(cards ratio)`` is ~1 for linear cost and above
+    ``threshold`` once cost grows faster than the list. Views whose card count
+    does not change (home is capped at 9) are reported flat.
+
+    Args:
+        results (list): Rows with ``view``, ``size``, ``cards`` (or ``rows``) and ``metric``
+        budget_ms (float): Also flag the first size whose ``visible_ms`` exceeds this
+
+    Returns:
+        dict: Per view, ``elasticity`` per step and ``breaks_at`` (seeded size or None)
+    """
+    report = {}
+    for view in sorted({row['view'] for row in results}):
+        rows = sorted((row for row in results if row['view'] == view), key=lambda row: row['size'])
+        steps, breaks_at = [], None
+        for previous, current in zip(rows, rows[1:]):
+            shown = [row.get('cards') or row.get('rows') or 0 for row in (previous, current)]
+            cost = [row.get(metric) or 0 for row in (previous, current)]
+            if shown[0] > 0 and shown[1] > shown[0] and cost[0] > 0 and cost[1] > 0:
+                elasticity = round(math.log(cost[1] / cost[0]) / math.log(shown[1] / shown[0]), 2)
+            else:
+                elasticity = None
+            steps.append({'from': previous['size'], 'to': current['size'], 'elasticity': elasticity})
+            if breaks_at is None and elasticity is not None and elasticity > threshold:
+                breaks_at = current['size']
+        if budget_ms is not None:
+            over = [row['size'] for row in rows if (row.get('visible_ms') or 0) > budget_ms]
+            if over and (breaks_at is None or over[0] < breaks_at):
+                breaks_at = over[0]
+        report[view] = {'metric': metric, 'elasticity': steps, 'breaks_at': breaks_at}
+    return report
+
+
+def run_benchmark(driver, base_url, sizes=DEFAULT_SIZES, client=None, admin=None, store=None,
+                  repeat=3, show_more_clicks=20, body_chars=2000, registry=None):
+    """
+    Seed up to each size in turn and measure every view at that size
+
+    Blogs are only ever added (sizes ascending), so a 10,000 run seeds
+    10,000 blogs in total rather than 11,110.
+
+    Returns:
+        list: One row per (size, view), medians over ``repeat`` loads
+    """
+    client = client or ApiClient(base_url)
+    admin = admin or client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+    results, seeded, run_tag = [], 0, uuid.uuid4().hex[:6]
+    driver.execute_cdp_cmd('Performance.enable', {})
+    for size in sorted(sizes):
+        if size > seeded:
+            seed_blogs(size - seeded, client, admin, store=store, body_chars=body_chars,
+                       seed=seeded, registry=registry, prefix=f"Render bench {run_tag}-{seeded}")
+            seeded = size
+        for name, view in VIEWS.items():
+            row = _median_row([measure_view(driver, base_url, view, size) for _ in range(repeat)])
+            results.append({'size': size, 'view': name, **row})
+        if show_more_clicks:
+            row = measure_show_more(driver, base_url, admin, show_more_clicks)
+            results.append({'size': size, 'view': 'show_more', **row})
+        print(f"[render] {size} blogs measured")
+    return results
+
+
+def print_results(results):
+    columns = ['size', 'view', 'cards', 'rows', 'visible_ms', 'script_ms', 'layout_ms', 'style_ms',
+               'dom_nodes', 'js_heap_mb', 'api_kb', 'click_ms_median']
+    print(' '.join(f"{column:>15}" for column in columns))
+    for row in results:
+        print(' '.join(f"{str(row.get(column, '') if row.get(column) is not None else '-'):>15}" for column in columns))
+
+
+def write_results_csv(results, path):
+    columns = sorted({key for row in results for key in row}, key=lambda key: (key not in ('size', 'view'), key))
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    import argparse
+
+    from utils.cleanup import cleanup, get_registry, login_admin
+    from utils.driver_setup import close_driver, get_chrome_driver
+
+    parser = argparse.ArgumentParser(description='Measure blog list rendering at increasing data sizes')
+    parser.add_argument('--url', default=BASE_URL, help='Target frontend URL (default: APP_URL)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3, help='Cold loads per view and size')
+    parser.add_argument('--show-more-clicks', type=int, default=20, help='0 skips the dashboard table')
+    parser.add_argument('--body-chars', type=int, default=2000, help='Size of each seeded blogBody')
+    parser.add_argument('--budget-ms', type=float, default=1000, help='Time-to-cards budget for the report')
+    parser.add_argument('--netem', default=None,
+                        help='Shape traffic through utils.netem_proxy: preset name or JSON spec file')
+    parser.add_argument('--standin', action='store_true', help='Seed and serve from a local stand-in')
+    parser.add_argument('--static-dir', default=os.path.join('..', 'client', 'dist'),
+                        help='Built SPA served by the stand-in (npm run build in client/)')
+    parser.add_argument('--keep', action='store_true', help='Keep blogs seeded into --url')
+    parser.add_argument('--out', default=None, help='Directory for render.csv and summary.json')
+    args = parser.parse_args()
+
+    standin, store, registry = None, None, None
+    url = args.url
+    if args.standin:
+        from utils.standin_server import StandinServer
+        standin = StandinServer(static_dir=args.static_dir).start()
+        standin.create_admin(TEST_ADMIN['email'], TEST_ADMIN['password'])
+        url, store = standin.url, standin.store
+    elif not args.keep:
+        registry = get_registry()
+    browser_url, netem = url, None
+    if args.netem:  # Only the browser is shaped; seeding and cleanup go direct
+        from utils.netem_proxy import NetemProxy, load_netem
+        netem = NetemProxy(url, load_netem(args.netem)).start()
+        browser_url = netem.url
+
+    driver = get_chrome_driver(headless=True)
+    try:
+        results = run_benchmark(driver, browser_url, args.sizes, client=ApiClient(url), store=store,
+                                repeat=args.repeat, show_more_clicks=args.show_more_clicks, body_chars=args.body_chars,
+                                registry=registry)
+    finally:
+        close_driver(driver)
+        if netem:
+            netem.stop()
+        if standin:
+            standin.stop()
+        if registry:
+            client = ApiClient(url)
+            print(f"[render] Cleanup: {cleanup(registry.entries(), client, login_admin(client))}")
+            registry.mark_done()
+
+    report = scaling_report(results, budget_ms=args.budget_ms)
+    print_results(results)
+    print(json.dumps(report, indent=2))
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        write_results_csv(results, os.path.join(args.out, 'render.csv'))
+        with open(os.path.join(args.out, 'summary.json'), 'w') as f:
+            json.dump({'target': url, 'sizes': args.sizes, 'scaling': report}, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,355 @@
+"""
+Columnar Sample Store
+Array-backed request samples (offset, endpoint, latency, status, bytes, error)
+that spill to memory-mapped files, with NumPy group-by and time-bucket analysis
+"""
+
+import json
+import math
+import os
+import threading
+
+import numpy as np
+
+from utils.load_harness import _timeline_row
+
+
+# ~21 bytes per sample, against several hundred for a sample dict
+COLUMNS = {
+    'offset': np.float64,   # Scheduled send time, seconds from the run's start
+    'route': np.uint16,     # Index into ``routes``
+    'latency': np.float32,  # Seconds
+    'status': np.int16,     # 0 when the request failed before a response
+    'bytes': np.uint32,
+    'error': np.uint8,      # Index into ``errors``; 0 is no error
+}
+PERCENTILES = (50, 95, 99)
+
+
+class SampleStore:
+    """
+    Append-only column store, usable as ``LoadHarness.run``'s sink
+
+    Samples fill a fixed-size chunk per column. Without ``directory`` full
+    chunks stay in memory; with it they are appended to ``<column>.bin`` files
+    that ``column`` maps back in, so a long run holds one chunk in RAM and
+    analysis reads pages on demand. ``meta.json`` keeps the route and error
+    names the id columns point into.
+
+    Args:
+        directory (str): Spill directory (in memory only if None)
+        chunk (int): Samples per column buffer
+        mode (str): ``'w'`` starts empty, ``'a'`` continues an existing directory
+    """
+
+    def __init__(self, directory=None, chunk=65536, mode='w'):
+        self.directory = directory
+        self.chunk = chunk
+        self.routes = []
+        self.errors = [None]
+        self._route_ids = {}
+        self._error_ids = {None: 0}
+        self._buffer = {name: np.empty(chunk, dtype) for name, dtype in COLUMNS.items()}
+        self._filled = 0
+        self._stored = 0
+        self._chunks = []
+        self._lock = threading.Lock()
+        if directory is None:
+            return
+        os.makedirs(directory, exist_ok=True)
+        if mode == 'a' and os.path.exists(self._path('meta.json')):
+            with open(self._path('meta.json')) as f:
+                meta = json.load(f)
+            self.routes, self.errors, self._stored = meta['routes'], meta['errors'], meta['count']
+            self._route_ids = {route: index for index, route in enumerate(self.routes)}
+            self._error_ids = {error: index for index, error in enumerate(self.errors)}
+        else:
+            for name in COLUMNS:
+                open(self._path(f"{name}.bin"), 'wb').close()
+            self._write_meta()
+
+    @classmethod
+    def open(cls, directory):
+        """Store previously written to ``directory``"""
+        if not os.path.exists(os.path.join(directory, 'meta.json')):
+            raise FileNotFoundError(f"No sample store in {directory}")
+        return cls(directory, mode='a')
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _write_meta(self):
+        with open(self._path('meta.json'), 'w') as f:
+            json.dump({'count': self._stored, 'routes': self.routes, 'errors': self.errors,
+                       'columns': {name: np.dtype(dtype).str for name, dtype in COLUMNS.items()}}, f)
+
+    def _spill(self):
+        """Move the filled part of the buffers to disk or the chunk list (caller holds the lock)"""
+        if not self._filled:
+            return
+        if self.directory is None:
+            self._chunks.append({name: buffer[:self._filled].copy() for name, buffer in self._buffer.items()})
+        else:
+            for name, buffer in self._buffer.items():
+                with open(self._path(f"{name}.bin"), 'ab') as f:
+                    buffer[:self._filled].tofile(f)
+        self._stored += self._filled
+        self._filled = 0
+
+    def _id(self, ids, names, name):
+        if name not in ids:
+            ids[name] = len(names)
+            names.append(name)
+        return ids[name]
+
+    def record(self, route, latency, offset=0.0, status=200, size=0, error=None):
+        """Add one sample; ``latency`` and ``offset`` in seconds"""
+        with self._lock:
+            row = self._filled
+            buffer = self._buffer
+            buffer['offset'][row] = offset
+            buffer['route'][row] = self._id(self._route_ids, self.routes, route)
+            buffer['latency'][row] = latency
+            buffer['status'][row] = status
+            buffer['bytes'][row] = size
+            buffer['error'][row] = self._id(self._error_ids, self.errors, error)
+            self._filled += 1
+            if self._filled == self.chunk:
+                self._spill()
+
+    def append(self, sample):
+        """Add a ``LoadHarness`` sample dict"""
+        self.record(sample['route'], sample['latency'], sample['offset'], sample['status'],
+                    sample['bytes'], sample['error'])
+
+    def extend(self, samples):
+        for sample in samples:
+            self.append(sample)
+        return self
+
+    def __len__(self):
+        return self._stored + self._filled
+
+    def flush(self):
+        """Write buffered samples and names so ``open`` sees everything recorded so far"""
+        with self._lock:
+            if self.directory is not None:
+                self._spill()
+                self._write_meta()
+
+    close = flush
+
+    def column(self, name):
+        """
+        One column as an array (a read-only memory map for spilled stores)
+
+        Returns:
+            numpy.ndarray: Values in recording order
+        """
+        with self._lock:
+            if self.directory is not None:
+                self._spill()
+                self._write_meta()
+                if not self._stored:
+                    return np.empty(0, COLUMNS[name])
+                return np.memmap(self._path(f"{name}.bin"), COLUMNS[name], mode='r', shape=(self._stored,))
+            parts = [chunk[name] for chunk in self._chunks] + [self._buffer[name][:self._filled]]
+            return np.concatenate(parts)
+
+    def is_error(self):
+        """Boolean column, same rule as ``load_harness.is_error``"""
+        return (self.column('error') > 0) | (self.column('status') >= 500)
+
+    def timeline(self, profile, bucket=1.0):
+        """Rows in the same format as ``load_harness.build_timeline``"""
+        buckets = time_buckets(self, bucket, profile.duration, PERCENTILES + (100,))
+        rows = []
+        for index in range(len(buckets['second'])):
+            def latency_ms(pct, index=index):
+                value = buckets[f"p{pct}_ms"][index]
+                return None if math.isnan(value) else float(value)
+            rows.append(_timeline_row(profile, index * bucket, bucket, int(buckets['sent'][index]),
+                                      int(buckets['errors'][index]), latency_ms))
+        return rows
+
+    def route_summary(self):
+        """Per-route count, response size and latency percentiles (``TimelineHistograms.route_summary`` keys and more)"""
+        return group_percentiles(self)
+
+
+def concat(stores):
+    """
+    In-memory store holding every sample of ``stores`` (e.g. one per load shard)
+
+    Route and error ids are re-mapped onto the combined name lists.
+    """
+    merged = SampleStore()
+    for store in stores:
+        columns = {name: np.asarray(store.column(name)) for name in COLUMNS}
+        routes = np.array([merged._id(merged._route_ids, merged.routes, route) for route in store.routes],
+                          dtype=COLUMNS['route'])
+        errors = np.array([merged._id(merged._error_ids, merged.errors, error) for error in store.errors],
+                          dtype=COLUMNS['error'])
+        if len(columns['route']):
+            columns['route'], columns['error'] = routes[columns['route']], errors[columns['error']]
+        merged._chunks.append(columns)
+        merged._stored += len(columns['offset'])
+    return merged
+
+
+def _ranked(groups, values, count, pcts):
+    """
+    Nearest-rank percentiles of ``values`` within each group id in ``range(count)``
+
+    One lexsort orders values inside their groups; each percentile is then a
+    single fancy-index at ``group start + rank - 1`` (NaN for empty groups).
+
+    Returns:
+        tuple: (sizes per group, {pct: values per group})
+    """
+    sizes = np.bincount(groups, minlength=count)[:count]
+    if not len(values):
+        return sizes, {pct: np.full(count, np.nan) for pct in pcts}
+    ordered = values[np.lexsort((values, groups))]
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    result = {}
+    for pct in pcts:
+        rank = np.maximum(1, np.ceil(pct * sizes / 100.0)).astype(np.int64)
+        index = np.minimum(starts + rank - 1, len(ordered) - 1)
+        result[pct] = np.where(sizes > 0, ordered[index], np.nan)
+    return sizes, result
+
+
+def group_percentiles(store, pcts=PERCENTILES):
+    """
+    Latency percentiles, errors and bytes per endpoint
+
+    Returns:
+        dict: Per route, ``count``, ``errors``, ``mean_ms``, ``p<N>_ms``,
+        ``max_ms``, ``mean_bytes`` and ``total_kb``
+    """
+    routes = store.column('route').astype(np.int64)
+    latency = store.column('latency').astype(np.float64) * 1000
+    count = len(store.routes)
+    sizes, ranked = _ranked(routes, latency, count, tuple(pcts) + (100,))
+    totals = np.bincount(routes, weights=latency, minlength=count)
+    size_totals = np.bincount(routes, weights=store.column('bytes').astype(np.float64), minlength=count)
+    errors = np.bincount(routes, weights=store.is_error().astype(np.float64), minlength=count)
+    summary = {}
+    for index in np.argsort(store.routes) if count else []:
+        if not sizes[index]:
+            continue
+        row = {
+            'count': int(sizes[index]),
+            'errors': int(errors[index]),
+            'mean_ms': round(float(totals[index] / sizes[index]), 2),
+            'mean_bytes': round(float(size_totals[index] / sizes[index])),
+            'total_kb': round(float(size_totals[index]) / 1024, 1),
+        }
+        row.update({f"p{pct}_ms": round(float(ranked[pct][index]), 2) for pct in pcts})
+        row['max_ms'] = round(float(ranked[100][index]), 2)
+        summary[store.routes[index]] = row
+    return summary
+
+
+def latency_histogram(store, edges=None, route=None):
+    """
+    Latency distribution in milliseconds
+
+    Args:
+        edges (array): Bin edges in ms; default is 10 log-spaced bins per
+            decade from 0.1 ms up past the slowest sample
+        route (str): Only this endpoint
+
+    Returns:
+        tuple: (counts, edges) as from ``numpy.histogram``
+    """
+    latency = store.column('latency').astype(np.float64) * 1000
+    if route is not None:
+        if route not in store.routes:
+            latency = latency[:0]
+        else:
+            latency = latency[store.column('route') == store.routes.index(route)]
+    if edges is None:
+        top = math.ceil(math.log10(max(float(latency.max()) if len(latency) else 1.0, 1.0)))
+        edges = np.logspace(-1, top, (top + 1) * 10 + 1)
+    return np.histogram(latency, bins=edges)
+
+
+def time_buckets(store, bucket=1.0, duration=None, pcts=PERCENTILES + (100,)):
+    """
+    Per-bucket counts and latency percentiles by scheduled send time
+
+    Samples past ``duration`` (default: the last offset) fall into the last
+    bucket, as ``build_timeline`` does.
+
+    Returns:
+        dict: Arrays ``second``, ``sent``, ``errors`` and ``p<N>_ms`` (NaN for
+        empty buckets; p100 is the maximum), one entry per bucket
+    """
+    offsets = store.column('offset')
+    if duration is None:
+        duration = (float(offsets.max()) // bucket + 1) * bucket if len(offsets) else bucket
+    count = max(1, math.ceil(duration / bucket))
+    index = np.minimum((np.asarray(offsets) // bucket).astype(np.int64), count - 1)
+    latency = store.column('latency').astype(np.float64) * 1000
+    sizes, ranked = _ranked(index, latency, count, pcts)
+    result = {
+        'second': np.arange(count) * bucket,
+        'sent': sizes,
+        'errors': np.bincount(index, weights=store.is_error().astype(np.float64), minlength=count).astype(np.int64),
+    }
+    result.update({f"p{pct}_ms": ranked[pct] for pct in pcts})
+    return result
+
+
+def load(paths):
+    """One store from one or more store directories (a directory of ``shard-*`` stores counts as many)"""
+    directories = []
+    for path in paths:
+        shards = sorted(os.path.join(path, name) for name in os.listdir(path) if name.startswith('shard-'))
+        directories += shards or [path]
+    stores = [SampleStore.open(directory) for directory in directories]
+    return stores[0] if len(stores) == 1 else concat(stores)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Summarise sample stores written by the load harness or benchmarks')
+    parser.add_argument('paths', nargs='+', help='Store directories (shard-* subdirectories are combined)')
+    parser.add_argument('--bucket', type=float, default=None, help='Also print a timeline with buckets of this many seconds')
+    parser.add_argument('--histogram', action='store_true', help='Also print the latency distribution')
+    parser.add_argument('--route', default=None, help='Histogram for this endpoint only')
+    parser.add_argument('--out', default=None, help='JSON file for the summary')
+    args = parser.parse_args()
+
+    store = load(args.paths)
+    summary = group_percentiles(store)
+    print(f"{len(store)} samples, {len(summary)} endpoints")
+    print(f"{'endpoint':50} {'count':>8} {'err':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'bytes':>8}")
+    for route, row in summary.items():
+        print(f"{route[:50]:50} {row['count']:8d} {row['errors']:6d} {row['p50_ms']:9.2f} {row['p95_ms']:9.2f} "
+              f"{row['p99_ms']:9.2f} {row['max_ms']:9.2f} {row['mean_bytes']:8d}")
+    result = {'samples': len(store), 'endpoints': summary}
+    if args.bucket:
+        buckets = time_buckets(store, args.bucket)
+        print(f"{'sec':>8} {'sent':>7} {'err':>5} {'p50':>9} {'p95':>9} {'p99':>9}")
+        for index, second in enumerate(buckets['second']):
+            print(f"{second:8.1f} {buckets['sent'][index]:7d} {buckets['errors'][index]:5d} "
+                  f"{buckets['p50_ms'][index]:9.2f} {buckets['p95_ms'][index]:9.2f} {buckets['p99_ms'][index]:9.2f}")
+        result['buckets'] = {key: [None if isinstance(value, float) and math.isnan(value) else value
+                                   for value in values.tolist()] for key, values in buckets.items()}
+    if args.histogram:
+        counts, edges = latency_histogram(store, route=args.route)
+        for low, high, hits in zip(edges, edges[1:], counts):
+            if hits:
+                print(f"{low:10.2f} - {high:10.2f} ms {hits:9d}")
+        result['histogram'] = {'edges_ms': edges.tolist(), 'counts': counts.tolist()}
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
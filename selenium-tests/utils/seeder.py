@@ -0,0 +1,157 @@
+"""
+Blog Data Seeder
+Bulk-creates blogs, users and comments through the API or straight into a
+stand-in store, so list pages can be exercised at realistic sizes
+"""
+
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from config import TEST_ADMIN
+from utils.api_client import ApiClient
+
+
+CATEGORIES = ['uncategorized', 'Java', 'Javascript', 'React.Js', 'Git', 'MongoDB']
+WORDS = ('lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt '
+         'ut labore et dolore magna aliqua react mongo express node docker jenkins kubernetes').split()
+
+
+def blog_body(chars, rng):
+    """Paragraph-shaped filler of roughly ``chars`` characters (what CreateBlog stores as HTML)"""
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return f"<p>{' '.join(words)}</p>"
+
+
+def blog_specs(count, body_chars=2000, seed=0, prefix=None):
+    """
+    Deterministic blog payloads with unique titles (``blogTitle`` is a unique index)
+
+    Returns:
+        list: ``{'title', 'body', 'category'}`` dicts
+    """
+    rng = random.Random(seed)
+    prefix = prefix or f"Seeded {uuid.uuid4().hex[:6]}"
+    return [{'title': f"{prefix} blog {index}",
+             'body': blog_body(body_chars, rng),
+             'category': rng.choice(CATEGORIES)} for index in range(count)]
+
+
+def seed_blogs(count, client=None, admin=None, store=None, body_chars=2000, seed=0,
+               workers=16, registry=None, prefix=None):
+    """
+    Create ``count`` blogs
+
+    With ``store`` (a StandinStore) documents are inserted directly, which
+    takes seconds even for 10,000 blogs. Otherwise they are posted through
+    the API as ``admin`` (TEST_ADMIN by default), in parallel.
+
+    Args:
+        registry (EntityRegistry): Records API-created blogs for cleanup
+
+    Returns:
+        list: Created blog documents
+    """
+    specs = blog_specs(count, body_chars, seed, prefix)
+    if store is not None:
+        owner = admin['_id'] if admin else next(
+            (user['_id'] for user in store.users.values() if user['isAdmin']), 'seeder')
+        return [store.add_blog(owner, spec['title'], spec['body'], spec['category']) for spec in specs]
+
+    client = client or ApiClient()
+    admin = admin or client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+
+    def create(spec):
+        blog = client.post_blog(admin, spec['title'], spec['body'], spec['category'])
+        if registry:
+            registry.add_blog(blog_id=blog['_id'])
+        return blog
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(create, specs))
+
+
+def seed_users(count, client=None, store=None, workers=16, registry=None, password='SeedPassword123!'):
+    """
+    Create ``count`` regular accounts named ``seed<tag>-<n>@test.com``
+
+    Returns:
+        list: Created user documents (without tokens)
+    """
+    tag = uuid.uuid4().hex[:6]
+    emails = [f"seed{tag}-{index}@test.com" for index in range(count)]
+    if store is not None:
+        return [store.add_user(email.split('@')[0], email, password) for email in emails]
+
+    client = client or ApiClient()
+
+    def create(email):
+        user = client.register(email.split('@')[0], email, password)
+        if registry:
+            registry.add_user(email, password, user.get('_id'))
+        return user
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(create, emails))
+
+
+def seed_comments(count, blogs, client=None, author=None, store=None, workers=16, registry=None, seed=0):
+    """
+    Spread ``count`` comments by ``author`` (TEST_ADMIN by default) over ``blogs``
+
+    Returns:
+        list: Created comment documents
+    """
+    rng = random.Random(seed)
+    texts = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 30))) for _ in range(count)]
+    targets = [blogs[index % len(blogs)]['_id'] for index in range(count)]
+    if store is not None:
+        owner = author['_id'] if author else next(
+            (user['_id'] for user in store.users.values() if user['isAdmin']), 'seeder')
+        return [store.add_comment(owner, blog_id, text) for blog_id, text in zip(targets, texts)]
+
+    client = client or ApiClient()
+    author = author or client.login(TEST_ADMIN['email'], TEST_ADMIN['password'])
+
+    def create(job):
+        comment = client.add_comment(author, *job)
+        if registry:
+            registry.add_comment(comment['_id'])
+        return comment
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(create, zip(targets, texts)))
+
+
+def main():
+    import argparse
+
+    from config import BASE_URL
+    from utils.cleanup import get_registry
+
+    parser = argparse.ArgumentParser(description='Seed blogs, users and comments through the API as TEST_ADMIN')
+    parser.add_argument('count', type=int, help='Blogs to create')
+    parser.add_argument('--users', type=int, default=0)
+    parser.add_argument('--comments', type=int, default=0, help='Spread over the seeded blogs')
+    parser.add_argument('--url', default=BASE_URL, help='Target frontend URL (default: APP_URL)')
+    parser.add_argument('--body-chars', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--keep', action='store_true', help='Do not record the seeded data for cleanup')
+    args = parser.parse_args()
+
+    registry = None if args.keep else get_registry()
+    client = ApiClient(args.url)
+    blogs = seed_blogs(args.count, client, body_chars=args.body_chars, workers=args.workers, registry=registry)
+    users = seed_users(args.users, client, workers=args.workers, registry=registry)
+    comments = seed_comments(args.comments, blogs, client, workers=args.workers, registry=registry) if blogs else []
+    print(f"Seeded {len(blogs)} blogs, {len(users)} users, {len(comments)} comments"
+          + (f" (run id {registry.run_id})" if registry else ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Duration-Balanced Test Sharding
+Splits the collected suite into N shards of about equal run time from
+historical durations, keeping each test class together and in order
+"""
+
+import heapq
+import json
+import os
+import statistics
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+
+import pytest
+
+from config import HARNESS_DIR
+
+
+DURATIONS_PATH = os.path.join(HARNESS_DIR, 'durations.json')
+DEFAULT_DURATION = 1.0  # Seconds assumed per test when nothing is known yet
+SMOOTHING = 0.5  # Weight of the latest run when updating stored durations
+
+
+def junit_key(nodeid):
+    """
+    Name a test the same way from a pytest nodeid and from a JUnit testcase
+
+    ``tests/test_api_suite.py::TestBlogApplication::test_01_x`` and JUnit's
+    ``classname="tests.test_api_suite.TestBlogApplication" name="test_01_x"``
+    both become ``tests.test_api_suite.TestBlogApplication.test_01_x``.
+    """
+    parts = nodeid.split('::')
+    path = parts[0][:-3] if parts[0].endswith('.py') else parts[0]
+    return '.'.join([path.replace('/', '.').replace('\\', '.')] + parts[1:])
+
+
+def unit_of(nodeid, group='class'):
+    """Scheduling unit: the test's class (or module for plain functions), its module, or the test itself"""
+    parts = nodeid.split('::')
+    if group == 'module':
+        return parts[0]
+    if group == 'class':
+        return '::'.join(parts[:-1])
+    return nodeid
+
+
+def load_durations(path):
+    """
+    Per-test seconds from a stored durations file, a JUnit XML report or a
+    ``--profile-phases`` profile
+
+    Returns:
+        dict: ``junit_key`` -> seconds (empty if ``path`` does not exist)
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    if path.endswith('.xml'):
+        durations = {}
+        for case in ET.parse(path).getroot().iter('testcase'):
+            key = f"{case.get('classname')}.{case.get('name')}" if case.get('classname') else case.get('name')
+            durations[key] = float(case.get('time') or 0.0)
+        return durations
+    with open(path) as f:
+        data = json.load(f)
+    if 'tests' in data:  # Phase profile
+        return {junit_key(test['nodeid']): test['setup'] + test['call'] + test['teardown'] for test in data['tests']}
+    return {key: float(seconds) for key, seconds in data.items()}
+
+
+def update_durations(path, measured, smoothing=SMOOTHING):
+    """Fold this run's per-test seconds into the stored file (exponential moving average)"""
+    stored = load_durations(path)
+    for key, seconds in measured.items():
+        previous = stored.get(key)
+        stored[key] = seconds if previous is None else round(smoothing * seconds + (1 - smoothing) * previous, 4)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(dict(sorted(stored.items())), f, indent=1)
+    return stored
+
+
+def plan_shards(nodeids, durations, count, group='class'):
+    """
+    Largest-first bin packing of scheduling units onto ``count`` shards
+
+    Tests of a unit stay together, so class-scoped fixtures are set up once
+    and numbered sequences (test_01 .. test_12) run in order on one shard.
+    Tests without history are assumed to take the median known duration.
+    Every shard keeps collection order, and ties are broken by unit name, so
+    every CI node computes the same plan from the same inputs.
+
+    Args:
+        nodeids (list): Collected tests in collection order
+        durations (dict): ``junit_key`` -> seconds
+
+    Returns:
+        list: Per shard, ``{'nodeids', 'units', 'seconds'}``
+    """
+    known = [durations[junit_key(nodeid)] for nodeid in nodeids if junit_key(nodeid) in durations]
+    default = statistics.median(known) if known else DEFAULT_DURATION
+    units, order = defaultdict(float), {}
+    for position, nodeid in enumerate(nodeids):
+        unit = unit_of(nodeid, group)
+        units[unit] += durations.get(junit_key(nodeid), default)
+        order.setdefault(unit, position)
+
+    loads = [(0.0, index) for index in range(max(1, count))]
+    assigned = {}
+    for unit, seconds in sorted(units.items(), key=lambda kv: (-kv[1], kv[0])):
+        load, index = heapq.heappop(loads)
+        assigned[unit] = index
+        heapq.heappush(loads, (load + seconds, index))
+
+    shards = [{'nodeids': [], 'units': [], 'seconds': 0.0} for _ in range(max(1, count))]
+    for unit in sorted(units, key=order.get):
+        shard = shards[assigned[unit]]
+        shard['units'].append(unit)
+        shard['seconds'] = round(shard['seconds'] + units[unit], 3)
+    for nodeid in nodeids:
+        shards[assigned[unit_of(nodeid, group)]]['nodeids'].append(nodeid)
+    return shards
+
+
+def merge_junit(paths, out):
+    """
+    Combine the JUnit reports of every shard into one ``<testsuites>`` document
+
+    Returns:
+        dict: Totals (``tests``, ``failures``, ``errors``, ``skipped``, ``time``)
+    """
+    merged = ET.Element('testsuites')
+    totals = {'tests': 0, 'failures': 0, 'errors': 0, 'skipped': 0, 'time': 0.0}
+    for path in paths:
+        root = ET.parse(path).getroot()
+        suites = [root] if root.tag == 'testsuite' else list(root.iter('testsuite'))
+        for suite in suites:
+            suite.set('name', f"{suite.get('name', 'pytest')} ({os.path.basename(path)})")
+            merged.append(suite)
+            for key in ('tests', 'failures', 'errors', 'skipped'):
+                totals[key] += int(suite.get(key) or 0)
+            totals['time'] += float(suite.get('time') or 0.0)
+    totals['time'] = round(totals['time'], 3)
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    ET.ElementTree(merged).write(out, encoding='utf-8', xml_declaration=True)
+    return totals
+
+
+# Pytest plugin ------------------------------------------------------------
+
+def pytest_addoption(parser):
+    group = parser.getgroup('sharding', 'duration-balanced sharding')
+    group.addoption('--shard-index', type=int, default=int(os.getenv('SHARD_INDEX', '0')),
+                    help='Shard to run, 0-based (env SHARD_INDEX)')
+    group.addoption('--shard-count', type=int, default=int(os.getenv('SHARD_COUNT', '1')),
+                    help='Number of shards the suite is split into (env SHARD_COUNT)')
+    group.addoption('--shard-durations', default=os.getenv('SHARD_DURATIONS', DURATIONS_PATH),
+                    help='Historical durations: stored JSON, a JUnit XML report or a phase profile')
+    group.addoption('--shard-group', choices=['class', 'module'], default='class',
+                    help='Keep tests of the same class (default) or module on one shard')
+    group.addoption('--store-durations', action='store_true', default=False,
+                    help='Update the durations file with this run\'s timings')
+
+
+_measured = None
+
+
+def pytest_configure(config):
+    global _measured
+    _measured = defaultdict(float)
+    config.shard_plan = None
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    count, index = config.getoption('shard_count'), config.getoption('shard_index')
+    if count <= 1:
+        return
+    if not 0 <= index < count:
+        raise pytest.UsageError(f"--shard-index must be in 0..{count - 1}, got {index}")
+    durations = load_durations(config.getoption('shard_durations'))
+    shards = plan_shards([item.nodeid for item in items], durations, count, config.getoption('shard_group'))
+    keep = set(shards[index]['nodeids'])
+    deselected = [item for item in items if item.nodeid not in keep]
+    items[:] = [item for item in items if item.nodeid in keep]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    config.shard_plan = {'index': index, 'count': count, 'known': len(durations),
+                         'seconds': [shard['seconds'] for shard in shards], 'units': len(shards[index]['units'])}
+
+
+def pytest_runtest_logreport(report):
+    if _measured is not None:
+        _measured[junit_key(report.nodeid)] += report.duration  # setup + call + teardown
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    if config.getoption('store_durations') and _measured and not hasattr(config, 'workerinput'):
+        update_durations(config.getoption('shard_durations'), _measured)
+
+
+def pytest_unconfigure(config):
+    global _measured
+    _measured = None
+
+
+def pytest_report_collectionfinish(config, items):
+    plan = config.shard_plan
+    if plan:
+        estimates = ', '.join(f"{seconds:.0f}s" for seconds in plan['seconds'])
+        return (f"shard {plan['index'] + 1}/{plan['count']}: {len(items)} tests in {plan['units']} units "
+                f"(planned {estimates}; history for {plan['known']} tests)")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Merge shard JUnit reports and keep the duration history')
+    commands = parser.add_subparsers(dest='command', required=True)
+    merge = commands.add_parser('merge-junit', help='Combine shard JUnit XML files into one report')
+    merge.add_argument('reports', nargs='+')
+    merge.add_argument('-o', '--out', default='test-results.xml')
+    merge.add_argument('--durations', default=None,
+                       help='Also fold the merged timings into this durations file for the next plan')
+    plan = commands.add_parser('plan', help='Show how a list of nodeids (one per line) would be split')
+    plan.add_argument('nodeids', help='File from pytest --collect-only -q')
+    plan.add_argument('--count', type=int, required=True)
+    plan.add_argument('--durations', default=DURATIONS_PATH)
+    plan.add_argument('--group', choices=['class', 'module'], default='class')
+    args = parser.parse_args()
+
+    if args.command == 'merge-junit':
+        totals = merge_junit(args.reports, args.out)
+        print(f"Merged {len(args.reports)} reports into {args.out}: {json.dumps(totals)}")
+        if args.durations:
+            update_durations(args.durations, load_durations(args.out))
+        return
+    with open(args.nodeids) as f:
+        nodeids = [line.strip() for line in f if '::' in line]
+    for index, shard in enumerate(plan_shards(nodeids, load_durations(args.durations), args.count, args.group)):
+        print(f"shard {index}: {shard['seconds']:.1f}s, {len(shard['nodeids'])} tests")
+        for unit in shard['units']:
+            print(f"  {unit}")
+
+
+if __name__ == '__main__':
+    main()
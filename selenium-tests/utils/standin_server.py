@@ -0,0 +1,641 @@
+"""
+Local Stand-in Backend
+In-memory imitation of the Express API (and optionally the built SPA) for
+running the harness without Mongo, Docker or a deployed instance
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import math
+import mimetypes
+import os
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+STANDIN_SECRET = os.getenv('STANDIN_SECRET', 'standin-secret')
+TOKEN_LIFETIME = 30 * 24 * 3600  # Same as loginUser's expiresIn: "30d"
+
+DEFAULT_BLOG_IMG = ('https://img.freepik.com/free-vector/laptop-with-program-code-isometric-icon-'
+                    'software-development-programming-applications-dark-neon_39422-971.jpg')
+DEFAULT_PROFILE_PICTURE = ('https://img.freepik.com/premium-vector/default-avatar-profile-icon-'
+                           'social-media-user-image-gray-avatar-icon-blank-profile-silhouette-'
+                           'vector-illustration_561158-3485.jpg')
+
+SHELL_HTML = """<!doctype html>
+<html lang="en">
+  <head><meta charset="UTF-8" /><title>Blog App</title></head>
+  <body><div id="root">Blog App stand-in</div></body>
+</html>
+"""
+
+
+def _b64url(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def make_token(user_id, lifetime=TOKEN_LIFETIME, secret=STANDIN_SECRET):
+    """
+    Issue an HS256 JWT shaped like the ones loginUser signs
+
+    Args:
+        user_id (str): Value for the ``id`` claim
+        lifetime (int): Seconds until the ``exp`` claim
+        secret (str): HMAC secret
+
+    Returns:
+        str: Encoded token
+    """
+    now = int(time.time())
+    header = _b64url(json.dumps({'alg': 'HS256', 'typ': 'JWT'}).encode())
+    payload = _b64url(json.dumps({'id': user_id, 'iat': now, 'exp': now + lifetime}).encode())
+    signing_input = f"{header}.{payload}".encode()
+    signature = _b64url(hmac.new(secret.encode(), signing_input, hashlib.sha256).digest())
+    return f"{header}.{payload}.{signature}"
+
+
+def verify_token(token, secret=STANDIN_SECRET):
+    """Return the token claims, or None when the signature or expiry is invalid"""
+    try:
+        header, payload, signature = token.split('.')
+    except (AttributeError, ValueError):
+        return None
+    expected = _b64url(hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest())
+    if not hmac.compare_digest(expected, signature):
+        return None
+    claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+    if claims.get('exp', 0) < time.time():
+        return None
+    return claims
+
+
+def _object_id():
+    return uuid.uuid4().hex[:24]
+
+
+def _now_iso():
+    return time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+
+
+class HttpError(Exception):
+    """Error carried back to the client in errorMiddleware's JSON shape"""
+
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class StandinStore:
+    """Thread-safe in-memory collections mirroring the Mongoose models"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = {}
+        self.blogs = {}
+        self.comments = {}
+
+    def add_user(self, username, email, password, is_admin=False):
+        """Insert a user document and return it"""
+        stamp = _now_iso()
+        user = {
+            '_id': _object_id(),
+            'username': username,
+            'email': email,
+            'password': hashlib.sha256(password.encode()).hexdigest(),
+            'profilePicture': DEFAULT_PROFILE_PICTURE,
+            'isAdmin': is_admin,
+            'createdAt': stamp,
+            'updatedAt': stamp,
+        }
+        with self.lock:
+            self.users[user['_id']] = user
+        return user
+
+    def add_blog(self, user_id, title, body, category='All', img=None):
+        """Insert a blog document and return it"""
+        stamp = _now_iso()
+        blog = {
+            '_id': _object_id(),
+            'userId': user_id,
+            'blogTitle': title,
+            'blogCategory': category or 'All',
+            'blogImgFile': img or DEFAULT_BLOG_IMG,
+            'blogBody': body,
+            'slug': re.sub(r'\s+', '-', title.strip().lower()),
+            'createdAt': stamp,
+            'updatedAt': stamp,
+        }
+        with self.lock:
+            if any(existing['blogTitle'] == title for existing in self.blogs.values()):
+                raise HttpError(f'E11000 duplicate key error dup key: {{ blogTitle: "{title}" }}', 500)
+            self.blogs[blog['_id']] = blog
+        return blog
+
+    def add_comment(self, user_id, blog_id, text):
+        """Insert a comment document and return it"""
+        stamp = _now_iso()
+        comment = {
+            '_id': _object_id(),
+            'comment': text,
+            'userId': user_id,
+            'blogId': blog_id,
+            'likes': [],
+            'numberOfLikes': 0,
+            'createdAt': stamp,
+            'updatedAt': stamp,
+        }
+        with self.lock:
+            self.comments[comment['_id']] = comment
+        return comment
+
+
+def _public(user):
+    return {key: value for key, value in user.items() if key != 'password'}
+
+
+def _page(items, page, limit, reverse):
+    ordered = sorted(items, key=lambda doc: doc['updatedAt'], reverse=reverse)
+    start = (page - 1) * limit
+    return ordered[start:start + limit]
+
+
+def _int_arg(query, name, default):
+    try:
+        return int(query.get(name, [default])[0]) or default
+    except (TypeError, ValueError):
+        return default
+
+
+class StandinApi:
+    """Route table reproducing the controllers' status codes and JSON shapes"""
+
+    def __init__(self, store):
+        self.store = store
+        self.routes = [
+            ('POST', r'/api/user/register$', self.register_user),
+            ('POST', r'/api/user/login$', self.login_user),
+            ('PUT', r'/api/user/updateuser/(?P<id>\w+)$', self.update_user),
+            ('DELETE', r'/api/user/deleteuser/(?P<id>\w+)$', self.delete_user),
+            ('POST', r'/api/user/signoutuser$', self.sign_out_user),
+            ('GET', r'/api/user/getusers$', self.get_users),
+            ('GET', r'/api/user/get-user-comment/(?P<id>\w+)$', self.get_user_comment),
+            ('POST', r'/api/blog/post-blog$', self.post_blog),
+            ('GET', r'/api/blog/get-all-blogs$', self.get_all_blogs),
+            ('DELETE', r'/api/blog/delete-blog/(?P<blogid>\w+)/(?P<userid>\w+)$', self.delete_blog),
+            ('PUT', r'/api/blog/update-blog/(?P<blogid>\w+)/(?P<userid>\w+)$', self.update_blog),
+            ('POST', r'/api/comment/add-comment/?$', self.add_comment),
+            ('GET', r'/api/comment/get-comment/(?P<blogId>\w+)$', self.get_comment),
+            ('PUT', r'/api/comment/like-the-comment/(?P<commentId>\w+)$', self.like_comment),
+            ('DELETE', r'/api/comment/delete-comment/(?P<commentId>\w+)$', self.delete_comment),
+            ('PUT', r'/api/comment/edit-comment/(?P<commentId>\w+)$', self.edit_comment),
+            ('GET', r'/api/comment/get-all-comments$', self.get_all_comments),
+        ]
+        self.routes = [(method, re.compile(pattern), handler) for method, pattern, handler in self.routes]
+
+    def dispatch(self, method, path, query, headers, body):
+        """
+        Resolve and run a route
+
+        Returns:
+            tuple: (status, payload) where payload is JSON-serialisable
+        """
+        known_path = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            known_path = True
+            if route_method != method:
+                continue
+            try:
+                return handler(match.groupdict(), query, headers, body)
+            except HttpError as e:
+                return e.status, {'success': False, 'statusCode': e.status, 'message': e.message}
+        if known_path:
+            return 404, {'success': False, 'statusCode': 404, 'message': f'Cannot {method} {path}'}
+        return None
+
+    # Middleware -----------------------------------------------------------
+
+    def _verify(self, headers):
+        token = headers.get('Authorization')
+        if not token:
+            raise HttpError('Unauthorized Access, Token not found!', 401)
+        claims = verify_token(token)
+        if not claims:
+            raise HttpError('invalid signature', 500)
+        return claims
+
+    # User routes ----------------------------------------------------------
+
+    def register_user(self, params, query, headers, body):
+        with self.store.lock:
+            exists = any(user['email'] == body.get('email') for user in self.store.users.values())
+        if exists:
+            raise HttpError('User is already exist!', 400)
+        if not body.get('username') or not body.get('email') or not body.get('password'):
+            raise HttpError('An unexpected error occurred while registering user!', 400)
+        user = self.store.add_user(body['username'], body['email'], body['password'])
+        return 200, {'success': True, 'message': 'User has been registered successfully', 'user': _public(user)}
+
+    def login_user(self, params, query, headers, body):
+        with self.store.lock:
+            user = next((u for u in self.store.users.values() if u['email'] == body.get('email')), None)
+        if not user:
+            raise HttpError('User not found', 401)
+        if user['password'] != hashlib.sha256(str(body.get('password', '')).encode()).hexdigest():
+            raise HttpError('Invalid password', 401)
+        user['token'] = make_token(user['_id'])
+        return 200, {'status': 200, 'success': True, 'message': 'Login successful', 'user': _public(user)}
+
+    def update_user(self, params, query, headers, body):
+        claims = self._verify(headers)
+        if params['id'] != claims['id']:
+            raise HttpError('Resources can not be accessed,Unauthorized user!', 401)
+        user = self.store.users[params['id']]
+        for field in ('username', 'email', 'profilePicture'):
+            if body.get(field) is not None:
+                user[field] = body[field]
+        user['updatedAt'] = _now_iso()
+        return 200, {'message': 'User has been updated', 'success': True, 'user': _public(user)}
+
+    def delete_user(self, params, query, headers, body):
+        claims = self._verify(headers)
+        is_admin = bool((body.get('user') or {}).get('isAdmin'))
+        if not is_admin and claims['id'] != params['id']:
+            raise HttpError('Unauthorized user!', 401)
+        with self.store.lock:
+            self.store.users.pop(params['id'], None)
+        return 200, {'success': True, 'message': 'User has been deleted'}
+
+    def sign_out_user(self, params, query, headers, body):
+        return 200, {'success': True, 'message': 'User has been signedOut'}
+
+    def get_users(self, params, query, headers, body):
+        self._verify(headers)
+        page = _int_arg(query, 'page', 1)
+        limit = _int_arg(query, 'user', 9)
+        with self.store.lock:
+            users = list(self.store.users.values())
+        selected = _page(users, page, limit, query.get('sortUser', [''])[0] != 'asc')
+        return 200, {
+            'success': True,
+            'message': 'user has been fetched',
+            'lastMonthUsers': len(users),
+            'user': [_public(user) for user in selected],
+            'countUser': len(users),
+        }
+
+    def get_user_comment(self, params, query, headers, body):
+        user = self.store.users.get(params['id'])
+        if not user:
+            raise HttpError('Comment not found!', 404)
+        return 200, _public(user)
+
+    # Blog routes ----------------------------------------------------------
+
+    def post_blog(self, params, query, headers, body):
+        self._verify(headers)
+        user = body.get('user') or {}
+        if not user.get('isAdmin'):
+            raise HttpError('You can not create blog,Unauthorized user!', 401)
+        blog = self.store.add_blog(user.get('_id'), body.get('blogTitle', ''), body.get('blogBody', ''),
+                                   body.get('blogCategory'), body.get('blogImgFile'))
+        return 200, {'success': True, 'message': 'Blog has been created', 'slug': blog['slug'], 'blog': blog}
+
+    def get_all_blogs(self, params, query, headers, body):
+        page = _int_arg(query, 'page', 1)
+        limit = _int_arg(query, 'limit', 8)
+        filters = {
+            'userId': query.get('userId', [None])[0],
+            'blogCategory': query.get('category', [None])[0],
+            'slug': query.get('slug', [None])[0],
+            '_id': query.get('blogId', [None])[0],
+        }
+        search = query.get('searchBlog', [None])[0]
+        with self.store.lock:
+            blogs = [
+                blog for blog in self.store.blogs.values()
+                if all(value is None or blog[key] == value for key, value in filters.items())
+                and (not search or re.search(re.escape(search), blog['blogTitle'] + ' ' + blog['blogBody'], re.I))
+            ]
+            user_count = len(self.store.users)
+        return 200, {
+            'success': True,
+            'message': 'Blogs have been fetched',
+            'lastMonthBlogs': user_count,
+            'countBlogs': len(blogs),
+            'blogs': _page(blogs, page, limit, query.get('sort', [''])[0] != 'asc'),
+        }
+
+    def delete_blog(self, params, query, headers, body):
+        self._verify(headers)
+        with self.store.lock:
+            self.store.blogs.pop(params['blogid'], None)
+        return 200, {'success': True, 'message': 'Blog has been deleted'}
+
+    def update_blog(self, params, query, headers, body):
+        self._verify(headers)
+        user = self.store.users.get(params['userid'])
+        blog = self.store.blogs.get(params['blogid'])
+        if not blog or not user or not (user['isAdmin'] or blog['userId'] == params['userid']):
+            raise HttpError('An unexpected error occurred while updating blog!', 401)
+        for field in ('blogTitle', 'blogCategory', 'blogImgFile', 'blogBody'):
+            if body.get(field) is not None:
+                blog[field] = body[field]
+        blog['updatedAt'] = _now_iso()
+        return 200, {'success': True, 'message': 'Blog has been updated', 'blog': blog}
+
+    # Comment routes -------------------------------------------------------
+
+    def add_comment(self, params, query, headers, body):
+        claims = self._verify(headers)
+        if claims['id'] != body.get('userId'):
+            raise HttpError('Unauthorized user!', 500)
+        comment = self.store.add_comment(body['userId'], body.get('blogId'), body.get('comment', ''))
+        return 200, {'success': True, 'message': 'Comment has been added ', 'comment': comment}
+
+    def get_comment(self, params, query, headers, body):
+        with self.store.lock:
+            comments = [c for c in self.store.comments.values() if c['blogId'] == params['blogId']]
+        if not comments:
+            raise HttpError('No comments found!', 404)
+        return 200, comments
+
+    def like_comment(self, params, query, headers, body):
+        self._verify(headers)
+        comment = self.store.comments.get(params['commentId'])
+        if not comment:
+            raise HttpError('Comment not found !', 500)
+        with self.store.lock:
+            if body.get('user') in comment['likes']:
+                comment['likes'].remove(body.get('user'))
+                comment['numberOfLikes'] -= 1
+            else:
+                comment['likes'].append(body.get('user'))
+                comment['numberOfLikes'] += 1
+        return 200, comment
+
+    def delete_comment(self, params, query, headers, body):
+        self._verify(headers)
+        if params['commentId'] not in self.store.comments:
+            raise HttpError('Comment not found!', 404)
+        # deleteComment compares userId on the result array, so only admins get through
+        if not (body.get('user') or {}).get('isAdmin'):
+            raise HttpError('You are not authorized to delete!', 401)
+        with self.store.lock:
+            self.store.comments.pop(params['commentId'], None)
+        return 200, {'success': True, 'message': 'Comment has been deleted'}
+
+    def edit_comment(self, params, query, headers, body):
+        claims = self._verify(headers)
+        comment = self.store.comments.get(params['commentId'])
+        if not comment:
+            raise HttpError('Comment not found!', 404)
+        if comment['userId'] != claims['id'] and not (body.get('currentUser') or {}).get('isAdmin'):
+            raise HttpError('Unauthorized error!', 401)
+        comment['comment'] = body.get('comment', comment['comment'])
+        return 200, comment
+
+    def get_all_comments(self, params, query, headers, body):
+        self._verify(headers)
+        page = _int_arg(query, 'page', 1)
+        limit = _int_arg(query, 'limitComments', 8)
+        with self.store.lock:
+            comments = list(self.store.comments.values())
+        return 200, {
+            'success': True,
+            'comments': _page(comments, page, limit, True),
+            'countDocument': len(comments),
+            'lastMonthComment': len(comments),
+        }
+
+
+class CapacityModel:
+    """
+    Finite pool of backend workers with an HPA-style scaler
+
+    Each API request holds one worker for ``service_time`` seconds, so latency
+    climbs once arrivals outpace ``workers / service_time``. When ``max_workers``
+    is above ``workers`` the pool is resized every ``period`` seconds using the
+    HPA rule ``desired = ceil(current * utilisation / target)``.
+    """
+
+    def __init__(self, workers=None, service_time=0.0, max_workers=None,
+                 target_utilization=0.5, period=1.0):
+        self.workers = workers
+        self.service_time = service_time
+        self.min_workers = workers
+        self.max_workers = max_workers or workers
+        self.target_utilization = target_utilization
+        self.period = period
+        self.in_flight = 0
+        self.busy_time = 0.0
+        self.scale_events = []
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.workers and self.max_workers > self.workers:
+            self._thread = threading.Thread(target=self._autoscale, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def serve(self):
+        """Hold one worker for the configured service time"""
+        if not self.workers:
+            if self.service_time:
+                time.sleep(self.service_time)
+            return
+        with self._cond:
+            while self.in_flight >= self.workers:
+                self._cond.wait()
+            self.in_flight += 1
+        started = time.monotonic()
+        try:
+            time.sleep(self.service_time)
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self.busy_time += time.monotonic() - started
+                self._cond.notify()
+
+    def _autoscale(self):
+        last_busy = 0.0
+        while not self._stop.wait(self.period):
+            with self._cond:
+                busy, last_busy = self.busy_time - last_busy, self.busy_time
+                utilization = busy / (self.period * self.workers)
+                desired = math.ceil(self.workers * utilization / self.target_utilization)
+                desired = max(self.min_workers, min(self.max_workers, desired))
+                if desired != self.workers:
+                    self.scale_events.append((time.time(), self.workers, desired))
+                    self.workers = desired
+                    self._cond.notify_all()
+
+
+def static_response(static_dir, path):
+    """
+    Serve ``path`` from a built SPA the way the frontend's nginx does, falling
+    back to index.html for client-side routes (a bare shell without ``static_dir``)
+
+    Returns:
+        tuple: (status, content type, bytes)
+    """
+    if not static_dir:
+        return 200, 'text/html; charset=utf-8', SHELL_HTML.encode()
+    root = os.path.abspath(static_dir)
+    candidate = os.path.normpath(os.path.join(root, path.lstrip('/')))
+    if not candidate.startswith(root) or not os.path.isfile(candidate):
+        candidate = os.path.join(root, 'index.html')  # try_files ... /index.html
+    with open(candidate, 'rb') as f:
+        content = f.read()
+    return 200, mimetypes.guess_type(candidate)[0] or 'application/octet-stream', content
+
+
+class StandinServer:
+    """
+    Threaded HTTP server wrapping StandinApi
+
+    Usage:
+        with StandinServer(workers=4, service_time=0.02) as server:
+            run_tests_against(server.url)
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, static_dir=None, **capacity):
+        self.store = StandinStore()
+        self.api = StandinApi(self.store)
+        self.capacity = CapacityModel(**capacity)
+        self.static_dir = static_dir
+        self.request_log = []
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.capacity.start()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.capacity.stop()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def create_admin(self, email='admin@blog.com', password='Admin123!', username='admin'):
+        """Seed an admin account (the real app requires one created by hand)"""
+        return self.store.add_user(username, email, password, is_admin=True)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self, method):
+                parsed = urlparse(self.path)
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    body = {}
+                if parsed.path.startswith('/api/'):
+                    server.capacity.serve()
+                    result = server.api.dispatch(method, parsed.path, parse_qs(parsed.query),
+                                                 self.headers, body if isinstance(body, dict) else {})
+                    if result is None:
+                        result = 404, {'success': False, 'statusCode': 404,
+                                       'message': f'Cannot {method} {parsed.path}'}
+                    status, payload = result
+                    content_type, content = 'application/json; charset=utf-8', json.dumps(payload).encode()
+                elif method in ('GET', 'HEAD'):
+                    status, content_type, content = static_response(server.static_dir, parsed.path)
+                else:
+                    status, content_type, content = 405, 'text/plain', b'Method Not Allowed'
+                server.request_log.append((time.time(), method, parsed.path, status))
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(content)))
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                if method != 'HEAD':
+                    self.wfile.write(content)
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_HEAD(self):
+                self._handle('HEAD')
+
+            def do_POST(self):
+                self._handle('POST')
+
+            def do_PUT(self):
+                self._handle('PUT')
+
+            def do_DELETE(self):
+                self._handle('DELETE')
+
+            def do_OPTIONS(self):
+                self.send_response(204)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Allow-Methods', 'GET,HEAD,PUT,PATCH,POST,DELETE')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+        return Handler
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run the in-memory stand-in backend')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8081)
+    parser.add_argument('--static-dir', default=None, help='Serve a built SPA, e.g. ../client/dist')
+    parser.add_argument('--workers', type=int, default=None, help='Concurrent API workers (unbounded if unset)')
+    parser.add_argument('--max-workers', type=int, default=None, help='Autoscale ceiling for --workers')
+    parser.add_argument('--service-time', type=float, default=0.0, help='Seconds each API request holds a worker')
+    args = parser.parse_args()
+
+    server = StandinServer(args.host, args.port, static_dir=args.static_dir, workers=args.workers,
+                           max_workers=args.max_workers, service_time=args.service_time)
+    admin = server.create_admin(os.getenv('ADMIN_EMAIL', 'admin@blog.com'),
+                                os.getenv('ADMIN_PASSWORD', 'Admin123!'))
+    server.start()
+    print(f"Stand-in backend running at {server.url} (admin: {admin['email']})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
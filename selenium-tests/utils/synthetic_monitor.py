@@ -0,0 +1,502 @@
+"""
+Synthetic Monitor
+Runs the API suite's stateless checks and browserless page checks on a
+jittered schedule, exporting latency histograms and outcome counters to Prometheus
+"""
+
+import bisect
+import heapq
+import json
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from requests.adapters import HTTPAdapter
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.common.by import By
+
+from config import BASE_URL, MONITOR_ACCOUNT
+from utils.html_driver import HtmlDriver
+
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Seconds
+MAX_REASONS = 16  # Distinct failure reasons kept per check; further ones count as "other"
+DEFAULT_INTERVAL = 30
+DEFAULT_JITTER = 0.1
+
+
+class FreshConnectionAdapter(HTTPAdapter):
+    """
+    Opens a new connection for every request, as a first visit does, so
+    connect time and refused connections count
+
+    Sending ``Connection: close`` alone is not enough: a server that closes
+    the socket without echoing the header leaves urllib3 pooling a dead
+    connection, which the next request then fails on.
+    """
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        if not kwargs.get('stream'):
+            response.content  # Read the body before its connection is dropped
+            self.close()
+        return response
+
+
+class CheckFailed(Exception):
+    """The app answered, but not as the check expects; ``reason`` becomes a metric label"""
+
+    def __init__(self, reason, detail=''):
+        super().__init__(f"{reason}: {detail}" if detail else reason)
+        self.reason = reason
+
+
+def _expect(response, allowed):
+    if response.status_code not in allowed:
+        raise CheckFailed(f"status_{response.status_code}", response.text[:200])
+    return response
+
+
+# Checks ----------------------------------------------------------------------
+# Each takes (session, base_url, timeout), raises CheckFailed (or a requests
+# error) on failure, and creates nothing, so it can run all day.
+
+def app_running(session, base_url, timeout):
+    """TestBlogApplication test_01: the frontend answers"""
+    _expect(session.get(base_url, timeout=timeout), (200, 301, 302, 304))
+
+
+def api_health(session, base_url, timeout):
+    """test_02: the API answers (401 without a token is fine)"""
+    _expect(session.get(f"{base_url}/api/user/getusers", timeout=timeout), (200, 401, 403))
+
+
+def invalid_login_rejected(session, base_url, timeout):
+    """test_05: wrong credentials are refused"""
+    _expect(session.post(f"{base_url}/api/user/login", timeout=timeout,
+                         json={'email': 'synthetic-monitor@example.invalid', 'password': 'WrongPassword123!'}),
+            (400, 401, 404))
+
+
+def routes_exist(session, base_url, timeout):
+    """test_07, with each route's own method: the SPA fallback answers every GET"""
+    for method, path in (('POST', '/api/user/register'), ('POST', '/api/user/login'), ('GET', '/api/user/getusers')):
+        response = session.request(method, f"{base_url}{path}", json={}, timeout=timeout)
+        if response.status_code == 404:
+            raise CheckFailed('route_missing', path)
+
+
+def json_response(session, base_url, timeout):
+    """test_08: the API speaks JSON"""
+    response = session.post(f"{base_url}/api/user/login", json={'email': 'test@test.com', 'password': 'test'},
+                            timeout=timeout)
+    if 'application/json' not in response.headers.get('Content-Type', '').lower() and \
+            not response.text.startswith('{'):
+        raise CheckFailed('not_json', response.headers.get('Content-Type', ''))
+
+
+def signout(session, base_url, timeout):
+    """test_09: the sign-out endpoint answers"""
+    _expect(session.post(f"{base_url}/api/user/signoutuser", timeout=timeout), (200, 400, 401))
+
+
+def cors_preflight(session, base_url, timeout):
+    """test_11: CORS preflight is answered"""
+    _expect(session.options(f"{base_url}/api/user/login", timeout=timeout), (200, 204, 404))
+
+
+def blog_list(session, base_url, timeout):
+    """Mongo round trip: the home page's blog query returns blogs"""
+    response = _expect(session.get(f"{base_url}/api/blog/get-all-blogs?limit=9", timeout=timeout), (200,))
+    try:
+        if 'blogs' not in response.json():
+            raise CheckFailed('no_blogs_key')
+    except ValueError:
+        raise CheckFailed('not_json', response.text[:200]) from None
+
+
+def login(session, base_url, timeout):
+    """test_04 with MONITOR_EMAIL/MONITOR_PASSWORD: an existing account can sign in"""
+    if not MONITOR_ACCOUNT['email']:
+        raise CheckFailed('not_configured', 'set MONITOR_EMAIL and MONITOR_PASSWORD')
+    response = _expect(session.post(f"{base_url}/api/user/login", json=MONITOR_ACCOUNT, timeout=timeout), (200,))
+    if not (response.json().get('user') or {}).get('token'):  # loginUser returns the user with its new token
+        raise CheckFailed('no_token')
+
+
+def _page_check(path):
+    def check(session, base_url, timeout):
+        driver = HtmlDriver(timeout=timeout)
+        try:
+            driver.get(f"{base_url}{path}")
+            if driver.status_code != 200:
+                raise CheckFailed(f"status_{driver.status_code}")
+            if not driver.title:
+                raise CheckFailed('no_title')
+            driver.find_element(By.ID, 'root')
+        except NoSuchElementException:
+            raise CheckFailed('no_root') from None
+        except WebDriverException:
+            raise CheckFailed('connection') from None
+        finally:
+            driver.quit()
+    check.__doc__ = f"Browserless: {path} serves the SPA shell with a title and #root"
+    return check
+
+
+# name -> check; login needs MONITOR_ACCOUNT and is not in DEFAULT_CHECKS
+CHECKS = {
+    'app_running': app_running,
+    'api_health': api_health,
+    'invalid_login_rejected': invalid_login_rejected,
+    'routes_exist': routes_exist,
+    'json_response': json_response,
+    'signout': signout,
+    'cors_preflight': cors_preflight,
+    'blog_list': blog_list,
+    'login': login,
+    'home_page': _page_check('/'),
+    'login_page': _page_check('/login'),
+    'register_page': _page_check('/register'),
+}
+DEFAULT_CHECKS = [name for name in CHECKS if name != 'login']
+
+
+# Metrics -----------------------------------------------------------------------
+
+class CheckMetrics:
+    """Fixed-bucket latency histogram and outcome counters of one check (constant memory)"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)  # Last one is +Inf
+        self.duration_sum = 0.0
+        self.successes = 0
+        self.failures = 0
+        self.reasons = {}
+        self.up = None
+        self.last_run = None
+        self.last_success = None
+        self.last_reason = None
+
+    def record(self, seconds, reason=None, at=None):
+        self.buckets[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.duration_sum += seconds
+        self.last_run = time.time() if at is None else at
+        if reason is None:
+            self.successes += 1
+            self.up, self.last_success, self.last_reason = 1, self.last_run, None
+            return
+        self.failures += 1
+        self.up, self.last_reason = 0, reason
+        if reason not in self.reasons and len(self.reasons) >= MAX_REASONS:
+            reason = 'other'
+        self.reasons[reason] = self.reasons.get(reason, 0) + 1
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class MonitorMetrics:
+    """
+    Metrics of every check, rendered in the Prometheus text format
+
+    Rendering reuses the previous text until a check records a new result, so
+    frequent scrapes cost one lock acquisition.
+    """
+
+    PREFIX = 'blog_synthetic'
+
+    def __init__(self, names):
+        self.checks = {name: CheckMetrics() for name in names}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._version = 0
+        self._rendered = (None, '')
+        self._le = [f'{bound:g}' for bound in BUCKETS] + ['+Inf']
+
+    def record(self, name, seconds, reason=None):
+        with self._lock:
+            self.checks[name].record(seconds, reason)
+            self._version += 1
+
+    def summary(self):
+        with self._lock:
+            return {name: {'up': check.up, 'successes': check.successes, 'failures': check.failures,
+                           'last_run': check.last_run, 'last_success': check.last_success,
+                           'last_reason': check.last_reason}
+                    for name, check in self.checks.items()}
+
+    def render(self):
+        with self._lock:
+            version, text = self._rendered
+            if version == self._version:
+                return text
+            text = self._render()
+            self._rendered = (self._version, text)
+            return text
+
+    def _render(self):
+        p = self.PREFIX
+        lines = [f"# HELP {p}_check_duration_seconds Time taken by a synthetic check, failures included",
+                 f"# TYPE {p}_check_duration_seconds histogram"]
+        for name, check in self.checks.items():
+            label = f'check="{_escape(name)}"'
+            cumulative = 0
+            for le, count in zip(self._le, check.buckets):
+                cumulative += count
+                lines.append(f'{p}_check_duration_seconds_bucket{{{label},le="{le}"}} {cumulative}')
+            lines.append(f"{p}_check_duration_seconds_sum{{{label}}} {check.duration_sum:.6f}")
+            lines.append(f"{p}_check_duration_seconds_count{{{label}}} {cumulative}")
+
+        lines += [f"# HELP {p}_check_runs_total Synthetic check runs by result",
+                  f"# TYPE {p}_check_runs_total counter"]
+        for name, check in self.checks.items():
+            lines.append(f'{p}_check_runs_total{{check="{_escape(name)}",result="success"}} {check.successes}')
+            lines.append(f'{p}_check_runs_total{{check="{_escape(name)}",result="failure"}} {check.failures}')
+
+        lines += [f"# HELP {p}_check_failures_total Failed synthetic check runs by reason",
+                  f"# TYPE {p}_check_failures_total counter"]
+        for name, check in self.checks.items():
+            for reason, count in sorted(check.reasons.items()):
+                lines.append(f'{p}_check_failures_total{{check="{_escape(name)}",reason="{_escape(reason)}"}} {count}')
+
+        lines += [f"# HELP {p}_check_up Whether the last run of the check passed",
+                  f"# TYPE {p}_check_up gauge"]
+        lines += [f'{p}_check_up{{check="{_escape(name)}"}} {check.up}'
+                  for name, check in self.checks.items() if check.up is not None]
+        lines += [f"# HELP {p}_check_last_success_timestamp_seconds Unix time of the last passing run",
+                  f"# TYPE {p}_check_last_success_timestamp_seconds gauge"]
+        lines += [f'{p}_check_last_success_timestamp_seconds{{check="{_escape(name)}"}} {check.last_success:.3f}'
+                  for name, check in self.checks.items() if check.last_success is not None]
+        lines += [f"# HELP {p}_start_time_seconds Unix time the monitor started",
+                  f"# TYPE {p}_start_time_seconds gauge",
+                  f"{p}_start_time_seconds {self.started:.3f}"]
+        return '\n'.join(lines) + '\n'
+
+
+# Scheduler ---------------------------------------------------------------------
+
+class SyntheticMonitor:
+    """
+    Runs each check every ``interval`` seconds, give or take ``jitter``
+
+    First runs are spread over one interval so checks do not fire together,
+    and each run is scheduled from when the previous one was due, not from
+    when it finished, so slow checks do not drift. A check never overlaps
+    itself: if a run overruns its interval, the next run starts right after it.
+
+    Args:
+        checks (dict): Check name -> interval in seconds
+        jitter (float): Fraction of the interval each wait may vary by
+        workers (int): Checks that may run at once
+    """
+
+    def __init__(self, base_url=BASE_URL, checks=None, jitter=DEFAULT_JITTER, timeout=10, workers=4, seed=None):
+        self.base_url = base_url.rstrip('/')
+        self.intervals = checks or {name: DEFAULT_INTERVAL for name in DEFAULT_CHECKS}
+        unknown = sorted(set(self.intervals) - set(CHECKS))
+        if unknown:
+            raise ValueError(f"Unknown checks {unknown}; known: {', '.join(CHECKS)}")
+        self.jitter = jitter
+        self.timeout = timeout
+        self.metrics = MonitorMetrics(self.intervals)
+        self._random = random.Random(seed)
+        self._heap = []
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='check')
+        self._thread = None
+
+    @staticmethod
+    def _session():
+        session = requests.Session()
+        session.headers['User-Agent'] = 'blog-synthetic-monitor'
+        session.headers['Connection'] = 'close'
+        adapter = FreshConnectionAdapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def run_once(self, name):
+        """
+        Run one check now and record it
+
+        Returns:
+            tuple: (seconds, failure reason or None)
+        """
+        started = time.perf_counter()
+        reason = None
+        session = self._session()
+        try:
+            CHECKS[name](session, self.base_url, self.timeout)
+        except CheckFailed as e:
+            reason = e.reason
+        except requests.RequestException as e:
+            reason = type(e).__name__
+        except Exception as e:  # A buggy check must not stop the daemon
+            reason = f"error_{type(e).__name__}"
+        finally:
+            session.close()
+        seconds = time.perf_counter() - started
+        self.metrics.record(name, seconds, reason)
+        return seconds, reason
+
+    def _jittered(self, interval):
+        return interval * (1 + self._random.uniform(-self.jitter, self.jitter))
+
+    def start(self):
+        now = time.monotonic()
+        with self._cond:
+            self._heap = [(now + self._random.uniform(0, interval), name) for name, interval in self.intervals.items()]
+            heapq.heapify(self._heap)
+        self._thread = threading.Thread(target=self._loop, name='synthetic-monitor', daemon=True)
+        self._thread.start()
+        return self
+
+    def _loop(self):
+        with self._cond:
+            while not self._stopping:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, name = self._heap[0]
+                delay = due - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                heapq.heappop(self._heap)
+                self._executor.submit(self._run, name, due)
+
+    def _run(self, name, due):
+        self.run_once(name)
+        with self._cond:
+            if self._stopping:
+                return
+            heapq.heappush(self._heap, (max(due + self._jittered(self.intervals[name]), time.monotonic()), name))
+            self._cond.notify()
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+
+
+class MetricsServer:
+    """
+    Serves ``GET /metrics`` (Prometheus text format) and ``GET /health``
+    (JSON per check) for a monitor
+    """
+
+    def __init__(self, metrics, host='127.0.0.1', port=9464):
+        self.metrics = metrics
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{'127.0.0.1' if host == '0.0.0.0' else host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _reply(self, status, content, content_type):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def do_GET(self):
+                if self.path == '/metrics':
+                    self._reply(200, server.metrics.render().encode(), 'text/plain; version=0.0.4; charset=utf-8')
+                elif self.path == '/health':
+                    self._reply(200, json.dumps(server.metrics.summary()).encode(), 'application/json')
+                else:
+                    self._reply(404, b'Not found', 'text/plain')
+
+        return Handler
+
+
+def load_config(path):
+    """
+    Checks and options from a JSON file::
+
+        {"interval": 30, "jitter": 0.1, "timeout": 10,
+         "checks": {"api_health": 15, "blog_list": {"interval": 60}, "home_page": {}}}
+
+    Returns:
+        dict: ``checks`` (name -> interval) plus any of ``jitter``, ``timeout``
+    """
+    with open(path) as f:
+        data = json.load(f)
+    default = data.get('interval', DEFAULT_INTERVAL)
+    checks = {}
+    for name, value in (data.get('checks') or dict.fromkeys(DEFAULT_CHECKS, {})).items():
+        checks[name] = value.get('interval', default) if isinstance(value, dict) else value
+    return dict({key: data[key] for key in ('jitter', 'timeout') if key in data}, checks=checks)
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run the app checks on a schedule and export Prometheus metrics')
+    parser.add_argument('--url', default=BASE_URL)
+    parser.add_argument('--checks', default=','.join(DEFAULT_CHECKS),
+                        help=f"Comma-separated subset of: {', '.join(CHECKS)}")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help='Seconds between runs of each check')
+    parser.add_argument('--jitter', type=float, default=DEFAULT_JITTER, help='Fraction each interval may vary by')
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--config', default=None, help='JSON file with per-check intervals (overrides the above)')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=9464, help='Port for /metrics and /health')
+    parser.add_argument('--list', action='store_true', help='List the available checks and exit')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, check in CHECKS.items():
+            print(f"{name:<24} {check.__doc__}")
+        return
+    options = {'checks': {name.strip(): args.interval for name in args.checks.split(',') if name.strip()},
+               'jitter': args.jitter, 'timeout': args.timeout}
+    if args.config:
+        options.update(load_config(args.config))
+    try:
+        monitor = SyntheticMonitor(args.url, **options)
+    except ValueError as e:
+        parser.error(str(e))
+    server = MetricsServer(monitor.metrics, args.host, args.port).start()
+    stopped = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopped.set())
+    monitor.start()
+    print(f"Monitoring {args.url} with {', '.join(monitor.intervals)}; metrics on {server.url}/metrics")
+    try:
+        stopped.wait()
+    except KeyboardInterrupt:
+        pass
+    monitor.stop()
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
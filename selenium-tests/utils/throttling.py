@@ -0,0 +1,268 @@
+"""
+Browser Throttling Matrix
+Named CDP network and CPU throttling profiles for the Chrome driver, and a
+runner that repeats the page vitals of key routes under each profile
+"""
+
+import csv
+import json
+import os
+import statistics
+import time
+
+from config import BASE_URL
+from utils.browser_metrics import page_vitals
+
+
+# Chrome DevTools presets: round-trip latency added per request, throughput in
+# kilobits per second. Unlike utils.netem_proxy these are applied inside the
+# browser, so only what the page loads is shaped
+NETWORK_PRESETS = {
+    'slow-3g': {'latency_ms': 2000, 'download_kbps': 400, 'upload_kbps': 400},
+    'fast-3g': {'latency_ms': 562.5, 'download_kbps': 1440, 'upload_kbps': 675},
+    'fast-4g': {'latency_ms': 165, 'download_kbps': 8100, 'upload_kbps': 1350},
+}
+
+# Main-thread slowdown factors (Lighthouse's mobile run uses 4x)
+CPU_PRESETS = {'cpu-2x': 2, 'cpu-4x': 4, 'cpu-6x': 6}
+
+VITALS = ['ttfb_ms', 'fcp_ms', 'dcl_ms', 'load_ms', 'get_ms']
+
+# SPA routes every profile is measured on; {slug} is filled from the newest post
+MATRIX_ROUTES = {
+    'home': '/',
+    'search': '/search?sort=desc',
+    'login': '/login',
+    'post': '/blog/{slug}',
+}
+DEFAULT_PROFILES = ['none', 'fast-4g', 'fast-3g', 'slow-3g', 'cpu-4x', 'fast-4g+cpu-4x']
+
+
+def resolve_throttle(name):
+    """
+    Settings for a profile name, combining parts joined by ``+``
+
+    ``"fast-4g+cpu-4x"`` is fast 4G with a 4x slower CPU; ``"none"`` (or an
+    empty name) is no throttling at all.
+
+    Returns:
+        dict: ``network`` (NETWORK_PRESETS entry or None) and ``cpu_rate``
+
+    Raises:
+        ValueError: For an unknown part or two network presets
+    """
+    settings = {'network': None, 'cpu_rate': 1}
+    for part in (name or 'none').lower().split('+'):
+        if part == 'none':
+            continue
+        if part in NETWORK_PRESETS:
+            if settings['network'] is not None:
+                raise ValueError(f"{name!r} combines two network presets")
+            settings['network'] = dict(NETWORK_PRESETS[part])
+        elif part in CPU_PRESETS:
+            settings['cpu_rate'] = CPU_PRESETS[part]
+        else:
+            raise ValueError(f"Unknown throttling profile {part!r}; use none, "
+                             f"{', '.join([*NETWORK_PRESETS, *CPU_PRESETS])} or a '+' combination")
+    return settings
+
+
+def network_conditions(network):
+    """``Network.emulateNetworkConditions`` parameters; None lifts the throttling (-1 is unlimited)"""
+    if network is None:
+        return {'offline': False, 'latency': 0, 'downloadThroughput': -1, 'uploadThroughput': -1}
+    return {
+        'offline': False,
+        'latency': network['latency_ms'],
+        'downloadThroughput': network['download_kbps'] * 1000 / 8,
+        'uploadThroughput': network['upload_kbps'] * 1000 / 8,
+    }
+
+
+def apply_throttle(driver, profile):
+    """
+    Throttle the driver's current tab
+
+    Both dimensions are always set, so switching profiles on one driver never
+    leaves the previous profile's network or CPU setting behind. Emulation is
+    per tab: call it again after switching to a new window or browser context.
+
+    Args:
+        profile: Profile name or settings from ``resolve_throttle``
+
+    Returns:
+        dict: The settings applied
+    """
+    settings = resolve_throttle(profile) if isinstance(profile, str) or profile is None else profile
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.emulateNetworkConditions', network_conditions(settings['network']))
+    driver.execute_cdp_cmd('Emulation.setCPUThrottlingRate', {'rate': settings['cpu_rate']})
+    return settings
+
+
+def resolve_routes(base_url, routes=MATRIX_ROUTES, client=None):
+    """
+    Fill ``{slug}`` with the newest post's slug
+
+    Returns:
+        dict: Route name to path; routes needing a post are dropped when there is none
+    """
+    if not any('{slug}' in path for path in routes.values()):
+        return dict(routes)
+    from utils.api_client import ApiClient
+
+    blogs = (client or ApiClient(base_url)).get_blogs(sort='desc', limit=1)['blogs']
+    if not blogs:
+        print("[throttle] No posts to open; skipping routes that need one")
+        return {name: path for name, path in routes.items() if '{slug}' not in path}
+    return {name: path.format(slug=blogs[0]['slug']) for name, path in routes.items()}
+
+
+def measure_route(driver, url, repeat=3):
+    """
+    Cold loads of ``url`` (browser cache cleared before each)
+
+    Returns:
+        dict: Median ``ttfb_ms``, ``fcp_ms``, ``dcl_ms``, ``load_ms``, ``dom_nodes``
+        and ``get_ms`` (how long ``driver.get`` blocked)
+    """
+    loads = []
+    for _ in range(repeat):
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        started = time.perf_counter()
+        driver.get(url)
+        get_ms = round((time.perf_counter() - started) * 1000, 1)
+        loads.append({**page_vitals(driver), 'get_ms': get_ms})
+    row = {}
+    for key in loads[0]:
+        values = [load[key] for load in loads if load[key] is not None]
+        row[key] = round(statistics.median(values), 1) if values else None
+    return row
+
+
+def run_matrix(driver, base_url, profiles=DEFAULT_PROFILES, routes=MATRIX_ROUTES, repeat=3):
+    """
+    Measure every route under every throttling profile
+
+    Profiles run one after another on the same driver and throttling is lifted
+    at the end.
+
+    Returns:
+        list: One row per (profile, route) with the medians of ``measure_route``
+    """
+    results = []
+    try:
+        for profile in profiles:
+            apply_throttle(driver, profile)
+            for name, path in routes.items():
+                results.append({'profile': profile, 'route': name, **measure_route(driver, base_url + path, repeat)})
+            print(f"[throttle] {profile} measured")
+    finally:
+        apply_throttle(driver, 'none')
+    return results
+
+
+def comparison_table(results, metric='load_ms', baseline='none'):
+    """
+    Pivot results into routes by profiles for one metric
+
+    Returns:
+        dict: ``metric``, ``baseline``, ``profiles`` (run order) and ``routes``:
+        route -> profile -> ``{"value", "ratio"}``, ratio to the baseline
+        profile's value (None without a baseline or a value)
+    """
+    profiles = list(dict.fromkeys(row['profile'] for row in results))
+    table = {}
+    for row in results:
+        table.setdefault(row['route'], {})[row['profile']] = {'value': row.get(metric), 'ratio': None}
+    for cells in table.values():
+        base = cells.get(baseline, {}).get('value')
+        for cell in cells.values():
+            if base and cell['value'] is not None:
+                cell['ratio'] = round(cell['value'] / base, 2)
+    return {'metric': metric, 'baseline': baseline, 'profiles': profiles, 'routes': table}
+
+
+def print_table(table):
+    print(f"{table['metric']} (ratio to {table['baseline']})")
+    print(f"{'route':>10} " + ' '.join(f"{profile:>16}" for profile in table['profiles']))
+    for route, cells in table['routes'].items():
+        shown = []
+        for profile in table['profiles']:
+            cell = cells.get(profile, {})
+            text = '-' if cell.get('value') is None else f"{cell['value']:.0f}"
+            if cell.get('ratio') is not None and profile != table['baseline']:
+                text += f" x{cell['ratio']:.1f}"
+            shown.append(f"{text:>16}")
+        print(f"{route:>10} " + ' '.join(shown))
+
+
+def write_results_csv(results, path):
+    columns = sorted({key for row in results for key in row}, key=lambda key: (key not in ('profile', 'route'), key))
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def main():
+    import argparse
+
+    from utils.driver_setup import close_driver, get_chrome_driver
+
+    parser = argparse.ArgumentParser(description='Compare page vitals of key routes under throttling profiles')
+    parser.add_argument('--url', default=BASE_URL, help='Target frontend URL (default: APP_URL)')
+    parser.add_argument('--profiles', nargs='+', default=DEFAULT_PROFILES,
+                        help='Profile names; join parts with + (e.g. fast-4g+cpu-4x)')
+    parser.add_argument('--routes', nargs='+', choices=sorted(MATRIX_ROUTES), default=list(MATRIX_ROUTES))
+    parser.add_argument('--repeat', type=int, default=3, help='Cold loads per route and profile')
+    parser.add_argument('--metric', choices=VITALS, default='load_ms', help='Metric of the printed table')
+    parser.add_argument('--page-load-timeout', type=float, default=120,
+                        help='Seconds driver.get may block (slow-3g needs far more than the usual 30)')
+    parser.add_argument('--standin', action='store_true', help='Serve the built SPA from a local stand-in')
+    parser.add_argument('--static-dir', default=os.path.join('..', 'client', 'dist'),
+                        help='Built SPA served by the stand-in (npm run build in client/)')
+    parser.add_argument('--out', default=None, help='Directory for throttle.csv and summary.json')
+    args = parser.parse_args()
+    for profile in args.profiles:
+        try:
+            resolve_throttle(profile)
+        except ValueError as e:
+            parser.error(str(e))
+
+    standin = None
+    url = args.url
+    if args.standin:
+        from utils.seeder import seed_blogs
+        from utils.standin_server import StandinServer
+        standin = StandinServer(static_dir=args.static_dir).start()
+        seed_blogs(9, store=standin.store)
+        url = standin.url
+
+    driver = get_chrome_driver(headless=True, throttle=None)
+    driver.set_page_load_timeout(args.page_load_timeout)
+    try:
+        routes = resolve_routes(url, {name: MATRIX_ROUTES[name] for name in args.routes})
+        results = run_matrix(driver, url, args.profiles, routes, args.repeat)
+    finally:
+        close_driver(driver)
+        if standin:
+            standin.stop()
+
+    baseline = args.profiles[0]
+    print_table(comparison_table(results, args.metric, baseline))
+    if args.out:
+        os.makedirs(args.out, exist_ok=True)
+        write_results_csv(results, os.path.join(args.out, 'throttle.csv'))
+        with open(os.path.join(args.out, 'summary.json'), 'w') as f:
+            json.dump({
+                'target': url,
+                'profiles': {profile: resolve_throttle(profile) for profile in args.profiles},
+                'routes': routes,
+                'tables': {metric: comparison_table(results, metric, baseline) for metric in VITALS},
+            }, f, indent=2)
+        print(f"Results written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()